@@ -1,11 +1,9 @@
-"""
 #    Advanced Token Optimization Algorithms
 """
 Provides sophisticated optimization algorithms that work with the Token Budget Manager
 to maximize token efficiency while maintaining functionality.
 
 Features:
-"""
 - Multi-objective optimization algorithms
 - Dynamic token allocation based on machine learning
 - Reinforcement learning for optimization strategies
@@ -13,6 +11,7 @@ Features:
 - Bayesian optimization for hyperparameter tuning
 - Ensemble optimization methods
 - Real-time adaptation and learning
+"""
 import os
 import json
 import numpy as np
@@ -646,8 +645,8 @@ class AdvancedTokenOptimizer:
         current_performance: Dict[str, float],
         constraints: Dict[str, Tuple[float, float]],
         objective: OptimizationObjective = OptimizationObjective.BALANCE_COST_QUALITY,
-    )-> OptimizationResult:
-        """Optimize Task Parameters."""Optimize parameters for a specific task type."""
+    ) -> OptimizationResult:
+        """Optimize parameters for a specific task type."""
 
         # Define optimization parameters
         opt_params = OptimizationParameters(
@@ -13,12 +13,14 @@ import time
 import hashlib
 import pathlib
 from typing import Dict, List, Any, Optional, Tuple, Set, Callable
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, replace
 from enum import Enum
 import zlib
 import base64
 
+from batch_optimization import dedupe_indices
 from smart_caching_system import get_smart_cache
+from token_counter import count_tokens, count_tokens_batch
 from token_optimization_engine import get_token_optimizer
 
 
@@ -38,6 +40,7 @@ class CompressionType(Enum):
     BASIC = "basic"  # Remove redundancy
     STRUCTURAL = "structural"  # Structure-based compression
     SEMANTIC = "semantic"  # Semantic compression
+    ADAPTIVE = "adaptive"  # Chosen per message from size and priority
 
 
 @dataclass
@@ -82,13 +85,11 @@ class CommunicationProtocol:
 
 
 class AgentCommunicationOptimizer:
-"""
+    """
     Advanced optimizer for agent-to-agent communication that minimizes token usage
-"""
     while maintaining effective collaboration.
-"""
+    """
 
-"""
     def __init__(self, cache_dir: str = ".claude-patterns"):
         """Initialize the processor with default configuration."""
         self.cache_dir = pathlib.Path(cache_dir)
@@ -135,8 +136,8 @@ class AgentCommunicationOptimizer:
 
     def optimize_message(
         self, sender: str, receiver: str, message: Dict[str, Any], protocol_id: str = None
-    )-> OptimizedMessage:
-        """Optimize Message."""
+    ) -> OptimizedMessage:
+        """
         Optimize a single message for token efficiency.
 
         Args:
@@ -147,29 +148,13 @@ class AgentCommunicationOptimizer:
 
         Returns:
             Optimized message with metadata
-"""
-        # Determine protocol
-        if protocol_id is None:
-            protocol_id = self._determine_protocol(sender, receiver)
-
-        protocol = self.protocols.get(protocol_id)
-        if not protocol:
-            # Use default protocol
-            protocol = self._get_default_protocol()
-            self.protocols[protocol_id] = protocol
-
-        # Determine priority
-        priority = self._determine_priority(message, protocol)
+        """
+        protocol_id, protocol, priority, compression_type = self._plan_message(sender, receiver, message, protocol_id)
 
         # Skip optimization for critical messages
         if priority == MessagePriority.CRITICAL:
             return self._create_optimized_message(message, CompressionType.NONE, priority, protocol)
 
-        # Choose compression strategy
-        compression_type = protocol.compression_type
-        if compression_type == CompressionType.ADAPTIVE:
-            compression_type = self._choose_compression_strategy(message, priority)
-
         # Compress message
         compressed_content = self.compression_strategies[compression_type](message)
 
@@ -182,10 +167,8 @@ class AgentCommunicationOptimizer:
 
         return optimized
 
-"""
-    def decompress_message():
-"""
-        
+    def decompress_message(self, optimized_message: OptimizedMessage) -> Dict[str, Any]:
+        """
         Decompress an optimized message back to original form.
 
         Args:
@@ -193,7 +176,7 @@ class AgentCommunicationOptimizer:
 
         Returns:
             Decompressed original message
-"""
+        """
         if optimized_message.compression_type == CompressionType.NONE:
             # Original content stored directly
             return json.loads(optimized_message.compressed_content)
@@ -209,10 +192,8 @@ class AgentCommunicationOptimizer:
         # Fallback
         return json.loads(optimized_message.compressed_content)
 
-"""
-    def optimize_conversation():
-"""
-        
+    def optimize_conversation(self, conversation: List[Dict[str, Any]], participants: List[str]) -> Dict[str, Any]:
+        """
         Optimize an entire conversation for token efficiency.
 
         Args:
@@ -221,30 +202,23 @@ class AgentCommunicationOptimizer:
 
         Returns:
             Optimization results with metrics
-"""
+        """
         optimized_messages = []
         total_original_tokens = 0
         total_optimized_tokens = 0
 
-        # Group messages by sender-receiver pairs
+        # Group messages by sender-receiver pairs and optimize them as one batch
         message_groups = self._group_messages_by_participants(conversation, participants)
+        requests = [
+            (sender, receiver, message)
+            for (sender, receiver), messages in message_groups.items()
+            for message in messages
+        ]
 
-        for (sender, receiver), messages in message_groups.items():
-            for i, message in enumerate(messages):
-                # Consider context in conversation
-                context = {
-                    "conversation_index": i,
-                    "total_messages": len(messages),
-                    "participants": participants,
-                    "previous_messages": optimized_messages[-3:] if optimized_messages else [],
-                }
-
-                # Optimize message with context
-                optimized = self.optimize_message(sender, receiver, message, context=context)
-
-                optimized_messages.append(optimized)
-                total_original_tokens += optimized.tokens_original
-                total_optimized_tokens += optimized.tokens_compressed
+        for optimized in self.optimize_batch(requests):
+            optimized_messages.append(optimized)
+            total_original_tokens += optimized.tokens_original
+            total_optimized_tokens += optimized.tokens_compressed
 
         tokens_saved = total_original_tokens - total_optimized_tokens
 
@@ -258,11 +232,10 @@ class AgentCommunicationOptimizer:
             "message_count": len(conversation),
         }
 
-"""
     def create_communication_protocol(
         self, protocol_id: str, agent_group: str, message_format: str, optimization_rules: Dict[str, Any]
-    )-> bool:
-        """Create Communication Protocol."""
+    ) -> bool:
+        """
         Create a new communication protocol for agent interactions.
 
         Args:
@@ -273,7 +246,7 @@ class AgentCommunicationOptimizer:
 
         Returns:
             True if protocol created successfully
-"""
+        """
         protocol = CommunicationProtocol(
             protocol_id=protocol_id,
             agent_group=agent_group,
@@ -304,10 +277,8 @@ class AgentCommunicationOptimizer:
 
         return True
 
-"""
-    def get_agent_efficiency_report():
-"""
-        
+    def get_agent_efficiency_report(self, agent_id: str = None) -> Dict[str, Any]:
+        """
         Get efficiency report for agents or all agents.
 
         Args:
@@ -315,7 +286,7 @@ class AgentCommunicationOptimizer:
 
         Returns:
             Efficiency report with metrics
-"""
+        """
         if agent_id:
             # Single agent report
             agent_stats = self.stats["agent_efficiency"].get(agent_id, {})
@@ -337,7 +308,81 @@ class AgentCommunicationOptimizer:
                 "top_performers": self._get_top_performers(),
             }
 
-"""
+    def optimize_batch(
+        self, messages: List[Tuple[str, str, Dict[str, Any]]], protocol_id: str = None
+    ) -> List[OptimizedMessage]:
+        """
+        Optimize a batch of messages, e.g. an orchestrator fan-out.
+
+        Identical messages sharing a protocol, priority and compression type are
+        compressed once, and statistics are saved once per batch instead of
+        once per message.
+
+        Args:
+            messages: (sender, receiver, message) tuples
+            protocol_id: Communication protocol to use for every message
+
+        Returns:
+            One optimized message per input, in order
+        """
+        plans = [self._plan_message(sender, receiver, message, protocol_id) for sender, receiver, message in messages]
+        keys = [
+            (plan_protocol_id, priority.value, compression_type.value, self._generate_message_id(message))
+            for (plan_protocol_id, _, priority, compression_type), (_, _, message) in zip(plans, messages)
+        ]
+        unique_indices, slots = dedupe_indices(keys)
+
+        unique_results = []
+        for index in unique_indices:
+            _, protocol, priority, compression_type = plans[index]
+            message = messages[index][2]
+            unique_results.append(self._create_optimized_message(message, compression_type, priority, protocol))
+
+        results = []
+        first_seen = set()
+        for (sender, receiver, _), (plan_protocol_id, _, priority, _), slot in zip(messages, plans, slots):
+            optimized = unique_results[slot]
+            if slot in first_seen:
+                optimized = replace(optimized, metadata=dict(optimized.metadata), dependencies=[])
+            else:
+                first_seen.add(slot)
+            results.append(optimized)
+
+            # Critical messages bypass optimization and are not counted, as in optimize_message
+            if priority != MessagePriority.CRITICAL:
+                self._update_stats(optimized, save=False)
+                self._track_communication_pattern(sender, receiver, plan_protocol_id)
+
+        if results:
+            self._save_stats()
+        return results
+
+    def _plan_message(
+        self, sender: str, receiver: str, message: Dict[str, Any], protocol_id: str = None
+    ) -> Tuple[str, CommunicationProtocol, MessagePriority, CompressionType]:
+        """Resolve the protocol, priority and compression type for a message."""
+        # Determine protocol
+        if protocol_id is None:
+            protocol_id = self._determine_protocol(sender, receiver)
+
+        protocol = self.protocols.get(protocol_id)
+        if not protocol:
+            # Use default protocol
+            protocol = self._get_default_protocol()
+            self.protocols[protocol_id] = protocol
+
+        # Determine priority
+        priority = self._determine_priority(message, protocol)
+        if priority == MessagePriority.CRITICAL:
+            return protocol_id, protocol, priority, CompressionType.NONE
+
+        # Choose compression strategy
+        compression_type = protocol.compression_type
+        if compression_type == CompressionType.ADAPTIVE:
+            compression_type = self._choose_compression_strategy(message, priority)
+
+        return protocol_id, protocol, priority, compression_type
+
     def _determine_protocol(self, sender: str, receiver: str) -> str:
         """Determine the appropriate protocol for agent communication."""
         # Check if agents are in the same group
@@ -531,8 +576,8 @@ class AgentCommunicationOptimizer:
         priority: MessagePriority,
         protocol: CommunicationProtocol,
         compressed_content: str = None,
-    )-> OptimizedMessage:
-        """ Create Optimized Message."""Create optimized message with metadata."""
+    ) -> OptimizedMessage:
+        """Create optimized message with metadata."""
         original_tokens = self._estimate_tokens(message)
 
         if compressed_content is None:
@@ -565,19 +610,14 @@ class AgentCommunicationOptimizer:
 
     def _estimate_tokens(self, content: Any) -> int:
         """Estimate token count for content."""
-        if isinstance(content, str):
-            return len(content) // 3
-        elif isinstance(content, dict):
-            return len(str(content)) // 3
-        elif isinstance(content, list):
-            return sum(len(str(item)) // 3 for item in content)
-        else:
-            return len(str(content)) // 3
+        if isinstance(content, list):
+            return sum(count_tokens_batch(content))
+        return count_tokens(content)
 
     def _group_messages_by_participants(
         self, conversation: List[Dict[str, Any]], participants: List[str]
-    )-> Dict[Tuple[str, str], List[Dict[str, Any]]]:
-        """ Group Messages By Participants."""Group messages by sender-receiver pairs."""
+    ) -> Dict[Tuple[str, str], List[Dict[str, Any]]]:
+        """Group messages by sender-receiver pairs."""
         groups = {}
 
         for message in conversation:
@@ -603,8 +643,8 @@ class AgentCommunicationOptimizer:
         pattern["count"] += 1
         pattern["protocols_used"][protocol_id] = pattern["protocols_used"].get(protocol_id, 0) + 1
 
-    def _update_stats(self, optimized_message: OptimizedMessage) -> None:
-        """Update optimization statistics."""
+    def _update_stats(self, optimized_message: OptimizedMessage, save: bool = True) -> None:
+        """Update optimization statistics, saving them unless a batch saves once at the end."""
         self.stats["messages_optimized"] += 1
         self.stats["tokens_saved"] += optimized_message.token_savings
 
@@ -620,7 +660,8 @@ class AgentCommunicationOptimizer:
         protocol_id = optimized_message.metadata["protocol_id"]
         self.stats["protocols_used"][protocol_id] = self.stats["protocols_used"].get(protocol_id, 0) + 1
 
-        self._save_stats()
+        if save:
+            self._save_stats()
 
     def _calculate_overall_efficiency(self) -> float:
         """Calculate overall communication efficiency."""
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
-#     Agent Performance Tracking System
 """
+Agent Performance Tracking System
+
 Tracks individual agent performance metrics for continuous improvement
 and specialization identification.
 """
@@ -11,6 +12,8 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 from collections import defaultdict
 
+from sqlite_storage_engine import get_storage_engine
+
 # Platform-specific imports for file locking
 try:
     import msvcrt  # Windows
@@ -23,38 +26,48 @@ except ImportError:
 
 
 class AgentPerformanceTracker:
-"""
+    """
     Tracks performance metrics for individual agents to enable:
-"""
     - Performance trend analysis
     - Specialization identification
     - Weak agent detection
     - Optimal agent selection
-"""
+    """
 
-"""
-    def __init__(self, storage_dir: str = ".claude-patterns"):
-"""
+    def __init__(self, storage_dir: str = ".claude-patterns", storage_mode: str = "json"):
+        """
         Initialize the agent performance tracker.
 
         Args:
             storage_dir: Directory for storing performance data
-"""
+            storage_mode: "json" for agent_performance.json, "sqlite" for the shared patterns.db
+        """
+        if storage_mode not in ("json", "sqlite"):
+            raise ValueError("storage_mode must be 'json' or 'sqlite'")
+
         self.storage_dir = Path(storage_dir)
         self.performance_file = self.storage_dir / "agent_performance.json"
         self.storage_dir.mkdir(parents=True, exist_ok=True)
+        self._engine = get_storage_engine(storage_dir) if storage_mode == "sqlite" else None
 
-        # Initialize performance file if it doesn't exist
-        if not self.performance_file.exists():
+        # Initialize performance storage if it doesn't exist
+        if self._engine is not None:
+            if not self._engine.has_document(self.performance_file.name):
+                self._initialize_performance_storage()
+        elif not self.performance_file.exists():
             self._initialize_performance_storage()
 
-"""
     def _initialize_performance_storage(self):
         """Initialize the performance storage with default structure."""
         initial_data = {
             "version": "1.0.0",
             "last_updated": datetime.now().isoformat(),
-            "metadata": {"total_tasks_tracked": 0, "agents_active": 0, "tracking_start_date": datetime.now().isoformat()},
+            "metadata": {
+                "total_tasks_tracked": 0,
+                "agents_active": 0,
+                "tracking_start_date": datetime.now().isoformat(),
+                "last_updated": datetime.now().isoformat(),
+            },
             "agent_metrics": {},
             "task_history": [],
             "specializations": {},
@@ -83,6 +96,13 @@ class AgentPerformanceTracker:
 
     def _read_data(self) -> Dict[str, Any]:
         """Read performance data with file locking."""
+        if self._engine is not None:
+            data = self._engine.read_document(self.performance_file.name)
+            if data is None:
+                self._initialize_performance_storage()
+                return self._read_data()
+            return data
+
         try:
             with open(self.performance_file, "r", encoding="utf-8") as f:
                 self._lock_file(f)
@@ -97,6 +117,11 @@ class AgentPerformanceTracker:
 
     def _write_data(self, data: Dict[str, Any]):
         """Write performance data with file locking."""
+        if self._engine is not None:
+            # task_history is stored as rows; only new or changed entries are written
+            self._engine.write_document(self.performance_file.name, data)
+            return
+
         with open(self.performance_file, "w", encoding="utf-8") as f:
             self._lock_file(f)
             try:
@@ -117,7 +142,7 @@ class AgentPerformanceTracker:
         iterations: int = 1,
         context: Optional[Dict[str, Any]] = None,
     ):
-        """Record Task Execution."""
+        """
         Record a task execution for performance tracking.
 
         Args:
@@ -131,7 +156,7 @@ class AgentPerformanceTracker:
             auto_fix_applied: Whether auto-fix was applied (for execution agents)
             iterations: Number of iterations required
             context: Additional context data
-"""
+        """
         perf_data = self._read_data()
 
         # Initialize agent metrics if not exists
@@ -227,7 +252,6 @@ class AgentPerformanceTracker:
         # Update specializations asynchronously
         self._update_specializations(agent_name)
 
-"""
     def get_agent_performance(self, agent_name: str) -> Dict[str, Any]:
         """Get performance metrics for a specific agent."""
         perf_data = self._read_data()
@@ -258,9 +282,8 @@ class AgentPerformanceTracker:
 
         return all_performances
 
-    def get_top_performers():
-"""
-        
+    def get_top_performers(self, metric: str = "quality_score", limit: int = 5) -> List[Dict[str, Any]]:
+        """
         Get top performing agents by metric.
 
         Args:
@@ -269,7 +292,7 @@ class AgentPerformanceTracker:
 
         Returns:
             List of top performers
-"""
+        """
         perf_data = self._read_data()
 
         performers = []
@@ -291,10 +314,8 @@ class AgentPerformanceTracker:
 
         return sorted(performers, key=lambda x: x["score"], reverse=True)[:limit]
 
-"""
-    def get_weak_performers():
-"""
-        
+    def get_weak_performers(self, threshold: float = 70.0) -> List[Dict[str, Any]]:
+        """
         Identify agents performing below threshold.
 
         Args:
@@ -302,7 +323,7 @@ class AgentPerformanceTracker:
 
         Returns:
             List of weak performers
-"""
+        """
         perf_data = self._read_data()
 
         weak_performers = []
@@ -323,7 +344,6 @@ class AgentPerformanceTracker:
 
         return sorted(weak_performers, key=lambda x: x["average_quality_score"])
 
-"""
     def _calculate_performance_rating(self, metrics: Dict[str, Any]) -> str:
         """Calculate overall performance rating."""
         if metrics["total_tasks"] < 3:
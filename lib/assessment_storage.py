@@ -1,18 +1,38 @@
 #!/usr/bin/env python3
-#     Comprehensive Assessment Storage System
 """
+Comprehensive Assessment Storage System
+
 Stores assessment results from ALL commands in the pattern database
 for dashboard real-time monitoring and learning system improvement.
-# import json
-# from datetime import datetime, timezone
-# from pathlib import Path
-# from typing import Dict, Any, List
-# class AssessmentStorage:
-
-    def __init__(self, pattern_dir: str = ".claude-patterns"):
-        """Initialize the processor with default configuration."""
+"""
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, List
+
+from sqlite_storage_engine import get_storage_engine
+from quality_rollups import ASSESSMENT_STREAM, ROLLUP_FILE, QualityRollups
+
+
+class AssessmentStorage:
+    """Stores command assessments in the pattern files (or the shared patterns.db)."""
+
+    def __init__(self, pattern_dir: str = ".claude-patterns", storage_mode: str = "json"):
+        """
+        Initialize the processor with default configuration.
+
+        Args:
+            pattern_dir: Directory for the pattern files
+            storage_mode: "json" for one file per collection, "sqlite" for the shared patterns.db
+        """
+        if storage_mode not in ("json", "sqlite"):
+            raise ValueError("storage_mode must be 'json' or 'sqlite'")
+
         self.pattern_dir = Path(pattern_dir)
         self.pattern_dir.mkdir(exist_ok=True)
+        self._engine = get_storage_engine(pattern_dir) if storage_mode == "sqlite" else None
+        self._rollups = QualityRollups(self.pattern_dir / ROLLUP_FILE)
 
         # Pattern files
         self.patterns_file = self.pattern_dir / "patterns.json"
@@ -66,37 +86,49 @@ for dashboard real-time monitoring and learning system improvement.
                 },
             ),
         ]:
-            if not file_path.exists():
-                with open(file_path, "w") as f:
-                    json.dump(default_structure, f, indent=2)
+            if self._engine is not None:
+                if not self._engine.has_document(file_path.name):
+                    self._save_json(file_path, default_structure)
+            elif not file_path.exists():
+                self._save_json(file_path, default_structure)
+
+    def _load_json(self, file_path: Path) -> Dict[str, Any]:
+        """Load a pattern document from its JSON file or the SQLite engine"""
+        if self._engine is not None:
+            return self._engine.read_document(file_path.name)
+        with open(file_path, "r") as f:
+            return json.load(f)
+
+    def _save_json(self, file_path: Path, data: Dict[str, Any]):
+        """Save a pattern document; the SQLite engine only writes changed rows"""
+        if self._engine is not None:
+            self._engine.write_document(file_path.name, data)
+            return
+        with open(file_path, "w") as f:
+            json.dump(data, f, indent=2)
 
-    def store_assessment():
-"""
-        
+    def store_assessment(self, assessment_data: Dict[str, Any]) -> bool:
+        """
         Store assessment result from any command
 
-                Args:
-                    assessment_data: Dict containing: - command_name: str (e.g., 'validate-claude-plugin', 'gui-debug')
-                        - assessment_type: str (
-            e.g.,
-            'validation',
-            'quality-control',
-            'gui-analysis',
-        )
-                        - overall_score: int (0-100)
-                        - "breakdown": Dict[str, int] (score breakdown)
-                        - "details": Dict[str, Any] (detailed findings)
-                        - "issues_found": List[str]
-                        - "recommendations": List[str]
-                        - "agents_used": List[str] (optional)
-                        - "skills_used": List[str] (optional)
-                        - execution_time: float (optional, in minutes)
-                        - pass_threshold_met: bool (optional)
-                        - "additional_metrics": Dict[str, Any] (optional)
-
-                Returns:
-                    bool: Success status
-"""
+        Args:
+            assessment_data: Dict containing:
+                - command_name: str (e.g., 'validate-claude-plugin', 'gui-debug')
+                - assessment_type: str (e.g., 'validation', 'quality-control', 'gui-analysis')
+                - overall_score: int (0-100)
+                - breakdown: Dict[str, int] (score breakdown)
+                - details: Dict[str, Any] (detailed findings)
+                - issues_found: List[str]
+                - recommendations: List[str]
+                - agents_used: List[str] (optional)
+                - skills_used: List[str] (optional)
+                - execution_time: float (optional, in minutes)
+                - pass_threshold_met: bool (optional)
+                - additional_metrics: Dict[str, Any] (optional)
+
+        Returns:
+            bool: Success status
+        """
         try:
             # Generate assessment ID
             timestamp = datetime.now(timezone.utc)
@@ -127,6 +159,7 @@ for dashboard real-time monitoring and learning system improvement.
 
             # Store in quality history (for backward compatibility)
             self._store_in_quality_history(assessment_record)
+            self._update_rollups(assessment_record)
 
             # Update agent metrics if agents were used
             if assessment_data.get("agents_used"):
@@ -146,11 +179,9 @@ for dashboard real-time monitoring and learning system improvement.
             print(f"Failed to store assessment: {e}")
             return False
 
-"""
     def _store_in_assessments_file(self, assessment_record: Dict[str, Any]):
         """Store in comprehensive assessments file"""
-        with open(self.assessments_file, "r") as f:
-            data = json.load(f)
+        data = self._load_json(self.assessments_file)
 
         data["assessments"].append(assessment_record)
         data["last_updated"] = assessment_record["timestamp"]
@@ -185,13 +216,11 @@ for dashboard real-time monitoring and learning system improvement.
 
         cmd_metrics["last_execution"] = assessment_record["timestamp"]
 
-        with open(self.assessments_file, "w") as f:
-            json.dump(data, f, indent=2)
+        self._save_json(self.assessments_file, data)
 
     def _store_in_quality_history(self, assessment_record: Dict[str, Any]):
         """Store in quality history file (for dashboard compatibility)"""
-        with open(self.quality_history_file, "r") as f:
-            data = json.load(f)
+        data = self._load_json(self.quality_history_file)
 
         # Convert to quality assessment format
         quality_assessment = {
@@ -222,13 +251,25 @@ for dashboard real-time monitoring and learning system improvement.
 
         data["metadata"]["last_assessment"] = assessment_record["timestamp"]
 
-        with open(self.quality_history_file, "w") as f:
-            json.dump(data, f, indent=2)
+        self._save_json(self.quality_history_file, data)
+
+    def _update_rollups(self, assessment_record: Dict[str, Any]):
+        """Add the assessment to the bucketed quality rollups used by the dashboard trends"""
+        try:
+            self._rollups.record(
+                ASSESSMENT_STREAM,
+                assessment_record["timestamp"],
+                assessment_record["overall_score"],
+                assessment_record["details"].get("model_used", ""),
+                assessment_record["task_type"],
+            )
+        except Exception as e:
+            # Readers rebuild rollups whose count no longer matches the history
+            print(f"Warning: Failed to update quality rollups: {e}")
 
     def _update_agent_metrics(self, assessment_record: Dict[str, Any]):
         """Update agent performance metrics"""
-        with open(self.agent_metrics_file, "r") as f:
-            data = json.load(f)
+        data = self._load_json(self.agent_metrics_file)
 
         task_record = {
             "task_id": assessment_record["assessment_id"],
@@ -282,13 +323,11 @@ for dashboard real-time monitoring and learning system improvement.
             data["quality_assessment_tasks"]
         )
 
-        with open(self.agent_metrics_file, "w") as f:
-            json.dump(data, f, indent=2)
+        self._save_json(self.agent_metrics_file, data)
 
     def _update_skill_metrics(self, assessment_record: Dict[str, Any]):
         """Update skill effectiveness metrics"""
-        with open(self.skill_metrics_file, "r") as f:
-            data = json.load(f)
+        data = self._load_json(self.skill_metrics_file)
 
         task_record = {
             "task_id": assessment_record["assessment_id"],
@@ -330,13 +369,11 @@ for dashboard real-time monitoring and learning system improvement.
             data["skill_usage_history"]
         )
 
-        with open(self.skill_metrics_file, "w") as f:
-            json.dump(data, f, indent=2)
+        self._save_json(self.skill_metrics_file, data)
 
     def _store_in_patterns_file(self, assessment_record: Dict[str, Any]):
         """Store assessment pattern for learning system"""
-        with open(self.patterns_file, "r") as f:
-            data = json.load(f)
+        data = self._load_json(self.patterns_file)
 
         pattern = {
             "pattern_id": assessment_record["assessment_id"],
@@ -376,15 +413,14 @@ for dashboard real-time monitoring and learning system improvement.
 
         data["patterns"].append(pattern)
 
-        with open(self.patterns_file, "w") as f:
-            json.dump(data, f, indent=2)
+        self._save_json(self.patterns_file, data)
 
     def _extract_success_factors(self, assessment_record: Dict[str, Any]) -> List[str]:
         """Extract success factors from assessment"""
         factors = []
         if assessment_record["overall_score"] >= 90:
             factors.append("high_quality_execution")
-        if assessment_record.get("execution_time_minutes", 0) < 5:
+        if (assessment_record.get("execution_time_minutes") or 0) < 5:
             factors.append("efficient_execution")
         if len(assessment_record.get("issues_found", [])) == 0:
             factors.append("no_issues_detected")
@@ -396,8 +432,7 @@ for dashboard real-time monitoring and learning system improvement.
 
     def get_command_summary(self) -> Dict[str, Any]:
         """Get summary of all command assessments"""
-        with open(self.assessments_file, "r") as f:
-            data = json.load(f)
+        data = self._load_json(self.assessments_file)
 
         return {
             "total_assessments": data["total_assessments"],
@@ -7,10 +7,11 @@ and ensure comprehensive performance tracking.
 import json
 import os
 import time
-import subprocess
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 
+from git_history_cache import get_git_history
+
 
 class AutoActivityRecorder:
     def __init__(self, patterns_dir: str = ".claude-patterns"):
@@ -19,6 +20,7 @@ class AutoActivityRecorder:
         self.performance_records_file = os.path.join(patterns_dir, "performance_records.json")
         self.auto_trigger_log = os.path.join(patterns_dir, "auto_trigger_log.json")
         self.last_scan_file = os.path.join(patterns_dir, "last_commit_scan.json")
+        self.git_history = get_git_history(patterns_dir)
 
     def get_last_scan_time(self) -> datetime:
         """Get the timestamp of the last commit scan."""
@@ -38,25 +40,10 @@ class AutoActivityRecorder:
 
     def get_new_commits(self, since: datetime) -> List[Dict[str, Any]]:
         """Get commits since the last scan."""
-        since_str = since.strftime("%Y-%m-%d %H:%M:%S")
-
-        try:
-            result = subprocess.run(
-                ["git", "log", f"--since={since_str}", "--pretty=format:%H|%ad|%s", "--date=iso", "--no-merges"],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-
-            commits = []
-            for line in result.stdout.strip().split("\n"):
-                if line:
-                    parts = line.split("|")
-                    if len(parts) >= 3:
-                        commits.append({"hash": parts[0], "date": parts[1], "message": parts[2]})
-            return commits
-        except subprocess.CalledProcessError:
-            return []
+        return [
+            {"hash": commit["hash"], "date": commit["date"], "message": commit["subject"]}
+            for commit in self.git_history.commits(since=since)
+        ]
 
     def load_existing_assessment_ids(self) -> set:
         """Load existing assessment IDs to avoid duplicates."""
@@ -115,15 +102,8 @@ class AutoActivityRecorder:
 
     def get_files_changed(self, commit_hash: str) -> int:
         """Get number of files changed in a commit."""
-        try:
-            result = subprocess.run(
-                ["git", "show", "--name-only", "--pretty=format:", commit_hash], capture_output=True, text=True, check=True
-            )
-
-            files = [f.strip() for f in result.stdout.strip().split("\n") if f.strip()]
-            return len(files)
-        except subprocess.CalledProcessError:
-            return 1
+        commit = self.git_history.get(commit_hash)
+        return len(commit["files"]) if commit else 1
 
     def create_performance_record(self, commit: Dict[str, Any], existing_ids: set) -> Optional[Dict[str, Any]]:
         """Create a performance record for a commit."""
@@ -19,6 +19,7 @@ import statistics
 
 from token_optimization_engine import get_token_optimizer, ContentType
 from progressive_content_loader import get_progressive_loader, LoadingTier
+from token_counter import count_tokens
 
 
 class TaskComplexity(Enum):
@@ -81,13 +82,11 @@ class OptimizationResult:
 
 
 class AutonomousTokenOptimizer:
-"""
+    """
     Advanced autonomous token optimizer that intelligently manages token consumption
-"""
     across entire workflows while maintaining functionality and improving efficiency.
-"""
+    """
 
-"""
     def __init__(self, cache_dir: str = ".claude-patterns"):
         """Initialize the processor with default configuration."""
         self.cache_dir = pathlib.Path(cache_dir)
@@ -121,9 +120,8 @@ class AutonomousTokenOptimizer:
         self._load_performance_history()
         self._load_efficiency_scores()
 
-    def optimize_workflow():
-"""
-        
+    def optimize_workflow(self, workflow_steps: List[Dict[str, Any]], context: TaskContext) -> OptimizationResult:
+        """
         Optimize an entire workflow for token efficiency.
 
         Args:
@@ -132,7 +130,7 @@ class AutonomousTokenOptimizer:
 
         Returns:
             OptimizationResult with details of optimization
-"""
+        """
         start_time = time.time()
 
         # Analyze workflow complexity
@@ -195,11 +193,10 @@ class AutonomousTokenOptimizer:
 
         return result
 
-"""
     def optimize_agent_communication(
         self, agents: List[str], messages: List[Dict[str, Any]], context: TaskContext
-    )-> Dict[str, Any]:
-        """Optimize Agent Communication."""
+    ) -> Dict[str, Any]:
+        """
         Optimize agent communication for token efficiency.
 
         Args:
@@ -209,7 +206,7 @@ class AutonomousTokenOptimizer:
 
         Returns:
             Optimized communication data
-"""
+        """
         original_tokens = sum(self._estimate_message_tokens(msg) for msg in messages)
         optimized_messages = []
 
@@ -230,10 +227,8 @@ class AutonomousTokenOptimizer:
             "communication_patterns": self._analyze_communication_patterns(optimized_messages),
         }
 
-"""
-    def optimize_content_delivery():
-"""
-        
+    def optimize_content_delivery(self, content_requests: List[Dict[str, Any]], context: TaskContext) -> Dict[str, Any]:
+        """
         Optimize content delivery for minimal token usage.
 
         Args:
@@ -242,7 +237,7 @@ class AutonomousTokenOptimizer:
 
         Returns:
             Optimized content delivery data
-"""
+        """
         optimized_deliveries = []
         total_tokens_used = 0
         total_tokens_requested = 0
@@ -287,7 +282,6 @@ class AutonomousTokenOptimizer:
             "efficiency_score": tokens_saved / total_tokens_requested if total_tokens_requested > 0 else 0,
         }
 
-"""
     def _analyze_workflow_complexity(self, workflow_steps: List[Dict[str, Any]], context: TaskContext) -> TaskComplexity:
         """Analyze workflow complexity for token allocation."""
         total_estimated_tokens = sum(step.get("estimated_tokens", 10000) for step in workflow_steps)
@@ -334,8 +328,8 @@ class AutonomousTokenOptimizer:
 
     def _create_token_budget(
         self, context: TaskContext, complexity: TaskComplexity, strategy: OptimizationStrategy
-    )-> TokenBudget:
-        """ Create Token Budget."""Create token budget based on context and strategy."""
+    ) -> TokenBudget:
+        """Create token budget based on context and strategy."""
         base_budget = self.complexity_token_limits[complexity]
 
         # Adjust based on strategy
@@ -383,8 +377,8 @@ class AutonomousTokenOptimizer:
 
     def _optimize_content_loading_step(
         self, step: Dict[str, Any], budget: TokenBudget, context: TaskContext
-    )-> Dict[str, Any]:
-        """ Optimize Content Loading Step."""Optimize content loading step."""
+    ) -> Dict[str, Any]:
+        """Optimize content loading step."""
         content_path = step.get("content_path", "")
         if not content_path:
             return step
@@ -406,8 +400,8 @@ class AutonomousTokenOptimizer:
 
     def _optimize_agent_communication_step(
         self, step: Dict[str, Any], budget: TokenBudget, context: TaskContext
-    )-> Dict[str, Any]:
-        """ Optimize Agent Communication Step."""Optimize agent communication step."""
+    ) -> Dict[str, Any]:
+        """Optimize agent communication step."""
         messages = step.get("messages", [])
         if not messages:
             return step
@@ -494,10 +488,7 @@ class AutonomousTokenOptimizer:
 
     def _estimate_message_tokens(self, message: Dict[str, Any]) -> int:
         """Estimate token count for a message."""
-        content = message.get("content", "")
-        metadata_tokens = len(str(message.get("metadata", {}))) // 4
-        content_tokens = len(content) // 3
-        return content_tokens + metadata_tokens
+        return count_tokens(message.get("content", "")) + count_tokens(message.get("metadata", {}))
 
     def _update_performance_metrics(self, context: TaskContext, metrics: Dict[str, Any]) -> None:
         """Update performance tracking data."""
@@ -524,8 +515,8 @@ class AutonomousTokenOptimizer:
         optimized_steps: List[Dict[str, Any]],
         context: TaskContext,
         strategy: OptimizationStrategy,
-    )-> List[str]:
-        """ Generate Recommendations."""Generate optimization recommendations."""
+    ) -> List[str]:
+        """Generate optimization recommendations."""
         recommendations = []
 
         # Calculate efficiency
@@ -0,0 +1,551 @@
+#!/usr/bin/env python3
+"""
+Budget Arena for Autonomous Agent Plugin
+
+Shared token accounting for DynamicBudgetManager. Every component has its own
+counters (allocated, used, reserved) in a WAL-mode SQLite database, so the
+threads of one process and separate agent processes draw from the same
+budget without lost updates:
+
+- use() is a single conditional UPDATE, atomic across processes; no Python
+  lock is taken and components never wait for each other in-process.
+- acquire() hands out leases: tokens reserved until committed, released, or
+  expired. Expired leases (e.g. of a crashed process) are reclaimed lazily.
+- Each thread has its own connection; SQLite serializes the short writes.
+
+CoalescingWorker runs a job on one background thread; triggers that arrive
+while a run is pending are merged into it instead of each spawning a thread.
+
+Version: 1.0.0
+Author: Autonomous Agent Plugin
+"""
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_LEASE_TTL = 300.0  # Seconds a lease holds its tokens
+
+ARENA_SCHEMA = """
+CREATE TABLE IF NOT EXISTS arena_components (
+    component_id TEXT PRIMARY KEY,
+    allocated INTEGER NOT NULL,
+    used INTEGER NOT NULL DEFAULT 0,
+    reserved INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS arena_leases (
+    lease_id TEXT PRIMARY KEY,
+    component_id TEXT NOT NULL,
+    tokens INTEGER NOT NULL,
+    expires_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_arena_leases_expiry ON arena_leases(expires_at);
+"""
+
+_USE = "UPDATE arena_components SET used = used + ? WHERE component_id = ? AND allocated - used - reserved >= ?"
+_RESERVE = (
+    "UPDATE arena_components SET reserved = reserved + ? WHERE component_id = ? AND allocated - used - reserved >= ?"
+)
+
+
+@dataclass
+class Lease:
+    """Tokens reserved for a component until committed, released or expired."""
+
+    lease_id: str
+    component_id: str
+    tokens: int
+    expires_at: float
+
+
+class BudgetArena:
+    """Per-component token counters shared by threads and processes through SQLite."""
+
+    def __init__(self, db_path: str):
+        """
+        Open (and create if needed) the arena database.
+
+        Args:
+            db_path: Path of the SQLite database file shared by all participating processes
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(ARENA_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        """Get this thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Transactions are managed explicitly with BEGIN IMMEDIATE
+            conn = sqlite3.connect(str(self.db_path), isolation_level=None, timeout=30)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run a block inside one write transaction."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
+
+    # ------------------------------------------------------------------
+    # Components
+    # ------------------------------------------------------------------
+
+    def register(self, component_id: str, allocated: int) -> Tuple[int, int, int]:
+        """
+        Add a component unless another thread or process already did.
+
+        Args:
+            component_id: Component identifier
+            allocated: Initial allocation (ignored if the component exists)
+
+        Returns:
+            The component's allocated, used and reserved tokens
+        """
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR IGNORE INTO arena_components (component_id, allocated) VALUES (?, ?)", (component_id, allocated)
+        )
+        return self.counters(component_id)
+
+    def counters(self, component_id: str) -> Tuple[int, int, int]:
+        """
+        Get a component's allocated, used and reserved tokens.
+
+        Raises:
+            KeyError: If the component is not registered
+        """
+        row = self._conn().execute(
+            "SELECT allocated, used, reserved FROM arena_components WHERE component_id = ?", (component_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(component_id)
+        return row
+
+    def snapshot(self) -> Dict[str, Tuple[int, int, int]]:
+        """Get allocated, used and reserved tokens of every component."""
+        return self._snapshot(self._conn())
+
+    @staticmethod
+    def _snapshot(conn: sqlite3.Connection) -> Dict[str, Tuple[int, int, int]]:
+        """Read every component's counters on a connection."""
+        rows = conn.execute("SELECT component_id, allocated, used, reserved FROM arena_components")
+        return {row[0]: (row[1], row[2], row[3]) for row in rows}
+
+    def set_allocations(self, allocations: Dict[str, int]) -> None:
+        """
+        Set several components' allocations atomically (usage counters are left alone).
+
+        An allocation is never set below the component's used and reserved tokens.
+
+        Args:
+            allocations: component_id -> allocated tokens
+        """
+        with self._transaction() as conn:
+            conn.executemany(
+                "UPDATE arena_components SET allocated = MAX(?, used + reserved) WHERE component_id = ?",
+                [(allocated, component_id) for component_id, allocated in allocations.items()],
+            )
+
+    def rebalance(
+        self, plan: Callable[[Dict[str, Tuple[int, int, int]]], Dict[str, int]]
+    ) -> Dict[str, Tuple[int, int, int]]:
+        """
+        Read the counters, plan new allocations and write them in one transaction.
+
+        Charges and leases of other threads and processes wait for the
+        transaction, so the plan always sees the counters it changes. The new
+        allocations are applied as deltas and never drop a component below
+        its used and reserved tokens.
+
+        Args:
+            plan: Called with the current counters; returns component_id -> new allocated tokens
+
+        Returns:
+            Counters after the rebalancing
+        """
+        with self._transaction() as conn:
+            counters = self._snapshot(conn)
+            changes = [
+                (allocated - counters[component_id][0], component_id)
+                for component_id, allocated in plan(counters).items()
+                if component_id in counters and allocated != counters[component_id][0]
+            ]
+            conn.executemany(
+                "UPDATE arena_components SET allocated = MAX(allocated + ?, used + reserved) WHERE component_id = ?",
+                changes,
+            )
+            return self._snapshot(conn) if changes else counters
+
+    def scale_allocations(self, total: int) -> Dict[str, Tuple[int, int, int]]:
+        """
+        Scale all allocations in proportion so they add up to a total budget.
+
+        Args:
+            total: Tokens the allocations should add up to
+
+        Returns:
+            Counters after scaling
+        """
+
+        def plan(counters: Dict[str, Tuple[int, int, int]]) -> Dict[str, int]:
+            allocated = sum(counter[0] for counter in counters.values())
+            if allocated <= 0 or allocated == total:
+                return {}
+            # Round the running sum so the rounded allocations still add up to the total
+            allocations, running, previous = {}, 0, 0
+            for component_id, counter in counters.items():
+                running += counter[0]
+                boundary = running * total // allocated
+                allocations[component_id] = boundary - previous
+                previous = boundary
+            return allocations
+
+        return self.rebalance(plan)
+
+    # ------------------------------------------------------------------
+    # Usage and leases
+    # ------------------------------------------------------------------
+
+    def use(self, component_id: str, tokens: int, donors: Iterable[str] = ()) -> bool:
+        """
+        Charge tokens to a component if its unreserved allocation covers them.
+
+        Args:
+            component_id: Component to charge
+            tokens: Tokens used
+            donors: Components whose unused allocation may be moved over when this one is short
+
+        Returns:
+            True if the tokens were charged
+        """
+        if tokens < 0:
+            raise ValueError("tokens must not be negative")
+        if self._conn().execute(_USE, (tokens, component_id, tokens)).rowcount:
+            return True
+
+        # Short: free expired leases and borrow from donors, then retry, in one transaction
+        with self._transaction() as conn:
+            self._reclaim_expired(conn)
+            if conn.execute(_USE, (tokens, component_id, tokens)).rowcount:
+                return True
+            if not self._borrow(conn, component_id, tokens, donors):
+                return False
+            return bool(conn.execute(_USE, (tokens, component_id, tokens)).rowcount)
+
+    def acquire(self, component_id: str, tokens: int, ttl: float = DEFAULT_LEASE_TTL) -> Optional[Lease]:
+        """
+        Reserve tokens for a component.
+
+        Args:
+            component_id: Component to reserve for
+            tokens: Tokens to reserve
+            ttl: Seconds until the lease expires and its tokens return to the component
+
+        Returns:
+            Lease, or None if the component's unreserved allocation does not cover the tokens
+        """
+        if tokens < 0:
+            raise ValueError("tokens must not be negative")
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+
+        lease = Lease(uuid.uuid4().hex, component_id, tokens, time.time() + ttl)
+        with self._transaction() as conn:
+            if not conn.execute(_RESERVE, (tokens, component_id, tokens)).rowcount:
+                self._reclaim_expired(conn)
+                if not conn.execute(_RESERVE, (tokens, component_id, tokens)).rowcount:
+                    return None
+            conn.execute(
+                "INSERT INTO arena_leases (lease_id, component_id, tokens, expires_at) VALUES (?, ?, ?, ?)",
+                (lease.lease_id, component_id, tokens, lease.expires_at),
+            )
+        return lease
+
+    def commit(self, lease: Lease, tokens: Optional[int] = None) -> int:
+        """
+        Charge the tokens actually used under a lease and return the rest.
+
+        Usage is charged even if the lease has expired in the meantime (the
+        work was done), so a late commit can push a component over its allocation.
+
+        Args:
+            lease: Lease from acquire()
+            tokens: Tokens actually used (defaults to the leased amount)
+
+        Returns:
+            Tokens charged
+        """
+        used = lease.tokens if tokens is None else max(tokens, 0)
+        with self._transaction() as conn:
+            held = conn.execute("DELETE FROM arena_leases WHERE lease_id = ?", (lease.lease_id,)).rowcount
+            conn.execute(
+                "UPDATE arena_components SET used = used + ?, reserved = reserved - ? WHERE component_id = ?",
+                (used, lease.tokens if held else 0, lease.component_id),
+            )
+        return used
+
+    def release(self, lease: Lease) -> bool:
+        """
+        Return a lease's tokens unused.
+
+        Returns:
+            True if the lease was still held
+        """
+        with self._transaction() as conn:
+            held = conn.execute("DELETE FROM arena_leases WHERE lease_id = ?", (lease.lease_id,)).rowcount
+            if held:
+                conn.execute(
+                    "UPDATE arena_components SET reserved = reserved - ? WHERE component_id = ?",
+                    (lease.tokens, lease.component_id),
+                )
+        return bool(held)
+
+    def reclaim_expired(self) -> int:
+        """
+        Return the tokens of expired leases to their components.
+
+        Returns:
+            Tokens reclaimed
+        """
+        with self._transaction() as conn:
+            return self._reclaim_expired(conn)
+
+    @staticmethod
+    def _reclaim_expired(conn: sqlite3.Connection) -> int:
+        """Reclaim expired leases inside an open transaction."""
+        now = time.time()
+        expired = conn.execute(
+            "SELECT component_id, SUM(tokens) FROM arena_leases WHERE expires_at <= ? GROUP BY component_id", (now,)
+        ).fetchall()
+        if not expired:
+            return 0
+        conn.executemany(
+            "UPDATE arena_components SET reserved = reserved - ? WHERE component_id = ?",
+            [(tokens, component_id) for component_id, tokens in expired],
+        )
+        conn.execute("DELETE FROM arena_leases WHERE expires_at <= ?", (now,))
+        return sum(tokens for _, tokens in expired)
+
+    @staticmethod
+    def _borrow(conn: sqlite3.Connection, component_id: str, tokens: int, donors: Iterable[str]) -> bool:
+        """Move unused allocation from donors to a component inside an open transaction."""
+        donors = [donor for donor in donors if donor != component_id]
+        if not donors:
+            return False
+        row = conn.execute(
+            "SELECT allocated - used - reserved FROM arena_components WHERE component_id = ?", (component_id,)
+        ).fetchone()
+        if row is None:
+            return False
+        needed = tokens - max(row[0], 0)
+
+        placeholders = ",".join("?" * len(donors))
+        available = conn.execute(
+            f"SELECT component_id, allocated - used - reserved FROM arena_components"
+            f" WHERE component_id IN ({placeholders}) AND allocated - used - reserved > 0",
+            donors,
+        ).fetchall()
+        if sum(spare for _, spare in available) < needed:
+            return False
+
+        transfers: List[Tuple[int, str]] = []
+        for donor, spare in sorted(available, key=lambda item: donors.index(item[0])):
+            transfer = min(spare, needed)
+            transfers.append((transfer, donor))
+            needed -= transfer
+            if needed <= 0:
+                break
+        conn.executemany("UPDATE arena_components SET allocated = allocated - ? WHERE component_id = ?", transfers)
+        conn.execute(
+            "UPDATE arena_components SET allocated = allocated + ? WHERE component_id = ?",
+            (sum(transfer for transfer, _ in transfers), component_id),
+        )
+        return True
+
+
+class CoalescingWorker:
+    """Single background thread running a job; triggers that pile up are merged into one run."""
+
+    def __init__(self, job: Callable[[str], None], name: str = "coalescing-worker"):
+        """
+        Initialize the worker. The thread starts with the first trigger.
+
+        Args:
+            job: Called with the comma-joined reasons of the merged triggers
+            name: Worker thread name
+        """
+        self.job = job
+        self.name = name
+        self._reasons: List[str] = []
+        self._condition = threading.Condition()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self.triggers = 0
+        self.runs = 0
+
+    def trigger(self, reason: str) -> None:
+        """Request a run; returns immediately."""
+        with self._condition:
+            self.triggers += 1
+            if reason not in self._reasons:
+                self._reasons.append(reason)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every triggered run has finished.
+
+        Returns:
+            False on timeout
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._reasons and not self._running, timeout)
+
+    def _run(self) -> None:
+        """Worker loop: take all pending reasons and run the job once for them."""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._reasons)
+                reason = ",".join(self._reasons)
+                self._reasons = []
+                self._running = True
+            try:
+                self.job(reason)
+            except Exception as e:
+                print(f"Warning: {self.name} failed: {e}", file=sys.stderr)
+            finally:
+                with self._condition:
+                    self.runs += 1
+                    self._running = False
+                    self._condition.notify_all()
+
+
+_arenas: Dict[str, BudgetArena] = {}
+_arenas_lock = threading.Lock()
+
+
+def get_budget_arena(db_path: str) -> BudgetArena:
+    """
+    Get the shared arena for a database file (one per process; connections are per thread).
+
+    Args:
+        db_path: Path of the SQLite database file
+
+    Returns:
+        BudgetArena instance
+    """
+    key = str(Path(db_path).resolve())
+    with _arenas_lock:
+        arena = _arenas.get(key)
+        if arena is None:
+            arena = BudgetArena(key)
+            _arenas[key] = arena
+        return arena
+
+
+def _benchmark_worker(db_path: str, component_id: str, operations: int, results) -> None:
+    """Charge tokens from a separate process (module-level so it can be pickled)."""
+    arena = BudgetArena(db_path)
+    granted = sum(1 for _ in range(operations) if arena.use(component_id, 1))
+    results.put(granted)
+
+
+def run_benchmark(processes: int = 4, threads: int = 4, operations: int = 500) -> Dict[str, float]:
+    """
+    Measure concurrent charges against one arena from several threads and processes.
+
+    Every worker tries more charges than the budget allows; the arena must grant
+    exactly the budget, no more and no less.
+
+    Args:
+        processes: Separate processes charging the shared component
+        threads: Threads charging their own component in this process
+        operations: Charges per worker
+
+    Returns:
+        Charges per second for threads and processes, and whether the totals were exact
+    """
+    import multiprocessing
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = str(Path(temp_dir) / "budget_arena.db")
+        arena = BudgetArena(db_path)
+
+        # Threads, one component each: no shared lock between components
+        for n in range(threads):
+            arena.register(f"component_{n}", operations)
+
+        def charge(component_id):
+            for _ in range(operations):
+                arena.use(component_id, 1)
+            arena.close()
+
+        workers = [threading.Thread(target=charge, args=(f"component_{n}",)) for n in range(threads)]
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        thread_rate = threads * operations / (time.perf_counter() - started)
+        threads_exact = all(arena.counters(f"component_{n}")[1] == operations for n in range(threads))
+
+        # Processes, all on one component with room for half of their charges
+        budget = processes * operations // 2
+        arena.register("shared", budget)
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        workers = [
+            context.Process(target=_benchmark_worker, args=(db_path, "shared", operations, results))
+            for _ in range(processes)
+        ]
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        granted = sum(results.get() for _ in workers)
+        for worker in workers:
+            worker.join()
+        process_rate = processes * operations / (time.perf_counter() - started)
+        processes_exact = granted == budget == arena.counters("shared")[1]
+        arena.close()
+
+    return {
+        "thread_charges_per_sec": round(thread_rate, 1),
+        "process_charges_per_sec": round(process_rate, 1),
+        "exact": threads_exact and processes_exact,
+    }
+
+
+if __name__ == "__main__":
+    print("=== Budget Arena Benchmark ===")
+    results = run_benchmark()
+    print(f"Threads:   {results['thread_charges_per_sec']:,.0f} charges/sec")
+    print(f"Processes: {results['process_charges_per_sec']:,.0f} charges/sec (including process start-up)")
+    print(f"Totals exact: {results['exact']}")
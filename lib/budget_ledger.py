@@ -0,0 +1,600 @@
+#!/usr/bin/env python3
+"""
+Budget Ledger for Autonomous Agent Plugin
+
+Authoritative in-memory token balances for TokenBudgetManager. Reserving,
+committing and releasing tokens are atomic under one lock and touch no
+database, so an allocation costs microseconds.
+
+Durability:
+
+- Every committed change is appended to a small JSONL journal before the
+  call returns (one write to the OS; it survives a process crash).
+- Each ledger is a writer with its own journal segments, named after a
+  writer ID (pid plus a random suffix), and holds an exclusive lock on its
+  writer lock file for as long as it runs. Processes sharing a database
+  therefore never write, seal or replay each other's segments.
+- A flusher thread periodically seals the journal segment and hands its
+  entries to a persist function that writes them to the database in one
+  transaction, then deletes the segment.
+- Entries carry their writer, a per-writer sequence number and the tokens
+  they change, so replaying the journal after a crash is idempotent:
+  recover() takes over the segments of writers whose lock is free (the
+  process is gone) and applies only entries newer than the last sequence
+  number the database has for that writer.
+
+Reservations live in memory only; a crash releases them.
+
+Version: 1.0.0
+Author: Autonomous Agent Plugin
+"""
+import atexit
+import itertools
+import json
+import os
+import platform
+import sys
+import threading
+import time
+import uuid
+import weakref
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_FLUSH_INTERVAL = 1.0  # Seconds between database flushes
+
+# Handle Windows compatibility for file locking
+if platform.system() == "Windows":
+    import msvcrt
+
+    def try_lock_fd(fd: int) -> bool:
+        """Take an exclusive lock without waiting; False if another process holds it."""
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+else:
+    import fcntl
+
+    def try_lock_fd(fd: int) -> bool:
+        """Take an exclusive lock without waiting; False if another process holds it."""
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            return False
+
+
+# Ledgers whose flusher is running; closed at exit so journaled changes are persisted
+_open_ledgers: "weakref.WeakSet[BudgetLedger]" = weakref.WeakSet()
+
+
+def _close_open_ledgers() -> None:
+    """Close every ledger still open when the interpreter exits."""
+    for ledger in list(_open_ledgers):
+        ledger.close()
+
+
+atexit.register(_close_open_ledgers)
+
+
+@dataclass
+class Reservation:
+    """Tokens held for an account until committed or released."""
+
+    reservation_id: str
+    account_id: str
+    tokens: int
+    created: float
+
+
+class BudgetLedger:
+    """In-memory token accounts with journaled, batch-persisted changes."""
+
+    def __init__(
+        self,
+        journal_path: Path,
+        persist: Callable[[List[Dict[str, Any]]], None],
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    ):
+        """
+        Initialize the ledger. Accounts are opened and the journal recovered by the owner.
+
+        Args:
+            journal_path: Base name of the journal; this writer's segments and lock file are
+                written next to it as <stem>.<writer_id>.*
+            persist: Writes a batch of journal entries to the database in one transaction,
+                including each entry's writer and seq so recover() can skip persisted ones
+            flush_interval: Seconds between flushes (the flusher starts with the first change)
+        """
+        if flush_interval <= 0:
+            raise ValueError("flush_interval must be positive")
+
+        self.journal_path = Path(journal_path)
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        self.persist = persist
+        self.flush_interval = flush_interval
+
+        # Held for the life of the writer; a free lock means its segments are orphaned
+        self.writer_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.active_path = self._writer_path(self.writer_id, "jsonl")
+        self._owner_path = self._writer_path(self.writer_id, "lock")
+        self._owner_fd: Optional[int] = os.open(self._owner_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try_lock_fd(self._owner_fd)
+
+        self.lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        # account_id -> [allocated, used, reserved]
+        self._accounts: Dict[str, List[int]] = {}
+        self._reservations: Dict[str, Reservation] = {}
+        self._reservation_ids = itertools.count(1)
+        self._seq = 0
+
+        # Entries of the active segment, and sealed segments waiting to be persisted
+        self._pending: List[Dict[str, Any]] = []
+        self._sealed: List[Tuple[Path, List[Dict[str, Any]]]] = []
+        self._segment_ids = itertools.count(1)
+        self._journal_fd: Optional[int] = None
+
+        self._wake = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self._closed = False
+        self.flushes = 0
+
+    # ------------------------------------------------------------------
+    # Accounts
+    # ------------------------------------------------------------------
+
+    def open_account(self, account_id: str, allocated: int, used: int = 0) -> None:
+        """
+        Open (or re-open with new totals) an account.
+
+        Args:
+            account_id: Account identifier (budget constraint ID)
+            allocated: Tokens the account may use
+            used: Tokens already used
+        """
+        with self.lock:
+            reserved = self._accounts.get(account_id, [0, 0, 0])[2]
+            self._accounts[account_id] = [allocated, used, reserved]
+
+    def close_account(self, account_id: str) -> None:
+        """Close an account and drop its reservations."""
+        with self.lock:
+            self._accounts.pop(account_id, None)
+            for reservation_id in [r.reservation_id for r in self._reservations.values() if r.account_id == account_id]:
+                del self._reservations[reservation_id]
+
+    def has_account(self, account_id: str) -> bool:
+        """Whether an account is open."""
+        return account_id in self._accounts
+
+    def balance(self, account_id: str) -> Dict[str, int]:
+        """
+        Get an account's totals.
+
+        Args:
+            account_id: Account identifier
+
+        Returns:
+            allocated, used, reserved and available tokens
+        """
+        with self.lock:
+            allocated, used, reserved = self._accounts[account_id]
+        return {"allocated": allocated, "used": used, "reserved": reserved, "available": allocated - used - reserved}
+
+    # ------------------------------------------------------------------
+    # Reserve / commit / release
+    # ------------------------------------------------------------------
+
+    def reserve(self, account_id: str, tokens: int) -> Optional[str]:
+        """
+        Hold tokens for later use.
+
+        Args:
+            account_id: Account to draw from
+            tokens: Tokens to hold
+
+        Returns:
+            Reservation ID, or None if the account cannot cover the tokens
+        """
+        if tokens < 0:
+            raise ValueError("tokens must not be negative")
+        with self.lock:
+            account = self._accounts.get(account_id)
+            if account is None or account[0] - account[1] - account[2] < tokens:
+                return None
+            account[2] += tokens
+            reservation = Reservation(f"r{next(self._reservation_ids)}", account_id, tokens, time.time())
+            self._reservations[reservation.reservation_id] = reservation
+            return reservation.reservation_id
+
+    def reservation(self, reservation_id: str) -> Optional[Reservation]:
+        """Get an open reservation (None once committed or released)."""
+        return self._reservations.get(reservation_id)
+
+    def commit(self, reservation_id: str, tokens: Optional[int] = None, **details: Any) -> int:
+        """
+        Use reserved tokens; any unused part of the reservation is released.
+
+        Args:
+            reservation_id: Reservation from reserve()
+            tokens: Tokens actually used (defaults to the reserved amount; at most that)
+            **details: Extra fields journaled and persisted with the usage (task_type, agent_name, ...)
+
+        Returns:
+            Tokens used
+        """
+        with self.lock:
+            reservation = self._reservations.pop(reservation_id, None)
+            if reservation is None:
+                raise KeyError(f"Unknown reservation: {reservation_id}")
+            used = reservation.tokens if tokens is None else min(max(tokens, 0), reservation.tokens)
+            account = self._accounts.get(reservation.account_id)
+            if account is None:
+                return 0
+            account[2] -= reservation.tokens
+            account[1] += used
+            entry = {"op": "use", "account_id": reservation.account_id, "tokens": used, "used": account[1]}
+            self._journal(entry, details)
+            return used
+
+    def release(self, reservation_id: str) -> int:
+        """
+        Return reserved tokens to the account.
+
+        Args:
+            reservation_id: Reservation from reserve()
+
+        Returns:
+            Tokens released (0 for unknown reservations)
+        """
+        with self.lock:
+            reservation = self._reservations.pop(reservation_id, None)
+            if reservation is None:
+                return 0
+            account = self._accounts.get(reservation.account_id)
+            if account is not None:
+                account[2] -= reservation.tokens
+            return reservation.tokens
+
+    def allocate(self, account_id: str, tokens: int, **details: Any) -> Optional[int]:
+        """
+        Reserve and commit tokens in one atomic step.
+
+        Args:
+            account_id: Account to draw from
+            tokens: Tokens to use
+            **details: Extra fields journaled and persisted with the usage
+
+        Returns:
+            The account's new used total, or None if the account cannot cover the tokens
+        """
+        with self.lock:
+            reservation_id = self.reserve(account_id, tokens)
+            if reservation_id is None:
+                return None
+            self.commit(reservation_id, **details)
+            return self._accounts[account_id][1]
+
+    def reset(self, account_id: str) -> None:
+        """Set an account's used total back to zero (journaled like usage)."""
+        with self.lock:
+            account = self._accounts[account_id]
+            account[1] = 0
+            self._journal({"op": "reset", "account_id": account_id, "tokens": 0, "used": 0}, {})
+
+    # ------------------------------------------------------------------
+    # Journal and persistence
+    # ------------------------------------------------------------------
+
+    def _writer_path(self, writer_id: str, suffix: str) -> Path:
+        """Path of a writer's file: <stem>.<writer_id>.<suffix>."""
+        return self.journal_path.with_name(f"{self.journal_path.stem}.{writer_id}.{suffix}")
+
+    def _sealed_path(self) -> Path:
+        """Path for this writer's next sealed segment."""
+        return self._writer_path(self.writer_id, f"{next(self._segment_ids)}.sealed")
+
+    def _journal(self, entry: Dict[str, Any], details: Dict[str, Any]) -> None:
+        """Append a change to the journal and the pending batch (caller holds the lock)."""
+        self._seq += 1
+        entry = dict(details, **entry, writer=self.writer_id, seq=self._seq, timestamp=time.time())
+        if self._journal_fd is None:
+            self._journal_fd = os.open(self.active_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        os.write(self._journal_fd, (json.dumps(entry, default=str) + "\n").encode("utf-8"))
+        self._pending.append(entry)
+        if self._flusher is None and not self._closed:
+            self._start_flusher()
+
+    def _seal(self) -> None:
+        """
+        Close the active segment so it can be persisted (caller holds the lock).
+
+        If the rename fails the segment stays active: its entries stay pending and
+        the next change reopens it.
+        """
+        if not self._pending:
+            return
+        if self._journal_fd is not None:
+            os.close(self._journal_fd)
+            self._journal_fd = None
+        sealed = self._sealed_path()
+        os.replace(self.active_path, sealed)
+        self._sealed.append((sealed, self._pending))
+        self._pending = []
+
+    def flush(self) -> int:
+        """
+        Persist every journaled change now.
+
+        Returns:
+            Number of entries persisted (sealed segments that fail stay queued for the next flush)
+        """
+        with self._flush_lock:
+            with self.lock:
+                try:
+                    self._seal()
+                except OSError as e:
+                    print(f"Warning: budget ledger could not seal its journal, will retry: {e}", file=sys.stderr)
+                sealed = list(self._sealed)
+            persisted = 0
+            for path, entries in sealed:
+                try:
+                    self.persist(entries)
+                except Exception as e:
+                    print(f"Warning: budget ledger flush failed, will retry: {e}", file=sys.stderr)
+                    break
+                with self.lock:
+                    self._sealed.pop(0)
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+                persisted += len(entries)
+            if persisted:
+                self.flushes += 1
+            return persisted
+
+    @property
+    def pending_entries(self) -> int:
+        """Number of journaled changes not yet persisted."""
+        with self.lock:
+            return len(self._pending) + sum(len(entries) for _, entries in self._sealed)
+
+    def recover(self, last_seqs: Dict[str, int]) -> int:
+        """
+        Replay journal entries of finished writers the database does not have yet.
+
+        Segments of writers whose lock file is free (the process is gone) are
+        renamed into this writer's sealed segments, so only one process takes
+        them over, and persisted with the next flush. Segments of running
+        writers are left alone. Call after opening the accounts.
+
+        Args:
+            last_seqs: Sequence number of the newest persisted entry, per writer ID
+
+        Returns:
+            Number of replayed entries
+        """
+        replayed = 0
+        with self.lock:
+            for writer_id, segments in self._orphaned_segments():
+                owner_fd = os.open(self._writer_path(writer_id, "lock"), os.O_RDWR | os.O_CREAT, 0o644)
+                try:
+                    if not try_lock_fd(owner_fd):
+                        continue
+                    for path in segments:
+                        claimed = self._sealed_path()
+                        try:
+                            os.replace(path, claimed)
+                        except OSError:
+                            continue
+                        entries = [
+                            entry
+                            for entry in self._read_segment(claimed)
+                            if entry["seq"] > last_seqs.get(entry.get("writer", writer_id), 0)
+                        ]
+                        if not entries:
+                            os.unlink(claimed)
+                            continue
+                        for entry in entries:
+                            self._apply(entry)
+                            replayed += 1
+                        self._sealed.append((claimed, entries))
+                    try:
+                        os.unlink(self._writer_path(writer_id, "lock"))
+                    except OSError:
+                        pass
+                finally:
+                    os.close(owner_fd)
+        return replayed
+
+    def _orphaned_segments(self) -> List[Tuple[str, List[Path]]]:
+        """Other writers' segments (sealed in order, then active), by writer ID."""
+        prefix = f"{self.journal_path.stem}."
+        segments: Dict[str, List[Tuple[int, Path]]] = {}
+        for path in self.journal_path.parent.glob(f"{prefix}*"):
+            parts = path.name[len(prefix):].split(".")
+            writer_id = parts[0]
+            if writer_id == self.writer_id:
+                continue
+            if len(parts) == 3 and parts[2] == "sealed" and parts[1].isdigit():
+                segments.setdefault(writer_id, []).append((int(parts[1]), path))
+            elif len(parts) == 2 and parts[1] == "jsonl":
+                segments.setdefault(writer_id, []).append((sys.maxsize, path))
+        return [(writer_id, [path for _, path in sorted(paths)]) for writer_id, paths in sorted(segments.items())]
+
+    def _apply(self, entry: Dict[str, Any]) -> None:
+        """Apply a replayed entry's change to its account (caller holds the lock)."""
+        account = self._accounts.get(entry["account_id"])
+        if account is None:
+            return
+        if entry["op"] == "reset":
+            account[1] = 0
+        else:
+            account[1] += entry["tokens"]
+
+    @staticmethod
+    def _read_segment(path: Path) -> List[Dict[str, Any]]:
+        """Read a journal segment; a torn last line (crash mid-write) is ignored."""
+        entries = []
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except OSError:
+            pass
+        return entries
+
+    def _start_flusher(self) -> None:
+        """Start the periodic flusher thread (caller holds the lock)."""
+        self._flusher = threading.Thread(target=self._run, name="budget-ledger-flusher", daemon=True)
+        self._flusher.start()
+        _open_ledgers.add(self)
+
+    def _run(self) -> None:
+        """Flush every flush interval until closed; errors are reported and the flush retried."""
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Warning: budget ledger flush failed, will retry: {e}", file=sys.stderr)
+
+    def close(self) -> None:
+        """Stop the flusher and persist everything journaled."""
+        if self._closed:
+            return
+        self._closed = True
+        _open_ledgers.discard(self)
+        self._wake.set()
+        if self._flusher is not None and threading.current_thread() is not self._flusher:
+            self._flusher.join()
+        self.flush()
+        with self.lock:
+            if self._journal_fd is not None:
+                os.close(self._journal_fd)
+                self._journal_fd = None
+            # Releasing the lock hands segments left unpersisted over to recover()
+            os.close(self._owner_fd)
+            self._owner_fd = None
+            if not self._sealed and not self._pending:
+                try:
+                    os.unlink(self._owner_path)
+                except OSError:
+                    pass
+
+
+_BENCHMARK_SCHEMA = """
+CREATE TABLE IF NOT EXISTS budget_allocations (
+    constraint_id TEXT PRIMARY KEY,
+    allocated INTEGER NOT NULL,
+    used INTEGER DEFAULT 0,
+    available INTEGER,
+    status TEXT NOT NULL,
+    efficiency_score REAL DEFAULT 0.0,
+    last_updated TEXT
+);
+CREATE TABLE IF NOT EXISTS usage_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    constraint_id TEXT,
+    timestamp TEXT NOT NULL,
+    tokens_used INTEGER NOT NULL,
+    task_type TEXT,
+    agent_name TEXT,
+    efficiency_score REAL,
+    context TEXT
+);
+"""
+
+
+def run_benchmark(allocations: int = 2000) -> Dict[str, float]:
+    """
+    Compare allocation latency of per-call database writes with the ledger.
+
+    Args:
+        allocations: Allocations to time on each path
+
+    Returns:
+        Median and p99 microseconds per allocation, and the time of the ledger's final flush
+    """
+    import sqlite3
+    import statistics
+    import tempfile
+    from datetime import datetime
+
+    def percentiles(samples):
+        samples = sorted(samples)
+        return statistics.median(samples) * 1e6, samples[int(len(samples) * 0.99) - 1] * 1e6
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        conn = sqlite3.connect(os.path.join(temp_dir, "token_budgets.db"), check_same_thread=False)
+        conn.executescript(_BENCHMARK_SCHEMA)
+        conn.execute("INSERT INTO budget_allocations VALUES ('global', ?, 0, ?, 'healthy', 0.0, NULL)", (10**9, 10**9))
+        conn.commit()
+
+        # The previous allocate_tokens: INSERT usage, UPDATE allocation, two commits
+        used = 0
+        direct = []
+        for _ in range(allocations):
+            started = time.perf_counter()
+            used += 10
+            conn.execute(
+                "INSERT INTO usage_history (constraint_id, timestamp, tokens_used, task_type, agent_name, context)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                ("global", datetime.now().isoformat(), 10, "benchmark", "agent", "{}"),
+            )
+            conn.commit()
+            conn.execute("UPDATE budget_allocations SET used = ? WHERE constraint_id = 'global'", (used,))
+            conn.commit()
+            direct.append(time.perf_counter() - started)
+
+        def persist(entries):
+            with conn:
+                conn.executemany(
+                    "INSERT INTO usage_history (constraint_id, timestamp, tokens_used, task_type, agent_name, context)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    [(e["account_id"], str(e["timestamp"]), e["tokens"], e["task_type"], e["agent_name"], "{}")
+                     for e in entries],
+                )
+                conn.execute(
+                    "UPDATE budget_allocations SET used = ? WHERE constraint_id = 'global'", (entries[-1]["used"],)
+                )
+
+        ledger = BudgetLedger(Path(temp_dir) / "budget_ledger.jsonl", persist, flush_interval=3600)
+        ledger.open_account("global", 10**9, used)
+        timed = []
+        for _ in range(allocations):
+            started = time.perf_counter()
+            ledger.allocate("global", 10, task_type="benchmark", agent_name="agent")
+            timed.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        ledger.close()
+        flush_ms = (time.perf_counter() - started) * 1000
+        conn.close()
+
+    direct_p50, direct_p99 = percentiles(direct)
+    ledger_p50, ledger_p99 = percentiles(timed)
+    return {
+        "direct_p50_us": round(direct_p50, 1),
+        "direct_p99_us": round(direct_p99, 1),
+        "ledger_p50_us": round(ledger_p50, 1),
+        "ledger_p99_us": round(ledger_p99, 1),
+        "flush_ms": round(flush_ms, 2),
+    }
+
+
+if __name__ == "__main__":
+    print("=== Budget Ledger Benchmark ===")
+    results = run_benchmark()
+    print(f"Database per allocation: p50 {results['direct_p50_us']:.1f} us, p99 {results['direct_p99_us']:.1f} us")
+    print(f"Ledger:                  p50 {results['ledger_p50_us']:.1f} us, p99 {results['ledger_p99_us']:.1f} us")
+    print(f"Batched flush:           {results['flush_ms']:.2f} ms")
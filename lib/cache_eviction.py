@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Cache Eviction Engine for Autonomous Agent Plugin
+
+Segmented LRU (probation + protected) eviction index with a running byte
+counter and an expiry heap. Every operation is O(1) except expiry tracking,
+which is O(log n), so cache put/get latency stays flat as the cache grows.
+
+New entries enter the probation segment; a second access promotes them to the
+protected segment. Victims are chosen in order: expired entries, probation
+LRU, protected LRU. This approximates the previous "expired, then least
+accessed, then oldest" ordering without sorting the whole cache.
+
+Version: 1.0.0
+Author: Autonomous Agent Plugin
+"""
+import heapq
+import pickle
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+def measure_bytes(content: Any) -> int:
+    """
+    Measure the serialized size of cached content in bytes.
+
+    Strings and bytes are measured directly; everything else is measured as
+    its pickle, which is how cache contents are persisted.
+    """
+    if isinstance(content, bytes):
+        return len(content)
+    if isinstance(content, str):
+        return len(content.encode("utf-8"))
+    try:
+        return len(pickle.dumps(content, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return len(str(content).encode("utf-8"))
+
+
+class EvictionEngine:
+    """Segmented LRU eviction index with byte accounting."""
+
+    def __init__(self, max_bytes: int, protected_ratio: float = 0.8):
+        """
+        Initialize the eviction engine.
+
+        Args:
+            max_bytes: Capacity in serialized bytes
+            protected_ratio: Share of capacity reserved for the protected segment
+        """
+        self.max_bytes = max_bytes
+        self.protected_max_bytes = int(max_bytes * protected_ratio)
+        self.total_bytes = 0
+        self.protected_bytes = 0
+
+        # key -> size in bytes; OrderedDict order is LRU -> MRU
+        self._probation: "OrderedDict[str, int]" = OrderedDict()
+        self._protected: "OrderedDict[str, int]" = OrderedDict()
+
+        # (expires_at, key) min-heap with lazy deletion
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._expires_at: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        """Number of tracked keys."""
+        return len(self._probation) + len(self._protected)
+
+    def __contains__(self, key: str) -> bool:
+        """Check whether a key is tracked."""
+        return key in self._probation or key in self._protected
+
+    def add(self, key: str, size: int, expires_at: Optional[float] = None) -> None:
+        """Track a new (or replaced) key in the probation segment."""
+        if key in self:
+            self.remove(key)
+        self._probation[key] = size
+        self.total_bytes += size
+        if expires_at is not None:
+            self._expires_at[key] = expires_at
+            heapq.heappush(self._expiry_heap, (expires_at, key))
+            self._maybe_compact_heap()
+
+    def touch(self, key: str) -> None:
+        """Record an access: promote to protected, or refresh protected recency."""
+        if key in self._protected:
+            self._protected.move_to_end(key)
+            return
+        size = self._probation.pop(key, None)
+        if size is None:
+            return
+
+        self._protected[key] = size
+        self.protected_bytes += size
+
+        # Overflowing protected entries are demoted back to probation MRU
+        while self.protected_bytes > self.protected_max_bytes and len(self._protected) > 1:
+            demoted_key, demoted_size = self._protected.popitem(last=False)
+            self.protected_bytes -= demoted_size
+            self._probation[demoted_key] = demoted_size
+
+    def remove(self, key: str) -> int:
+        """
+        Stop tracking a key.
+
+        Returns:
+            Bytes released (0 if the key was not tracked)
+        """
+        size = self._probation.pop(key, None)
+        if size is None:
+            size = self._protected.pop(key, None)
+            if size is None:
+                return 0
+            self.protected_bytes -= size
+        self.total_bytes -= size
+        # Heap entry is dropped lazily
+        self._expires_at.pop(key, None)
+        return size
+
+    def needs_eviction(self, incoming_bytes: int) -> bool:
+        """Check whether adding incoming_bytes would exceed capacity."""
+        return self.total_bytes + incoming_bytes > self.max_bytes
+
+    def expired_keys(self, now: Optional[float] = None) -> Iterator[str]:
+        """Yield keys whose expiry has passed, earliest first, removing them from the heap."""
+        now = time.time() if now is None else now
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_at, key = heapq.heappop(self._expiry_heap)
+            # Skip stale heap entries left behind by remove/re-add
+            if self._expires_at.get(key) == expires_at:
+                yield key
+
+    def victims(self, now: Optional[float] = None) -> Iterator[str]:
+        """
+        Yield eviction candidates in priority order.
+
+        Callers must remove() each yielded key before asking for the next one.
+        """
+        for key in self.expired_keys(now):
+            yield key
+        while self._probation or self._protected:
+            segment = self._probation if self._probation else self._protected
+            yield next(iter(segment))
+
+    def _maybe_compact_heap(self) -> None:
+        """Rebuild the expiry heap when stale entries dominate it."""
+        if len(self._expiry_heap) > 2 * len(self._expires_at) + 64:
+            self._expiry_heap = [(expires_at, key) for key, expires_at in self._expires_at.items()]
+            heapq.heapify(self._expiry_heap)
+
+
+def run_benchmark(
+    sizes: Tuple[int, ...] = (1_000, 10_000, 100_000, 1_000_000), ops: int = 20_000
+) -> Dict[int, Dict[str, float]]:
+    """
+    Measure put/get latency of the eviction engine at increasing cache sizes.
+
+    The cache is filled to each size, then ops puts (each forcing an eviction)
+    and ops touches are timed. Flat per-operation latency across sizes shows
+    the engine has no O(n) step on the hot path.
+
+    Returns:
+        Mapping of cache size to per-operation latency in microseconds
+    """
+    results = {}
+    for size in sizes:
+        engine = EvictionEngine(max_bytes=size * 100)
+        now = time.time()
+        for i in range(size):
+            engine.add(f"k{i}", 100, now + 3600)
+
+        start = time.perf_counter()
+        for i in range(ops):
+            key = f"n{i}"
+            for victim in engine.victims(now):
+                engine.remove(victim)
+                if not engine.needs_eviction(100):
+                    break
+            engine.add(key, 100, now + 3600)
+        put_us = (time.perf_counter() - start) / ops * 1e6
+
+        start = time.perf_counter()
+        for i in range(ops):
+            engine.touch(f"n{i % ops}")
+        get_us = (time.perf_counter() - start) / ops * 1e6
+
+        results[size] = {"put_us": round(put_us, 3), "get_us": round(get_us, 3)}
+    return results
+
+
+if __name__ == "__main__":
+    print("=== Eviction Engine Microbenchmark ===")
+    for size, latency in run_benchmark().items():
+        print(f"{size:>9,} entries: put {latency['put_us']:.2f} us/op, get {latency['get_us']:.2f} us/op")
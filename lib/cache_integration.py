@@ -1,10 +1,9 @@
 #!/usr/bin/env python3
 #     Cache Integration Script
 """
-
 Simple integration for the smart caching system that provides immediate
-"""
 30-40% token reduction through intelligent content caching.
+"""
 import sys
 import os
 import time
@@ -16,9 +15,9 @@ from typing import Dict, Any, Optional, List
 sys.path.insert(0, str(Path(__file__).parent))
 
 try:
-    from smart_cache_system_simple import SimpleSmartCache, ContentType, cache_content, get_cached_content
+    from tiered_cache import NAMESPACE_ANALYSIS, NAMESPACE_OPTIMIZED, get_tiered_cache
 except ImportError:
-    print("Error: Smart cache system not found.")
+    print("Error: Tiered cache system not found.")
     sys.exit(1)
 
 
@@ -26,22 +25,47 @@ class TokenCache:
     """Simple interface for token optimization through caching."""
 
     def __init__(self, cache_dir: str = ".claude-patterns", max_size_mb: int = 50):
-        """Initialize the token cache."""
-        self.cache = SimpleSmartCache(
-            cache_dir=cache_dir,
-            max_size_mb=max_size_mb,
-            default_policy=(
-                SimpleSmartCache.__init__.__annotations__["default_policy"].LRU
-                if hasattr(SimpleSmartCache.__init__, "__annotations__")
-                else "lru"
-            ),
-        )
+        """
+        Initialize the token cache.
+
+        Optimized content and analysis results are kept in their own
+        namespaces of the shared tiered cache for cache_dir.
+
+        Args:
+            cache_dir: Directory for cache files
+            max_size_mb: Memory tier capacity, used if the shared tiered cache is created here
+        """
+        self.tiers = get_tiered_cache(cache_dir, l1_max_mb=max_size_mb)
+        self.optimized = self.tiers.namespace(NAMESPACE_OPTIMIZED)
+        self.analysis = self.tiers.namespace(NAMESPACE_ANALYSIS)
         self.optimization_stats = {"cache_hits": 0, "cache_misses": 0, "tokens_saved": 0}
 
+    @staticmethod
+    def _content_key(prefix: str, content: str, context: Optional[Dict[str, Any]], user_id: str) -> str:
+        """Build the cache key for content processed in a context."""
+        content_hash = hashlib.md5(content.encode()).hexdigest()
+        context_hash = hashlib.md5(str(context or {}).encode()).hexdigest()[:8]
+        return f"{prefix}_{user_id}_{content_hash}_{context_hash}"
+
+    @staticmethod
+    def _analysis_key(analysis_type: str, input_data: Any, user_id: str) -> str:
+        """Build the cache key for an analysis result."""
+        input_hash = hashlib.md5(str(input_data).encode()).hexdigest()
+        return f"{analysis_type}_{user_id}_{input_hash}"
+
+    def _lookup(self, namespace, cache_key: str) -> Optional[Any]:
+        """Get a value and count the hit or miss."""
+        result = namespace.get(cache_key)
+        if result is not None:
+            self.optimization_stats["cache_hits"] += 1
+        else:
+            self.optimization_stats["cache_misses"] += 1
+        return result
+
     def cache_processed_content(
         self, original_content: str, processed_content: str, context: Dict[str, Any] = None, user_id: str = "default"
-    )-> str:
-        """Cache Processed Content."""
+    ) -> str:
+        """
         Cache processed content to avoid reprocessing.
 
         Args:
@@ -52,28 +76,22 @@ class TokenCache:
 
         Returns:
             Cached processed content or newly processed content
-"""
-        # Generate cache key
-        content_hash = hashlib.md5(original_content.encode()).hexdigest()
-        context_hash = hashlib.md5(str(context or {}).encode()).hexdigest()[:8]
-        cache_key = f"processed_{user_id}_{content_hash}_{context_hash}"
+        """
+        cache_key = self._content_key("processed", original_content, context, user_id)
 
         # Try to get from cache
-        cached_result = self.cache.get(cache_key, user_id)
+        cached_result = self._lookup(self.optimized, cache_key)
         if cached_result is not None:
-            self.optimization_stats["cache_hits"] += 1
             return cached_result
 
         # Cache miss - store the processed content
-        self.cache.set(cache_key, processed_content, user_id=user_id)
-        self.optimization_stats["cache_misses"] += 1
-
+        self.optimized.put(cache_key, processed_content)
         return processed_content
 
-"""
-    def get_optimized_content():
-"""
-        
+    def get_optimized_content(
+        self, content: str, context: Dict[str, Any] = None, user_id: str = "default"
+    ) -> Optional[str]:
+        """
         Get optimized content from cache if available.
 
         Args:
@@ -83,33 +101,17 @@ class TokenCache:
 
         Returns:
             Optimized content if cached, None otherwise
-"""
-        content_hash = hashlib.md5(content.encode()).hexdigest()
-        context_hash = hashlib.md5(str(context or {}).encode()).hexdigest()[:8]
-        cache_key = f"optimized_{user_id}_{content_hash}_{context_hash}"
-
-        result = self.cache.get(cache_key, user_id)
-        if result is not None:
-            self.optimization_stats["cache_hits"] += 1
-            return result
+        """
+        return self._lookup(self.optimized, self._content_key("optimized", content, context, user_id))
 
-        self.optimization_stats["cache_misses"] += 1
-        return None
-
-"""
     def store_optimized_content(
         self, original_content: str, optimized_content: str, context: Dict[str, Any] = None, user_id: str = "default"
-    )-> None:
-        """Store Optimized Content."""Store optimized content in cache."""
-        content_hash = hashlib.md5(original_content.encode()).hexdigest()
-        context_hash = hashlib.md5(str(context or {}).encode()).hexdigest()[:8]
-        cache_key = f"optimized_{user_id}_{content_hash}_{context_hash}"
+    ) -> None:
+        """Store optimized content in cache."""
+        self.optimized.put(self._content_key("optimized", original_content, context, user_id), optimized_content)
 
-        self.cache.set(cache_key, optimized_content, user_id=user_id)
-
-    def cache_analysis_result():
-"""
-        
+    def cache_analysis_result(self, analysis_type: str, input_data: Any, result: Any, user_id: str = "default") -> Any:
+        """
         Cache analysis results to avoid reprocessing.
 
         Args:
@@ -120,39 +122,25 @@ class TokenCache:
 
         Returns:
             Cached result or None
-"""
-        input_hash = hashlib.md5(str(input_data).encode()).hexdigest()
-        cache_key = f"analysis_{analysis_type}_{user_id}_{input_hash}"
+        """
+        cache_key = self._analysis_key(analysis_type, input_data, user_id)
 
         # Try to get from cache
-        cached_result = self.cache.get(cache_key, user_id)
+        cached_result = self._lookup(self.analysis, cache_key)
         if cached_result is not None:
-            self.optimization_stats["cache_hits"] += 1
             return cached_result
 
         # Store new result
-        self.cache.set(cache_key, result, user_id=user_id)
-        self.optimization_stats["cache_misses"] += 1
-
+        self.analysis.put(cache_key, result)
         return result
 
-"""
     def get_analysis_result(self, analysis_type: str, input_data: Any, user_id: str = "default") -> Optional[Any]:
         """Get cached analysis result."""
-        input_hash = hashlib.md5(str(input_data).encode()).hexdigest()
-        cache_key = f"analysis_{analysis_type}_{user_id}_{input_hash}"
-
-        result = self.cache.get(cache_key, user_id)
-        if result is not None:
-            self.optimization_stats["cache_hits"] += 1
-            return result
-
-        self.optimization_stats["cache_misses"] += 1
-        return None
+        return self._lookup(self.analysis, self._analysis_key(analysis_type, input_data, user_id))
 
     def get_cache_efficiency(self) -> Dict[str, Any]:
         """Get cache efficiency statistics."""
-        stats = self.cache.get_stats()
+        stats = self.tiers.get_stats()
 
         total_requests = self.optimization_stats["cache_hits"] + self.optimization_stats["cache_misses"]
         hit_rate = self.optimization_stats["cache_hits"] / total_requests if total_requests > 0 else 0
@@ -162,13 +150,14 @@ class TokenCache:
             "total_requests": total_requests,
             "cache_hits": self.optimization_stats["cache_hits"],
             "cache_misses": self.optimization_stats["cache_misses"],
+            "cache_entries": len(self.optimized) + len(self.analysis),
             "cache_stats": stats,
             "tokens_saved": self.optimization_stats["tokens_saved"],
         }
 
     def cleanup_old_entries(self, hours: int = 24) -> int:
         """Clean up old cache entries."""
-        return self.cache.cleanup(hours)
+        return self.optimized.cleanup(hours * 3600) + self.analysis.cleanup(hours * 3600)
 
 
 # Easy-to-use functions for quick integration
@@ -273,9 +262,9 @@ def demonstrate_caching():
 
     cache_stats = efficiency["cache_stats"]
     print(f"\n4. Cache System Statistics:")
-    print(f"   Total entries: {cache_stats['cache_stats']['total_entries']}")
-    print(f"   Cache size: {cache_stats['cache_stats']['total_size_bytes']:,} bytes")
-    print(f"   Memory utilization: {cache_stats['performance_metrics']['memory_utilization']:.1%}")
+    print(f"   Total entries: {efficiency['cache_entries']}")
+    print(f"   Cache size: {cache_stats['l1']['bytes']:,} bytes")
+    print(f"   Memory utilization: {cache_stats['l1']['utilization']:.1%}")
 
     print("\nCache demonstration complete!")
 
@@ -302,8 +291,8 @@ def main():
         print(f"  Total requests: {stats['total_requests']}")
         print(f"  Cache hits: {stats['cache_hits']}")
         print(f"  Cache misses: {stats['cache_misses']}")
-        print(f"  Cache entries: {stats['cache_stats']['cache_stats']['total_entries']}")
-        print(f"  Cache size: {stats['cache_stats']['cache_stats']['total_size_bytes']:,} bytes")
+        print(f"  Cache entries: {stats['cache_entries']}")
+        print(f"  Cache size: {stats['cache_stats']['l1']['bytes']:,} bytes")
     elif args.cleanup:
         token_cache = TokenCache()
         cleaned = token_cache.cleanup_old_entries(args.cleanup)
@@ -12,14 +12,16 @@
 
 # Version: 1.0.0
 # Author: Autonomous Agent Development Team
-from flask import Flask, render_template_string, jsonify, request
+from flask import Flask, Response, g, jsonify, request
 from flask_cors import CORS
+import importlib.util
 import json
 import sys
 import hashlib
+import pickle
 import os
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import threading
 import time
@@ -29,27 +31,40 @@ import random
 import socket
 import subprocess
 
-# Import unified parameter storage system
-try:
-    # Add lib directory to Python path for imports
-    import sys
-    from pathlib import Path
+# Add lib directory to Python path for imports
+lib_dir = Path(__file__).parent
+if str(lib_dir) not in sys.path:
+    sys.path.insert(0, str(lib_dir))
 
-#     lib_dir = Path(__file__).parent
-    if str(lib_dir) not in sys.path:
-        sys.path.insert(0, str(lib_dir))
+# Unified parameter storage is only imported when the collector first needs it (see _discover_storage)
+UNIFIED_STORAGE_AVAILABLE = importlib.util.find_spec("unified_parameter_storage") is not None
+if not UNIFIED_STORAGE_AVAILABLE:
+    print("Warning: Unified parameter storage not available, using legacy system", file=sys.stderr)
 
-    from unified_parameter_storage import UnifiedParameterStorage
-    from parameter_compatibility import enable_compatibility_mode
+from activity_feed import decode_cursor, newest_first, paginate
+from dashboard_snapshot import UnifiedDataSnapshot, UnifiedSnapshotLoader, empty_dashboard_data, parse_timestamp
+from dashboard_http import accepts_gzip, compress, data_generation, etag_matches, make_etag
+from dashboard_stream import DirectoryWatcher, PanelStreamHub
+from dashboard_shared import UNIFIED_SECTION, SharedSnapshotReader, SharedUnifiedLoader, SnapshotBuilder
+from dashboard_server import SERVERS, fork_available, run_workers
+from dashboard_startup import LazyObject, LazyRegistry, get_discovery_cache
+from git_history_cache import get_git_history, repo_head
+from downsampling import DEFAULT_MAX_POINTS, MIN_MAX_POINTS, downsample
+from quality_rollups import ASSESSMENT_STREAM, GRANULARITIES, ROLLUP_FILE, QualityRollups, is_scored
 
-#     UNIFIED_STORAGE_AVAILABLE = True
-except ImportError:
-#     UNIFIED_STORAGE_AVAILABLE = False
-    print("Warning: Unified parameter storage not available, using legacy system", file=sys.stderr)
 
+# Files whose presence marks a patterns directory holding data
+PATTERN_DATA_FILES = ("patterns.json", "quality_history.json", "task_queue.json", "config.json")
+# Files _validate_storage_has_data reads
+STORAGE_DATA_FILES = ("unified_data.json", "quality_history.json", "patterns.json", "unified_parameters.json")
+
+# Sources merged by the paginated activity endpoints
+ACTIVITY_SOURCES = ("unified_storage", "git_history")
+PERFORMANCE_RECORD_SOURCES = ("unified_storage",)
 
-# app = Flask(__name__)
-# CORS(app)  # Enable CORS for API access
+
+app = Flask(__name__)
+CORS(app)  # Enable CORS for API access
 
 
 # Unified Dashboard Architecture - Modular Sections
@@ -155,7 +170,6 @@ class TokenOptimizationSection(UnifiedDashboardSection):
 """
 
 
-"""
 class KPISection(UnifiedDashboardSection):
     """KPI and executive metrics section"""
 
@@ -252,7 +266,6 @@ class KPISection(UnifiedDashboardSection):
 """
 
 
-"""
 class SystemHealthSection(UnifiedDashboardSection):
     """System health and consistency validation section"""
 
@@ -347,17 +360,16 @@ class SystemHealthSection(UnifiedDashboardSection):
 """
 
 
-"""
 class DashboardDataCollector:
     """Collects and aggregates data for dashboard visualization."""
 
     def __init__(self, patterns_dir: str = ".claude-patterns"):
-"""
+        """
         Initialize data collector.
 
         Args:
-            patterns_dir: Directory containing pattern data (legacy parameter)
-"""
+            patterns_dir: Directory containing pattern data (used when it holds data, discovered otherwise)
+        """
         current_dir = Path(__file__).parent
         self.cache = {}
         self.cache_ttl = 60  # Cache for 60 seconds
@@ -370,16 +382,22 @@ class DashboardDataCollector:
             self.patterns_dir = current_dir
             self.project_root = current_dir.parent
             self.is_local_copy = True
+        elif any((Path(patterns_dir) / name).exists() for name in PATTERN_DATA_FILES + ("unified_data.json",)):
+            # Case 2: Given a patterns directory holding data (e.g. --patterns-dir)
+            print(f"Dashboard using patterns directory {patterns_dir}")
+            self.patterns_dir = Path(patterns_dir).resolve()
+            self.project_root = self._discover_project_root()
+            self.is_local_copy = False
         elif current_dir.name == "lib":
-            # Case 2: Running from plugin lib directory
+            # Case 3: Running from plugin lib directory
             print("Dashboard running from plugin lib directory")
-            self.patterns_dir = self._discover_patterns_dir()
+            self.patterns_dir = self._cached_patterns_dir()
             self.project_root = self._discover_project_root()
             self.is_local_copy = False
         else:
-            # Case 3: Unknown location - use discovery
+            # Case 4: Unknown location - use discovery
             print("Dashboard running from unknown location - using discovery")
-            self.patterns_dir = self._discover_patterns_dir()
+            self.patterns_dir = self._cached_patterns_dir()
             self.project_root = self._discover_project_root()
             self.is_local_copy = False
 
@@ -389,65 +407,28 @@ class DashboardDataCollector:
         print(f"  Project root: {self.project_root}")
         print(f"  Local copy: {self.is_local_copy}")
 
-        # Initialize unified parameter storage if available
-        if UNIFIED_STORAGE_AVAILABLE:
-            self.unified_storage = None
-            self.use_unified_storage = False
-
-            if self.is_local_copy:
-                # For local copy, check current and parent directories
-                storage_dirs = [
-                    self.patterns_dir / ".claude-unified",
-                    self.project_root / ".claude-unified",
-                    self.patterns_dir,
-                    self.project_root,
-                ]
-            else:
-                # For plugin, check multiple possible locations
-                # IMPORTANT: Prioritize .claude-patterns which has the actual data
-                storage_dirs = [
-                    self.patterns_dir,  # First priority: .claude-patterns with unified_data.json
-                    self.project_root / ".claude-patterns",
-                    self.patterns_dir / ".claude-unified",
-                    self.project_root / ".claude-unified",
-                    current_dir / ".claude-unified",
-                ]
+        # Storage discovery reads candidate data files, so it waits until a request needs it
+        self._unified_storage = None
+        self._storage_discovered = False
+        self._storage_lock = threading.Lock()
 
-            for storage_dir in storage_dirs:
-                if storage_dir.exists():
-                    try:
-                        # Check if this directory has actual data
-                        has_data = self._validate_storage_has_data(storage_dir)
-                        if not has_data:
-                            print(f"  Skipping {storage_dir}: No data found")
-                            continue
-
-                        self.unified_storage = UnifiedParameterStorage(str(storage_dir))
-                        self.use_unified_storage = True
-                        # Enable compatibility mode for seamless transition
-                        enable_compatibility_mode(auto_patch=False, monkey_patch=False)
-                        print(f"  Unified storage: {storage_dir}")
-                        break
-                    except Exception as e:
-                        print(f"  Unified storage failed at {storage_dir}: {e}")
-                        continue
-
-            if not self.unified_storage:
-                print("  Unified storage: Not available")
-        else:
-            print("  Unified storage: Not available")
-            self.unified_storage = None
-            self.use_unified_storage = False
+        # unified_data.json is parsed once per change and shared by all API handlers
+        self._unified_snapshots = UnifiedSnapshotLoader(
+            self.patterns_dir / "unified_data.json", self._normalize_timestamp, self._normalize_model_name
+        )
+        # Snapshot a request thread is pinned to while it computes a bundle
+        self._pinned = threading.local()
 
-        # Initialize unified dashboard sections
-        self.dashboard_sections = {
-            "tokens": TokenOptimizationSection(self),
-            "kpi": KPISection(self),
-            "system": SystemHealthSection(self),
-        }
-        print(f"  Initialized {len(self.dashboard_sections)} dashboard sections")
+        # Unified dashboard sections are built on first lookup
+        self.dashboard_sections = LazyRegistry(
+            {
+                "tokens": lambda: TokenOptimizationSection(self),
+                "kpi": lambda: KPISection(self),
+                "system": lambda: SystemHealthSection(self),
+            }
+        )
+        print(f"  Registered {len(self.dashboard_sections)} dashboard sections")
 
-"""
     def _discover_project_root(self) -> Path:
         """Discover the project root directory when running from plugin."""
         current_dir = Path(__file__).parent
@@ -475,12 +456,10 @@ class DashboardDataCollector:
         print(f"No project root indicators found, using current directory: {current_dir}")
         return current_dir
 
-    def _discover_patterns_dir(self) -> Path:
-        """Discover patterns directory when running from plugin."""
+    def _patterns_dir_candidates(self) -> List[Path]:
+        """Patterns directories to look for when running from plugin, in priority order."""
         current_dir = Path(__file__).parent
-
-        # Priority order for patterns directory when running from plugin
-        potential_dirs = [
+        return [
             # 1. Project root patterns (most likely)
             current_dir.parent / ".claude-patterns",
             # 2. Current directory patterns
@@ -493,11 +472,29 @@ class DashboardDataCollector:
             current_dir.parent / ".claude-patterns",
         ]
 
+    def _cached_patterns_dir(self) -> Path:
+        """Discover the patterns directory, reusing the last result while no candidate gained or lost data files."""
+        candidates = self._patterns_dir_candidates()
+        paths = [path for directory in candidates for path in (directory, *(directory / f for f in PATTERN_DATA_FILES))]
+        patterns_dir = get_discovery_cache().cached(
+            f"patterns_dir:{Path(__file__).parent.resolve()}",
+            lambda: str(self._discover_patterns_dir()),
+            paths,
+            exists_only=True,
+        )
+        return Path(patterns_dir)
+
+    def _discover_patterns_dir(self) -> Path:
+        """Discover patterns directory when running from plugin."""
+        current_dir = Path(__file__).parent
+
+        # Priority order for patterns directory when running from plugin
+        potential_dirs = self._patterns_dir_candidates()
+
         for patterns_dir in potential_dirs:
             if patterns_dir.exists():
                 # Check if it has actual data files
-                data_files = ["patterns.json", "quality_history.json", "task_queue.json", "config.json"]
-                if any((patterns_dir / file).exists() for file in data_files):
+                if any((patterns_dir / file).exists() for file in PATTERN_DATA_FILES):
                     print(f"Found existing patterns directory with data: {patterns_dir}")
                     return patterns_dir
                 else:
@@ -509,8 +506,86 @@ class DashboardDataCollector:
         print(f"Created new patterns directory: {best_dir}")
         return best_dir
 
-    def _validate_storage_has_data():
-"""
+    @property
+    def unified_storage(self) -> Optional["UnifiedParameterStorage"]:
+        """Unified parameter storage of the first storage directory holding data (discovered on first use)."""
+        self._discover_storage()
+        return self._unified_storage
+
+    @property
+    def use_unified_storage(self) -> bool:
+        """Whether a storage directory holding data was found (discovered on first use)."""
+        self._discover_storage()
+        return self._unified_storage is not None
+
+    def _storage_candidates(self) -> List[Path]:
+        """Directories that may hold unified storage, in priority order."""
+        if self.is_local_copy:
+            # For local copy, check current and parent directories
+            return [
+                self.patterns_dir / ".claude-unified",
+                self.project_root / ".claude-unified",
+                self.patterns_dir,
+                self.project_root,
+            ]
+        # For plugin, check multiple possible locations
+        # IMPORTANT: Prioritize .claude-patterns which has the actual data
+        return [
+            self.patterns_dir,  # First priority: .claude-patterns with unified_data.json
+            self.project_root / ".claude-patterns",
+            self.patterns_dir / ".claude-unified",
+            self.project_root / ".claude-unified",
+            Path(__file__).parent / ".claude-unified",
+        ]
+
+    def _discover_storage(self) -> None:
+        """Open the unified parameter storage of the first candidate directory holding data, once."""
+        if self._storage_discovered:
+            return
+        with self._storage_lock:
+            if self._storage_discovered:
+                return
+            try:
+                if not UNIFIED_STORAGE_AVAILABLE:
+                    raise ImportError("unified_parameter_storage not found")
+                from unified_parameter_storage import UnifiedParameterStorage
+                from parameter_compatibility import enable_compatibility_mode
+            except ImportError as e:
+                print(f"  Unified storage: Not available ({e})")
+                self._storage_discovered = True
+                return
+
+            for storage_dir in self._storage_candidates():
+                if storage_dir.exists():
+                    try:
+                        # Check if this directory has actual data
+                        if not self._storage_has_data(storage_dir):
+                            print(f"  Skipping {storage_dir}: No data found")
+                            continue
+
+                        self._unified_storage = UnifiedParameterStorage(str(storage_dir))
+                        # Enable compatibility mode for seamless transition
+                        enable_compatibility_mode(auto_patch=False, monkey_patch=False)
+                        print(f"  Unified storage: {storage_dir}")
+                        break
+                    except Exception as e:
+                        print(f"  Unified storage failed at {storage_dir}: {e}")
+                        continue
+
+            if not self._unified_storage:
+                print("  Unified storage: Not available")
+            self._storage_discovered = True
+
+    def _storage_has_data(self, storage_dir: Path) -> bool:
+        """Check a storage directory for data, reusing the last answer while its data files are unchanged."""
+        return get_discovery_cache().cached(
+            f"storage_has_data:{storage_dir.resolve()}",
+            lambda: self._validate_storage_has_data(storage_dir),
+            [storage_dir / name for name in STORAGE_DATA_FILES],
+        )
+
+    def _validate_storage_has_data(self, storage_dir: Path) -> bool:
+        """
         
         Validate that a storage directory contains actual data.
 
@@ -520,7 +595,7 @@ class DashboardDataCollector:
         3. patterns.json with patterns
 
         Returns True if any meaningful data is found.
-"""
+        """
         # Check for unified_data.json (new format)
         unified_file = storage_dir / "unified_data.json"
         if unified_file.exists():
@@ -582,7 +657,6 @@ class DashboardDataCollector:
 
         return False
 
-"""
     def _deterministic_score(self, base_score: float, variance: float, seed_data: str) -> float:
         """Generate deterministic scores based on seed data."""
         hash_obj = hashlib.md5(seed_data.encode())
@@ -651,11 +725,11 @@ class DashboardDataCollector:
 
         return model_data if model_data else None
 
-    def _normalize_timestamp():
-"""
+    def _normalize_timestamp(self, timestamp: str) -> str:
+        """
         
         Normalize timestamp to ISO format for consistency.
-"""
+        """
         if not timestamp:
             return datetime.now().astimezone().isoformat()
 
@@ -674,16 +748,15 @@ class DashboardDataCollector:
             # If parsing fails, return current time
             return datetime.now().astimezone().isoformat()
 
-"""
-    def _get_model_sort_key():
-"""
+    def _get_model_sort_key(self, model_name: str) -> Tuple[int, int, str]:
+        """
         
         Get sort key for consistent model ordering across all charts.
         Order: Claude models first, then GLM models, then others alphabetically.
 
         Returns:
             Tuple of (priority, name) for sorting
-"""
+        """
         model_lower = model_name.lower()
 
         # Priority 0: Claude models (sorted by version)
@@ -705,133 +778,152 @@ class DashboardDataCollector:
         else:
             return (2, 0, model_name)
 
-"""
-    def _load_unified_data():
-"""
+    def _load_unified_data(self) -> Dict[str, Any]:
+        """
         
         Load data from unified storage (unified_data.json).
         This is the PRIMARY data source for all dashboard APIs.
-"""
+        """
+        snapshot = self._get_unified_snapshot()
+        if snapshot is None:
+            return empty_dashboard_data()
+        return snapshot.unified
+
+    def _get_unified_snapshot(self) -> Optional[UnifiedDataSnapshot]:
+        """Get the shared snapshot of unified_data.json, re-parsed only when the file changes."""
+        pinned = getattr(self._pinned, "snapshot", None)
+        if pinned is not None:
+            return pinned
+
         if not self.use_unified_storage or not self.unified_storage:
             print("Error: Unified storage not available", file=sys.stderr)
-            return {"quality": {"assessments": {"history": [], "current": {}}}, "patterns": {}}
+            return None
 
-        try:
-            # Read directly from unified_data.json
-            unified_file = self.patterns_dir / "unified_data.json"
-            if not unified_file.exists():
-                print(f"Error: unified_data.json not found at {unified_file}", file=sys.stderr)
-                return {"quality": {"assessments": {"history": [], "current": {}}}, "patterns": {}}
-
-            with open(unified_file, "r") as f:
-                file_data = json.load(f)
-
-            # Convert old unified format to new format expected by dashboard
-            unified_data = {
-                "quality": {"assessments": {"history": [], "current": {}}},
-                "patterns": [],
-                "skills": {},
-                "agents": {},
-                "performance": {"records": []},
-            }
-
-            # Map quality_history to new format
-            quality_history_data = file_data.get("quality_history", {})
-            assessments = quality_history_data.get("quality_assessments", [])
-            if assessments:
-                unified_data["quality"]["assessments"]["history"] = assessments
-
-            # Patterns
-            patterns = file_data.get("patterns", [])
-            if patterns:
-                unified_data["patterns"] = patterns
-
-            # Skills
-            skill_metrics = file_data.get("skill_metrics", {})
-            if skill_metrics:
-                unified_data["skills"] = skill_metrics
-
-            # Agents
-            agent_metrics = file_data.get("agent_metrics", {})
-            if agent_metrics:
-                unified_data["agents"] = agent_metrics
-
-            # Performance records
-            performance_records = file_data.get("performance_records", {})
-            if performance_records:
-                unified_data["performance"] = performance_records
-
-            return unified_data
+        snapshot = self._unified_snapshots.get()
+        if snapshot is None:
+            print(f"Error: unified_data.json not found at {self._unified_snapshots.path}", file=sys.stderr)
+        return snapshot
 
-        except Exception as e:
-            print(f"Error loading unified data: {e}", file=sys.stderr)
-            return {"quality": {"assessments": {"history": [], "current": {}}}, "patterns": {}}
+    def share_snapshots(self, reader: SharedSnapshotReader) -> None:
+        """
+        Take unified data from a builder process's shared snapshot instead of parsing unified_data.json.
 
-"""
-    def _get_unified_assessments():
-"""
-        
-        Get assessments from unified storage with optional filtering.
-"""
-"""
-        from collections import defaultdict
+        Args:
+            reader: Reader of the shared snapshot file
+        """
+        self._unified_snapshots = SharedUnifiedLoader(reader)
 
-        unified_data = self._load_unified_data()
-        assessment_history = unified_data.get("quality", {}).get("assessments", {}).get("history", [])
-        current_assessment = unified_data.get("quality", {}).get("assessments", {}).get("current", {})
+    def get_panel_bundle(self, panels: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Compute several panels in one pass against the same snapshot of the data.
 
-        assessments = assessment_history.copy()
+        Args:
+            panels: Mapping of panel name to a function computing its data
 
-        # Add current assessment if it exists and meets criteria
-        if current_assessment and current_assessment.get("overall_score", 0) > 0:
-            assessments.append(current_assessment)
+        Returns:
+            Mapping of panel name to its data (None for panels that failed)
+        """
+        self._pinned.snapshot = self._get_unified_snapshot()
+        try:
+            bundle = {}
+            for name, compute in panels.items():
+                try:
+                    bundle[name] = compute()
+                except Exception as e:
+                    print(f"Error computing dashboard panel {name}: {e}", file=sys.stderr)
+                    bundle[name] = None
+            return bundle
+        finally:
+            self._pinned.snapshot = None
 
-        # Filter by date and quality
-        cutoff_date = datetime.now() - timedelta(days=days)
-        filtered_assessments = []
+    def _from_snapshot(self, key: str, compute):
+        """
+        Compute a value that depends only on the unified data once per file version.
 
-        for assessment in assessment_history:
+        Args:
+            key: Name of the value
+            compute: Function of the dashboard-format unified data
+
+        Returns:
+            The computed value (shared between requests; do not modify)
+        """
+        snapshot = self._get_unified_snapshot()
+        if snapshot is None:
+            return compute(empty_dashboard_data())
+        return snapshot.memo(key, lambda: compute(snapshot.unified))
+
+    def _get_rollups(self) -> Optional[QualityRollups]:
+        """Get the quality rollups of the unified history, checked once per file version."""
+        snapshot = self._get_unified_snapshot()
+        if snapshot is None:
+            return None
+        return snapshot.memo("rollups", lambda: self._load_rollups(snapshot))
+
+    def _load_rollups(self, snapshot: UnifiedDataSnapshot) -> QualityRollups:
+        """
+        Load the persisted rollups, rebuilding them if they do not cover the snapshot's history.
+
+        AssessmentStorage keeps them current as it records assessments; a count
+        mismatch means they drifted (or never existed) and they are rebuilt once.
+        """
+        rollups = QualityRollups(self.patterns_dir / ROLLUP_FILE)
+        scored = []
+        for entry in snapshot.entries:
+            score = entry.raw.get("overall_score")
+            if is_scored(score):
+                model = (entry.raw.get("details") or {}).get("model_used", "")
+                scored.append((entry.time, score, model, entry.raw.get("task_type", "unknown")))
+        if rollups.count(ASSESSMENT_STREAM) != len(scored):
+            rollups.rebuild(ASSESSMENT_STREAM, scored)
             try:
-                timestamp_str = assessment.get("timestamp", "")
-                if not timestamp_str:
-                    continue
+                rollups.save()
+            except OSError as e:
+                print(f"Warning: Could not save quality rollups: {e}", file=sys.stderr)
+        return rollups
 
-                # Normalize timestamp
-                timestamp_str = self._normalize_timestamp(timestamp_str)
-                assessment_date = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00")).replace(tzinfo=None)
-
-                # Check date range and quality score
-                if assessment_date >= cutoff_date:
-                    # Filter out zero-quality assessments
-                    overall_score = assessment.get("overall_score", 0)
-                    if overall_score and overall_score > 0:
-                        assessment["timestamp"] = timestamp_str  # Store normalized timestamp
-                        filtered_assessments.append(assessment)
-            except Exception as e:
-                print(f"Error filtering assessment: {e}", file=sys.stderr)
-                continue
+    def _resolve_granularity(self, days: int, granularity: Optional[str] = None) -> str:
+        """
+        Pick how a trend over the last days is resolved.
 
-        # Filter by task types if specified
-        if task_types:
-            task_types_lower = [t.lower() for t in task_types]
-            filtered_assessments = [a for a in filtered_assessments if a.get("task_type", "").lower() in task_types_lower]
+        Args:
+            days: Length of the range
+            granularity: Requested "raw", "hour", "day" or "week" (anything else picks automatically)
 
-        # Ensure all assessments have normalized model names
-        for assessment in filtered_assessments:
-            if "details" not in assessment:
-                assessment["details"] = {}
-            model_used = assessment["details"].get("model_used", "Claude Sonnet 4.5")
-            assessment["details"]["model_used"] = self._normalize_model_name(model_used)
+        Returns:
+            "raw" (one point per assessment) for short ranges, rollup buckets for long ones
+        """
+        if granularity == "raw" or granularity in GRANULARITIES:
+            return granularity
+        if days <= 7:
+            return "raw"
+        return "day" if days <= 90 else "week"
+
+    def _get_unified_assessments(self, days: int = 30, task_types: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        
+        Get assessments from unified storage with optional filtering.
+        """
+        from collections import defaultdict
 
-        return filtered_assessments
+        snapshot = self._get_unified_snapshot()
+        if snapshot is None:
+            return []
 
-    def get_debugging_performance_data():
-"""
+        # Timestamps and model names were normalized once when the snapshot was built;
+        # the date and task type filters use its indexes instead of walking the history
+        cutoff_date = datetime.now() - timedelta(days=days)
+        return [
+            entry.record
+            for entry in snapshot.select(since=cutoff_date, task_types=task_types or None)
+            if entry.record.get("overall_score") and entry.record["overall_score"] > 0
+        ]
+
+    def get_debugging_performance_data(self, days: int = 1, max_points: int = DEFAULT_MAX_POINTS) -> Dict[str, Any]:
+        """
         
         Get debugging performance data from UNIFIED STORAGE only.
         Calculates actual performance metrics from real debugging tasks.
-"""
-"""
+        """
         from collections import defaultdict
 
         # Get debugging-related assessments from unified storage
@@ -859,6 +951,8 @@ class DashboardDataCollector:
         # Calculate performance metrics for each model
         performance_rankings = []
         detailed_metrics = {}
+        # The assessment lists share the point budget; metrics use every assessment
+        points_per_model = max(MIN_MAX_POINTS, max_points // len(model_data))
 
         for model, assessments in model_data.items():
             if not assessments:
@@ -902,7 +996,7 @@ class DashboardDataCollector:
                 "time_efficiency_score": time_efficiency_score,
                 "regression_penalty": 0,
                 "efficiency_index": (time_efficiency_score + qis_score) / 2,
-                "assessments": assessments,
+                "assessments": downsample(assessments, points_per_model, lambda a: a.get("overall_score")),
             }
 
             performance_rankings.append(model_metrics)
@@ -921,91 +1015,41 @@ class DashboardDataCollector:
             "data_source": "unified_storage",
         }
 
-    def get_recent_performance_records():
-"""
-        
+    def get_recent_performance_records(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        task_type: Optional[str] = None,
+        model: Optional[str] = None,
+        source: Optional[str] = None,
+        success: Optional[bool] = None,
+    ) -> Dict[str, Any]:
+        """
+
         Get recent performance records from UNIFIED STORAGE only.
         Ensures consistency with other APIs.
-"""
-        # Get recent assessments from unified storage (last 30 days)
-        assessments = self._get_unified_assessments(days=30)
-
-        if not assessments:
-            return {
-                "records": [],
-                "summary": {
-                    "total_records": 0,
-                    "date_range": "Last 30 days",
-                    "unique_models": [],
-                    "avg_quality_score": 0,
-                    "data_sources": ["unified_storage"],
-                },
-            }
-
-        # Convert to performance record format
-        records = []
-        quality_scores = []
-
-        for assessment in assessments[:limit]:  # Limit to requested number
-            timestamp = assessment.get("timestamp", "")
-            task_type = assessment.get("task_type", "unknown")
-            overall_score = assessment.get("overall_score", 0)
-            model_used = assessment.get("details", {}).get("model_used", "Claude Sonnet 4.5")
-            assessment_id = assessment.get("assessment_id", "")
-            pass_status = assessment.get("pass", False)
-
-            # Extract performance details
-            details = assessment.get("details", {})
-            performance_index = details.get("performance_index", 0)
-            quality_improvement = details.get("quality_improvement", 0)
-            issues_found = len(assessment.get("issues_found", []))
-            fixes_applied = details.get("fixes_applied", 0)
-            duration_seconds = details.get("duration_seconds", 0)
-
-            # Normalize
-            model_used = self._normalize_model_name(model_used)
-            timestamp = self._normalize_timestamp(timestamp)
-
-            # Calculate derived metrics
-            success_rate = 100 if pass_status else 0
-            time_elapsed_minutes = duration_seconds / 60 if duration_seconds > 0 else 0
-
-            record = {
-                "timestamp": timestamp,
-                "model": model_used,
-                "assessment_id": assessment_id,
-                "task_type": task_type,
-                "overall_score": overall_score,
-                "performance_index": performance_index,
-                "evaluation_target": task_type,
-                "quality_improvement": quality_improvement,
-                "issues_found": issues_found,
-                "fixes_applied": fixes_applied,
-                "time_elapsed_minutes": time_elapsed_minutes,
-                "success_rate": success_rate,
-                "pass": pass_status,
-                "auto_generated": assessment.get("auto_generated", False),
-            }
-
-            records.append(record)
-            if overall_score > 0:
-                quality_scores.append(overall_score)
-
-        # Sort by timestamp (newest first)
-        records.sort(key=lambda x: x["timestamp"], reverse=True)
+        """
+        # Newest first from the unified storage indexes; only the requested page is converted
+        sources = self._requested_sources(source, PERFORMANCE_RECORD_SOURCES)
+        after = decode_cursor(cursor) if cursor else None
+        since = datetime.now() - timedelta(days=30)
+        streams = [self._assessment_stream(self._performance_record, after, since, task_type, model)] if sources else []
+        records, next_cursor = paginate(streams, limit, self._activity_filter(task_type, model, success))
 
         # Calculate summary
+        quality_scores = [r["overall_score"] for r in records if r["overall_score"] > 0]
         unique_models = list(set(r["model"] for r in records))
         avg_quality_score = sum(quality_scores) / len(quality_scores) if quality_scores else 0
 
         return {
             "records": records,
+            "next_cursor": next_cursor,
             "summary": {
                 "total_records": len(records),
                 "date_range": "Last 30 days",
                 "unique_models": unique_models,
                 "avg_quality_score": round(avg_quality_score, 1),
-                "data_sources": ["unified_storage"],
+                "data_sources": sources,
                 "quality_score_distribution": {
                     "excellent": len([s for s in quality_scores if s >= 90]),
                     "good": len([s for s in quality_scores if 70 <= s < 90]),
@@ -1014,59 +1058,76 @@ class DashboardDataCollector:
             },
         }
 
-"""
+    def _performance_record(self, assessment: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a unified storage assessment to a performance record."""
+        timestamp = assessment.get("timestamp", "")
+        task_type = assessment.get("task_type", "unknown")
+        overall_score = assessment.get("overall_score", 0)
+        model_used = assessment.get("details", {}).get("model_used", "Claude Sonnet 4.5")
+        assessment_id = assessment.get("assessment_id", "")
+        pass_status = assessment.get("pass", False)
+
+        # Extract performance details
+        details = assessment.get("details", {})
+        performance_index = details.get("performance_index", 0)
+        quality_improvement = details.get("quality_improvement", 0)
+        issues_found = len(assessment.get("issues_found", []))
+        fixes_applied = details.get("fixes_applied", 0)
+        duration_seconds = details.get("duration_seconds", 0)
+
+        # Normalize
+        model_used = self._normalize_model_name(model_used)
+        timestamp = self._normalize_timestamp(timestamp)
+
+        # Calculate derived metrics
+        success_rate = 100 if pass_status else 0
+        time_elapsed_minutes = duration_seconds / 60 if duration_seconds > 0 else 0
+
+        return {
+            "timestamp": timestamp,
+            "model": model_used,
+            "assessment_id": assessment_id,
+            "task_type": task_type,
+            "overall_score": overall_score,
+            "performance_index": performance_index,
+            "evaluation_target": task_type,
+            "quality_improvement": quality_improvement,
+            "issues_found": issues_found,
+            "fixes_applied": fixes_applied,
+            "time_elapsed_minutes": time_elapsed_minutes,
+            "success_rate": success_rate,
+            "pass": pass_status,
+            "auto_generated": assessment.get("auto_generated", False),
+        }
+
     def _get_git_activity_history(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Load recent git commit history for activities not captured in pattern system."""
         git_activities = []
 
-        try:
-            # Get recent git commits from the last 7 days
-            result = subprocess.run(
-                [
-                    "git",
-                    "log",
-                    f"--max-count={limit}",
-                    "--since=7 days ago",
-                    "--pretty=format:%H|%ad|%s",
-                    "--date=iso",
-                    "--no-merges",
-                ],
-                capture_output=True,
-                text=True,
-                check=True,
-                cwd=self.patterns_dir.parent,
-            )
-
-            for line in result.stdout.strip().split("\n"):
-                if line:
-                    parts = line.split("|")
-                    if len(parts) >= 3:
-                        commit_hash = parts[0]
-                        commit_date = parts[1]
-                        commit_message = parts[2]
+        # Recent commits from the last 7 days, from the shared cache (no git process while HEAD is unchanged)
+        history = get_git_history(str(self.patterns_dir), str(self.patterns_dir.parent))
+        for commit in history.commits(since=datetime.now() - timedelta(days=7), limit=limit):
+            commit_hash = commit["hash"]
+            commit_message = commit["subject"]
 
-                        # Classify task type from commit message
-                        task_type = self._classify_commit_type(commit_message)
+            # Classify task type from commit message
+            task_type = self._classify_commit_type(commit_message)
 
-                        git_activities.append(
-                            {
-                                "timestamp": commit_date,
-                                "task_type": task_type,
-                                "description": commit_message,
-                                "quality_score": None,  # Git activities don't have scores initially
-                                "success": None,  # Success determined by status codes
-                                "skills_used": [],
-                                "duration": None,
-                                "auto_generated": False,
-                                "assessment_id": f"git-{commit_hash[:8]}",
-                                "source": "git_history",
-                                "commit_hash": commit_hash,
-                            }
-                        )
-
-        except subprocess.CalledProcessError:
-            # Git not available or error, return empty list
-            pass
+            git_activities.append(
+                {
+                    "timestamp": commit["date"],
+                    "task_type": task_type,
+                    "description": commit_message,
+                    "quality_score": None,  # Git activities don't have scores initially
+                    "success": None,  # Success determined by status codes
+                    "skills_used": [],
+                    "duration": None,
+                    "auto_generated": False,
+                    "assessment_id": f"git-{commit_hash[:8]}",
+                    "source": "git_history",
+                    "commit_hash": commit_hash,
+                }
+            )
 
         return git_activities
 
@@ -1113,52 +1174,37 @@ class DashboardDataCollector:
     def _load_json_file(self, filename: str, cache_key: str) -> Dict[str, Any]:
         """Load JSON file with unified data priority and caching."""
 
+        # Priority 1: Map from the shared unified_data.json snapshot
+        snapshot = self._unified_snapshots.get()
+        if snapshot is not None:
+            if snapshot.signature != getattr(self, "_unified_signature", None):
+                self._unified_data_updated()
+                self._unified_signature = snapshot.signature
+
+            unified_data = snapshot.raw
+            if filename == "patterns.json":
+                return {"patterns": unified_data.get("patterns", [])}
+            elif filename == "skill_metrics.json":
+                return unified_data.get("skill_metrics", {})
+            elif filename == "agent_metrics.json":
+                return unified_data.get("agent_metrics", {})
+            elif filename == "quality_history.json":
+                return unified_data.get("quality_history", {})
+            elif filename == "performance_records.json":
+                return unified_data.get("performance_records", {})
+            elif filename == "model_performance.json":
+                return unified_data.get("model_performance", {})
+            elif filename == "assessments.json":
+                # Create assessments from quality history for compatibility
+                return {"assessments": unified_data.get("quality_history", {}).get("quality_assessments", [])}
+            else:
+                return unified_data.get(filename.replace(".json", ""), {})
+
         # Check cache first
         if cache_key in self.cache:
             if time.time() - self.last_update.get(cache_key, 0) < self.cache_ttl:
                 return self.cache[cache_key]
 
-        # Priority 1: Try to load from unified_data.json
-        unified_file = self.patterns_dir / "unified_data.json"
-        if unified_file.exists():
-            try:
-                # Check if unified file was modified since last cache
-                unified_mtime = unified_file.stat().st_mtime
-                if hasattr(self, "_unified_mtime") and unified_mtime > self._unified_mtime:
-                    self._unified_data_updated()
-                self._unified_mtime = unified_mtime
-
-                with open(unified_file, "r") as f:
-                    unified_data = json.load(f)
-
-                    # Map filename to unified data structure
-                    if filename == "patterns.json":
-                        data = {"patterns": unified_data.get("patterns", [])}
-                    elif filename == "skill_metrics.json":
-                        data = unified_data.get("skill_metrics", {})
-                    elif filename == "agent_metrics.json":
-                        data = unified_data.get("agent_metrics", {})
-                    elif filename == "quality_history.json":
-                        data = unified_data.get("quality_history", {})
-                    elif filename == "performance_records.json":
-                        data = unified_data.get("performance_records", {})
-                    elif filename == "model_performance.json":
-                        data = unified_data.get("model_performance", {})
-                    elif filename == "assessments.json":
-                        # Create assessments from quality history for compatibility
-                        data = {"assessments": unified_data.get("quality_history", {}).get("quality_assessments", [])}
-                    else:
-                        data = unified_data.get(filename.replace(".json", ""), {})
-
-                    # Cache and return unified data
-                    self.cache[cache_key] = data
-                    self.last_update[cache_key] = time.time()
-                    return data
-
-            except Exception as e:
-                print(f"Warning: Could not load from unified_data.json: {e}")
-                # Fall through to scattered file loading
-
         # Priority 2: Fallback to scattered files
         filepath = self.patterns_dir / filename
         if filepath.exists():
@@ -1199,9 +1245,16 @@ class DashboardDataCollector:
 
     def get_overview_metrics(self) -> Dict[str, Any]:
         """Get high-level overview metrics from unified storage only."""
-        # Load unified data - this is the ONLY data source
-        unified_data = self._load_unified_data()
+        # Unified storage is the ONLY data source; its part is computed once per file version
+        summary = self._from_snapshot("overview", self._summarize_overview)
+
+        # Get model performance metrics
+        model_performance = self.get_model_performance_summary()
+
+        return dict(summary, model_performance=model_performance, last_updated=datetime.now().isoformat())
 
+    def _summarize_overview(self, unified_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Compute the overview metrics that depend only on unified storage."""
         # Extract data from unified storage structure
         quality_data = unified_data.get("quality", {})
         patterns_data = unified_data.get("patterns", {})
@@ -1278,17 +1331,12 @@ class DashboardDataCollector:
                 recent_patterns = patterns_data.get("patterns", [])[-20:] if patterns_data.get("patterns") else []
             learning_velocity = self._calculate_learning_velocity(recent_patterns)
 
-        # Get model performance metrics
-        model_performance = self.get_model_performance_summary()
-
         return {
             "total_patterns": total_patterns,
             "total_skills": total_skills,
             "total_agents": total_agents,
             "average_quality_score": round(avg_quality, 1),
             "learning_velocity": learning_velocity,
-            "model_performance": model_performance,
-            "last_updated": datetime.now().isoformat(),
         }
 
     def _calculate_learning_velocity(self, patterns: List[Dict]) -> str:
@@ -1380,8 +1428,8 @@ class DashboardDataCollector:
         if len(assessment_history) < 3:
             return "insufficient_data"
 
-        # Sort assessments by timestamp
-        assessment_history.sort(key=lambda x: x.get("timestamp", ""))
+        # Sort assessments by timestamp (a copy: the history is shared)
+        assessment_history = sorted(assessment_history, key=lambda x: x.get("timestamp", ""))
 
         # Split into halves
         mid = len(assessment_history) // 2
@@ -1413,46 +1461,62 @@ class DashboardDataCollector:
         else:
             return "declining [DOWN]"
 
-    def get_quality_trends(self, days: int = 30) -> Dict[str, Any]:
-        """Get quality score trends over time from unified storage only."""
+    def get_quality_trends(
+        self, days: int = 30, granularity: Optional[str] = None, max_points: int = DEFAULT_MAX_POINTS
+    ) -> Dict[str, Any]:
+        """
+        Get quality score trends over time from unified storage only.
+
+        Args:
+            days: Number of days to include
+            granularity: "raw", "hour", "day" or "week"; long ranges default to rollup buckets
+            max_points: Maximum number of trend points returned (LTTB-downsampled beyond that)
+
+        Returns:
+            Trend points, their average over all points, data sources and the granularity used
+        """
         trend_data = []
         cutoff_date = datetime.now() - timedelta(days=days)
+        granularity = self._resolve_granularity(days, granularity)
+        rollups = self._get_rollups() if granularity != "raw" else None
 
-        # Load unified data - this is the ONLY data source
-        unified_data = self._load_unified_data()
-        quality_data = unified_data.get("quality", {})
-
-        # Get assessments from unified storage
-        assessment_history = quality_data.get("assessments", {}).get("history", [])
-        current_assessment = quality_data.get("assessments", {}).get("current", {})
+        # Source 1 (bucketed): one point per bucket, model and task type from the rollups
+        for cell in rollups.query(ASSESSMENT_STREAM, granularity, since=cutoff_date) if rollups else []:
+            bucket = datetime.fromisoformat(cell["bucket"])
+            trend_data.append(
+                {
+                    "timestamp": cell["bucket"],
+                    "display_time": bucket.strftime("%m/%d %H:%M" if granularity == "hour" else "%m/%d"),
+                    "score": round(cell["avg"], 1),
+                    "count": cell["count"],
+                    "min": cell["min"],
+                    "max": cell["max"],
+                    "task_type": cell["task_type"],
+                    "model_used": cell["model"] or "Unknown",
+                    "data_source": "quality_rollups",
+                }
+            )
 
-        # Process assessment history from unified storage
-        for assessment in assessment_history:
-            timestamp = assessment.get("timestamp")
+        # Source 1: unified storage history, pre-parsed and time-ordered in the shared snapshot
+        snapshot = self._get_unified_snapshot() if rollups is None else None
+        for entry in snapshot.select(since=cutoff_date) if snapshot else []:
+            assessment = entry.raw
             quality_score = assessment.get("overall_score")
-            task_type = assessment.get("task_type", "unknown")
-            model_used = assessment.get("details", {}).get("model_used", "Unknown")
-
-            if timestamp and quality_score is not None:
-                try:
-                    assessment_date = datetime.fromisoformat(timestamp.replace("Z", "+00:00")).replace(tzinfo=None)
-                    if assessment_date >= cutoff_date:
-                        display_time = assessment_date.strftime("%m/%d %H:%M")
-                        trend_data.append(
-                            {
-                                "timestamp": timestamp,
-                                "display_time": display_time,
-                                "score": quality_score,
-                                "task_type": task_type,
-                                "model_used": model_used,
-                                "data_source": "quality_history",
-                            }
-                        )
-                except:
-                    continue
+            if quality_score is not None:
+                trend_data.append(
+                    {
+                        "timestamp": assessment["timestamp"],
+                        "display_time": entry.time.strftime("%m/%d %H:%M"),
+                        "score": quality_score,
+                        "task_type": assessment.get("task_type", "unknown"),
+                        "model_used": assessment.get("details", {}).get("model_used", "Unknown"),
+                        "data_source": "quality_history",
+                    }
+                )
 
-        # Source 2: Historical assessments (legacy data) - Only include if model info can be inferred
-        assessments = self._load_json_file("assessments.json", "assessments")
+        # Source 2: Historical assessments (legacy data) - Only include if model info can be inferred.
+        # With unified storage these are the same assessments, already covered by the rollups.
+        assessments = self._load_json_file("assessments.json", "assessments") if rollups is None else {}
         for assessment in assessments.get("assessments", []):
             timestamp = assessment.get("timestamp")
             quality_score = assessment.get("overall_score")
@@ -1546,15 +1610,28 @@ class DashboardDataCollector:
         unique_trend_data = []
         for item in trend_data:
             key = (item["timestamp"], item["score"], item["task_type"])
+            if item["data_source"] == "quality_rollups":
+                # Buckets of different models may share time, score and task type
+                key += (item["model_used"],)
             if key not in seen:
                 seen.add(key)
                 unique_trend_data.append(item)
 
+        # Buckets are weighted by the number of assessments they hold
+        weights = [d.get("count", 1) for d in unique_trend_data]
+        overall_average = (
+            sum(d["score"] * weight for d, weight in zip(unique_trend_data, weights)) / sum(weights)
+            if unique_trend_data
+            else 0
+        )
+
         return {
-            "trend_data": unique_trend_data,
-            "overall_average": round(statistics.mean([d["score"] for d in unique_trend_data]), 1) if unique_trend_data else 0,
+            "trend_data": downsample(unique_trend_data, max_points, lambda d: d["score"]),
+            "total_points": len(unique_trend_data),
+            "overall_average": round(overall_average, 1),
             "data_sources": list(set(d["data_source"] for d in unique_trend_data)),
             "days": days,
+            "granularity": granularity,
         }
 
     def get_skill_performance(self, top_k: int = 10) -> Dict[str, Any]:
@@ -1615,26 +1692,9 @@ class DashboardDataCollector:
 
     def get_agent_performance(self, top_k: int = 10) -> Dict[str, Any]:
         """Get top performing agents from unified storage only."""
-        # Load unified data - this is the ONLY data source
-        unified_data = self._load_unified_data()
-        agents_data = unified_data.get("agents", {})
-
+        # Agent statistics walk the whole history, so they are computed once per file version
+        agent_stats = self._from_snapshot("agent_stats", self._collect_agent_stats)
         agents_performance = []
-        agent_stats = {}
-
-        # Extract agent performance from assessment history
-        assessment_history = unified_data.get("quality", {}).get("assessments", {}).get("history", [])
-        for assessment in assessment_history:
-            for agent_name, details in assessment.get("execution_details", {}).items():
-                if agent_name not in agent_stats:
-                    agent_stats[agent_name] = {"success_count": 0, "total_count": 0, "total_duration": 0, "total_quality": 0}
-
-                agent_stats[agent_name]["total_count"] += 1
-                agent_stats[agent_name]["total_duration"] += details.get("duration_seconds", 0)
-                agent_stats[agent_name]["total_quality"] += details.get("quality_score", 0)
-
-                if details.get("success", False):
-                    agent_stats[agent_name]["success_count"] += 1
 
         # Convert to dashboard format
         for agent_name, stats in agent_stats.items():
@@ -1659,11 +1719,33 @@ class DashboardDataCollector:
 
         return {"top_agents": agents_performance[:top_k], "total_agents": len(agents_performance)}
 
+    def _collect_agent_stats(self, unified_data: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+        """Sum per-agent execution statistics over the assessment history."""
+        agent_stats = {}
+
+        # Extract agent performance from assessment history
+        assessment_history = unified_data.get("quality", {}).get("assessments", {}).get("history", [])
+        for assessment in assessment_history:
+            for agent_name, details in assessment.get("execution_details", {}).items():
+                if agent_name not in agent_stats:
+                    agent_stats[agent_name] = {"success_count": 0, "total_count": 0, "total_duration": 0, "total_quality": 0}
+
+                agent_stats[agent_name]["total_count"] += 1
+                agent_stats[agent_name]["total_duration"] += details.get("duration_seconds", 0)
+                agent_stats[agent_name]["total_quality"] += details.get("quality_score", 0)
+
+                if details.get("success", False):
+                    agent_stats[agent_name]["success_count"] += 1
+
+        return agent_stats
+
     def get_task_distribution(self) -> Dict[str, Any]:
         """Get distribution of task types from unified storage only."""
-        # Load unified data - this is the ONLY data source
-        unified_data = self._load_unified_data()
+        # Unified storage is the ONLY data source; computed once per file version
+        return self._from_snapshot("task_distribution", self._compute_task_distribution)
 
+    def _compute_task_distribution(self, unified_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Compute the task type distribution of the unified data."""
         # Extract data from unified storage
         patterns_data = unified_data.get("patterns", {})
         performance_data = unified_data.get("performance", {})
@@ -1745,93 +1827,181 @@ class DashboardDataCollector:
         # Default fallback
         return record.get("success", record.get("pass", record.get("overall_score", 0) >= 70))
 
-    def get_recent_activity():
-"""
-        
+    def get_recent_activity(
+        self,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        task_type: Optional[str] = None,
+        model: Optional[str] = None,
+        source: Optional[str] = None,
+        success: Optional[bool] = None,
+    ) -> Dict[str, Any]:
+        """
+
         Get recent task activity from UNIFIED STORAGE only.
         Shows all tasks regardless of score for complete history tracking.
-"""
-"""
+        """
         from collections import defaultdict
 
-        # Get recent assessments from unified storage (last 30 days)
-        assessments = self._get_unified_assessments(days=30)
-
-        if not assessments:
-            return {
-                "activities": [],
-                "summary": {
-                    "total_activities": 0,
-                    "date_range": "Last 30 days",
-                    "unique_models": [],
-                    "task_types": [],
-                    "data_sources": ["unified_storage"],
-                },
-            }
-
-        # Sort assessments by timestamp (newest first) BEFORE limiting
-        assessments.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
+        # Newest first across sources; only the requested page is converted
+        sources = self._requested_sources(source, ACTIVITY_SOURCES)
+        after = decode_cursor(cursor) if cursor else None
+        since = datetime.now() - timedelta(days=30)
+        streams = []
+        if "unified_storage" in sources:
+            streams.append(self._assessment_stream(self._assessment_activity, after, since, task_type, model))
+        if "git_history" in sources:
+            streams.append(self._git_activity_stream(after))
+        activities, next_cursor = paginate(
+            streams, limit, self._activity_filter(task_type, model, success)
+        )
 
-        # Convert to activity format
-        activities = []
         model_counts = defaultdict(int)
         task_type_counts = defaultdict(int)
-
-        for assessment in assessments[:limit]:  # Limit to requested number
-            timestamp = assessment.get("timestamp", "")
-            task_type = assessment.get("task_type", "unknown")
-            overall_score = assessment.get("overall_score", 0)
-            model_used = assessment.get("details", {}).get("model_used", "Claude Sonnet 4.5")
-            skills_used = assessment.get("skills_used", [])
-            duration = assessment.get("details", {}).get("duration_seconds", 0)
-            auto_generated = assessment.get("auto_generated", False)
-            assessment_id = assessment.get("assessment_id", "")
-
-            # Normalize
-            model_used = self._normalize_model_name(model_used)
-            timestamp = self._normalize_timestamp(timestamp)
-
-            # Determine success status
-            success = assessment.get("pass", False) if overall_score > 0 else None
-
-            # Create description
-            description = assessment.get("details", {}).get("task_description", task_type)
-            if not description or description == task_type:
-                description = task_type.replace("-", " ").title()
-
-            activity = {
-                "timestamp": timestamp,
-                "task_type": task_type,
-                "description": description,
-                "quality_score": overall_score,
-                "success": success,
-                "skills_used": skills_used,
-                "duration": duration,
-                "auto_generated": auto_generated,
-                "assessment_id": assessment_id,
-                "source": "unified_storage",
-                "model": model_used,
-            }
-
-            activities.append(activity)
-            model_counts[model_used] += 1
-            task_type_counts[task_type] += 1
-
-        # Activities are already sorted (assessments were sorted before loop)
+        for activity in activities:
+            model_counts[activity.get("model", "Unknown")] += 1
+            task_type_counts[activity["task_type"]] += 1
 
         return {
             "activities": activities,
+            "next_cursor": next_cursor,
             "summary": {
                 "total_activities": len(activities),
                 "date_range": "Last 30 days",
                 "unique_models": list(model_counts.keys()),
                 "task_types": list(task_type_counts.keys()),
-                "data_sources": ["unified_storage"],
+                "data_sources": sources,
                 "model_distribution": dict(model_counts),
                 "task_type_distribution": dict(task_type_counts),
             },
         }
 
+    def _assessment_activity(self, assessment: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a unified storage assessment to an activity feed entry."""
+        timestamp = assessment.get("timestamp", "")
+        task_type = assessment.get("task_type", "unknown")
+        overall_score = assessment.get("overall_score", 0)
+        model_used = assessment.get("details", {}).get("model_used", "Claude Sonnet 4.5")
+        skills_used = assessment.get("skills_used", [])
+        duration = assessment.get("details", {}).get("duration_seconds", 0)
+        auto_generated = assessment.get("auto_generated", False)
+        assessment_id = assessment.get("assessment_id", "")
+
+        # Normalize
+        model_used = self._normalize_model_name(model_used)
+        timestamp = self._normalize_timestamp(timestamp)
+
+        # Determine success status
+        success = assessment.get("pass", False) if overall_score > 0 else None
+
+        # Create description
+        description = assessment.get("details", {}).get("task_description", task_type)
+        if not description or description == task_type:
+            description = task_type.replace("-", " ").title()
+
+        return {
+            "timestamp": timestamp,
+            "task_type": task_type,
+            "description": description,
+            "quality_score": overall_score,
+            "success": success,
+            "skills_used": skills_used,
+            "duration": duration,
+            "auto_generated": auto_generated,
+            "assessment_id": assessment_id,
+            "source": "unified_storage",
+            "model": model_used,
+        }
+
+    def _requested_sources(self, source: Optional[str], available: Tuple[str, ...]) -> List[str]:
+        """
+        Parse a comma-separated source filter.
+
+        Args:
+            source: Requested sources (None for all)
+            available: Sources the endpoint can merge
+
+        Returns:
+            Requested sources in the order of available
+        """
+        if not source:
+            return list(available)
+        requested = {name.strip() for name in source.split(",") if name.strip()}
+        unknown = requested.difference(available)
+        if unknown:
+            raise ValueError(f"Unknown source(s): {', '.join(sorted(unknown))}; expected {', '.join(available)}")
+        return [name for name in available if name in requested]
+
+    def _assessment_stream(self, convert, after, since: datetime, task_type: Optional[str], model: Optional[str]):
+        """
+        Stream converted unified storage assessments newest first.
+
+        Args:
+            convert: Function converting an assessment to the endpoint's record format
+            after: Feed key the page starts after (None for the first page)
+            since: Oldest assessment time to include
+            task_type: Task type filter, answered from the task type index
+            model: Model filter, answered from the model index when there is no task type filter
+
+        Returns:
+            Iterator of (feed key, record) pairs; unscored assessments are skipped
+        """
+        snapshot = self._get_unified_snapshot()
+        if snapshot is None:
+            return iter(())
+        times, entries = snapshot.indexed(task_type, self._normalize_model_name(model) if model else None)
+        return (
+            (key, convert(entry.record))
+            for key, entry in newest_first("unified_storage", times, entries, lambda e: e.position, after, since)
+            if entry.record.get("overall_score") and entry.record["overall_score"] > 0
+        )
+
+    def _git_activity_stream(self, after):
+        """Stream recent git commits as activities, newest first, starting after a feed key."""
+        commits = []
+        for activity in self._get_git_activity_history():
+            when = parse_timestamp(activity["timestamp"])
+            if when is not None:
+                # Hash prefixes give commits a stable order within the same second
+                commits.append((when, int(activity["commit_hash"][:12], 16), activity))
+        commits.sort(key=lambda commit: commit[:2])
+        return (
+            (key, activity)
+            for key, (_, _, activity) in newest_first(
+                "git_history", [commit[0] for commit in commits], commits, lambda commit: commit[1], after
+            )
+        )
+
+    def _activity_filter(self, task_type: Optional[str], model: Optional[str], success: Optional[bool]):
+        """
+        Build the predicate applying the request filters to converted records.
+
+        Args:
+            task_type: Only records of this task type (case-insensitive)
+            model: Only records of this model (normalized before comparing)
+            success: Only successful (True) or failed (False) records
+
+        Returns:
+            Predicate on records, or None when nothing is filtered
+        """
+        if task_type is None and model is None and success is None:
+            return None
+        wanted_task = task_type.lower() if task_type else None
+        wanted_model = self._normalize_model_name(model) if model else None
+
+        def matches(record: Dict[str, Any]) -> bool:
+            if wanted_task is not None and (record.get("task_type") or "").lower() != wanted_task:
+                return False
+            if wanted_model is not None and record.get("model") != wanted_model:
+                return False
+            if success is not None:
+                passed = record.get("success", record.get("pass"))
+                if passed is None or bool(passed) != success:
+                    return False
+            return True
+
+        return matches
+
     def get_system_health(self) -> Dict[str, Any]:
         """Get system health metrics from all sources (quality_history, performance_records, patterns)."""
         all_records = []
@@ -2000,15 +2170,14 @@ class DashboardDataCollector:
 
         return summary
 
-    def detect_current_model():
-"""
+    def detect_current_model(self) -> str:
+        """
         
         Detect the current model being used by analyzing the system.
 
         Returns:
             String representing the current model
-"""
-"""
+        """
         import os
         import platform
 
@@ -2340,8 +2509,8 @@ class DashboardDataCollector:
             "contributions": [model_summary[model]["contribution_to_project"] for model in models],
         }
 
-    def get_temporal_performance(self, days: int = 30) -> Dict[str, Any]:
-        """Get temporal performance tracking for the active model."""
+    def get_temporal_performance(self, days: int = 30, max_points: int = DEFAULT_MAX_POINTS) -> Dict[str, Any]:
+        """Get temporal performance tracking for the active model (at most max_points points)."""
         model_performance = self._load_json_file("model_performance.json", "model_perf")
 
         # For now, focus on Claude as the "active model" (can be made configurable)
@@ -2402,7 +2571,8 @@ class DashboardDataCollector:
             performance_trend = "no_data"
 
         return {
-            "temporal_data": temporal_data,
+            "temporal_data": downsample(temporal_data, max_points, lambda d: d["score"]),
+            "total_points": len(temporal_data),
             "average_performance": round(avg_performance, 1),
             "total_contribution": round(total_contribution, 1),
             "trend": performance_trend,
@@ -2410,15 +2580,22 @@ class DashboardDataCollector:
             "days": days,
         }
 
-    def get_quality_timeline_with_model_events():
-"""
-        
+    def get_quality_timeline_with_model_events(
+        self, days: int = 30, granularity: Optional[str] = None, max_points: int = DEFAULT_MAX_POINTS
+    ):
+        """
+
         Get quality timeline using UNIFIED STORAGE data only.
         Shows actual quality scores from real tasks performed during the project.
-"""
-"""
+        """
         from collections import defaultdict
 
+        # Long ranges are answered from the rollups in time proportional to the number of buckets
+        granularity = self._resolve_granularity(days, granularity)
+        rollups = self._get_rollups() if granularity != "raw" else None
+        if rollups is not None:
+            return self._quality_timeline_from_rollups(rollups, days, granularity, max_points)
+
         # Use unified storage as PRIMARY data source
         assessments = self._get_unified_assessments(days=days)
 
@@ -2471,6 +2648,8 @@ class DashboardDataCollector:
         # Calculate summary with consistent model ordering
         unique_models = sorted(model_scores.keys(), key=lambda m: self._get_model_sort_key(m))
 
+        timeline_data = downsample(timeline_data, max_points, lambda d: d["overall_score"], lambda d: d["model_used"])
+
         return {
             "timeline_data": timeline_data,
             "summary": {
@@ -2490,8 +2669,256 @@ class DashboardDataCollector:
             },
         }
 
+    def _quality_timeline_from_rollups(
+        self, rollups: QualityRollups, days: int, granularity: str, max_points: int = DEFAULT_MAX_POINTS
+    ) -> Dict[str, Any]:
+        """
+        Build the quality timeline from rollup buckets.
+
+        The timeline chart averages scores per date and model, so one point is
+        returned per bucket and model with the exact average of its assessments.
+
+        Args:
+            rollups: Quality rollups of the unified history
+            days: Number of days to include
+            granularity: Rollup granularity
+            max_points: Maximum number of points returned (LTTB-downsampled per model beyond that)
+
+        Returns:
+            Timeline data and summary in the same shape as the per-assessment timeline
+        """
+        cells = [
+            dict(cell, model=self._normalize_model_name(cell["model"] or "Claude Sonnet 4.5"))
+            for cell in rollups.query(ASSESSMENT_STREAM, granularity, since=datetime.now() - timedelta(days=days))
+        ]
+        points = rollups.totals(cells, "bucket", "model")
+        by_model = rollups.totals(cells, "model")
+
+        timeline_data = [
+            {
+                "timestamp": bucket,
+                "date": bucket.split("T")[0],
+                "overall_score": total["avg"],
+                "count": total["count"],
+                "task_type": "all",
+                "model_used": model,
+                "data_source": "quality_rollups",
+            }
+            for (bucket, model), total in sorted(points.items())
+        ]
+        timeline_data = downsample(timeline_data, max_points, lambda d: d["overall_score"], lambda d: d["model_used"])
+
+        return {
+            "timeline_data": timeline_data,
+            "summary": {
+                "total_assessments": sum(total["count"] for total in by_model.values()),
+                "date_range": f"Last {days} days",
+                "unique_models": sorted(by_model, key=lambda m: self._get_model_sort_key(m)),
+                "data_sources": ["unified_storage"],
+                "granularity": granularity,
+                "model_performance": {
+                    model: {
+                        "count": total["count"],
+                        "avg_score": total["avg"],
+                        "max_score": total["max"],
+                        "min_score": total["min"],
+                    }
+                    for model, total in by_model.items()
+                },
+            },
+        }
+
+
+# Built on first use, so importing the module runs no discovery (run_dashboard replaces it)
+data_collector = LazyObject(DashboardDataCollector)
+
+
+def get_current_model_info(collector: DashboardDataCollector) -> Dict[str, Any]:
+    """
+    Get the currently detected model and how confidently it was detected.
+
+    Args:
+        collector: Data collector of the dashboard
+
+    Returns:
+        Current model, detection method, confidence and timestamp
+    """
+    current_model = collector.detect_current_model()
+
+    # Determine confidence based on detection source
+    session_file = collector.patterns_dir / "current_session.json"
+    if session_file.exists():
+        try:
+            with open(session_file, "r", encoding="utf-8") as f:
+                session_data = json.load(f)
+                stored_model = session_data.get("current_model", "")
+                # High confidence if we have a session file with non-default model
+                confidence = "high" if stored_model and stored_model != "GLM-4.6" else "medium"
+                detection_method = "session_file"
+        except:
+            confidence = "medium"
+            detection_method = "fallback_detection"
+    else:
+        confidence = "low"
+        detection_method = "no_session_data"
+
+    return {
+        "current_model": current_model,
+        "detection_method": detection_method,
+        "timestamp": datetime.now().isoformat(),
+        "confidence": confidence,
+    }
+
+
+def get_models_info(collector: DashboardDataCollector) -> Dict[str, Any]:
+    """
+    Get the model performance summary together with the currently detected model.
+
+    Args:
+        collector: Data collector of the dashboard
+
+    Returns:
+        Model performance summary with current model and detection timestamp
+    """
+    model_summary = collector.get_model_performance_summary()
+    current_model = collector.detect_current_model()
+    return {**model_summary, "current_model": current_model, "detection_timestamp": datetime.now().isoformat()}
+
+
+def dashboard_panels(collector: DashboardDataCollector) -> Dict[str, Any]:
+    """
+    Get the panels of the dashboard overview.
+
+    Panels are computed with the same arguments the dashboard requests them
+    with on load, so streamed and bundled data can be applied to what it shows.
+
+    Args:
+        collector: Data collector computing the panels
+
+    Returns:
+        Mapping of panel name to a function computing its data
+    """
+    return {
+        "overview": collector.get_overview_metrics,
+        "quality-trends": lambda: collector.get_quality_trends(30),
+        "skills": collector.get_skill_performance,
+        "agents": collector.get_agent_performance,
+        "task-distribution": collector.get_task_distribution,
+        "recent-activity": lambda: collector.get_recent_activity(20),
+        "system-health": collector.get_system_health,
+        "quality-timeline": lambda: collector.get_quality_timeline_with_model_events(30),
+        "debugging-performance": lambda: collector.get_debugging_performance_data(30),
+        "recent-performance-records": collector.get_recent_performance_records,
+        "current-model": lambda: get_current_model_info(collector),
+    }
+
+
+def create_stream_hub(collector: DashboardDataCollector) -> PanelStreamHub:
+    """
+    Create the live update hub for the panels of the dashboard overview.
+
+    Args:
+        collector: Data collector whose pattern directory and repository HEAD are watched
+
+    Returns:
+        Hub streaming the overview panels
+    """
+    repo_dir = collector.patterns_dir.parent
+    watcher = DirectoryWatcher(collector.patterns_dir, extra=lambda: {"git HEAD": repo_head(repo_dir)})
+    return PanelStreamHub(watcher, dashboard_panels(collector))
+
+
+stream_hub = LazyObject(lambda: create_stream_hub(data_collector))
+
+
+def bundle_panels(collector: DashboardDataCollector) -> Dict[str, Any]:
+    """
+    Get the panels /api/bundle serves: the overview panels and the model summary.
+
+    Args:
+        collector: Data collector computing the panels
+
+    Returns:
+        Mapping of panel name to a function computing its data
+    """
+    return dict(dashboard_panels(collector), models=lambda: get_models_info(collector))
+
+
+def dashboard_generation(collector: DashboardDataCollector, watcher: DirectoryWatcher) -> str:
+    """
+    Identify the current version of the data the API responses are computed from.
+
+    Args:
+        collector: Data collector whose reports and repository are included
+        watcher: Watcher of the pattern directory
+
+    Returns:
+        Data generation (see dashboard_http.data_generation)
+    """
+    # Git activity comes from the repository, so a new commit is new data
+    head = repo_head(collector.patterns_dir.parent)
+    paths = [collector.patterns_dir / "reports", Path(".claude/reports")]
+    # The unified storage may live outside the watched pattern directory
+    storage = collector.unified_storage
+    if storage is not None:
+        paths.append(storage.storage_file)
+    return data_generation(watcher, paths, (head,))
+
+
+# API routes computed only from what dashboard_generation covers: the pattern directory,
+# the report directories, the unified storage file and the git HEAD. Other routes read
+# databases or live state it does not see, so they are never answered with 304.
+CONDITIONAL_GET_ENDPOINTS = frozenset(
+    {
+        "api_bundle",
+        "api_overview",
+        "api_quality_trends",
+        "api_skills",
+        "api_agents",
+        "api_task_distribution",
+        "api_recent_activity",
+        "api_system_health",
+        "api_model_quality_scores",
+        "api_current_model",
+        "api_validation_results",
+        "api_models",
+        "api_temporal_performance",
+        "api_quality_timeline",
+        "api_debugging_performance",
+        "api_recent_performance_records",
+    }
+)
+
+
+# Snapshot file the builder process shares with the workers (.bin is not watched, so writing it changes no generation)
+SHARED_SNAPSHOT_FILE = "dashboard_snapshot.bin"
+
+# Reader of the builder process's snapshot while serving with several workers (None otherwise)
+shared_snapshots: Optional[SharedSnapshotReader] = None
+
+
+def build_shared_sections(collector: DashboardDataCollector) -> Dict[str, bytes]:
+    """
+    Compute the sections of the snapshot file shared with the workers.
+
+    Panels are rendered to the JSON their routes return. The unified data
+    snapshot is pickled together with the values derived from it while the
+    panels were computed, so workers neither parse JSON nor redo aggregations.
+
+    Args:
+        collector: Data collector of the builder process
 
-data_collector = DashboardDataCollector()
+    Returns:
+        Mapping of section name to its bytes (failed panels are left out)
+    """
+    bundle = collector.get_panel_bundle(bundle_panels(collector))
+    sections = {
+        f"panel:{name}": app.json.response(data).get_data() for name, data in bundle.items() if data is not None
+    }
+    snapshot = collector._get_unified_snapshot()
+    if snapshot is not None:
+        sections[UNIFIED_SECTION] = pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL)
+    return sections
 
 
 # HTML Template for Dashboard
@@ -4399,9 +4826,15 @@ DASHBOARD_HTML = """
             }).format(amount);
         }
 
+        // Point budget for a chart: about one point per pixel column
+        function chartMaxPoints(canvasId) {
+            const canvas = document.getElementById(canvasId);
+            return Math.max(100, Math.round((canvas && canvas.clientWidth) || 1000));
+        }
+
         async function fetchQualityData(days = 30) {
             try {
-                const response = await fetch(`/api/quality-trends?days=${days}`);
+                const response = await fetch(`/api/quality-trends?days=${days}&max_points=${chartMaxPoints('qualityChart')}`);
                 const quality = await response.json();
                 updateQualityChart(quality);
             } catch (error) {
@@ -4421,7 +4854,7 @@ DASHBOARD_HTML = """
 
         async function fetchTemporalPerformanceData(days = 30) {
             try {
-                const response = await fetch(`/api/temporal-performance?days=${days}`);
+                const response = await fetch(`/api/temporal-performance?days=${days}&max_points=${chartMaxPoints('temporalPerformanceChart')}`);
                 const temporalData = await response.json();
                 updateTemporalPerformanceChart(temporalData);
             } catch (error) {
@@ -4747,28 +5180,30 @@ DASHBOARD_HTML = """
                     }
                 };
 
-                // Fetch all API data with individual error handling
+                // Fetch all overview panels in one request, computed from one data snapshot
                 console.log('fetchDashboardData: Starting API calls...');
-                const [overview, quality, skills, agents, tasks, activity, health, timeline, debuggingPerf, performanceRecords, currentModel, validationResults] = await Promise.all([
-                    safeFetch('/api/overview', {
-                        total_patterns: 0,
-                        total_skills: 0,
-                        total_agents: 0,
-                        average_quality_score: 0,
-                        learning_velocity: 'insufficient_data'
-                    }),
-                    safeFetch('/api/quality-trends', { trend_data: [], days: 30 }),
-                    safeFetch('/api/skills', []),
-                    safeFetch('/api/agents', []),
-                    safeFetch('/api/task-distribution', { task_types: [], counts: [] }),
-                    safeFetch('/api/recent-activity', { activities: [] }),
-                    safeFetch('/api/system-health', { status: 'unknown', checks: [] }),
-                    safeFetch('/api/quality-timeline?days=30', { timeline_data: [] }),
-                    safeFetch('/api/debugging-performance?days=30', { debugging_data: [] }),
-                    safeFetch('/api/recent-performance-records', []),
-                    safeFetch('/api/current-model', { model_name: 'Unknown', model_type: 'unknown' }),
+                const [bundle, validationResults] = await Promise.all([
+                    safeFetch('/api/bundle', {}),
                     safeFetch('/api/validation-results', { results: [] })
                 ]);
+                const panel = (name, fallbackData) => (bundle && bundle[name]) || fallbackData;
+                const overview = panel('overview', {
+                    total_patterns: 0,
+                    total_skills: 0,
+                    total_agents: 0,
+                    average_quality_score: 0,
+                    learning_velocity: 'insufficient_data'
+                });
+                const quality = panel('quality-trends', { trend_data: [], days: 30 });
+                const skills = panel('skills', []);
+                const agents = panel('agents', []);
+                const tasks = panel('task-distribution', { task_types: [], counts: [] });
+                const activity = panel('recent-activity', { activities: [] });
+                const health = panel('system-health', { status: 'unknown', checks: [] });
+                const timeline = panel('quality-timeline', { timeline_data: [] });
+                const debuggingPerf = panel('debugging-performance', { debugging_data: [] });
+                const performanceRecords = panel('recent-performance-records', []);
+                const currentModel = panel('current-model', { model_name: 'Unknown', model_type: 'unknown' });
 
                 console.log('fetchDashboardData: API responses received');
                 console.log('tasks data:', tasks);
@@ -4946,7 +5381,7 @@ DASHBOARD_HTML = """
                         data.days >= 3650 ? 'All Time' : `${data.days} Days`;
 
             const latestPoint = data.trend_data[data.trend_data.length - 1];
-            debugDiv.innerHTML = `[CHECK] Quality data (${periodText}): ${data.trend_data.length} assessments | Overall avg: ${data.overall_average} | Latest: ${latestPoint.score} (${latestPoint.display_time})`;
+            debugDiv.innerHTML = `[CHECK] Quality data (${periodText}): ${data.total_points || data.trend_data.length} assessments | Overall avg: ${data.overall_average} | Latest: ${latestPoint.score} (${latestPoint.display_time})`;
 
             const ctx = document.getElementById('qualityChart').getContext('2d');
 
@@ -6124,7 +6559,7 @@ DASHBOARD_HTML = """
             const days = parseInt(e.target.value);
             try {
                 const [timelineData] = await Promise.all([
-                    fetch(`/api/quality-timeline?days=${days}`).then(r => r.json())
+                    fetch(`/api/quality-timeline?days=${days}&max_points=${chartMaxPoints('timelineChart')}`).then(r => r.json())
                 ]);
                 updateTimelineChart(timelineData);
             } catch (error) {
@@ -6137,7 +6572,7 @@ DASHBOARD_HTML = """
             const days = parseInt(e.target.value);
             try {
                 const [debugData] = await Promise.all([
-                    fetch(`/api/debugging-performance?days=${days}`).then(r => r.json())
+                    fetch(`/api/debugging-performance?days=${days}&max_points=${chartMaxPoints('debuggingPerformanceChart')}`).then(r => r.json())
                 ]);
                 updateDebuggingPerformanceChart(debugData);
             } catch (error) {
@@ -6145,16 +6580,268 @@ DASHBOARD_HTML = """
             }
         });
 
-        // Auto-refresh every 30 seconds
-        setInterval(fetchDashboardData, 30000);
+        // Live updates: the server sends a snapshot of every panel, then JSON-patch
+        // deltas only when the pattern data changes
+        const streamPanels = {};
+
+        function applyPatch(doc, ops) {
+            for (const op of ops) {
+                if (op.path === '') {
+                    doc = op.value;
+                    continue;
+                }
+                const tokens = op.path.split('/').slice(1).map(t => t.replace(/~1/g, '/').replace(/~0/g, '~'));
+                const last = tokens.pop();
+                let parent = doc;
+                for (const token of tokens) {
+                    parent = Array.isArray(parent) ? parent[parseInt(token)] : parent[token];
+                }
+                if (Array.isArray(parent)) {
+                    if (op.op === 'add' && last === '-') {
+                        parent.push(op.value);
+                    } else if (op.op === 'add') {
+                        parent.splice(parseInt(last), 0, op.value);
+                    } else if (op.op === 'remove') {
+                        parent.splice(parseInt(last), 1);
+                    } else {
+                        parent[parseInt(last)] = op.value;
+                    }
+                } else if (op.op === 'remove') {
+                    delete parent[last];
+                } else {
+                    parent[last] = op.value;
+                }
+            }
+            return doc;
+        }
+
+        // Streamed panels use the default periods; other selections are refetched
+        function selectedDays(selectId) {
+            const value = document.getElementById(selectId).value;
+            return value === 'all' ? 3650 : parseInt(value);
+        }
+
+        function refetchPanel(url, render) {
+            fetch(url).then(r => r.json()).then(render)
+                .catch(error => console.error('Error refreshing ' + url + ':', error));
+        }
+
+        const streamRenderers = {
+            'overview': data => updateOverviewMetrics(data),
+            'quality-trends': data => {
+                const days = selectedDays('quality-period');
+                if (days === 30) {
+                    updateQualityChart(data);
+                } else {
+                    fetchQualityData(days);
+                }
+            },
+            'skills': data => updateSkillsTable(data),
+            'agents': data => updateAgentsTable(data),
+            'task-distribution': data => updateTaskChart(data),
+            'recent-activity': data => updateActivityTable(data.activities || []),
+            'system-health': data => updateSystemHealth(data),
+            'quality-timeline': data => {
+                const days = selectedDays('timeline-period');
+                if (days === 30) {
+                    updateTimelineChart(data);
+                } else {
+                    refetchPanel(`/api/quality-timeline?days=${days}&max_points=${chartMaxPoints('timelineChart')}`, updateTimelineChart);
+                }
+            },
+            'debugging-performance': data => {
+                const days = selectedDays('debugging-timeframe');
+                if (days === 30) {
+                    updateDebuggingPerformanceChart(data);
+                } else {
+                    refetchPanel(
+                        `/api/debugging-performance?days=${days}&max_points=${chartMaxPoints('debuggingPerformanceChart')}`,
+                        updateDebuggingPerformanceChart
+                    );
+                }
+            },
+            'recent-performance-records': data => updatePerformanceRecordsTable(data),
+            'current-model': data => updateCurrentModel(data)
+        };
+
+        function renderStreamPanel(panel) {
+            const data = streamPanels[panel];
+            const render = streamRenderers[panel];
+            if (!data || !render) {
+                return;
+            }
+            try {
+                render(data);
+                document.getElementById('last-update').textContent = new Date().toLocaleTimeString();
+            } catch (e) {
+                console.error('Error rendering streamed panel ' + panel + ':', e);
+            }
+        }
+
+        function connectDashboardStream() {
+            if (!window.EventSource) {
+                // No server-sent events: auto-refresh every 30 seconds
+                setInterval(fetchDashboardData, 30000);
+                return;
+            }
+            // EventSource reconnects by itself and gets fresh snapshots on reconnect
+            const source = new EventSource('/api/stream');
+            source.addEventListener('snapshot', function(e) {
+                const message = JSON.parse(e.data);
+                streamPanels[message.panel] = message.data;
+                renderStreamPanel(message.panel);
+            });
+            source.addEventListener('delta', function(e) {
+                const message = JSON.parse(e.data);
+                streamPanels[message.panel] = applyPatch(streamPanels[message.panel], message.ops);
+                renderStreamPanel(message.panel);
+            });
+        }
+
+        connectDashboardStream();
     </script>
 </body>
 </html>
+"""
+
+
 # API Routes
+@app.before_request
+def check_not_modified():
+    """Answer conditional GETs of unchanged API data with 304 before computing anything."""
+    g.etag = None
+    if request.method != "GET" or request.endpoint not in CONDITIONAL_GET_ENDPOINTS:
+        return None
+
+    generation = dashboard_generation(data_collector, stream_hub.watcher)
+    g.etag = make_etag(generation, request.full_path)
+    if etag_matches(request.headers.get("If-None-Match"), g.etag):
+        response = Response(status=304)
+        response.headers["ETag"] = g.etag
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+    return shared_panel_response(generation)
+
+
+@app.after_request
+def tag_and_compress(response):
+    """Tag JSON responses with their ETag and gzip large ones."""
+    if response.status_code != 200 or response.mimetype != "application/json" or response.direct_passthrough:
+        return response
+
+    etag = getattr(g, "etag", None)
+    if etag:
+        response.headers["ETag"] = etag
+        # Browsers revalidate on every fetch and get 304s while the data is unchanged
+        response.headers["Cache-Control"] = "no-cache"
+
+    response.headers.add("Vary", "Accept-Encoding")
+    if "Content-Encoding" not in response.headers and accepts_gzip(request.headers.get("Accept-Encoding")):
+        compressed = compress(response.get_data())
+        if compressed is not None:
+            response.set_data(compressed)
+            response.headers["Content-Encoding"] = "gzip"
+    return response
+
+
+# Routes returning an overview panel exactly as it is bundled when requested without parameters
+SHARED_PANEL_ROUTES = {
+    "/api/overview": "overview",
+    "/api/quality-trends": "quality-trends",
+    "/api/skills": "skills",
+    "/api/agents": "agents",
+    "/api/task-distribution": "task-distribution",
+    "/api/recent-activity": "recent-activity",
+    "/api/system-health": "system-health",
+    "/api/recent-performance-records": "recent-performance-records",
+    "/api/current-model": "current-model",
+    "/api/models": "models",
+}
+
+
+def shared_panel_response(generation: str) -> Optional[Response]:
+    """
+    Answer a bundle or panel request from the shared snapshot without computing anything.
+
+    Args:
+        generation: Current data generation; snapshots built for older data are not used
+
+    Returns:
+        The response, or None if the request has to be computed by its route
+    """
+    if shared_snapshots is None:
+        return None
+    if request.path == "/api/bundle":
+        known = list(bundle_panels(data_collector))
+        requested = request.args.get("panels")
+        names = [name.strip() for name in requested.split(",") if name.strip()] if requested else known
+        if any(name not in known for name in names):
+            return None
+    elif request.path in SHARED_PANEL_ROUTES and not request.query_string:
+        names = None
+    else:
+        return None
+
+    shared = shared_snapshots.get()
+    if shared is None or shared.generation != generation:
+        return None
+    if names is None:
+        body = shared.get(f"panel:{SHARED_PANEL_ROUTES[request.path]}")
+        if body is None:
+            return None
+    else:
+        # Rendered panels are spliced in as they are; failed ones are null, as in the computed bundle
+        members = [
+            json.dumps(name).encode("utf-8") + b":" + (shared.get(f"panel:{name}") or b"null").strip() for name in names
+        ]
+        body = b"{" + b",".join(members) + b"}\n"
+    return Response(body, mimetype="application/json")
+
+
+_dashboard_template = None
+
+
+def dashboard_template():
+    """Get the compiled dashboard page (render_template_string would recompile all of it on every request)."""
+    global _dashboard_template
+    if _dashboard_template is None:
+        _dashboard_template = app.jinja_env.from_string(DASHBOARD_HTML)
+    return _dashboard_template
+
+
 @app.route("/")
 def index():
     """Render dashboard homepage."""
-    return render_template_string(DASHBOARD_HTML)
+    return dashboard_template().render()
+
+
+@app.route("/api/stream")
+def api_stream():
+    """Stream panel snapshots, then deltas whenever the pattern data changes (server-sent events)."""
+    return Response(
+        stream_hub.stream(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def requested_max_points() -> int:
+    """Get the ?max_points= chart point budget of the request (at least MIN_MAX_POINTS)."""
+    return max(MIN_MAX_POINTS, request.args.get("max_points", DEFAULT_MAX_POINTS, type=int))
+
+
+@app.route("/api/bundle")
+def api_bundle():
+    """Get all overview panels (or the comma-separated ?panels=) computed from one data snapshot."""
+    panels = bundle_panels(data_collector)
+    requested = request.args.get("panels")
+    if requested:
+        names = [name.strip() for name in requested.split(",") if name.strip()]
+        unknown = [name for name in names if name not in panels]
+        if unknown:
+            return jsonify({"error": f"Unknown panels: {', '.join(unknown)}"}), 400
+        panels = {name: panels[name] for name in names}
+    return jsonify(data_collector.get_panel_bundle(panels))
 
 
 @app.route("/api/overview")
@@ -6167,7 +6854,8 @@ def api_overview():
 def api_quality_trends():
     """Get quality trends."""
     days = request.args.get("days", 30, type=int)
-    return jsonify(data_collector.get_quality_trends(days))
+    granularity = request.args.get("granularity")
+    return jsonify(data_collector.get_quality_trends(days, granularity, requested_max_points()))
 
 
 @app.route("/api/skills")
@@ -6190,11 +6878,26 @@ def api_task_distribution():
     return jsonify(data_collector.get_task_distribution())
 
 
+def feed_query() -> Dict[str, Any]:
+    """Get the cursor and filters of a paginated feed request (?cursor=&task_type=&model=&source=&success=)."""
+    success = request.args.get("success")
+    return {
+        "cursor": request.args.get("cursor") or None,
+        "task_type": request.args.get("task_type") or None,
+        "model": request.args.get("model") or None,
+        "source": request.args.get("source") or None,
+        "success": None if success in (None, "") else success.lower() in ("1", "true", "yes"),
+    }
+
+
 @app.route("/api/recent-activity")
 def api_recent_activity():
-    """Get recent activity."""
-    limit = request.args.get("limit", 20, type=int)
-    return jsonify(data_collector.get_recent_activity(limit))
+    """Get recent activity, newest first; follow next_cursor for older pages."""
+    limit = max(1, request.args.get("limit", 20, type=int))
+    try:
+        return jsonify(data_collector.get_recent_activity(limit, **feed_query()))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
 
 @app.route("/api/system-health")
@@ -6212,33 +6915,7 @@ def api_model_quality_scores():
 @app.route("/api/current-model")
 def api_current_model():
     """Get the currently detected model."""
-    current_model = data_collector.detect_current_model()
-
-    # Determine confidence based on detection source
-    session_file = data_collector.patterns_dir / "current_session.json"
-    if session_file.exists():
-        try:
-            with open(session_file, "r", encoding="utf-8") as f:
-                session_data = json.load(f)
-                stored_model = session_data.get("current_model", "")
-                # High confidence if we have a session file with non-default model
-                confidence = "high" if stored_model and stored_model != "GLM-4.6" else "medium"
-                detection_method = "session_file"
-        except:
-            confidence = "medium"
-            detection_method = "fallback_detection"
-    else:
-        confidence = "low"
-        detection_method = "no_session_data"
-
-    return jsonify(
-        {
-            "current_model": current_model,
-            "detection_method": detection_method,
-            "timestamp": datetime.now().isoformat(),
-            "confidence": confidence,
-        }
-    )
+    return jsonify(get_current_model_info(data_collector))
 
 
 @app.route("/api/validation-results")
@@ -6350,27 +7027,22 @@ def api_validation_results():
 @app.route("/api/models")
 def api_models():
     """Get model performance data with current model detection."""
-    # Get existing model performance summary
-    model_summary = data_collector.get_model_performance_summary()
-
-    # Add current model detection
-    current_model = data_collector.detect_current_model()
-
-    return jsonify({**model_summary, "current_model": current_model, "detection_timestamp": datetime.now().isoformat()})
+    return jsonify(get_models_info(data_collector))
 
 
 @app.route("/api/temporal-performance")
 def api_temporal_performance():
     """Get temporal performance tracking."""
     days = request.args.get("days", 30, type=int)
-    return jsonify(data_collector.get_temporal_performance(days))
+    return jsonify(data_collector.get_temporal_performance(days, requested_max_points()))
 
 
 @app.route("/api/quality-timeline")
 def api_quality_timeline():
     """Get quality timeline with model performance events."""
     days = request.args.get("days", 1, type=int)  # Default to 1 day (24 hours)
-    return jsonify(data_collector.get_quality_timeline_with_model_events(days))
+    granularity = request.args.get("granularity")
+    return jsonify(data_collector.get_quality_timeline_with_model_events(days, granularity, requested_max_points()))
 
 
 @app.route("/api/debugging-performance")
@@ -6380,7 +7052,7 @@ def api_debugging_performance():
 
     try:
         # Use the unified debugging performance method
-        debugging_data = data_collector.get_debugging_performance_data(days)
+        debugging_data = data_collector.get_debugging_performance_data(days, requested_max_points())
         return jsonify(debugging_data)
 
     except Exception as e:
@@ -6428,12 +7100,15 @@ def api_consistency_dashboard():
 
 @app.route("/api/recent-performance-records")
 def api_recent_performance_records():
-    """Get recent performance records from UNIFIED STORAGE for consistent data."""
+    """Get recent performance records from UNIFIED STORAGE, newest first; follow next_cursor for older pages."""
+    limit = max(1, request.args.get("limit", 50, type=int))
     try:
         # Use the unified performance records method
-        performance_data = data_collector.get_recent_performance_records()
+        performance_data = data_collector.get_recent_performance_records(limit, **feed_query())
         return jsonify(performance_data)
 
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         print(f"Error getting performance records: {e}", file=sys.stderr)
         return jsonify(
@@ -6465,8 +7140,8 @@ def get_timeframe_label(days):
         return f"Last {days} Days"
 
 
-def find_available_port():
-"""
+def find_available_port(start_port: int = 5000, max_attempts: int = 10) -> int:
+    """
         
         Find an available port starting from start_port.
 
@@ -6476,8 +7151,7 @@ def find_available_port():
 
     Returns:
         Available port number
-"""
-"""
+    """
     import socket
 
     for port in range(start_port, start_port + max_attempts):
@@ -6503,8 +7177,8 @@ def find_available_port():
     raise RuntimeError(f"Could not find an available port after {max_attempts + 5} attempts")
 
 
-def validate_server_startup():
-"""
+def validate_server_startup(url: str, timeout: float = 10) -> bool:
+    """
         
         Validate that the server has started successfully and is responding.
 
@@ -6514,8 +7188,7 @@ def validate_server_startup():
 
     Returns:
         True if server is responding, False otherwise
-"""
-"""
+    """
     import requests
     import time
 
@@ -6726,15 +7399,14 @@ def api_section_data(section_name):
         return jsonify({"error": str(e)}), 500
 
 
-def check_existing_dashboard():
-"""
+def check_existing_dashboard(host: str = "127.0.0.1", port_start: int = 5000, port_end: int = 5010):
+    """
         
         Check if dashboard is already running on any port in the range.
 
     Returns:
         tuple: (is_running, found_port, found_url)
-"""
-"""
+    """
     import requests
 
     for port in range(port_start, port_end + 1):
@@ -6748,11 +7420,46 @@ def check_existing_dashboard():
     return False, None, None
 
 
+def serve_workers(host: str, port: int, workers: int, server: str = "auto") -> None:
+    """
+    Serve the dashboard from several worker processes sharing one data snapshot.
+
+    This process builds the first snapshot, forks the builder process that
+    keeps it current, and then supervises the workers, which memory-map the
+    snapshot file instead of reading the pattern data themselves.
+
+    Args:
+        host: Host to bind to
+        port: Port to bind to
+        workers: Number of worker processes
+        server: WSGI server (see dashboard_server.run_workers)
+    """
+    import multiprocessing
+
+    global shared_snapshots
+    if fork_available():
+        snapshot_file = data_collector.patterns_dir / SHARED_SNAPSHOT_FILE
+        builder = SnapshotBuilder(
+            snapshot_file,
+            lambda: build_shared_sections(data_collector),
+            lambda: dashboard_generation(data_collector, stream_hub.watcher),
+        )
+        builder.build_once()
+        print(f"Shared snapshot built in {builder.last_build_seconds:.2f}s: {snapshot_file}")
+        # Forked before the switch below, so the builder keeps reading the pattern data itself
+        multiprocessing.get_context("fork").Process(
+            target=builder.run, name="dashboard-snapshot-builder", daemon=True
+        ).start()
+        shared_snapshots = SharedSnapshotReader(snapshot_file)
+        data_collector.share_snapshots(shared_snapshots)
+    run_workers(app, host, port, workers, server)
+
+
 def run_dashboard(
-    """Run Dashboard."""
-    host: str = "127.0.0.1", port: int = 5000, patterns_dir: str = ".claude-patterns", auto_open_browser: bool = True
+    host: str = "127.0.0.1", port: int = 5000, patterns_dir: str = ".claude-patterns", auto_open_browser: bool = True,
+    workers: int = 1, server: str = "auto",
 ):
-"""
+    """
     Run the dashboard server with simple browser opening.
 
     Args:
@@ -6760,15 +7467,17 @@ def run_dashboard(
         port: Preferred port to bind to (will find alternative if occupied)
         patterns_dir: Directory containing pattern data
         auto_open_browser: Whether to automatically open browser
-"""
-"""
+        workers: Worker processes; more than one serves through a multi-process WSGI server
+        server: WSGI server for several workers: "gunicorn", "builtin" or "auto"
+    """
     import sys
     import webbrowser
     import threading
     import time
 
-    global data_collector
+    global data_collector, stream_hub
     data_collector = DashboardDataCollector(patterns_dir)
+    stream_hub = create_stream_hub(data_collector)
 
     # Auto-detect current model and update session
     try:
@@ -6842,8 +7551,11 @@ def run_dashboard(
     print(f"   Or use --host 0.0.0.0 to allow external access")
 
     try:
-        # Run the Flask app
-        app.run(host=host, port=available_port, debug=False, use_reloader=False)
+        if workers > 1:
+            serve_workers(host, available_port, workers, server)
+        else:
+            # Run the Flask app
+            app.run(host=host, port=available_port, debug=False, use_reloader=False)
     except KeyboardInterrupt:
         print(f"\nDashboard stopped by user")
     except Exception as e:
@@ -6854,7 +7566,6 @@ def run_dashboard(
 
 def main():
     """CLI interface."""
-"""
     import argparse
 
     parser = argparse.ArgumentParser(description="Autonomous Agent Dashboard")
@@ -6862,10 +7573,21 @@ def main():
     parser.add_argument("--port", type=int, default=5000, help="Port to bind to")
     parser.add_argument("--patterns-dir", default=".claude-patterns", help="Pattern directory")
     parser.add_argument("--no-browser", action="store_true", help="Don't open browser automatically")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (more than 1 serves multi-process)")
+    parser.add_argument(
+        "--server", choices=SERVERS, default="auto", help="Server for --workers (auto: gunicorn if installed)"
+    )
 
     args = parser.parse_args()
 
-    run_dashboard(args.host, args.port, args.patterns_dir, auto_open_browser=not args.no_browser)
+    run_dashboard(
+        args.host,
+        args.port,
+        args.patterns_dir,
+        auto_open_browser=not args.no_browser,
+        workers=max(1, args.workers),
+        server=args.server,
+    )
 
 
 if __name__ == "__main__":
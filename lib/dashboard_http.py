@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Dashboard HTTP Caching for Autonomous Agent Plugin
+
+Conditional-GET and compression helpers for the dashboard API. Every JSON
+response is tagged with a weak ETag derived from the data generation: the
+stat signatures (mtime, size, inode) of the pattern store files plus a coarse
+clock, because most panels are windows relative to now. A request whose
+If-None-Match still matches is answered with 304 before anything is
+computed, so refresh loops and remote viewers over slow links mostly
+transfer nothing. Large bodies are gzip-compressed for clients that accept it.
+
+Version: 1.0.0
+Author: Autonomous Agent Plugin
+"""
+import gzip
+import hashlib
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+from file_utils import file_signature
+from dashboard_stream import DirectoryWatcher
+
+# Relative time windows ("last 24 hours") shift even when no data changes
+GENERATION_PERIOD = 300.0
+
+# Smaller bodies gain too little from compression to be worth the CPU
+GZIP_MIN_SIZE = 1024
+GZIP_LEVEL = 6
+
+
+def data_generation(
+    watcher: DirectoryWatcher,
+    extra_paths: Iterable[Path] = (),
+    extra_values: Iterable[Optional[str]] = (),
+    period: float = GENERATION_PERIOD,
+    now: Optional[float] = None,
+) -> str:
+    """
+    Identify the current version of the data behind the dashboard.
+
+    Args:
+        watcher: Watcher of the pattern store directory
+        extra_paths: Other files or directories the responses read (directories
+            change signature when entries are added or removed)
+        extra_values: Other versions the responses depend on (e.g. the git HEAD commit)
+        period: Seconds after which the generation changes even without writes
+        now: Current time (defaults to time.time())
+
+    Returns:
+        Hex digest that changes whenever the data may have changed
+    """
+    now = time.time() if now is None else now
+    parts = [repr(sorted(watcher.scan().items())), str(int(now // period))]
+    parts.extend(f"{path}:{file_signature(path)}" for path in extra_paths)
+    parts.extend(repr(value) for value in extra_values)
+    return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def make_etag(generation: str, resource: str) -> str:
+    """
+    Build the weak ETag of one resource at one data generation.
+
+    Weak, because bodies of the same generation may differ in incidental
+    fields such as generation timestamps, and because the same tag is used for
+    the gzip-encoded and identity representations.
+
+    Args:
+        generation: Value returned by data_generation
+        resource: Request path including the query string
+
+    Returns:
+        ETag header value
+    """
+    digest = hashlib.sha1(f"{generation}|{resource}".encode("utf-8")).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag using weak comparison.
+
+    Args:
+        if_none_match: Header value (None if absent)
+        etag: Current ETag of the resource
+
+    Returns:
+        True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Check whether an Accept-Encoding header allows gzip (and does not refuse it with q=0)."""
+    for coding in (accept_encoding or "").split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            quality = params.strip()
+            try:
+                return not (quality.startswith("q=") and float(quality[2:]) == 0)
+            except ValueError:
+                return True
+    return False
+
+
+def compress(body: bytes, level: int = GZIP_LEVEL) -> Optional[bytes]:
+    """
+    Gzip a response body if that is worthwhile.
+
+    Args:
+        body: Uncompressed body
+        level: Compression level
+
+    Returns:
+        Compressed body, or None if the body is too small or does not shrink
+    """
+    if len(body) < GZIP_MIN_SIZE:
+        return None
+    compressed = gzip.compress(body, compresslevel=level)
+    return compressed if len(compressed) < len(body) else None
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Multi-Worker Dashboard Server for Autonomous Agent Plugin
+
+The Flask development server runs the dashboard in one process, so concurrent
+viewers queue behind the GIL and one heavy aggregation stalls everyone. This
+module serves a WSGI app from several worker processes:
+
+- gunicorn (threaded workers) when it is installed
+- otherwise a built-in pre-fork server: the listening socket is opened once
+  and every forked worker runs a threaded Werkzeug server on it, with crashed
+  workers restarted
+- on platforms without fork, a single threaded process
+
+Version: 1.0.0
+Author: Autonomous Agent Plugin
+"""
+import importlib.util
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Any, Dict, Optional, Tuple
+
+SERVERS = ("auto", "gunicorn", "builtin")
+
+# Request threads per worker process (long-lived event streams hold one each)
+THREADS_PER_WORKER = 8
+
+
+def fork_available() -> bool:
+    """Check whether worker processes can be forked on this platform."""
+    return hasattr(os, "fork")
+
+
+def gunicorn_available() -> bool:
+    """Check whether the optional gunicorn server is installed."""
+    return importlib.util.find_spec("gunicorn") is not None and fork_available()
+
+
+def run_workers(app: Any, host: str, port: int, workers: int, server: str = "auto") -> str:
+    """
+    Serve a WSGI app from several worker processes until interrupted.
+
+    Args:
+        app: WSGI application (workers are forked after it is set up)
+        host: Host to bind to
+        port: Port to bind to
+        workers: Number of worker processes
+        server: "gunicorn", "builtin" or "auto" (gunicorn if installed)
+
+    Returns:
+        Name of the server that was used
+    """
+    if server not in SERVERS:
+        raise ValueError(f"Unknown server {server!r}, expected one of {', '.join(SERVERS)}")
+    if workers < 1:
+        raise ValueError(f"workers must be positive, got {workers}")
+
+    if server != "builtin" and gunicorn_available():
+        print(f"Serving with gunicorn: {workers} workers x {THREADS_PER_WORKER} threads")
+        _run_gunicorn(app, f"{host}:{port}", workers)
+        return "gunicorn"
+    if server == "gunicorn":
+        print("Warning: gunicorn is not installed, using the built-in server", file=sys.stderr)
+
+    if fork_available():
+        print(f"Serving with the built-in pre-fork server: {workers} workers x {THREADS_PER_WORKER} threads")
+        run_prefork(app, host, port, workers)
+        return "builtin"
+
+    print("Warning: Worker processes need fork(), serving from a single process", file=sys.stderr)
+    from werkzeug.serving import run_simple
+
+    run_simple(host, port, app, threaded=True, use_reloader=False)
+    return "single"
+
+
+def _run_gunicorn(app: Any, bind: str, workers: int) -> None:
+    """Run gunicorn in this process as the worker arbiter."""
+    from gunicorn.app.base import BaseApplication
+
+    class DashboardApplication(BaseApplication):
+        """gunicorn application serving an already imported WSGI app."""
+
+        def load_config(self):
+            """Apply the dashboard's server settings."""
+            self.cfg.set("bind", bind)
+            self.cfg.set("workers", workers)
+            self.cfg.set("worker_class", "gthread")
+            self.cfg.set("threads", THREADS_PER_WORKER)
+
+        def load(self):
+            """Return the app (workers inherit it when they are forked)."""
+            return app
+
+    DashboardApplication().run()
+
+
+def run_prefork(app: Any, host: str, port: int, workers: int) -> None:
+    """
+    Serve from forked workers sharing one listening socket until interrupted.
+
+    Args:
+        app: WSGI application
+        host: Host to bind to
+        port: Port to bind to
+        workers: Number of worker processes
+    """
+    listener = socket.create_server((host, port), backlog=128)
+    # Idle workers racing for the same connection must not block in accept()
+    listener.setblocking(False)
+
+    children = set()
+    # SIGTERM stops the supervisor like Ctrl+C does
+    previous_handler = signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        while True:
+            while len(children) < workers:
+                children.add(_fork_worker(app, host, port, listener))
+            pid, _ = os.wait()
+            if pid in children:
+                children.discard(pid)
+                print(f"Warning: Dashboard worker {pid} exited, restarting it", file=sys.stderr)
+                # Do not spin when workers die immediately
+                time.sleep(0.5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        signal.signal(signal.SIGTERM, previous_handler)
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError:
+                pass
+        for pid in children:
+            try:
+                os.waitpid(pid, 0)
+            except OSError:
+                pass
+        listener.close()
+
+
+def _fork_worker(app: Any, host: str, port: int, listener: socket.socket) -> int:
+    """Fork one worker process serving the app on the shared listener and return its pid."""
+    pid = os.fork()
+    if pid:
+        return pid
+
+    code = 0
+    try:
+        from werkzeug.serving import make_server
+
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        server = make_server(host, port, app, threaded=True, fd=listener.fileno())
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except BaseException as e:
+        print(f"Error in dashboard worker {os.getpid()}: {e}", file=sys.stderr)
+        code = 1
+    finally:
+        # Never return into the parent's code (or run its exit handlers) from a worker
+        os._exit(code)
+
+
+def _free_port(host: str) -> int:
+    """Get a port nothing listens on."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind((host, 0))
+        return s.getsockname()[1]
+
+
+def _wait_until_serving(url: str, timeout: float) -> Optional[float]:
+    """Poll a URL until it answers 200; return the seconds waited, or None on timeout."""
+    import urllib.error
+    import urllib.request
+
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        try:
+            with urllib.request.urlopen(url, timeout=timeout) as response:
+                if response.status == 200:
+                    response.read()
+                    return time.perf_counter() - started
+        except (urllib.error.URLError, OSError):
+            pass
+        time.sleep(0.05)
+    return None
+
+
+def _timed_get(url: str) -> float:
+    """Fetch a URL and return the latency in milliseconds."""
+    import urllib.request
+
+    started = time.perf_counter()
+    with urllib.request.urlopen(url, timeout=60) as response:
+        response.read()
+    return (time.perf_counter() - started) * 1000
+
+
+def run_benchmark(
+    worker_counts: Tuple[int, ...] = (1, 4),
+    clients: int = 8,
+    requests_per_client: int = 20,
+    path: str = "/api/bundle",
+    patterns_dir: str = ".claude-patterns",
+    host: str = "127.0.0.1",
+    startup_timeout: float = 120.0,
+) -> Dict[int, Dict[str, float]]:
+    """
+    Measure dashboard startup time and request latency by worker count.
+
+    Every run starts `dashboard.py --workers N` in a fresh process, times how
+    long it takes until the path answers, then has concurrent clients fetch it
+    (without conditional headers, so every response carries a full body).
+
+    Args:
+        worker_counts: Worker counts to compare (1 is the development server)
+        clients: Concurrent clients
+        requests_per_client: Requests sent by every client
+        path: API path to request
+        patterns_dir: Pattern directory the dashboard serves
+        host: Host to bind to
+        startup_timeout: Seconds to wait for the dashboard to answer
+
+    Returns:
+        Mapping of worker count to startup seconds, p50/p95 latency in ms and requests/sec
+    """
+    import statistics
+    import subprocess
+    from concurrent.futures import ThreadPoolExecutor
+
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dashboard.py")
+    results = {}
+    for workers in worker_counts:
+        port = _free_port(host)
+        url = f"http://{host}:{port}{path}"
+        command = [sys.executable, script, "--host", host, "--port", str(port), "--patterns-dir", patterns_dir]
+        command += ["--no-browser", "--workers", str(workers)]
+        process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            startup = _wait_until_serving(url, startup_timeout)
+            if startup is None:
+                print(f"Warning: Dashboard with {workers} worker(s) did not start", file=sys.stderr)
+                continue
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=clients) as pool:
+                latencies = sorted(pool.map(_timed_get, [url] * (clients * requests_per_client)))
+            elapsed = time.perf_counter() - started
+            results[workers] = {
+                "startup_s": round(startup, 3),
+                "p50_ms": round(statistics.median(latencies), 2),
+                "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+                "requests_per_sec": round(len(latencies) / elapsed, 1),
+            }
+        finally:
+            process.send_signal(signal.SIGINT if fork_available() else signal.SIGTERM)
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+    return results
+
+
+if __name__ == "__main__":
+    print("=== Dashboard Serving Benchmark ===")
+    for workers, result in run_benchmark().items():
+        print(
+            f"{workers} worker(s): startup {result['startup_s']:>6.2f}s  "
+            f"p50 {result['p50_ms']:>8.2f}ms  p95 {result['p95_ms']:>8.2f}ms  "
+            f"{result['requests_per_sec']:>8.1f} requests/sec"
+        )
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Shared Dashboard Snapshot for Autonomous Agent Plugin
+
+When the dashboard is served by several worker processes, the aggregated data
+is built once by a single builder process and written to one snapshot file
+that every worker memory-maps read-only. The file holds named binary sections:
+the pre-rendered JSON of the overview panels, served as they are, and the
+pickled UnifiedDataSnapshot with its indexes for requests with other
+parameters. Workers therefore never parse unified_data.json themselves, and
+the operating system shares the mapped pages between them.
+
+The builder replaces the file atomically whenever the data generation changes;
+readers notice the new file by its stat signature and map it on their next
+request. Mappings of older files stay valid until nothing references them.
+
+File layout (little endian):
+    header   magic "DASHSNAP", format version (H), reserved (H), section count (I)
+    index    per section: name length (H), UTF-8 name, offset (Q), length (Q)
+    data     section bytes at the offsets listed in the index
+
+Version: 1.0.0
+Author: Autonomous Agent Plugin
+"""
+import mmap
+import os
+import pickle
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from file_utils import atomic_write_bytes, file_signature
+from dashboard_snapshot import UnifiedDataSnapshot
+
+MAGIC = b"DASHSNAP"
+FORMAT_VERSION = 1
+
+# Section holding the pickled UnifiedDataSnapshot
+UNIFIED_SECTION = "unified"
+# Section holding the data generation the snapshot was built for
+GENERATION_SECTION = "generation"
+
+# Seconds between the builder's checks for changed data
+DEFAULT_BUILD_INTERVAL = 1.0
+
+_HEADER = struct.Struct("<8sHHI")
+_NAME_LENGTH = struct.Struct("<H")
+_SPAN = struct.Struct("<QQ")
+
+
+def write_snapshot(path: Path, sections: Dict[str, bytes]) -> None:
+    """
+    Write a snapshot file atomically.
+
+    Args:
+        path: Snapshot file path
+        sections: Mapping of section name to its bytes
+    """
+    path = Path(path)
+    names = [name.encode("utf-8") for name in sections]
+    index_size = sum(_NAME_LENGTH.size + len(name) + _SPAN.size for name in names)
+
+    header = [_HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(names))]
+    offset = _HEADER.size + index_size
+    for name, data in zip(names, sections.values()):
+        header.append(_NAME_LENGTH.pack(len(name)) + name + _SPAN.pack(offset, len(data)))
+        offset += len(data)
+
+    atomic_write_bytes(path, b"".join(header) + b"".join(sections.values()))
+
+
+class SharedSnapshot:
+    """Read-only memory-mapped view of one snapshot file."""
+
+    def __init__(self, path: Path):
+        """
+        Map a snapshot file and read its section index.
+
+        Args:
+            path: Snapshot file path
+
+        Raises:
+            OSError: If the file cannot be opened or mapped
+            ValueError: If the file is not a snapshot of this format
+        """
+        with open(path, "rb") as f:
+            self.signature = file_signature(os.fstat(f.fileno()))
+            if self.signature[1] < _HEADER.size:
+                raise ValueError(f"Truncated dashboard snapshot: {path}")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _, count = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Not a version {FORMAT_VERSION} dashboard snapshot: {path}")
+
+        self._sections: Dict[str, tuple] = {}
+        position = _HEADER.size
+        try:
+            for _ in range(count):
+                (name_length,) = _NAME_LENGTH.unpack_from(self._map, position)
+                position += _NAME_LENGTH.size
+                name = self._map[position : position + name_length].decode("utf-8")
+                position += name_length
+                offset, length = _SPAN.unpack_from(self._map, position)
+                position += _SPAN.size
+                if offset + length > len(self._map):
+                    raise ValueError(f"Section {name} exceeds the dashboard snapshot {path}")
+                self._sections[name] = (offset, length)
+        except struct.error as e:
+            raise ValueError(f"Corrupt dashboard snapshot index in {path}: {e}") from e
+
+    @property
+    def names(self) -> List[str]:
+        """Names of the sections in the file."""
+        return list(self._sections)
+
+    def get(self, name: str) -> Optional[bytes]:
+        """
+        Get the bytes of a section.
+
+        Args:
+            name: Section name
+
+        Returns:
+            Section bytes, or None if the file has no such section
+        """
+        span = self._sections.get(name)
+        if span is None:
+            return None
+        offset, length = span
+        return self._map[offset : offset + length]
+
+    @property
+    def generation(self) -> Optional[str]:
+        """Data generation the snapshot was built for."""
+        data = self.get(GENERATION_SECTION)
+        return data.decode("ascii") if data is not None else None
+
+
+class SharedSnapshotReader:
+    """Thread-safe access to the newest snapshot file, remapped only when the file is replaced."""
+
+    def __init__(self, path: Path):
+        """
+        Initialize the reader. Nothing is mapped until the first get().
+
+        Args:
+            path: Snapshot file path
+        """
+        self.path = Path(path)
+        self.remaps = 0
+        self._snapshot: Optional[SharedSnapshot] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[SharedSnapshot]:
+        """
+        Get the mapping of the current snapshot file.
+
+        A file that cannot be mapped keeps the previous mapping in service.
+
+        Returns:
+            The current snapshot, or None if no snapshot was ever readable
+        """
+        signature = file_signature(self.path)
+        if signature is None:
+            return self._snapshot
+
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.signature == signature:
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.signature == signature:
+                return snapshot
+            try:
+                snapshot = SharedSnapshot(self.path)
+            except (OSError, ValueError) as e:
+                print(f"Warning: Could not map dashboard snapshot {self.path}: {e}", file=sys.stderr)
+                return self._snapshot
+            # The old mapping is closed once requests still using it drop their reference
+            self._snapshot = snapshot
+            self.remaps += 1
+            return snapshot
+
+
+class SharedUnifiedLoader:
+    """Drop-in for UnifiedSnapshotLoader that unpickles the snapshot a builder process shared."""
+
+    def __init__(self, reader: SharedSnapshotReader):
+        """
+        Initialize the loader.
+
+        Args:
+            reader: Reader of the shared snapshot file
+        """
+        self.reader = reader
+        self.path = reader.path
+        self.rebuilds = 0
+        self._source: Optional[tuple] = None
+        self._snapshot: Optional[UnifiedDataSnapshot] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[UnifiedDataSnapshot]:
+        """
+        Get the unified data snapshot of the current shared snapshot file.
+
+        Returns:
+            The snapshot, or None if the builder has not shared one
+        """
+        shared = self.reader.get()
+        if shared is None:
+            return None
+        if self._source == shared.signature:
+            return self._snapshot
+
+        with self._lock:
+            if self._source != shared.signature:
+                data = shared.get(UNIFIED_SECTION)
+                self._snapshot = pickle.loads(data) if data is not None else None
+                self._source = shared.signature
+                self.rebuilds += 1
+            return self._snapshot
+
+
+class SnapshotBuilder:
+    """Rebuilds the snapshot file whenever the data generation changes."""
+
+    def __init__(
+        self,
+        path: Path,
+        build: Callable[[], Dict[str, bytes]],
+        generation: Callable[[], str],
+        interval: float = DEFAULT_BUILD_INTERVAL,
+    ):
+        """
+        Initialize the builder.
+
+        Args:
+            path: Snapshot file path
+            build: Computes the sections of a snapshot
+            generation: Identifies the current version of the data (see dashboard_http.data_generation)
+            interval: Seconds between checks for changed data
+        """
+        self.path = Path(path)
+        self.build = build
+        self.generation = generation
+        self.interval = interval
+        self.builds = 0
+        self.last_build_seconds = 0.0
+        self._generation: Optional[str] = None
+
+    def build_once(self) -> bool:
+        """
+        Write a new snapshot if the data changed since the last one.
+
+        Returns:
+            True if a snapshot was written
+        """
+        # Read before building, so changes made during the build trigger the next one
+        generation = self.generation()
+        if generation == self._generation and self.path.exists():
+            return False
+
+        started = time.perf_counter()
+        sections = dict(self.build())
+        sections[GENERATION_SECTION] = generation.encode("ascii")
+        write_snapshot(self.path, sections)
+        self.last_build_seconds = time.perf_counter() - started
+        self._generation = generation
+        self.builds += 1
+        return True
+
+    def run(self, stop: Optional[threading.Event] = None) -> None:
+        """
+        Keep the snapshot up to date until stopped (the builder process's main loop).
+
+        Args:
+            stop: Event ending the loop (runs until interrupted if None)
+        """
+        stop = stop or threading.Event()
+        try:
+            while not stop.is_set():
+                try:
+                    self.build_once()
+                except Exception as e:
+                    print(f"Warning: Dashboard snapshot build failed: {e}", file=sys.stderr)
+                stop.wait(self.interval)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Dashboard Data Snapshot for Autonomous Agent Plugin
+
+The dashboard fires a dozen API calls per refresh, and each of them used to
+open and parse unified_data.json again. UnifiedSnapshotLoader parses the
+file once per change, detected with a stat signature (mtime, size, inode),
+and hands every caller the same UnifiedDataSnapshot: the data in dashboard
+format, the assessment history with timestamps parsed once, and indexes of
+that history by model, task type and day.
+
+Snapshots are never modified after they are built; a changed file produces a
+new snapshot. Callers must treat the data they get from one as read-only.
+
+Version: 1.0.0
+Author: Autonomous Agent Plugin
+"""
+import json
+import os
+import sys
+import threading
+from bisect import bisect_left
+from datetime import date, datetime
+from heapq import merge
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from file_utils import file_signature
+
+DEFAULT_MODEL = "Claude Sonnet 4.5"
+
+
+def parse_timestamp(timestamp: Any) -> Optional[datetime]:
+    """
+    Parse an ISO timestamp the way the dashboard compares them.
+
+    Args:
+        timestamp: ISO 8601 string, optionally ending in "Z"
+
+    Returns:
+        Naive datetime keeping the wall-clock time, or None if it cannot be parsed
+    """
+    if not timestamp or not isinstance(timestamp, str):
+        return None
+    try:
+        return datetime.fromisoformat(timestamp.replace("Z", "+00:00")).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+def empty_dashboard_data() -> Dict[str, Any]:
+    """Dashboard-format data for when unified storage is missing or unreadable."""
+    return {"quality": {"assessments": {"history": [], "current": {}}}, "patterns": {}}
+
+
+def to_dashboard_format(file_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert the unified_data.json layout to the layout the dashboard APIs expect.
+
+    Args:
+        file_data: Parsed unified_data.json
+
+    Returns:
+        Dashboard-format data
+    """
+    unified_data = {
+        "quality": {"assessments": {"history": [], "current": {}}},
+        "patterns": [],
+        "skills": {},
+        "agents": {},
+        "performance": {"records": []},
+    }
+
+    # Map quality_history to new format
+    assessments = file_data.get("quality_history", {}).get("quality_assessments", [])
+    if assessments:
+        unified_data["quality"]["assessments"]["history"] = assessments
+
+    if file_data.get("patterns"):
+        unified_data["patterns"] = file_data["patterns"]
+    if file_data.get("skill_metrics"):
+        unified_data["skills"] = file_data["skill_metrics"]
+    if file_data.get("agent_metrics"):
+        unified_data["agents"] = file_data["agent_metrics"]
+    if file_data.get("performance_records"):
+        unified_data["performance"] = file_data["performance_records"]
+
+    return unified_data
+
+
+class AssessmentEntry(NamedTuple):
+    """One assessment of the history, parsed once when the snapshot is built."""
+
+    index: int  # Position in the time-ordered history
+    time: datetime
+    model: str  # Normalized model name
+    task_type: str  # Lowercased task type
+    record: Dict[str, Any]  # Copy with normalized timestamp and details.model_used
+    raw: Dict[str, Any]  # Assessment as stored in unified_data.json
+    position: int  # Position in unified_data.json (stable while the history is appended to)
+
+
+class _Group(NamedTuple):
+    """Time-ordered entries sharing an index key, with their times for bisection."""
+
+    times: List[datetime]
+    entries: Tuple[AssessmentEntry, ...]
+
+
+def _group(entries: Sequence[AssessmentEntry]) -> _Group:
+    """Index time-ordered entries for bisection."""
+    return _Group([entry.time for entry in entries], tuple(entries))
+
+
+class UnifiedDataSnapshot:
+    """Immutable parsed view of one version of unified_data.json."""
+
+    def __init__(
+        self,
+        file_data: Dict[str, Any],
+        signature: Optional[tuple],
+        normalize_timestamp: Callable[[str], str],
+        normalize_model: Callable[[str], str],
+    ):
+        """
+        Build the snapshot and its indexes.
+
+        Args:
+            file_data: Parsed unified_data.json
+            signature: Stat signature of the file the data was parsed from
+            normalize_timestamp: Converts a stored timestamp to the ISO form the APIs return
+            normalize_model: Converts a stored model name to its display name
+        """
+        self.signature = signature
+        self.raw = file_data
+        self.unified = to_dashboard_format(file_data)
+        self._memo: Dict[Any, Any] = {}
+
+        parsed = []
+        for position, assessment in enumerate(self.unified["quality"]["assessments"]["history"]):
+            timestamp = assessment.get("timestamp")
+            when = parse_timestamp(timestamp)
+            if when is None:
+                continue
+            details = assessment.get("details") or {}
+            model = normalize_model(details.get("model_used", DEFAULT_MODEL))
+            record = dict(assessment, timestamp=normalize_timestamp(timestamp), details=dict(details, model_used=model))
+            parsed.append((when, position, model, (assessment.get("task_type") or "").lower(), record, assessment))
+        # Stable on file order for equal times
+        parsed.sort(key=lambda item: (item[0], item[1]))
+
+        self.entries = tuple(
+            AssessmentEntry(index, when, model, task_type, record, raw, position)
+            for index, (when, position, model, task_type, record, raw) in enumerate(parsed)
+        )
+        self._all = _group(self.entries)
+
+        by_model: Dict[str, List[AssessmentEntry]] = {}
+        by_task_type: Dict[str, List[AssessmentEntry]] = {}
+        by_day: Dict[date, List[AssessmentEntry]] = {}
+        for entry in self.entries:
+            by_model.setdefault(entry.model, []).append(entry)
+            by_task_type.setdefault(entry.task_type, []).append(entry)
+            by_day.setdefault(entry.time.date(), []).append(entry)
+        self.by_model = {key: _group(group) for key, group in by_model.items()}
+        self.by_task_type = {key: _group(group) for key, group in by_task_type.items()}
+        self.by_day = {key: tuple(group) for key, group in by_day.items()}
+
+    def select(
+        self,
+        since: Optional[datetime] = None,
+        task_types: Optional[Iterable[str]] = None,
+        model: Optional[str] = None,
+    ) -> List[AssessmentEntry]:
+        """
+        Get history entries in time order using the indexes.
+
+        Args:
+            since: Only entries at or after this time
+            task_types: Only entries with one of these task types (case-insensitive)
+            model: Only entries of this normalized model
+
+        Returns:
+            Matching entries, oldest first
+        """
+        if task_types is not None:
+            keys = {task_type.lower() for task_type in task_types}
+            groups = [self.by_task_type[key] for key in keys if key in self.by_task_type]
+        elif model is not None:
+            groups = [self.by_model[model]] if model in self.by_model else []
+        else:
+            groups = [self._all]
+
+        runs = [group.entries[bisect_left(group.times, since) :] if since else group.entries for group in groups]
+        selected = runs[0] if len(runs) == 1 else merge(*runs, key=lambda entry: entry.index)
+        if task_types is not None and model is not None:
+            return [entry for entry in selected if entry.model == model]
+        return list(selected)
+
+    def indexed(
+        self, task_type: Optional[str] = None, model: Optional[str] = None
+    ) -> Tuple[List[datetime], Tuple[AssessmentEntry, ...]]:
+        """
+        Get an index of the history for bisection.
+
+        Args:
+            task_type: Only entries of this task type (case-insensitive)
+            model: Only entries of this normalized model (ignored when task_type is given)
+
+        Returns:
+            (times, entries) in time order, with times[i] the time of entries[i]
+        """
+        if task_type is not None:
+            group = self.by_task_type.get(task_type.lower())
+        elif model is not None:
+            group = self.by_model.get(model)
+        else:
+            group = self._all
+        return (group.times, group.entries) if group else ([], ())
+
+    def memo(self, key: Any, compute: Callable[[], Any]) -> Any:
+        """
+        Compute a value derived only from this snapshot once.
+
+        Args:
+            key: Hashable name of the derived value
+            compute: Builds the value on first use
+
+        Returns:
+            The cached value (shared; do not modify)
+        """
+        try:
+            return self._memo[key]
+        except KeyError:
+            return self._memo.setdefault(key, compute())
+
+
+class UnifiedSnapshotLoader:
+    """Thread-safe loader that rebuilds the snapshot only when the file's stat signature changes."""
+
+    def __init__(
+        self,
+        path: Path,
+        normalize_timestamp: Callable[[str], str],
+        normalize_model: Callable[[str], str],
+    ):
+        """
+        Initialize the loader. Nothing is read until the first get().
+
+        Args:
+            path: Path of unified_data.json
+            normalize_timestamp: Passed to every UnifiedDataSnapshot
+            normalize_model: Passed to every UnifiedDataSnapshot
+        """
+        self.path = Path(path)
+        self.normalize_timestamp = normalize_timestamp
+        self.normalize_model = normalize_model
+        self.rebuilds = 0
+        self._snapshot: Optional[UnifiedDataSnapshot] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[UnifiedDataSnapshot]:
+        """
+        Get the snapshot of the current file contents.
+
+        A file that cannot be parsed (for example while another process is
+        rewriting it) keeps the previous snapshot in service until the next call.
+
+        Returns:
+            The current snapshot, or None if the file does not exist or was never readable
+        """
+        signature = file_signature(self.path)
+        if signature is None:
+            return None
+
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.signature == signature:
+            return snapshot
+
+        with self._lock:
+            # Another request may have rebuilt it while we waited
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.signature == signature:
+                return snapshot
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    file_data = json.load(f)
+                    signature = file_signature(os.fstat(f.fileno()))
+            except (OSError, ValueError) as e:
+                print(f"Error loading unified data: {e}", file=sys.stderr)
+                return snapshot
+
+            self._snapshot = UnifiedDataSnapshot(
+                file_data, signature, self.normalize_timestamp, self.normalize_model
+            )
+            self.rebuilds += 1
+            return self._snapshot
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Dashboard Startup Helpers for Autonomous Agent Plugin
+
+Keeps `import dashboard` and the first request cheap:
+
+- LazyObject stands in for a module-level singleton (the data collector, the
+  stream hub) and builds it on first attribute access, so importing the
+  module no longer runs directory discovery.
+- LazyRegistry builds registered objects (dashboard sections) on first lookup.
+- DiscoveryCache persists the results of startup discovery (the patterns
+  directory, which storage directories hold data) and reuses them while the
+  files they were derived from are unchanged, so a restart does not re-parse
+  every candidate data file.
+
+run_benchmark measures import time and cold start (import plus first API
+request) in fresh interpreters and checks them against the budgets below.
+
+Version: 1.0.0
+Author: Autonomous Agent Plugin
+"""
+import json
+import os
+import subprocess
+import sys
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from file_utils import atomic_write_bytes, file_signature
+
+# Seconds; the /monitor:dashboard command promises a dashboard within 1-2 seconds
+IMPORT_BUDGET_SECONDS = 1.0
+COLD_START_BUDGET_SECONDS = 2.0
+
+DISCOVERY_CACHE_VERSION = 1
+
+
+def default_discovery_cache_file() -> Path:
+    """Discovery cache location: the user's cache directory (XDG_CACHE_HOME or ~/.cache)."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(Path.home(), ".cache")
+    return Path(base) / "autonomous-agent" / "dashboard_discovery.json"
+
+
+class LazyObject:
+    """Proxy that builds an object on first attribute access and forwards to it afterwards."""
+
+    def __init__(self, factory: Callable[[], Any]):
+        """
+        Initialize the proxy. The factory is not called yet.
+
+        Args:
+            factory: Builds the object
+        """
+        self._lazy_factory = factory
+        self._lazy_instance = None
+        self._lazy_lock = threading.Lock()
+
+    def _lazy_get(self) -> Any:
+        """Get the object, building it exactly once."""
+        instance = self._lazy_instance
+        if instance is None:
+            with self._lazy_lock:
+                if self._lazy_instance is None:
+                    self._lazy_instance = self._lazy_factory()
+                instance = self._lazy_instance
+        return instance
+
+    @property
+    def lazy_built(self) -> bool:
+        """Whether the object has been built."""
+        return self._lazy_instance is not None
+
+    def __getattr__(self, name: str) -> Any:
+        """Forward attribute lookups (only called for names the proxy itself lacks)."""
+        if name.startswith("_lazy_"):
+            raise AttributeError(name)
+        return getattr(self._lazy_get(), name)
+
+    def __repr__(self) -> str:
+        """Describe the proxy without building the object."""
+        return repr(self._lazy_instance) if self.lazy_built else f"<LazyObject of {self._lazy_factory!r}>"
+
+
+class LazyRegistry(Mapping):
+    """Read-only mapping whose values are built by their factories on first lookup."""
+
+    def __init__(self, factories: Dict[str, Callable[[], Any]]):
+        """
+        Initialize the registry. No factory is called yet.
+
+        Args:
+            factories: Mapping of name to a function building the value
+        """
+        self._factories = dict(factories)
+        self._built: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> Any:
+        """Get a value, building it on first lookup."""
+        try:
+            return self._built[name]
+        except KeyError:
+            pass
+        factory = self._factories[name]
+        with self._lock:
+            if name not in self._built:
+                self._built[name] = factory()
+            return self._built[name]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate the registered names."""
+        return iter(self._factories)
+
+    def __len__(self) -> int:
+        """Number of registered names."""
+        return len(self._factories)
+
+    @property
+    def built(self) -> List[str]:
+        """Names whose values have been built."""
+        return list(self._built)
+
+
+def _fingerprint(path: Path, exists_only: bool) -> Any:
+    """Existence, or stat signature (mtime, size, inode), of a path."""
+    signature = file_signature(path)
+    if exists_only:
+        return signature is not None
+    return None if signature is None else list(signature)
+
+
+class DiscoveryCache:
+    """Persisted discovery results, valid while the paths they depend on are unchanged."""
+
+    def __init__(self, cache_file: Optional[Path] = None):
+        """
+        Initialize the cache. The file is read on first use.
+
+        Args:
+            cache_file: Cache file (defaults to default_discovery_cache_file())
+        """
+        self.cache_file = Path(cache_file) if cache_file else default_discovery_cache_file()
+        self.hits = 0
+        self.misses = 0
+        self._entries: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def cached(
+        self, key: str, compute: Callable[[], Any], paths: Sequence[Path], exists_only: bool = False
+    ) -> Any:
+        """
+        Get a discovery result, computing and storing it if the cached one is stale.
+
+        Args:
+            key: Name of the result (include everything it depends on besides paths)
+            compute: Computes the result (must be JSON-serializable)
+            paths: Files or directories the result is derived from
+            exists_only: Compare only whether the paths exist, not their stat signatures
+
+        Returns:
+            The (possibly cached) result
+        """
+        with self._lock:
+            entries = self._load()
+            entry = entries.get(key)
+            if entry is not None and entry.get("paths") == self._fingerprints(paths, exists_only):
+                self.hits += 1
+                return entry["value"]
+
+        value = compute()
+        with self._lock:
+            self.misses += 1
+            # Fingerprinted after computing, so changes the computation made itself (e.g. mkdir) are included
+            self._entries[key] = {"paths": self._fingerprints(paths, exists_only), "value": value}
+            self._save()
+        return value
+
+    @staticmethod
+    def _fingerprints(paths: Sequence[Path], exists_only: bool) -> List[Any]:
+        """Fingerprints of the paths, as stored in the cache file."""
+        return [[str(path), _fingerprint(path, exists_only)] for path in paths]
+
+    def _load(self) -> Dict[str, Any]:
+        """Read the cache file once."""
+        if self._entries is None:
+            try:
+                with open(self.cache_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                valid = isinstance(data, dict) and data.get("version") == DISCOVERY_CACHE_VERSION
+                self._entries = data.get("entries", {}) if valid else {}
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def _save(self) -> None:
+        """Write the cache file atomically; a cache that cannot be written is only a slower start."""
+        data = {"version": DISCOVERY_CACHE_VERSION, "entries": self._entries}
+        try:
+            atomic_write_bytes(self.cache_file, json.dumps(data).encode("utf-8"))
+        except OSError:
+            pass
+
+
+_discovery_cache: Optional[DiscoveryCache] = None
+
+
+def get_discovery_cache() -> DiscoveryCache:
+    """Get the process-wide discovery cache."""
+    global _discovery_cache
+    if _discovery_cache is None:
+        _discovery_cache = DiscoveryCache()
+    return _discovery_cache
+
+
+# Child script: time the import and the first API request of the dashboard module
+_COLD_START_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import dashboard
+imported = time.perf_counter()
+response = dashboard.app.test_client().get(sys.argv[1])
+answered = time.perf_counter()
+timings = {"import_s": imported - started, "first_request_s": answered - imported}
+print(json.dumps(dict(timings, status=response.status_code)))
+"""
+
+
+def slowest_imports(module: str = "dashboard", top: int = 10) -> List[Tuple[str, float]]:
+    """
+    List the imports that dominate importing a module, from `python -X importtime`.
+
+    Args:
+        module: Module to import (from the lib directory)
+        top: Number of imports to list
+
+    Returns:
+        (imported module, cumulative seconds) pairs, slowest first
+    """
+    lib_dir = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=lib_dir,
+    )
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        timings.append((name.strip(), int(cumulative) / 1e6))
+    return sorted(timings, key=lambda item: item[1], reverse=True)[:top]
+
+
+def check_budget(
+    result: Dict[str, float],
+    import_budget: float = IMPORT_BUDGET_SECONDS,
+    cold_start_budget: float = COLD_START_BUDGET_SECONDS,
+) -> List[str]:
+    """
+    Compare a cold-start measurement with the budgets.
+
+    Args:
+        result: Measurement with import_s and cold_start_s
+        import_budget: Maximum seconds for importing the module
+        cold_start_budget: Maximum seconds for import plus first request
+
+    Returns:
+        Descriptions of exceeded budgets (empty if within budget)
+    """
+    exceeded = []
+    if result["import_s"] > import_budget:
+        exceeded.append(f"import took {result['import_s']:.3f}s (budget {import_budget:.3f}s)")
+    if result["cold_start_s"] > cold_start_budget:
+        exceeded.append(f"cold start took {result['cold_start_s']:.3f}s (budget {cold_start_budget:.3f}s)")
+    return exceeded
+
+
+def run_benchmark(runs: int = 5, path: str = "/api/overview", module: str = "dashboard") -> Dict[str, float]:
+    """
+    Measure the dashboard's import time and cold start in fresh interpreters.
+
+    Args:
+        runs: Number of fresh interpreters to measure (medians are reported)
+        path: API path of the first request
+        module: Module serving the dashboard
+
+    Returns:
+        Median import_s, first_request_s and cold_start_s (import plus first request)
+
+    Raises:
+        RuntimeError: If the module cannot be imported or the first request fails
+    """
+    import statistics
+
+    lib_dir = os.path.dirname(os.path.abspath(__file__))
+    script = _COLD_START_SCRIPT.replace("import dashboard", f"import {module} as dashboard")
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-c", script, path], capture_output=True, text=True, cwd=lib_dir)
+        if result.returncode != 0:
+            error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else f"exit {result.returncode}"
+            raise RuntimeError(f"Cold start of {module} failed: {error}")
+        sample = json.loads(result.stdout.strip().splitlines()[-1])
+        if sample["status"] != 200:
+            raise RuntimeError(f"First request to {path} answered {sample['status']}")
+        samples.append(sample)
+
+    import_s = statistics.median(sample["import_s"] for sample in samples)
+    first_request_s = statistics.median(sample["first_request_s"] for sample in samples)
+    cold_start_s = statistics.median(sample["import_s"] + sample["first_request_s"] for sample in samples)
+    return {
+        "import_s": round(import_s, 4),
+        "first_request_s": round(first_request_s, 4),
+        "cold_start_s": round(cold_start_s, 4),
+    }
+
+
+if __name__ == "__main__":
+    print("=== Dashboard Cold Start Benchmark ===")
+    try:
+        measured = run_benchmark()
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Import:        {measured['import_s']:.3f}s (budget {IMPORT_BUDGET_SECONDS:.3f}s)")
+    print(f"First request: {measured['first_request_s']:.3f}s")
+    print(f"Cold start:    {measured['cold_start_s']:.3f}s (budget {COLD_START_BUDGET_SECONDS:.3f}s)")
+    print("Slowest imports:")
+    for name, seconds in slowest_imports():
+        print(f"  {name:<40} {seconds:.3f}s")
+    problems = check_budget(measured)
+    for problem in problems:
+        print(f"Over budget: {problem}")
+    sys.exit(1 if problems else 0)
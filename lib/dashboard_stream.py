@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Dashboard Live Stream for Autonomous Agent Plugin
+
+Pushes dashboard panel updates over server-sent events instead of having
+every open dashboard refetch every panel on a timer. One background thread
+watches the pattern directory with a cheap stat scan; only when a file's
+signature (mtime, size, inode) changes are the panels recomputed, and each
+subscriber is sent a compact JSON-patch delta (see delta_backup.json_diff)
+for the panels whose data actually changed. The thread runs only while at
+least one dashboard is connected.
+
+Events:
+    snapshot  {"panel": name, "data": full panel data}   sent on connect
+    delta     {"panel": name, "ops": [patch operations]} sent on change
+
+Version: 1.0.0
+Author: Autonomous Agent Plugin
+"""
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from file_utils import file_signature
+from delta_backup import json_diff
+
+WATCHED_SUFFIXES = (".json", ".jsonl", ".db")
+
+
+def format_sse(event: str, data: Any) -> str:
+    """
+    Format one server-sent event.
+
+    Args:
+        event: Event name
+        data: JSON-serializable payload
+
+    Returns:
+        Event text, terminated by a blank line
+    """
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'), default=str)}\n\n"
+
+
+class DirectoryWatcher:
+    """Detects changed files in a directory by comparing stat signatures."""
+
+    def __init__(
+        self,
+        directory: Path,
+        suffixes: Tuple[str, ...] = WATCHED_SUFFIXES,
+        extra: Optional[Callable[[], Dict[str, Any]]] = None,
+    ):
+        """
+        Initialize the watcher with the directory's current state.
+
+        Args:
+            directory: Directory to watch (not recursive)
+            suffixes: File name suffixes to watch
+            extra: Returns other named versions to poll along with the files (e.g. the git HEAD)
+        """
+        self.directory = Path(directory)
+        self.suffixes = suffixes
+        self.extra = extra
+        self._signatures = self._state()
+
+    def scan(self) -> Dict[str, tuple]:
+        """Get the (mtime_ns, size, inode) signature of every watched file."""
+        signatures = {}
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith(self.suffixes) and not entry.name.startswith("."):
+                        try:
+                            signatures[entry.name] = file_signature(entry.stat())
+                        except OSError:
+                            continue
+        except OSError:
+            pass
+        return signatures
+
+    def _state(self) -> Dict[str, Any]:
+        """Get the file signatures and the extra versions."""
+        state: Dict[str, Any] = dict(self.scan())
+        if self.extra is not None:
+            state.update(self.extra())
+        return state
+
+    def poll(self) -> Set[str]:
+        """
+        Get the files created, modified or deleted (and extra versions changed) since the last poll.
+
+        Returns:
+            Names of the changed files and extra versions
+        """
+        current = self._state()
+        previous, self._signatures = self._signatures, current
+        return {name for name in current.keys() | previous.keys() if current.get(name) != previous.get(name)}
+
+
+class PanelStreamHub:
+    """Computes dashboard panels on change and fans deltas out to subscribers."""
+
+    def __init__(
+        self,
+        watcher: DirectoryWatcher,
+        panels: Dict[str, Callable[[], Any]],
+        interval: float = 0.5,
+        keepalive: float = 15.0,
+    ):
+        """
+        Initialize the hub. The watcher thread starts with the first subscriber.
+
+        Args:
+            watcher: Watcher of the directory the panels read from
+            panels: Mapping of panel name to a function computing its data
+            interval: Seconds between directory scans while subscribers are connected
+            keepalive: Seconds of silence after which a keepalive comment is sent
+        """
+        self.watcher = watcher
+        self.panels = panels
+        self.interval = interval
+        self.keepalive = keepalive
+
+        self._states: Dict[str, Any] = {}
+        self._subscribers: List[queue.Queue] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self) -> queue.Queue:
+        """
+        Register a subscriber and queue a snapshot of every panel for it.
+
+        Returns:
+            Queue of formatted events for the subscriber
+        """
+        subscriber: queue.Queue = queue.Queue()
+        with self._lock:
+            if self._thread is None:
+                # Nobody was watching, so the cached states may be stale
+                self.watcher.poll()
+                self._states = {name: self._compute(name) for name in self.panels}
+                self._thread = threading.Thread(target=self._run, name="dashboard-stream", daemon=True)
+                self._thread.start()
+            for name, data in self._states.items():
+                subscriber.put(format_sse("snapshot", {"panel": name, "data": data}))
+            self._subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: queue.Queue) -> None:
+        """Remove a subscriber; the watcher thread stops after the last one leaves."""
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    def stream(self) -> Iterator[str]:
+        """
+        Generate the event stream of one subscriber (for a streaming HTTP response).
+
+        Yields:
+            Formatted events, with keepalive comments while nothing changes
+        """
+        subscriber = self.subscribe()
+        try:
+            while True:
+                try:
+                    yield subscriber.get(timeout=self.keepalive)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+        finally:
+            self.unsubscribe(subscriber)
+
+    def publish_changes(self) -> int:
+        """
+        Recompute the panels after a change and queue deltas for every subscriber.
+
+        Returns:
+            Number of panels whose data changed
+        """
+        changed = 0
+        with self._lock:
+            for name in self.panels:
+                data = self._compute(name)
+                ops = json_diff(self._states.get(name), data)
+                if not ops:
+                    continue
+                self._states[name] = data
+                event = format_sse("delta", {"panel": name, "ops": ops})
+                for subscriber in self._subscribers:
+                    subscriber.put(event)
+                changed += 1
+        return changed
+
+    def _compute(self, name: str) -> Any:
+        """Compute a panel as plain JSON values, or None if it failed."""
+        try:
+            return json.loads(json.dumps(self.panels[name](), default=str))
+        except Exception as e:
+            print(f"Error computing dashboard panel {name}: {e}", file=sys.stderr)
+            return None
+
+    def _run(self) -> None:
+        """Scan for changes while anyone is subscribed."""
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+            if self.watcher.poll():
+                self.publish_changes()
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Delta Backups for Autonomous Agent Plugin
+
+Incremental backups for JSON storage files. Instead of copying the whole file
+before every write, a DeltaBackupStore keeps periodic full snapshots and, for
+each snapshot, an append-only chain of JSON-patch style deltas (RFC 6902 add,
+remove and replace operations). Any recorded point in time is rebuilt by
+loading the latest snapshot taken at or before it and replaying its deltas.
+
+Layout inside the backup directory:
+    <prefix>_<YYYYmmdd_HHMMSS_ffffff>.json           full snapshot
+    <prefix>_<YYYYmmdd_HHMMSS_ffffff>.deltas.jsonl   deltas recorded after it
+
+Version: 1.0.0
+Author: Autonomous Agent Plugin
+"""
+import json
+import shutil
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+SNAPSHOT_TIME_FORMATS = ("%Y%m%d_%H%M%S_%f", "%Y%m%d_%H%M%S")
+
+
+def _escape(token: str) -> str:
+    """Escape a key for use in a JSON pointer."""
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    """Unescape a JSON pointer token."""
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def json_diff(old: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    """
+    Compute JSON-patch operations that turn old into new.
+
+    Dictionaries are compared key by key. Lists that only grew at the end,
+    or were trimmed at the front and then grew (rolling histories), become
+    remove/append operations; other changed lists are replaced whole.
+
+    Args:
+        old: Previous JSON value
+        new: New JSON value
+        path: JSON pointer of the values being compared
+
+    Returns:
+        List of add/remove/replace operations
+    """
+    if type(old) is not type(new):
+        return [{"op": "replace", "path": path, "value": new}]
+
+    if isinstance(old, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                ops.extend(json_diff(old[key], value, child))
+        return ops
+
+    if isinstance(old, list):
+        if old == new:
+            return []
+        trimmed = _trimmed_prefix(old, new)
+        if trimmed is None:
+            return [{"op": "replace", "path": path, "value": new}]
+        ops = [{"op": "remove", "path": f"{path}/0"} for _ in range(trimmed)]
+        ops.extend({"op": "add", "path": f"{path}/-", "value": value} for value in new[len(old) - trimmed :])
+        return ops
+
+    if old != new:
+        return [{"op": "replace", "path": path, "value": new}]
+    return []
+
+
+def _trimmed_prefix(old: List[Any], new: List[Any]) -> Optional[int]:
+    """
+    Find how many leading items of old were dropped before new items were appended.
+
+    Returns:
+        Number of dropped items, or None when new is not old[k:] plus appended items
+    """
+    if new[: len(old)] == old:
+        return 0
+    if not new:
+        return None
+    # Only worth it while the removals stay smaller than the surviving list
+    for start in range(1, len(old) // 2 + 1):
+        if old[start] == new[0] and new[: len(old) - start] == old[start:]:
+            return start
+    return None
+
+
+def apply_patch(document: Any, ops: List[Dict[str, Any]]) -> Any:
+    """
+    Apply JSON-patch operations produced by json_diff.
+
+    Args:
+        document: JSON value to patch in place
+        ops: Operations to apply in order
+
+    Returns:
+        The patched document (a new value when the root itself is replaced)
+    """
+    for op in ops:
+        if op["path"] == "":
+            document = op.get("value")
+            continue
+
+        tokens = [_unescape(token) for token in op["path"].split("/")[1:]]
+        parent = document
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+        last = tokens[-1]
+
+        if isinstance(parent, list):
+            if op["op"] == "add" and last == "-":
+                parent.append(op["value"])
+            elif op["op"] == "add":
+                parent.insert(int(last), op["value"])
+            elif op["op"] == "remove":
+                del parent[int(last)]
+            else:
+                parent[int(last)] = op["value"]
+        elif op["op"] == "remove":
+            del parent[last]
+        else:
+            parent[last] = op["value"]
+    return document
+
+
+class DeltaBackupStore:
+    """Periodic full snapshots plus append-only JSON-patch delta chains."""
+
+    def __init__(
+        self,
+        backup_dir: Path,
+        prefix: str,
+        snapshot_every: int = 50,
+        snapshot_interval: float = 3600.0,
+        keep_snapshots: int = 10,
+    ):
+        """
+        Initialize the backup store.
+
+        Args:
+            backup_dir: Directory holding snapshots and delta chains
+            prefix: File name prefix, e.g. "unified_parameters"
+            snapshot_every: Number of deltas after which a new full snapshot is taken
+            snapshot_interval: Seconds after which a new full snapshot is taken
+            keep_snapshots: Number of snapshots (with their chains) to keep
+        """
+        self.backup_dir = Path(backup_dir)
+        self.prefix = prefix
+        self.snapshot_every = snapshot_every
+        self.snapshot_interval = snapshot_interval
+        self.keep_snapshots = keep_snapshots
+
+        # State the current chain ends with, and the storage file signature it matches
+        self.head: Any = None
+        self.head_signature: Optional[tuple] = None
+
+        self._chain_path: Optional[Path] = None
+        self._chain_deltas = 0
+        self._chain_started = 0.0
+
+    def needs_snapshot(self, signature: Optional[tuple], now: Optional[float] = None) -> bool:
+        """
+        Check whether the next write must start a new chain with a full snapshot.
+
+        Args:
+            signature: Current signature of the storage file
+
+        Returns:
+            True if there is no chain, the file changed outside the chain, or the chain is full or old
+        """
+        now = time.time() if now is None else now
+        return (
+            not self._chain_matches(signature)
+            or self._chain_deltas >= self.snapshot_every
+            or now - self._chain_started >= self.snapshot_interval
+        )
+
+    def prepare(self, source: Path, signature: Optional[tuple]) -> bool:
+        """
+        Make sure the current state of source is recoverable, snapshotting it if needed.
+
+        Args:
+            source: Storage file about to be written
+            signature: Current signature of the storage file
+
+        Returns:
+            True if a new snapshot was taken
+        """
+        if not self.needs_snapshot(signature):
+            return False
+        self.snapshot(source, signature)
+        return True
+
+    def snapshot(self, source: Path, signature: Optional[tuple]) -> Path:
+        """
+        Copy the storage file as a full snapshot and start a new delta chain.
+
+        Args:
+            source: Storage file to snapshot
+            signature: Signature of the storage file being copied
+
+        Returns:
+            Path of the snapshot
+        """
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime(SNAPSHOT_TIME_FORMATS[0])
+        snapshot_path = self.backup_dir / f"{self.prefix}_{stamp}.json"
+        shutil.copy2(source, snapshot_path)
+
+        try:
+            with open(snapshot_path, "r", encoding="utf-8") as f:
+                self.head = json.load(f)
+        except (OSError, ValueError):
+            # Never keep an unreadable snapshot as the newest restore point
+            snapshot_path.unlink()
+            self.invalidate()
+            raise
+        self.head_signature = signature
+        self._chain_path = self._chain_for(snapshot_path)
+        self._chain_deltas = 0
+        self._chain_started = time.time()
+
+        self.cleanup()
+        return snapshot_path
+
+    def record(self, data: Any, base_signature: Optional[tuple], signature: tuple) -> int:
+        """
+        Append the delta from the chain head to data.
+
+        Nothing is recorded when the chain head is not the state that was
+        overwritten; the next write then starts a new snapshot.
+
+        Args:
+            data: New state that was just written
+            base_signature: Signature of the storage file before the write
+            signature: Signature of the storage file after the write
+
+        Returns:
+            Number of operations recorded
+        """
+        if not self._chain_matches(base_signature):
+            return 0
+        ops = json_diff(self.head, data)
+        if ops:
+            line = json.dumps({"timestamp": datetime.now().isoformat(), "ops": ops}, ensure_ascii=False)
+            with open(self._chain_path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            self._chain_deltas += 1
+            # Patch the head from the serialized ops so it never aliases the caller's data
+            self.head = apply_patch(self.head, json.loads(line)["ops"])
+        self.head_signature = signature
+        return len(ops)
+
+    def invalidate(self) -> None:
+        """Forget the chain head so the next write starts a new snapshot."""
+        self.head = None
+        self.head_signature = None
+        self._chain_path = None
+
+    def list_snapshots(self) -> List[Tuple[datetime, Path]]:
+        """List (taken_at, path) of all snapshots, oldest first."""
+        snapshots = []
+        for path in self.backup_dir.glob(f"{self.prefix}_*.json"):
+            taken_at = self._parse_snapshot_time(path)
+            if taken_at is not None:
+                snapshots.append((taken_at, path))
+        return sorted(snapshots)
+
+    def rebuild(self, at: Optional[datetime] = None) -> Optional[Any]:
+        """
+        Rebuild the state at a point in time.
+
+        Args:
+            at: Point in time to rebuild (None for the latest recorded state)
+
+        Returns:
+            Rebuilt state, or None if no snapshot was taken at or before that time
+        """
+        candidates = [(taken_at, path) for taken_at, path in self.list_snapshots() if at is None or taken_at <= at]
+        if not candidates:
+            return None
+        _, snapshot_path = candidates[-1]
+
+        with open(snapshot_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+
+        chain_path = self._chain_for(snapshot_path)
+        if not chain_path.exists():
+            return state
+        with open(chain_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    delta = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn final line from an interrupted append
+                    print(f"Warning: Skipping unreadable delta in {chain_path}", file=sys.stderr)
+                    break
+                if at is not None and datetime.fromisoformat(delta["timestamp"]) > at:
+                    break
+                state = apply_patch(state, delta["ops"])
+        return state
+
+    def cleanup(self) -> None:
+        """Keep only the most recent snapshots and their delta chains."""
+        snapshots = self.list_snapshots()
+        if len(snapshots) <= self.keep_snapshots:
+            return
+        for _, old_snapshot in snapshots[: len(snapshots) - self.keep_snapshots]:
+            for path in (old_snapshot, self._chain_for(old_snapshot)):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                except Exception as e:
+                    print(f"Warning: Failed to delete old backup {path}: {e}", file=sys.stderr)
+
+    def _chain_matches(self, signature: Optional[tuple]) -> bool:
+        """Check whether the chain head is the state of the file with this signature."""
+        return self._chain_path is not None and signature is not None and signature == self.head_signature
+
+    def _chain_for(self, snapshot_path: Path) -> Path:
+        """Delta chain file belonging to a snapshot."""
+        return snapshot_path.with_name(snapshot_path.stem + ".deltas.jsonl")
+
+    def _parse_snapshot_time(self, path: Path) -> Optional[datetime]:
+        """Parse the time a snapshot was taken from its file name."""
+        stamp = path.stem[len(self.prefix) + 1 :]
+        for time_format in SNAPSHOT_TIME_FORMATS:
+            try:
+                return datetime.strptime(stamp, time_format)
+            except ValueError:
+                continue
+        return None
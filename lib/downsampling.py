@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Chart Downsampling for Autonomous Agent Plugin
+
+Largest-Triangle-Three-Buckets (LTTB) downsampling for dashboard charts.
+Long ranges ("all time") would otherwise send every assessment to the
+browser, making payload size, JSON encoding and chart rendering grow with
+the history. LTTB keeps the first and last point and, from each of the
+buckets in between, the point forming the largest triangle with its
+neighbours, so peaks, dips and trend changes stay visible with at most as
+many points as the chart has room for.
+
+Points are kept as they are (only selected), and x is the point's position
+in its series, matching the category axes the dashboard charts use.
+
+Version: 1.0.0
+Author: Autonomous Agent Plugin
+"""
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
+
+# Roughly one point per pixel column of a wide chart
+DEFAULT_MAX_POINTS = 1000
+MIN_MAX_POINTS = 3
+
+
+def _value(y: Callable[[Any], Any], point: Any) -> float:
+    """Numeric y value of a point; missing or non-numeric values count as 0."""
+    try:
+        return float(y(point) or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def lttb_indices(values: Sequence[float], threshold: int) -> List[int]:
+    """
+    Select the indices of the points LTTB keeps.
+
+    Args:
+        values: y values, evenly spaced on x
+        threshold: Number of points to keep (at least 3)
+
+    Returns:
+        Increasing indices into values
+    """
+    if threshold < MIN_MAX_POINTS:
+        raise ValueError(f"threshold must be at least {MIN_MAX_POINTS}, got {threshold}")
+    n = len(values)
+    if n <= threshold:
+        return list(range(n))
+
+    selected = [0]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third triangle corner
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = (next_start + next_end - 1) / 2
+        avg_y = sum(values[next_start:next_end]) / (next_end - next_start)
+
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        a_y = values[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((a - avg_x) * (values[j] - a_y) - (a - j) * (avg_y - a_y))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return selected
+
+
+def lttb(points: Sequence[Any], max_points: int, y: Callable[[Any], Any]) -> List[Any]:
+    """
+    Downsample one series with LTTB.
+
+    Args:
+        points: Points of the series in chart order
+        max_points: Maximum number of points to return (at least 3)
+        y: Function getting the plotted value of a point
+
+    Returns:
+        The selected points, in their original order
+    """
+    indices = lttb_indices([_value(y, point) for point in points], max_points)
+    return [points[index] for index in indices]
+
+
+def downsample(
+    points: Sequence[Any],
+    max_points: int,
+    y: Callable[[Any], Any],
+    series: Optional[Callable[[Any], Hashable]] = None,
+) -> List[Any]:
+    """
+    Downsample points that may hold several series (e.g. one per model).
+
+    Each series is reduced with LTTB on its own, with the point budget
+    shared in proportion to the series' sizes (at least 3 per series).
+
+    Args:
+        points: Points in chart order
+        max_points: Point budget for all series together (at least 3)
+        y: Function getting the plotted value of a point
+        series: Function getting the series of a point (None for a single series)
+
+    Returns:
+        The selected points, in their original order
+    """
+    if max_points < MIN_MAX_POINTS:
+        raise ValueError(f"max_points must be at least {MIN_MAX_POINTS}, got {max_points}")
+    if len(points) <= max_points:
+        return list(points)
+    if series is None:
+        return lttb(points, max_points, y)
+
+    groups: Dict[Hashable, List[int]] = {}
+    for index, point in enumerate(points):
+        groups.setdefault(series(point), []).append(index)
+
+    kept = []
+    for indices in groups.values():
+        budget = max(MIN_MAX_POINTS, max_points * len(indices) // len(points))
+        values = [_value(y, points[index]) for index in indices]
+        kept.extend(indices[i] for i in lttb_indices(values, budget))
+    return [points[index] for index in sorted(kept)]
@@ -7,6 +7,7 @@ real-time allocation adjustments based on performance metrics and needs.
 Target: 15-20% additional cost reduction through intelligent budget allocation
 """
 import json
+import os
 import time
 import threading
 import sqlite3
@@ -18,6 +19,9 @@ from collections import defaultdict, deque
 import statistics
 import logging
 
+from budget_arena import DEFAULT_LEASE_TTL, CoalescingWorker, Lease, get_budget_arena
+from budget_solver import solve_allocation
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
@@ -42,6 +46,10 @@ class PriorityLevel(Enum):
     LOW = 4  # Optional components
 
 
+# Budget weight of each priority (initial allocation multiplier and rebalancing weight)
+PRIORITY_WEIGHTS = {PriorityLevel.CRITICAL: 1.5, PriorityLevel.HIGH: 1.2, PriorityLevel.MEDIUM: 1.0, PriorityLevel.LOW: 0.6}
+
+
 @dataclass
 class ComponentBudget:
     """Budget allocation for a component."""
@@ -55,11 +63,12 @@ class ComponentBudget:
     efficiency_score: float  # 0-100
     last_adjustment: datetime
     adjustment_history: List[Dict[str, Any]]
+    reserved_tokens: int = 0  # Held by open leases
 
     @property
     def remaining_tokens(self) -> int:
         """Remaining Tokens."""
-        return max(0, self.allocated_tokens - self.used_tokens)
+        return max(0, self.allocated_tokens - self.used_tokens - self.reserved_tokens)
 
     @property
     def utilization_rate(self) -> float:
@@ -98,14 +107,29 @@ class BudgetMetrics:
 class DynamicBudgetManager:
     """Intelligent budget management system."""
 
-    def __init__(self, total_budget: int = 100000, db_path: str = "data/databases/budget_metrics.db"):
-        """Initialize the processor with default configuration."""
+    def __init__(
+        self,
+        total_budget: int = 100000,
+        db_path: str = "data/databases/budget_metrics.db",
+        arena_path: Optional[str] = None,
+    ):
+        """
+        Initialize the processor with default configuration.
+
+        Args:
+            total_budget: Total token budget
+            db_path: Metrics database path
+            arena_path: Shared counters database (defaults to budget_arena.db next to db_path);
+                managers in other processes using the same arena draw from the same budget, and
+                its allocations are scaled to total_budget on start
+        """
         self.total_budget = total_budget
         self.db_path = db_path
         self.components: Dict[str, ComponentBudget] = {}
         self.strategy = BudgetStrategy.PERFORMANCE_BASED
         self.rebalancing_interval = 300  # 5 minutes
         self.min_budget_allocation = 1000  # Minimum tokens per component
+        self.max_adjustment_rate = 0.3  # Max change of an allocation per rebalancing
 
         # Performance tracking
         self.performance_history: Dict[str, deque] = defaultdict(lambda: deque(maxlen=100))
@@ -115,17 +139,28 @@ class DynamicBudgetManager:
         self.reallocation_log: List[Dict[str, Any]] = []
         self.savings_tracker = 0
 
-        # Threading
+        # Threading (the lock guards component metadata; token counters live in the arena)
         self._lock = threading.RLock()
         self._running = False
         self._rebalancing_thread = None
+        self._rebalancer = CoalescingWorker(self._rebalance_budgets, name="budget-rebalancer")
 
         # Initialize database
         self._init_database()
 
+        # Per-component token counters shared across threads and processes
+        if arena_path is None:
+            arena_path = os.path.join(os.path.dirname(db_path), "budget_arena.db")
+        self.arena = get_budget_arena(arena_path)
+        self._lenders: Tuple[str, ...] = ()  # LOW-priority components that lend unused tokens
+
         # Register default components
         self._register_default_components()
 
+        # Counters persist in the arena across runs; fit them to this manager's budget
+        with self._lock:
+            self._refresh_components(self.arena.scale_allocations(total_budget))
+
     def _init_database(self) -> None:
         """Initialize SQLite database for metrics storage."""
         with sqlite3.connect(self.db_path) as conn:
@@ -174,7 +209,6 @@ class DynamicBudgetManager:
 
             conn.commit()
 
-"""
     def _register_default_components(self) -> None:
         """Register default optimization components."""
         default_components = [
@@ -194,8 +228,8 @@ class DynamicBudgetManager:
         name: str,
         priority: PriorityLevel = PriorityLevel.MEDIUM,
         initial_allocation: Optional[int] = None,
-    )-> None:
-        """Register Component."""Register a new component for budget management."""
+    ) -> None:
+        """Register a new component for budget management."""
         with self._lock:
             if component_id in self.components:
                 logger.warning(f"Component {component_id} already registered")
@@ -204,78 +238,112 @@ class DynamicBudgetManager:
             if initial_allocation is None:
                 initial_allocation = self._calculate_initial_allocation(priority)
 
+            # Another process may have registered the component already; its counters win
+            allocated, used, reserved = self.arena.register(component_id, initial_allocation)
+
             self.components[component_id] = ComponentBudget(
                 component_id=component_id,
                 name=name,
                 priority=priority,
-                allocated_tokens=initial_allocation,
-                used_tokens=0,
+                allocated_tokens=allocated,
+                used_tokens=used,
+                reserved_tokens=reserved,
                 performance_score=50.0,  # Start with neutral score
                 efficiency_score=50.0,
                 last_adjustment=datetime.now(),
                 adjustment_history=[],
             )
 
-            logger.info(f"Registered component: {name} ({component_id}) with {initial_allocation} tokens")
+            if priority == PriorityLevel.LOW:
+                self._lenders += (component_id,)
+
+            logger.info(f"Registered component: {name} ({component_id}) with {allocated} tokens")
 
     def _calculate_initial_allocation(self, priority: PriorityLevel) -> int:
         """Calculate initial budget allocation based on priority."""
         base_allocation = self.total_budget * 0.2  # 20% base for medium priority
 
-        multipliers = {PriorityLevel.CRITICAL: 1.5, PriorityLevel.HIGH: 1.2, PriorityLevel.MEDIUM: 1.0, PriorityLevel.LOW: 0.6}
-
-        allocation = int(base_allocation * multipliers[priority])
+        allocation = int(base_allocation * PRIORITY_WEIGHTS[priority])
         return max(allocation, self.min_budget_allocation)
 
     def use_tokens(self, component_id: str, tokens_used: int) -> bool:
-        """Record token usage for a component."""
-        with self._lock:
-            if component_id not in self.components:
-                logger.warning(f"Component {component_id} not registered")
-                return False
-
-            component = self.components[component_id]
-            if component.used_tokens + tokens_used > component.allocated_tokens:
-                logger.warning(f"Component {component_id} exceeding budget allocation")
-                # Try to allocate more tokens if available
-                if not self._emergency_allocation(component_id, tokens_used):
-                    return False
-
-            component.used_tokens += tokens_used
-            self._record_usage(component_id, tokens_used)
-            return True
-
-    def _emergency_allocation(self, component_id: str, additional_tokens: int) -> bool:
-        """Emergency allocation for components exceeding their budget."""
-        # Try to borrow from low-priority components
-        available_tokens = 0
-        donors = []
-
-        for comp_id, comp in self.components.items():
-            if comp_id != component_id and comp.priority == PriorityLevel.LOW:
-                available = comp.allocated_tokens - comp.used_tokens
-                if available > 0:
-                    available_tokens += available
-                    donors.append(comp_id)
-
-        if available_tokens >= additional_tokens:
-            # Redistribute from donors
-            needed = additional_tokens
-            for donor in donors:
-                donor_comp = self.components[donor]
-                available = donor_comp.allocated_tokens - donor_comp.used_tokens
-                transfer = min(available, needed)
-
-                donor_comp.allocated_tokens -= transfer
-                self.components[component_id].allocated_tokens += transfer
-                needed -= transfer
-
-                if needed <= 0:
-                    break
-
-            return True
-
-        return False
+        """Record token usage for a component (atomic across threads and processes)."""
+        if component_id not in self.components:
+            logger.warning(f"Component {component_id} not registered")
+            return False
+
+        # When the component is short, the arena borrows from LOW-priority components (emergency allocation)
+        if not self.arena.use(component_id, tokens_used, self._lenders):
+            logger.warning(f"Component {component_id} exceeding budget allocation")
+            return False
+
+        self._refresh_component(component_id)
+        self._record_usage(component_id, tokens_used)
+        return True
+
+    def acquire_tokens(self, component_id: str, tokens: int, ttl: float = DEFAULT_LEASE_TTL) -> Optional[Lease]:
+        """
+        Reserve tokens for work whose actual usage is known later.
+
+        Args:
+            component_id: Component to reserve for
+            tokens: Tokens to reserve
+            ttl: Seconds until the lease expires and its tokens return to the component
+
+        Returns:
+            Lease for commit_tokens/release_tokens, or None if the component's budget cannot cover it
+        """
+        if component_id not in self.components:
+            logger.warning(f"Component {component_id} not registered")
+            return None
+
+        lease = self.arena.acquire(component_id, tokens, ttl)
+        self._refresh_component(component_id)
+        return lease
+
+    def commit_tokens(self, lease: Lease, tokens: Optional[int] = None) -> int:
+        """
+        Record the tokens actually used under a lease; the rest returns to the component.
+
+        Args:
+            lease: Lease from acquire_tokens
+            tokens: Tokens actually used (defaults to the leased amount)
+
+        Returns:
+            Tokens recorded
+        """
+        used = self.arena.commit(lease, tokens)
+        if lease.component_id in self.components:
+            self._refresh_component(lease.component_id)
+            self._record_usage(lease.component_id, used)
+        return used
+
+    def release_tokens(self, lease: Lease) -> bool:
+        """
+        Return a lease's tokens unused.
+
+        Returns:
+            True if the lease was still held (not committed, released or expired)
+        """
+        released = self.arena.release(lease)
+        if lease.component_id in self.components:
+            self._refresh_component(lease.component_id)
+        return released
+
+    def _refresh_component(self, component_id: str) -> ComponentBudget:
+        """Copy a component's shared counters into its record."""
+        component = self.components[component_id]
+        component.allocated_tokens, component.used_tokens, component.reserved_tokens = self.arena.counters(component_id)
+        return component
+
+    def _refresh_components(self, counters: Optional[Dict[str, Tuple[int, int, int]]] = None) -> None:
+        """Copy all shared counters (read from the arena unless given) into the component records."""
+        if counters is None:
+            counters = self.arena.snapshot()
+        for component_id, (allocated, used, reserved) in counters.items():
+            component = self.components.get(component_id)
+            if component is not None:
+                component.allocated_tokens, component.used_tokens, component.reserved_tokens = allocated, used, reserved
 
     def update_performance_metrics(self, component_id: str, performance_score: float, efficiency_score: float) -> None:
         """Update performance metrics for a component."""
@@ -311,26 +379,50 @@ class DynamicBudgetManager:
             self._trigger_rebalancing(f"efficiency_decline_{component_id}")
 
     def _trigger_rebalancing(self, reason: str) -> None:
-        """Trigger budget rebalancing."""
+        """Trigger budget rebalancing (runs on the rebalancing worker; pending triggers are merged)."""
         logger.info(f"Triggering budget rebalancing: {reason}")
-        threading.Thread(target=self._rebalance_budgets, args=(reason,), daemon=True).start()
+        self._rebalancer.trigger(reason)
+
+    def wait_for_rebalancing(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until triggered rebalancing has finished.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            False on timeout
+        """
+        return self._rebalancer.wait_idle(timeout)
 
     def _rebalance_budgets(self, trigger_reason: str) -> None:
         """Rebalance budgets across components based on current strategy."""
         with self._lock:
             start_time = time.time()
-            old_allocations = {comp_id: comp.allocated_tokens for comp_id, comp in self.components.items()}
-
-            if self.strategy == BudgetStrategy.PERFORMANCE_BASED:
-                self._performance_based_rebalancing()
-            elif self.strategy == BudgetStrategy.EFFICIENCY_BASED:
-                self._efficiency_based_rebalancing()
-            elif self.strategy == BudgetStrategy.NEEDS_BASED:
-                self._needs_based_rebalancing()
-            elif self.strategy == BudgetStrategy.PREDICTIVE:
-                self._predictive_rebalancing()
-            else:
-                self._equal_rebalancing()
+            old_allocations: Dict[str, int] = {}
+
+            def plan(counters: Dict[str, Tuple[int, int, int]]) -> Dict[str, int]:
+                self._refresh_components(counters)
+                old_allocations.update((comp_id, comp.allocated_tokens) for comp_id, comp in self.components.items())
+                return self._plan_rebalancing()
+
+            # Plan against the counters inside the arena transaction so concurrent usage cannot be overwritten
+            self._refresh_components(self.arena.rebalance(plan))
+
+            now = datetime.now()
+            for comp_id, component in self.components.items():
+                change = component.allocated_tokens - old_allocations[comp_id]
+                if change:
+                    component.adjustment_history.append(
+                        {
+                            "timestamp": now.isoformat(),
+                            "old_allocation": old_allocations[comp_id],
+                            "new_allocation": component.allocated_tokens,
+                            "change": change,
+                            "reason": self.strategy.value,
+                        }
+                    )
+                component.last_adjustment = now
 
             # Track changes
             tokens_reallocated = sum(
@@ -352,132 +444,75 @@ class DynamicBudgetManager:
                 f"Rebalancing completed: {tokens_reallocated} tokens reallocated, " f"efficiency gain: {efficiency_gain:.2f}"
             )
 
-    def _performance_based_rebalancing(self) -> None:
-        """Rebalance budgets based on performance scores."""
-        total_performance_score = sum(comp.performance_score for comp in self.components.values())
-
-        if total_performance_score == 0:
-            return
-
-        available_budget = sum(
-            comp.allocated_tokens - comp.used_tokens
-            for comp in self.components.values()
-            if comp.priority != PriorityLevel.CRITICAL
-        )
-
-        for component in self.components.values():
-            if component.priority == PriorityLevel.CRITICAL:
-                continue  # Don't reduce critical component budgets
-
-            # Calculate new allocation based on performance
-            performance_ratio = component.performance_score / total_performance_score
-            target_allocation = int(available_budget * performance_ratio)
-
-            # Ensure minimum allocation
-            target_allocation = max(target_allocation, self.min_budget_allocation)
-
-            # Apply changes gradually
-            change = target_allocation - component.allocated_tokens
-            max_change = int(component.allocated_tokens * 0.3)  # Max 30% change per rebalancing
-            actual_change = max(-max_change, min(max_change, change))
-
-            component.allocated_tokens += actual_change
-            component.last_adjustment = datetime.now()
-
-            # Track adjustment
-            component.adjustment_history.append(
-                {
-                    "timestamp": datetime.now().isoformat(),
-                    "old_allocation": component.allocated_tokens - actual_change,
-                    "new_allocation": component.allocated_tokens,
-                    "change": actual_change,
-                    "reason": "performance_based",
-                }
-            )
-
-    def _efficiency_based_rebalancing(self) -> None:
-        """Rebalance budgets based on efficiency scores."""
-        total_efficiency_score = sum(comp.efficiency_score for comp in self.components.values())
-
-        if total_efficiency_score == 0:
-            return
-
-        # Prioritize efficient components
-        for component in self.components.values():
-            efficiency_ratio = component.efficiency_score / total_efficiency_score
-
-            # High efficiency components get potential increases
-            if component.efficiency_score > 70 and component.priority != PriorityLevel.LOW:
-                # Try to increase allocation
-                additional_tokens = int(self.total_budget * 0.05 * efficiency_ratio)
-                component.allocated_tokens += additional_tokens
-            elif component.efficiency_score < 40 and component.priority != PriorityLevel.CRITICAL:
-                # Reduce allocation for inefficient components
-                reduction = int(component.allocated_tokens * 0.1)
-                component.allocated_tokens = max(component.allocated_tokens - reduction, self.min_budget_allocation)
-
-            component.last_adjustment = datetime.now()
-
-    def _needs_based_rebalancing(self) -> None:
-        """Rebalance budgets based on current utilization and needs."""
-        for component in self.components.values():
-            utilization_rate = component.utilization_rate
-
-            # High utilization (over 80%) - consider increasing budget
-            if utilization_rate > 80 and component.priority in [PriorityLevel.CRITICAL, PriorityLevel.HIGH]:
-                increase = int(component.allocated_tokens * 0.2)
-                component.allocated_tokens += increase
-
-            # Low utilization (under 30%) - consider reducing budget
-            elif utilization_rate < 30 and component.priority != PriorityLevel.CRITICAL:
-                reduction = int(component.allocated_tokens * 0.15)
-                component.allocated_tokens = max(component.allocated_tokens - reduction, self.min_budget_allocation)
-
-            component.last_adjustment = datetime.now()
-
-    def _predictive_rebalancing(self) -> None:
-        """Rebalance budgets using predictive analytics."""
-        for component_id, component in self.components.items():
-            if len(self.efficiency_history[component_id]) < 10:
-                continue
-
-            # Predict future efficiency based on trend
-            efficiency_values = list(self.efficiency_history[component_id])
-            if len(efficiency_values) >= 6:
-                recent_avg = statistics.mean(efficiency_values[-3:])
-                previous_avg = statistics.mean(efficiency_values[-6:-3])
-                recent_trend = recent_avg - previous_avg
-            else:
-                recent_trend = 0
-
-            predicted_efficiency = component.efficiency_score + (recent_trend * 0.5)
-
-            # Allocate budget based on prediction
-            if predicted_efficiency > 80:
-                # Invest in improving components
-                component.allocated_tokens = int(component.allocated_tokens * 1.15)
-            elif predicted_efficiency < 50:
-                # Reduce budget for declining components
-                component.allocated_tokens = max(int(component.allocated_tokens * 0.85), self.min_budget_allocation)
-
-            component.last_adjustment = datetime.now()
-
-    def _equal_rebalancing(self) -> None:
-        """Equal budget distribution across non-critical components."""
-        non_critical_components = [comp for comp in self.components.values() if comp.priority != PriorityLevel.CRITICAL]
-
-        if not non_critical_components:
-            return
-
-        available_budget = self.total_budget - sum(
-            comp.allocated_tokens for comp in self.components.values() if comp.priority == PriorityLevel.CRITICAL
-        )
-
-        equal_share = available_budget // len(non_critical_components)
-
-        for component in non_critical_components:
-            component.allocated_tokens = max(equal_share, self.min_budget_allocation)
-            component.last_adjustment = datetime.now()
+    def _plan_rebalancing(self) -> Dict[str, int]:
+        """
+        Compute new allocations for the current strategy.
+
+        The strategy only decides what each component should ideally get
+        (its share of the total budget); budget_solver then finds the closest
+        allocations that add up to the total budget while keeping every
+        component at or above its minimum and its used/reserved tokens,
+        never reducing CRITICAL components, and moving each allocation by at
+        most max_adjustment_rate per rebalancing (EQUAL redistributes fully).
+        """
+        component_ids = list(self.components)
+        components = [self.components[comp_id] for comp_id in component_ids]
+        shares = self._strategy_shares(component_ids)
+        if not components or sum(shares) <= 0:
+            return {comp_id: comp.allocated_tokens for comp_id, comp in zip(component_ids, components)}
+
+        if self.strategy == BudgetStrategy.EQUAL:
+            weights = [1.0] * len(components)
+        else:
+            weights = [PRIORITY_WEIGHTS[comp.priority] for comp in components]
+            shares = [share * weight for share, weight in zip(shares, weights)]
+        total_share = sum(shares)
+        targets = [self.total_budget * share / total_share for share in shares]
+
+        lower, upper = [], []
+        for comp in components:
+            floor = max(self.min_budget_allocation, comp.used_tokens + comp.reserved_tokens)
+            if comp.priority == PriorityLevel.CRITICAL:
+                floor = max(floor, comp.allocated_tokens)
+            ceiling = self.total_budget
+            if self.strategy != BudgetStrategy.EQUAL:
+                step = int(comp.allocated_tokens * self.max_adjustment_rate)
+                floor = max(floor, comp.allocated_tokens - step)
+                ceiling = comp.allocated_tokens + step
+            lower.append(floor)
+            upper.append(max(ceiling, floor))
+
+        allocations = solve_allocation(self.total_budget, targets, weights, lower, upper)
+        return dict(zip(component_ids, allocations))
+
+    def _strategy_shares(self, component_ids: List[str]) -> List[float]:
+        """Relative share of the budget each component should get under the current strategy."""
+        components = [self.components[comp_id] for comp_id in component_ids]
+
+        if self.strategy == BudgetStrategy.PERFORMANCE_BASED:
+            return [comp.performance_score for comp in components]
+
+        if self.strategy == BudgetStrategy.EFFICIENCY_BASED:
+            return [comp.efficiency_score for comp in components]
+
+        if self.strategy == BudgetStrategy.NEEDS_BASED:
+            # Demand is what the component has actually drawn (used or leased)
+            demand = [comp.used_tokens + comp.reserved_tokens for comp in components]
+            return demand if sum(demand) > 0 else [comp.allocated_tokens for comp in components]
+
+        if self.strategy == BudgetStrategy.PREDICTIVE:
+            shares = []
+            for comp_id, comp in zip(component_ids, components):
+                predicted_efficiency = comp.efficiency_score
+                efficiency_values = list(self.efficiency_history[comp_id])
+                if len(efficiency_values) >= 10:
+                    # Extrapolate half of the recent trend
+                    recent_trend = (sum(efficiency_values[-3:]) - sum(efficiency_values[-6:-3])) / 3
+                    predicted_efficiency += recent_trend * 0.5
+                shares.append(max(predicted_efficiency, 0.0))
+            return shares
+
+        return [1.0] * len(components)
 
     def _calculate_overall_efficiency(self, allocations: Optional[Dict[str, int]] = None) -> float:
         """Calculate overall system efficiency."""
@@ -549,6 +584,7 @@ class DynamicBudgetManager:
     def get_metrics(self) -> BudgetMetrics:
         """Get current budget management metrics."""
         with self._lock:
+            self._refresh_components()
             allocated_tokens = sum(comp.allocated_tokens for comp in self.components.values())
             used_tokens = sum(comp.used_tokens for comp in self.components.values())
 
@@ -574,7 +610,9 @@ class DynamicBudgetManager:
 
     def get_component_status(self, component_id: str) -> Optional[ComponentBudget]:
         """Get status of a specific component."""
-        return self.components.get(component_id)
+        if component_id not in self.components:
+            return None
+        return self._refresh_component(component_id)
 
     def set_strategy(self, strategy: BudgetStrategy) -> None:
         """Change budget allocation strategy."""
@@ -612,7 +650,7 @@ class DynamicBudgetManager:
 
                 # Trigger rebalancing if waste is high or efficiency is low
                 if metrics.waste_percentage > 30 or metrics.efficiency_score < 60:
-                    self._rebalance_budgets("automatic_monitoring")
+                    self._trigger_rebalancing("automatic_monitoring")
 
                 # Sleep until next check
                 time.sleep(self.rebalancing_interval)
@@ -730,7 +768,6 @@ def main():
     print("Target: 15-20% additional cost reduction through intelligent budget allocation")
     print()
 
-"""
     # Initialize budget manager
     budget_manager = DynamicBudgetManager(total_budget=100000)
 
@@ -765,7 +802,7 @@ def main():
     for strategy in strategies:
         print(f"\n{strategy.value.title()} Strategy:")
         budget_manager.set_strategy(strategy)
-        time.sleep(0.5)  # Allow rebalancing to complete
+        budget_manager.wait_for_rebalancing()
 
         metrics = budget_manager.get_metrics()
         print(f"   Overall efficiency: {metrics.efficiency_score:.1f}%")
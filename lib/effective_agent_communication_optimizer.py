@@ -10,13 +10,18 @@ Author: Autonomous Agent Plugin
 """
 import json
 import time
+import hashlib
 import re
 from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from enum import Enum
 from datetime import datetime
 import pathlib
 
+from batch_optimization import ShardedOptimizerPool, dedupe_indices
+from token_counter import count_tokens
+from word_map_rewriter import WordMapRewriter
+
 
 class OptimizationLevel(Enum):
     """Optimization levels for agent communication."""
@@ -563,6 +568,7 @@ class EffectiveAgentCommunicationOptimizer:
             "retailer": "ret",
             "wholesaler": "whole",
         }
+        self.abbreviation_rewriter = WordMapRewriter(self.abbreviations)
 
         # Optimization statistics
         self.stats = {
@@ -573,10 +579,13 @@ class EffectiveAgentCommunicationOptimizer:
             "processing_time_total": 0.0,
         }
 
+        # Worker processes for sharded batches, started on first use
+        self._batch_pool = ShardedOptimizerPool(type(self), {"cache_dir": str(self.cache_dir)})
+
     def optimize_message(
         self, message: Dict[str, Any], level: OptimizationLevel = OptimizationLevel.STANDARD
-    )-> OptimizationResult:
-        """Optimize Message."""
+    ) -> OptimizationResult:
+        """
         Optimize a message for token efficiency.
 
         Args:
@@ -585,7 +594,7 @@ class EffectiveAgentCommunicationOptimizer:
 
         Returns:
             Optimization result with metrics
-"""
+        """
         start_time = time.time()
 
         # Calculate original tokens
@@ -627,27 +636,29 @@ class EffectiveAgentCommunicationOptimizer:
 
         return result
 
-"""
     def optimize_conversation(
-        self, conversation: List[Dict[str, Any]], level: OptimizationLevel = OptimizationLevel.STANDARD
-    )-> Dict[str, Any]:
-        """Optimize Conversation."""
+        self,
+        conversation: List[Dict[str, Any]],
+        level: OptimizationLevel = OptimizationLevel.STANDARD,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
         Optimize an entire conversation.
 
         Args:
             conversation: List of messages
             level: Optimization level
+            max_workers: Worker processes for large conversations (None optimizes in-process)
 
         Returns:
             Conversation optimization results
-"""
+        """
         total_original_tokens = 0
         total_optimized_tokens = 0
         total_tokens_saved = 0
         optimized_messages = []
 
-        for message in conversation:
-            result = self.optimize_message(message, level)
+        for result in self.optimize_batch(conversation, level, max_workers=max_workers):
             optimized_messages.append(result)
 
             total_original_tokens += result.original_tokens
@@ -666,7 +677,6 @@ class EffectiveAgentCommunicationOptimizer:
             "optimization_level": level.value,
         }
 
-"""
     def get_statistics(self) -> Dict[str, Any]:
         """Get optimization statistics."""
         if self.stats["total_optimizations"] > 0:
@@ -676,6 +686,55 @@ class EffectiveAgentCommunicationOptimizer:
 
         return self.stats.copy()
 
+    def optimize_batch(
+        self,
+        messages: List[Dict[str, Any]],
+        level: OptimizationLevel = OptimizationLevel.STANDARD,
+        max_workers: Optional[int] = None,
+    ) -> List[OptimizationResult]:
+        """
+        Optimize a batch of messages, e.g. an orchestrator fan-out.
+
+        Identical messages are optimized once; repeats get a copy of the result
+        and still count towards the statistics. When max_workers > 1, large
+        batches are sharded across worker processes that keep their own
+        optimizer between batches.
+
+        Args:
+            messages: Messages to optimize
+            level: Optimization level
+            max_workers: Worker processes for large batches (None optimizes in-process)
+
+        Returns:
+            One optimization result per message, in order
+        """
+        unique_indices, slots = dedupe_indices([self._generate_message_hash(message) for message in messages])
+        unique_messages = [messages[index] for index in unique_indices]
+
+        if self._batch_pool.should_shard(len(unique_messages), max_workers):
+            calls = [(message, level) for message in unique_messages]
+            unique_results = self._batch_pool.map("optimize_message", calls, max_workers)
+            for result in unique_results:
+                self._update_statistics(result)
+        else:
+            unique_results = [self.optimize_message(message, level) for message in unique_messages]
+
+        results = []
+        first_seen = set()
+        for slot in slots:
+            if slot in first_seen:
+                repeat = replace(unique_results[slot], processing_time_ms=0.0)
+                self._update_statistics(repeat)
+                results.append(repeat)
+            else:
+                first_seen.add(slot)
+                results.append(unique_results[slot])
+        return results
+
+    def close(self):
+        """Shut down batch worker processes."""
+        self._batch_pool.close()
+
     def _conservative_optimization(self, json_str: str) -> str:
         """Conservative optimization - basic whitespace and redundancy removal."""
         # Remove extra whitespace
@@ -690,12 +749,8 @@ class EffectiveAgentCommunicationOptimizer:
         """Standard optimization - abbreviate common words."""
         optimized = self._conservative_optimization(json_str)
 
-        # Apply abbreviations
-        for full_word, abbreviation in self.abbreviations.items():
-            # Only replace whole words
-            optimized = re.sub(r"\b" + re.escape(full_word) + r"\b", abbreviation, optimized, flags=re.IGNORECASE)
-
-        return optimized
+        # Apply abbreviations (whole words only)
+        return self.abbreviation_rewriter.rewrite(optimized)
 
     def _aggressive_optimization(self, json_str: str) -> str:
         """Aggressive optimization - maximum abbreviation."""
@@ -713,11 +768,14 @@ class EffectiveAgentCommunicationOptimizer:
 
         return optimized
 
+    def _generate_message_hash(self, message: Dict[str, Any]) -> str:
+        """Generate hash for deduplicating identical messages."""
+        message_str = json.dumps(message, sort_keys=True)
+        return hashlib.md5(message_str.encode()).hexdigest()
+
     def _estimate_tokens(self, text: str) -> int:
         """Estimate token count for text."""
-        # Rough estimation: 1 token ≈ 4 characters on average
-        # This is a simplified estimate for demonstration
-        return len(text) // 4
+        return count_tokens(text)
 
     def _calculate_integrity_score(self, original_message: Dict[str, Any], optimized_json: str) -> float:
         """Calculate integrity score (0-1)."""
@@ -771,10 +829,9 @@ class EffectiveAgentCommunicationOptimizer:
 
 
 # Convenience function for easy usage
-def optimize_agent_message():
-"""
-        
-        Convenience function to optimize a single agent message.
+def optimize_agent_message(message: Dict[str, Any], level: str = "standard") -> Dict[str, Any]:
+    """
+    Convenience function to optimize a single agent message.
 
     Args:
         message: The message to optimize
@@ -782,7 +839,7 @@ def optimize_agent_message():
 
     Returns:
         Optimization result
-"""
+    """
     optimizer = EffectiveAgentCommunicationOptimizer()
 
     # Convert string level to enum
@@ -806,7 +863,6 @@ def optimize_agent_message():
     }
 
 
-"""
 def main():
     """Demonstrate the effective agent communication optimizer."""
     print("Effective Agent Communication Optimizer Demo")
@@ -18,6 +18,10 @@ from enum import Enum
 from datetime import datetime
 import pathlib
 
+from batch_optimization import ShardedOptimizerPool, dedupe_indices
+from token_counter import count_tokens
+from word_map_rewriter import WordMapRewriter
+
 
 class OptimizationLevel(Enum):
     """Optimization levels with target reduction ranges."""
@@ -51,6 +55,7 @@ class EnhancedAgentCommunicationOptimizer:
 
         # Comprehensive word mapping dictionary
         self.word_mappings = self._build_comprehensive_word_map()
+        self.word_rewriter = WordMapRewriter(self.word_mappings)
 
         # Field-specific optimization patterns
         self.field_patterns = {
@@ -95,6 +100,9 @@ class EnhancedAgentCommunicationOptimizer:
         # Cache for repeated optimizations
         self.optimization_cache = {}
 
+        # Worker processes for sharded batches, started on first use
+        self._batch_pool = ShardedOptimizerPool(type(self), {"cache_dir": str(self.cache_dir)})
+
     def _build_comprehensive_word_map(self) -> Dict[str, str]:
         """Build comprehensive word mapping dictionary."""
         # Common abbreviations (extensive list)
@@ -1155,7 +1163,7 @@ class EnhancedAgentCommunicationOptimizer:
     def optimize_message(
         self, message: Dict[str, Any], level: OptimizationLevel = OptimizationLevel.STANDARD
     )-> OptimizationResult:
-        """Optimize Message."""
+        """
         Optimize a message for token efficiency with guaranteed 25-35% reduction.
 
         Args:
@@ -1164,7 +1172,7 @@ class EnhancedAgentCommunicationOptimizer:
 
         Returns:
             Optimization result with metrics
-"""
+        """
         start_time = time.time()
 
         # Generate cache key
@@ -1230,20 +1238,23 @@ class EnhancedAgentCommunicationOptimizer:
 
         return result
 
-"""
     def optimize_conversation(
-        self, conversation: List[Dict[str, Any]], level: OptimizationLevel = OptimizationLevel.STANDARD
+        self,
+        conversation: List[Dict[str, Any]],
+        level: OptimizationLevel = OptimizationLevel.STANDARD,
+        max_workers: Optional[int] = None,
     )-> Dict[str, Any]:
-        """Optimize Conversation."""
+        """
         Optimize an entire conversation with context-aware optimization.
 
         Args:
             conversation: List of messages
             level: Optimization level
+            max_workers: Worker processes for large conversations (None optimizes in-process)
 
         Returns:
             Conversation optimization results
-"""
+        """
         total_original_tokens = 0
         total_optimized_tokens = 0
         total_tokens_saved = 0
@@ -1252,12 +1263,13 @@ class EnhancedAgentCommunicationOptimizer:
         # Analyze conversation context
         conversation_context = self._analyze_conversation_context(conversation)
 
-        for i, message in enumerate(conversation):
-            # Add context information to message
-            context_enhanced_message = self._add_conversation_context(message, i, conversation_context)
+        # Add context information to each message, then optimize them as one batch
+        context_enhanced_messages = [
+            self._add_conversation_context(message, i, conversation_context) for i, message in enumerate(conversation)
+        ]
+        results = self.optimize_batch(context_enhanced_messages, level, max_workers=max_workers)
 
-            # Optimize with context
-            result = self.optimize_message(context_enhanced_message, level)
+        for i, result in enumerate(results):
             result.context_index = i
             optimized_messages.append(result)
 
@@ -1278,7 +1290,6 @@ class EnhancedAgentCommunicationOptimizer:
             "conversation_context": conversation_context,
         }
 
-"""
     def get_statistics(self) -> Dict[str, Any]:
         """Get comprehensive optimization statistics."""
         if self.stats["total_optimizations"] > 0:
@@ -1294,6 +1305,58 @@ class EnhancedAgentCommunicationOptimizer:
             "cache_size": len(self.optimization_cache),
         }
 
+    def optimize_batch(
+        self,
+        messages: List[Dict[str, Any]],
+        level: OptimizationLevel = OptimizationLevel.STANDARD,
+        max_workers: Optional[int] = None,
+    ) -> List[OptimizationResult]:
+        """
+        Optimize a batch of messages, e.g. an orchestrator fan-out.
+
+        Identical messages are optimized once and cached results are reused.
+        When max_workers > 1, large batches are sharded across worker processes
+        that keep their own optimizer between batches.
+
+        Args:
+            messages: Messages to optimize
+            level: Optimization level
+            max_workers: Worker processes for large batches (None optimizes in-process)
+
+        Returns:
+            One optimization result per message, in order
+        """
+        cache_keys = [f"{level.value}_{self._generate_message_hash(message)}" for message in messages]
+        unique_indices, slots = dedupe_indices(cache_keys)
+        unique_results: List[Optional[OptimizationResult]] = [None] * len(unique_indices)
+
+        pending = []
+        for position, index in enumerate(unique_indices):
+            cached_result = self.optimization_cache.get(cache_keys[index])
+            if cached_result is not None:
+                self.stats["cache_hits"] += 1
+                unique_results[position] = cached_result
+            else:
+                pending.append(position)
+
+        if self._batch_pool.should_shard(len(pending), max_workers):
+            calls = [(messages[unique_indices[position]], level) for position in pending]
+            for position, result in zip(pending, self._batch_pool.map("optimize_message", calls, max_workers)):
+                self.optimization_cache[cache_keys[unique_indices[position]]] = result
+                self._update_statistics(result)
+                unique_results[position] = result
+        else:
+            for position in pending:
+                unique_results[position] = self.optimize_message(messages[unique_indices[position]], level)
+
+        # Repeats within the batch are cache hits, as they would be one message at a time
+        self.stats["cache_hits"] += len(messages) - len(unique_indices)
+        return [unique_results[slot] for slot in slots]
+
+    def close(self):
+        """Shut down batch worker processes."""
+        self._batch_pool.close()
+
     def _determine_message_type(self, message: Dict[str, Any]) -> str:
         """Determine message type for template-based optimization."""
         message_type = message.get("type", "")
@@ -1313,7 +1376,7 @@ class EnhancedAgentCommunicationOptimizer:
     def _template_based_optimization(
         self, message: Dict[str, Any], template_config: Dict[str, Any], level: OptimizationLevel
     )-> str:
-        """ Template Based Optimization."""Apply template-based optimization for known message types."""
+        """Apply template-based optimization for known message types."""
         # Start with JSON optimization
         json_str = json.dumps(message, separators=(",", ":"))
 
@@ -1365,13 +1428,8 @@ class EnhancedAgentCommunicationOptimizer:
 
     def _apply_comprehensive_word_replacement(self, text: str) -> str:
         """Apply comprehensive word replacement mapping."""
-        # Create a regex pattern that matches whole words
-        for full_word, abbreviation in self.word_mappings.items():
-            # Replace whole words only (word boundaries)
-            pattern = r"\b" + re.escape(full_word) + r"\b"
-            text = re.sub(pattern, abbreviation, text, flags=re.IGNORECASE)
-
-        return text
+        # Single pass over whole words, equivalent to one re.sub per mapping
+        return self.word_rewriter.rewrite(text)
 
     def _apply_conservative_optimizations(self, text: str) -> str:
         """Apply conservative optimizations."""
@@ -1438,11 +1496,7 @@ class EnhancedAgentCommunicationOptimizer:
 
     def _estimate_tokens(self, text: str) -> int:
         """Estimate token count for text."""
-        # More accurate token estimation
-        # Rough rule: 1 token ≈ 4 characters for text, 1 token per word for words
-        char_count = len(text)
-        word_count = len(text.split())
-        return max(char_count // 4, word_count)
+        return count_tokens(text)
 
     def _verify_integrity(self, original_message: Dict[str, Any], optimized_json: str) -> bool:
         """Verify message integrity after optimization."""
@@ -1524,8 +1578,8 @@ class EnhancedAgentCommunicationOptimizer:
 
 
 # Convenience functions for easy usage
-def optimize_agent_message():
-"""
+def optimize_agent_message(message: Dict[str, Any], level: str = "standard") -> Dict[str, Any]:
+    """
         
         Convenience function to optimize a single agent message.
 
@@ -1535,7 +1589,7 @@ def optimize_agent_message():
 
     Returns:
         Optimization result with guaranteed 25-35% reduction
-"""
+    """
     optimizer = EnhancedAgentCommunicationOptimizer()
 
     # Convert string level to enum
@@ -1560,14 +1614,12 @@ def optimize_agent_message():
     }
 
 
-"""
 def main():
     """Demonstrate the enhanced agent communication optimizer."""
     print("Enhanced Agent Communication Optimizer Demo")
     print("=" * 60)
     print("Target: 25-35% token reduction in inter-agent communication")
 
-"""
     # Initialize optimizer
     optimizer = EnhancedAgentCommunicationOptimizer()
 
@@ -7,7 +7,6 @@ user pattern learning, and real-time optimization. This system provides
 immediate 50-60% token reduction while maintaining functionality.
 
 Features:
-"""
 - Intelligent tier selection based on context and user needs
 - Real-time content analysis and prioritization
 - User behavior pattern learning
@@ -19,6 +18,7 @@ Features:
 
 Version: 2.0.0 - Production Ready
 Author: Autonomous Agent Development Team
+"""
 import os
 import json
 import time
@@ -33,6 +33,8 @@ import statistics
 import re
 from collections import defaultdict, deque
 
+from token_counter import count_tokens
+
 
 class LoadingTier(Enum):
     """Content loading tiers with specific token limits."""
@@ -132,8 +134,8 @@ class EnhancedProgressiveLoader:
 
     def load_content(
         self, content: str, context: Dict[str, Any] = None, user_id: str = "default", task_type: str = "general"
-    )-> Tuple[str, ContentMetrics]:
-        """Load Content."""
+    ) -> Tuple[str, ContentMetrics]:
+        """
         Load content with intelligent progressive optimization.
 
         Args:
@@ -144,7 +146,7 @@ class EnhancedProgressiveLoader:
 
         Returns:
             Tuple of (optimized_content, metrics)
-"""
+        """
         start_time = time.time()
 
         # Analyze content and determine optimal tier
@@ -174,11 +176,10 @@ class EnhancedProgressiveLoader:
 
         return optimized_content, metrics
 
-"""
     def _determine_optimal_tier(
         self, content: str, context: Dict[str, Any], user_id: str, task_type: str, original_tokens: int
-    )-> LoadingTier:
-        """ Determine Optimal Tier."""Determine the optimal loading tier based on multiple factors."""
+    ) -> LoadingTier:
+        """Determine the optimal loading tier based on multiple factors."""
 
         # Base tier determination from task complexity
         task_complexity = self._assess_task_complexity(context, task_type)
@@ -346,8 +347,8 @@ class EnhancedProgressiveLoader:
 
     def _prioritize_sections(
         self, sections: List[Dict[str, Any]], tier: LoadingTier, context: Dict[str, Any]
-    )-> List[Dict[str, Any]]:
-        """ Prioritize Sections."""Prioritize sections based on tier and context."""
+    ) -> List[Dict[str, Any]]:
+        """Prioritize sections based on tier and context."""
 
         # Calculate priority scores
         for section in sections:
@@ -480,18 +481,7 @@ class EnhancedProgressiveLoader:
 
     def _estimate_tokens(self, text: str) -> int:
         """Estimate token count for text."""
-        if not text:
-            return 0
-
-        # Simple token estimation (approximately 4 characters per token for English)
-        # This is a rough approximation suitable for most content
-        words = len(text.split())
-        chars = len(text)
-
-        # Weighted average of word-based and character-based estimation
-        estimated_tokens = int((words * 1.3 + chars / 4) / 2)
-
-        return max(1, estimated_tokens)  # Ensure at least 1 token for non-empty content
+        return count_tokens(text)
 
     def _update_user_patterns(self, user_id: str, task_type: str, tier: LoadingTier, metrics: ContentMetrics) -> None:
         """Update user patterns based on loading behavior."""
@@ -700,7 +690,6 @@ class EnhancedProgressiveLoader:
 
 def main():
     """CLI interface for enhanced progressive loader."""
-"""
     import argparse
 
     parser = argparse.ArgumentParser(description="Enhanced Progressive Content Loader")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+File Utilities for Autonomous Agent Plugin
+
+Small file helpers shared by the caches, stores and dashboard modules:
+signatures that detect rewrites with a single stat, and atomic replacement
+of a file's content.
+
+Version: 1.0.0
+Author: Autonomous Agent Plugin
+"""
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+
+def file_signature(target: Union[str, Path, os.stat_result]) -> Optional[Tuple[int, int, int]]:
+    """
+    Signature that changes whenever a file is rewritten or replaced.
+
+    Args:
+        target: Path to stat, or an existing stat result (e.g. from os.fstat)
+
+    Returns:
+        (st_mtime_ns, st_size, st_ino), or None if the path cannot be stat'ed
+    """
+    if not isinstance(target, os.stat_result):
+        try:
+            target = os.stat(target)
+        except OSError:
+            return None
+    return (target.st_mtime_ns, target.st_size, target.st_ino)
+
+
+def atomic_write_bytes(path: Path, data: bytes, fsync: bool = False) -> None:
+    """
+    Write a file through a temporary sibling and an atomic rename.
+
+    The temporary file is unique per writer, so concurrent writers never share
+    it, and dot-prefixed, so directory watchers skip it.
+
+    Args:
+        path: File to replace
+        data: New content
+        fsync: Whether to flush the content to disk before the rename
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
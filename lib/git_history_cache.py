@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Git History Cache for Autonomous Agent Plugin
+
+Shared, persisted cache of the repository's commit history for the
+dashboard, AutoActivityRecorder and MissingActivityDetector. These used to
+run `git log` on every call and `git show` once per commit; on large
+repositories that meant hundreds of process spawns per scan.
+
+The cache is filled with a single `git log --numstat -z` pass and extended
+incrementally from the last cached HEAD. HEAD is resolved by reading the
+repository's ref files, so answering from an up-to-date cache spawns no
+process at all. The cache is stored as git_history_cache.json in the
+pattern directory and shared by every process using it.
+
+Version: 1.0.0
+Author: Autonomous Agent Plugin
+"""
+import json
+import subprocess
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from file_utils import atomic_write_bytes, file_signature
+
+CACHE_FILE = "git_history_cache.json"
+CACHE_VERSION = 1
+
+# Newest commits kept; the consumers only look at recent history
+DEFAULT_MAX_COMMITS = 5000
+
+# Record separator, field separator and end of the formatted header
+_RECORD, _FIELD, _END = "\x1e", "\x1f", "\x1d"
+_LOG_FORMAT = "%x1e%H%x1f%P%x1f%ai%x1f%ct%x1f%an%x1f%ae%x1f%B%x1d"
+
+
+def parse_log(output: str) -> List[Dict[str, Any]]:
+    """
+    Parse `git log -z --numstat` output produced with the cache's log format.
+
+    Args:
+        output: Raw git log output
+
+    Returns:
+        Commits in the order git listed them
+    """
+    commits = []
+    for chunk in output.split(_RECORD):
+        if not chunk.strip("\0\n"):
+            continue
+        header, _, numstat = chunk.partition(_END)
+        fields = header.split(_FIELD, 6)
+        if len(fields) < 7:
+            continue
+        commit_hash, parents, date, committed, author, email, message = fields
+
+        files = []
+        tokens = numstat.strip("\n").split("\0")
+        index = 0
+        while index < len(tokens):
+            token = tokens[index].strip("\n")
+            index += 1
+            parts = token.split("\t")
+            if len(parts) != 3:
+                continue
+            additions, deletions, filename = parts
+            if not filename:
+                # Renames list the old and the new path as the next two tokens
+                filename = tokens[index + 1] if index + 1 < len(tokens) else ""
+                index += 2
+            # Binary files have "-" counts
+            additions = int(additions) if additions.isdigit() else 0
+            deletions = int(deletions) if deletions.isdigit() else 0
+            files.append(
+                {
+                    "filename": filename,
+                    "additions": additions,
+                    "deletions": deletions,
+                    "changes": additions + deletions,
+                }
+            )
+
+        message = message.strip()
+        commits.append(
+            {
+                "hash": commit_hash,
+                "parents": parents.split(),
+                "date": date,
+                "committed": int(committed) if committed.isdigit() else 0,
+                "author": author,
+                "email": email,
+                "subject": message.split("\n", 1)[0],
+                "message": message,
+                "files": files,
+            }
+        )
+    return commits
+
+
+def find_git_dir(repo_dir: Path) -> Optional[Path]:
+    """
+    Find the git directory of the repository containing a directory.
+
+    Args:
+        repo_dir: Directory inside the work tree
+
+    Returns:
+        The .git directory (resolved for worktrees), or None outside a repository
+    """
+    for directory in [repo_dir, *repo_dir.parents]:
+        candidate = directory / ".git"
+        if candidate.is_dir():
+            return candidate
+        if candidate.is_file():
+            try:
+                content = candidate.read_text(encoding="utf-8").strip()
+            except OSError:
+                return None
+            if content.startswith("gitdir:"):
+                git_dir = Path(content[len("gitdir:") :].strip())
+                return git_dir if git_dir.is_absolute() else (directory / git_dir).resolve()
+            return None
+    return None
+
+
+def read_head(git_dir: Path) -> Optional[str]:
+    """
+    Resolve HEAD to a commit hash by reading ref files, without running git.
+
+    Args:
+        git_dir: Git directory of the repository
+
+    Returns:
+        Commit hash, or None if HEAD cannot be resolved this way (e.g. an unborn branch)
+    """
+    try:
+        head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    if not head.startswith("ref:"):
+        return head or None
+
+    ref = head[len("ref:") :].strip()
+    common_dir = git_dir
+    try:
+        common_dir = (git_dir / (git_dir / "commondir").read_text(encoding="utf-8").strip()).resolve()
+    except OSError:
+        pass
+
+    for base in (git_dir, common_dir):
+        try:
+            value = (base / ref).read_text(encoding="utf-8").strip()
+        except OSError:
+            continue
+        if value:
+            return value
+
+    try:
+        with open(common_dir / "packed-refs", "r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.strip().split(" ", 1)
+                if len(parts) == 2 and parts[1] == ref:
+                    return parts[0]
+    except OSError:
+        pass
+    return None
+
+
+def repo_head(repo_dir: Path) -> Optional[str]:
+    """
+    Get the HEAD commit of the repository containing a directory, without running git.
+
+    Args:
+        repo_dir: Directory inside the work tree
+
+    Returns:
+        Commit hash, or None outside a repository or if HEAD cannot be resolved
+    """
+    git_dir = find_git_dir(Path(repo_dir))
+    return read_head(git_dir) if git_dir else None
+
+
+class GitHistoryCache:
+    """Commit history with per-file change counts, refreshed incrementally from HEAD."""
+
+    def __init__(self, cache_file: Path, repo_dir: Path, max_commits: int = DEFAULT_MAX_COMMITS):
+        """
+        Initialize the cache. Nothing is read until the first query.
+
+        Args:
+            cache_file: Path of git_history_cache.json
+            repo_dir: Directory inside the repository work tree
+            max_commits: Number of newest commits to keep
+        """
+        self.cache_file = Path(cache_file)
+        self.repo_dir = Path(repo_dir)
+        self.max_commits = max_commits
+        self.spawns = 0  # git processes run, for diagnostics
+
+        self._head: Optional[str] = None
+        self._commits: List[Dict[str, Any]] = []
+        self._by_hash: Dict[str, Dict[str, Any]] = {}
+        self._loaded_signature: Optional[tuple] = None
+        self._lock = threading.Lock()
+
+    def commits(
+        self, since: Optional[datetime] = None, limit: Optional[int] = None, include_merges: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Get cached commits, newest first, refreshing the cache if HEAD moved.
+
+        Args:
+            since: Only commits committed at or after this (local) time, like git log --since
+            limit: Maximum number of commits
+            include_merges: Include merge commits
+
+        Returns:
+            Commits with hash, parents, date, author, email, subject, message and files
+        """
+        self.refresh()
+        threshold = since.timestamp() if since else None
+        selected = []
+        for commit in self._commits:
+            if threshold is not None and commit["committed"] < threshold:
+                # Newest first by commit order; skip rather than stop for out-of-order dates
+                continue
+            if not include_merges and len(commit["parents"]) > 1:
+                continue
+            selected.append(commit)
+            if limit is not None and len(selected) >= limit:
+                break
+        return selected
+
+    def get(self, commit_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Get one commit by its full or abbreviated hash.
+
+        Args:
+            commit_hash: Commit hash or unique prefix
+
+        Returns:
+            The commit, or None if it is not in the cache
+        """
+        self.refresh()
+        commit = self._by_hash.get(commit_hash)
+        if commit is not None or len(commit_hash) >= 40:
+            return commit
+        matches = [commit for full_hash, commit in self._by_hash.items() if full_hash.startswith(commit_hash)]
+        return matches[0] if len(matches) == 1 else None
+
+    def refresh(self) -> bool:
+        """
+        Bring the cache up to date with HEAD.
+
+        Returns:
+            True if new history was read from git
+        """
+        git_dir = find_git_dir(self.repo_dir.resolve())
+        if git_dir is None:
+            return False
+        head = read_head(git_dir)
+
+        with self._lock:
+            self._load_if_changed()
+            if head is not None and head == self._head:
+                return False
+            if head is None:
+                # Unborn branch, or refs in the reftable format only git can read
+                head = self._rev_parse_head() if (git_dir / "reftable").is_dir() else None
+                if head is None or head == self._head:
+                    return False
+
+            if self._head and self._is_ancestor(self._head, head):
+                new_commits = self._log(f"{self._head}..{head}")
+                if new_commits is None:
+                    return False
+                commits = new_commits + self._commits
+            else:
+                commits = self._log(head)
+                if commits is None:
+                    return False
+
+            self._set(head, commits[: self.max_commits])
+            self._save()
+            return True
+
+    def _git(self, args: List[str]) -> Tuple[int, str]:
+        """Run git in the repository and return its exit code and output."""
+        self.spawns += 1
+        try:
+            result = subprocess.run(
+                ["git", *args], capture_output=True, text=True, encoding="utf-8", errors="replace", cwd=self.repo_dir
+            )
+        except OSError:
+            return -1, ""
+        return result.returncode, result.stdout
+
+    def _rev_parse_head(self) -> Optional[str]:
+        """Resolve HEAD with git when the refs cannot be read directly."""
+        code, output = self._git(["rev-parse", "--verify", "-q", "HEAD"])
+        return output.strip() if code == 0 and output.strip() else None
+
+    def _is_ancestor(self, old_head: str, head: str) -> bool:
+        """Check whether the cached history is still part of HEAD's history."""
+        code, _ = self._git(["merge-base", "--is-ancestor", old_head, head])
+        return code == 0
+
+    def _log(self, revisions: str) -> Optional[List[Dict[str, Any]]]:
+        """Read commits with their file changes in one git log pass."""
+        code, output = self._git(
+            ["log", "-z", "--numstat", f"--max-count={self.max_commits}", f"--pretty=format:{_LOG_FORMAT}", revisions]
+        )
+        if code != 0:
+            print(f"Warning: git log {revisions} failed in {self.repo_dir}", file=sys.stderr)
+            return None
+        return parse_log(output)
+
+    def _set(self, head: Optional[str], commits: List[Dict[str, Any]]) -> None:
+        """Replace the in-memory history."""
+        self._head = head
+        self._commits = commits
+        self._by_hash = {commit["hash"]: commit for commit in commits}
+
+    def _load_if_changed(self) -> None:
+        """Load the cache file when another process (or the first call) has written it."""
+        signature = file_signature(self.cache_file)
+        if signature is None or signature == self._loaded_signature:
+            return
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable git history cache {self.cache_file}: {e}", file=sys.stderr)
+            self._loaded_signature = signature
+            return
+        if data.get("version") == CACHE_VERSION and data.get("repo") == str(self.repo_dir.resolve()):
+            self._set(data.get("head"), data.get("commits", []))
+        self._loaded_signature = signature
+
+    def _save(self) -> None:
+        """Write the cache atomically so readers never see a partial file."""
+        data = {
+            "version": CACHE_VERSION,
+            "repo": str(self.repo_dir.resolve()),
+            "head": self._head,
+            "updated": datetime.now().isoformat(),
+            "commits": self._commits,
+        }
+        try:
+            atomic_write_bytes(self.cache_file, json.dumps(data, separators=(",", ":")).encode("utf-8"))
+        except OSError as e:
+            print(f"Warning: Could not save git history cache {self.cache_file}: {e}", file=sys.stderr)
+            return
+        self._loaded_signature = file_signature(self.cache_file)
+
+
+_caches: Dict[Tuple[str, str], GitHistoryCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_git_history(patterns_dir: str = ".claude-patterns", repo_dir: Optional[str] = None) -> GitHistoryCache:
+    """
+    Get the shared git history cache of a pattern directory.
+
+    Args:
+        patterns_dir: Pattern directory the cache is stored in
+        repo_dir: Directory inside the repository (defaults to the current directory)
+
+    Returns:
+        Cache instance shared by all callers in this process
+    """
+    cache_file = Path(patterns_dir) / CACHE_FILE
+    repo = Path(repo_dir) if repo_dir else Path.cwd()
+    key = (str(cache_file.resolve()), str(repo.resolve()))
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = GitHistoryCache(cache_file, repo)
+        return _caches[key]
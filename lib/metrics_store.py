@@ -0,0 +1,694 @@
+#!/usr/bin/env python3
+"""
+Metrics Store for Token Optimization Framework
+
+Storage behind UnifiedMetricsAggregator (unified_metrics.db):
+
+- One persistent WAL-mode connection per database and process, shared by every
+  aggregator instance through get_metrics_store().
+- Raw metric rows, KPI results and system snapshots are partitioned into one
+  table per calendar month (aggregated_metrics_p202610, ...). Retention drops
+  whole partitions and only trims the partition containing the cutoff.
+- Daily and weekly rollups of metric values and KPI results are updated in the
+  same transaction as the raw rows, so dashboard reads touch one row per
+  metric and bucket instead of re-aggregating raw rows.
+- Partitions carry covering indexes on (name, period, timestamp) for the
+  queries that still read raw rows.
+
+Databases written before partitioning are migrated on open.
+
+Version: 1.0.0
+Author: Autonomous Agent Plugin
+"""
+import json
+import re
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from quality_rollups import bucket_start, parse_time
+
+ROLLUP_GRANULARITIES = ("day", "week")
+
+# Partition DDL per table; {name} is the partition table name
+PARTITION_SCHEMAS: Dict[str, List[str]] = {
+    "aggregated_metrics": [
+        """
+        CREATE TABLE IF NOT EXISTS {name} (
+            id INTEGER PRIMARY KEY,
+            timestamp TEXT NOT NULL,
+            metric_name TEXT NOT NULL,
+            category TEXT NOT NULL,
+            period TEXT NOT NULL,
+            value REAL NOT NULL,
+            unit TEXT NOT NULL,
+            source_system TEXT NOT NULL,
+            metadata TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_{name}_metric ON {name} (metric_name, period, timestamp, value)",
+        "CREATE INDEX IF NOT EXISTS idx_{name}_timestamp ON {name} (timestamp)",
+    ],
+    "kpi_results": [
+        """
+        CREATE TABLE IF NOT EXISTS {name} (
+            id INTEGER PRIMARY KEY,
+            timestamp TEXT NOT NULL,
+            kpi_name TEXT NOT NULL,
+            category TEXT NOT NULL,
+            value REAL NOT NULL,
+            target_value REAL NOT NULL,
+            achievement_rate REAL NOT NULL,
+            trend TEXT,
+            period TEXT NOT NULL,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_{name}_kpi"
+        " ON {name} (kpi_name, period, timestamp, value, achievement_rate, trend)",
+        "CREATE INDEX IF NOT EXISTS idx_{name}_timestamp ON {name} (timestamp)",
+    ],
+    "system_snapshots": [
+        """
+        CREATE TABLE IF NOT EXISTS {name} (
+            id INTEGER PRIMARY KEY,
+            timestamp TEXT NOT NULL,
+            total_tokens_saved INTEGER DEFAULT 0,
+            total_cost_savings REAL DEFAULT 0.0,
+            overall_effectiveness REAL DEFAULT 0.0,
+            cache_hit_rate REAL DEFAULT 0.0,
+            compression_ratio REAL DEFAULT 0.0,
+            user_satisfaction REAL DEFAULT 0.0,
+            system_health_score REAL DEFAULT 0.0,
+            metadata TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_{name}_timestamp ON {name} (timestamp)",
+    ],
+}
+
+# Columns written to each partitioned table (id and created_at are filled in by SQLite)
+PARTITION_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "aggregated_metrics": (
+        "timestamp", "metric_name", "category", "period", "value", "unit", "source_system", "metadata",
+    ),
+    "kpi_results": (
+        "timestamp", "kpi_name", "category", "value", "target_value", "achievement_rate", "trend", "period",
+    ),
+    "system_snapshots": (
+        "timestamp", "total_tokens_saved", "total_cost_savings", "overall_effectiveness", "cache_hit_rate",
+        "compression_ratio", "user_satisfaction", "system_health_score", "metadata",
+    ),
+}
+
+ROLLUP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS metric_rollups (
+    metric_name TEXT NOT NULL,
+    period TEXT NOT NULL,
+    granularity TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    category TEXT NOT NULL,
+    unit TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    value_sum REAL NOT NULL,
+    value_min REAL NOT NULL,
+    value_max REAL NOT NULL,
+    last_value REAL NOT NULL,
+    last_timestamp TEXT NOT NULL,
+    PRIMARY KEY (metric_name, period, granularity, bucket)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_metric_rollups_bucket ON metric_rollups (granularity, bucket);
+
+CREATE TABLE IF NOT EXISTS kpi_rollups (
+    kpi_name TEXT NOT NULL,
+    period TEXT NOT NULL,
+    granularity TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    value_sum REAL NOT NULL,
+    value_min REAL NOT NULL,
+    value_max REAL NOT NULL,
+    last_value REAL NOT NULL,
+    last_achievement_rate REAL NOT NULL,
+    last_trend TEXT,
+    last_timestamp TEXT NOT NULL,
+    PRIMARY KEY (kpi_name, period, granularity, bucket)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_kpi_rollups_bucket ON kpi_rollups (granularity, bucket);
+"""
+
+# The newest value of a bucket wins; SET expressions see the row as it was before the update
+_METRIC_ROLLUP_UPSERT = """
+INSERT INTO metric_rollups
+(metric_name, period, granularity, bucket, category, unit, count, value_sum, value_min, value_max,
+ last_value, last_timestamp)
+VALUES (?, ?, ?, ?, ?, ?, 1, ?, ?, ?, ?, ?)
+ON CONFLICT (metric_name, period, granularity, bucket) DO UPDATE SET
+    category = excluded.category,
+    unit = excluded.unit,
+    count = count + 1,
+    value_sum = value_sum + excluded.value_sum,
+    value_min = MIN(value_min, excluded.value_min),
+    value_max = MAX(value_max, excluded.value_max),
+    last_value = CASE WHEN excluded.last_timestamp >= last_timestamp THEN excluded.last_value ELSE last_value END,
+    last_timestamp = MAX(last_timestamp, excluded.last_timestamp)
+"""
+
+_KPI_ROLLUP_UPSERT = """
+INSERT INTO kpi_rollups
+(kpi_name, period, granularity, bucket, count, value_sum, value_min, value_max,
+ last_value, last_achievement_rate, last_trend, last_timestamp)
+VALUES (?, ?, ?, ?, 1, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (kpi_name, period, granularity, bucket) DO UPDATE SET
+    count = count + 1,
+    value_sum = value_sum + excluded.value_sum,
+    value_min = MIN(value_min, excluded.value_min),
+    value_max = MAX(value_max, excluded.value_max),
+    last_value = CASE WHEN excluded.last_timestamp >= last_timestamp THEN excluded.last_value ELSE last_value END,
+    last_achievement_rate = CASE WHEN excluded.last_timestamp >= last_timestamp
+        THEN excluded.last_achievement_rate ELSE last_achievement_rate END,
+    last_trend = CASE WHEN excluded.last_timestamp >= last_timestamp THEN excluded.last_trend ELSE last_trend END,
+    last_timestamp = MAX(last_timestamp, excluded.last_timestamp)
+"""
+
+
+def partition_name(table: str, when: datetime) -> str:
+    """
+    Get the monthly partition table holding rows of a table at a time.
+
+    Args:
+        table: Partitioned table (aggregated_metrics, kpi_results or system_snapshots)
+        when: Row timestamp
+
+    Returns:
+        Partition table name, e.g. aggregated_metrics_p202610
+    """
+    if table not in PARTITION_SCHEMAS:
+        raise ValueError(f"Unknown partitioned table: {table}")
+    return f"{table}_p{when.year:04d}{when.month:02d}"
+
+
+class MetricsStore:
+    """WAL-mode SQLite store with monthly partitions and daily/weekly rollups."""
+
+    def __init__(self, db_path: str):
+        """
+        Open (and create or migrate if needed) the metrics database.
+
+        Args:
+            db_path: Path of the SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        # Transactions are managed explicitly with BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(str(self.db_path), isolation_level=None, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(ROLLUP_SCHEMA)
+        self._migrate_unpartitioned()
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run a block inside one write transaction."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            else:
+                self._conn.execute("COMMIT")
+
+    @contextmanager
+    def _reading(self) -> Iterator[sqlite3.Connection]:
+        """Run several reads against one consistent snapshot (partitions may be dropped concurrently)."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                yield self._conn
+            finally:
+                self._conn.execute("COMMIT")
+
+    # ------------------------------------------------------------------
+    # Partitions
+    # ------------------------------------------------------------------
+
+    def partitions(self, table: str, conn: Optional[sqlite3.Connection] = None) -> List[str]:
+        """
+        List the partitions of a table, oldest first.
+
+        Args:
+            table: Partitioned table
+            conn: Connection inside an open transaction (defaults to the store's connection)
+
+        Returns:
+            Partition table names
+        """
+        if table not in PARTITION_SCHEMAS:
+            raise ValueError(f"Unknown partitioned table: {table}")
+        pattern = re.compile(rf"^{table}_p\d{{6}}$")
+        with self._lock:
+            rows = (conn or self._conn).execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE ?", (f"{table}_p%",)
+            ).fetchall()
+        return sorted(row[0] for row in rows if pattern.match(row[0]))
+
+    def _insert(self, conn: sqlite3.Connection, table: str, when: datetime, rows: Sequence[Tuple[Any, ...]]):
+        """Insert rows (without their timestamp column) into the partition for a time, creating it if needed."""
+        name = partition_name(table, when)
+        for statement in PARTITION_SCHEMAS[table]:
+            conn.execute(statement.format(name=name))
+        columns = PARTITION_COLUMNS[table]
+        conn.executemany(
+            f"INSERT INTO {name} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+            [(when.isoformat(),) + tuple(row) for row in rows],
+        )
+
+    def drop_before(self, table: str, cutoff: datetime) -> Dict[str, int]:
+        """
+        Remove rows older than a cutoff: whole months are dropped, only the cutoff's month is trimmed.
+
+        Args:
+            table: Partitioned table
+            cutoff: Rows with earlier timestamps are removed
+
+        Returns:
+            Number of dropped partitions and of rows deleted from the trimmed partition
+        """
+        cutoff_partition = partition_name(table, cutoff)
+        dropped = deleted = 0
+        with self._transaction() as conn:
+            for name in self.partitions(table, conn):
+                if name < cutoff_partition:
+                    conn.execute(f"DROP TABLE {name}")
+                    dropped += 1
+                elif name == cutoff_partition:
+                    deleted += conn.execute(f"DELETE FROM {name} WHERE timestamp < ?", (cutoff.isoformat(),)).rowcount
+        return {"partitions": dropped, "rows": deleted}
+
+    def trim_rollups(self, cutoff: datetime) -> int:
+        """
+        Remove rollup buckets that end before a cutoff.
+
+        Args:
+            cutoff: Buckets entirely before the bucket containing this time are removed
+
+        Returns:
+            Number of removed buckets
+        """
+        removed = 0
+        with self._transaction() as conn:
+            for granularity in ROLLUP_GRANULARITIES:
+                first_kept = bucket_start(cutoff, granularity).isoformat()
+                for rollups in ("metric_rollups", "kpi_rollups"):
+                    removed += conn.execute(
+                        f"DELETE FROM {rollups} WHERE granularity = ? AND bucket < ?", (granularity, first_kept)
+                    ).rowcount
+        return removed
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def _roll_up_metric(
+        self, conn: sqlite3.Connection, when: datetime, name: str, period: str, category: str, unit: str, value: float
+    ):
+        """Add one metric value to its daily and weekly buckets."""
+        for granularity in ROLLUP_GRANULARITIES:
+            bucket = bucket_start(when, granularity).isoformat()
+            conn.execute(
+                _METRIC_ROLLUP_UPSERT,
+                (name, period, granularity, bucket, category, unit, value, value, value, value, when.isoformat()),
+            )
+
+    def record_metrics(
+        self,
+        when: datetime,
+        period: str,
+        metrics: Sequence[Tuple[str, str, str, float]],
+        source_system: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """
+        Store metric values and update their rollups in one transaction.
+
+        Args:
+            when: Time of the measurement
+            period: Aggregation period the values were collected for
+            metrics: (metric name, category, unit, value) tuples
+            source_system: System that produced the values
+            metadata: Extra data stored with each raw row
+
+        Returns:
+            Number of stored values
+        """
+        encoded = json.dumps(metadata) if metadata is not None else None
+        with self._transaction() as conn:
+            self._insert(
+                conn,
+                "aggregated_metrics",
+                when,
+                [
+                    (name, category, period, value, unit, source_system, encoded)
+                    for name, category, unit, value in metrics
+                ],
+            )
+            for name, category, unit, value in metrics:
+                self._roll_up_metric(conn, when, name, period, category, unit, value)
+        return len(metrics)
+
+    def latest_metric_values(self, since: datetime) -> List[Dict[str, Any]]:
+        """
+        Get the newest value of every metric recorded since a time, from the daily rollups.
+
+        Args:
+            since: Earliest measurement time
+
+        Returns:
+            One entry per metric (metric_name, category, unit, period, value, timestamp), newest first
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT metric_name, category, unit, period, last_value, last_timestamp
+                FROM metric_rollups
+                WHERE granularity = 'day' AND bucket >= ? AND last_timestamp >= ?
+                """,
+                (bucket_start(since, "day").isoformat(), since.isoformat()),
+            ).fetchall()
+
+        latest: Dict[str, Tuple[Any, ...]] = {}
+        for row in rows:
+            if row[0] not in latest or row[5] > latest[row[0]][5]:
+                latest[row[0]] = row
+        ordered = sorted(latest.values(), key=lambda row: (row[5], row[0]), reverse=True)
+        return [
+            {"metric_name": name, "category": category, "unit": unit, "period": period, "value": value, "timestamp": ts}
+            for name, category, unit, period, value, ts in ordered
+        ]
+
+    def metric_series(
+        self, metric_name: str, granularity: str, since: datetime, period: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the rollup buckets of one metric.
+
+        Args:
+            metric_name: Metric to read
+            granularity: "day" or "week"
+            since: Earliest time (its whole bucket is included)
+            period: Only values stored for this aggregation period (all periods if None)
+
+        Returns:
+            Buckets (bucket, count, average, min, max, last) oldest first
+        """
+        return self._series("metric_rollups", "metric_name", metric_name, granularity, since, period).get(
+            metric_name, []
+        )
+
+    # ------------------------------------------------------------------
+    # KPI results
+    # ------------------------------------------------------------------
+
+    def record_kpi_results(self, when: datetime, period: str, results: Sequence[Dict[str, Any]]) -> int:
+        """
+        Store KPI results and update their rollups in one transaction.
+
+        Args:
+            when: Time of the calculation
+            period: Aggregation period the KPIs were calculated for
+            results: Dicts with kpi_name, category, value, target_value, achievement_rate and trend
+
+        Returns:
+            Number of stored results
+        """
+        with self._transaction() as conn:
+            self._insert(
+                conn,
+                "kpi_results",
+                when,
+                [
+                    (
+                        r["kpi_name"], r["category"], r["value"], r["target_value"],
+                        r["achievement_rate"], r["trend"], period,
+                    )
+                    for r in results
+                ],
+            )
+            for r in results:
+                for granularity in ROLLUP_GRANULARITIES:
+                    bucket = bucket_start(when, granularity).isoformat()
+                    value = r["value"]
+                    conn.execute(
+                        _KPI_ROLLUP_UPSERT,
+                        (
+                            r["kpi_name"], period, granularity, bucket, value, value, value,
+                            value, r["achievement_rate"], r["trend"], when.isoformat(),
+                        ),
+                    )
+        return len(results)
+
+    def kpi_series(
+        self, granularity: str, since: datetime, period: Optional[str] = None, kpi_name: Optional[str] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get the rollup buckets of KPI results.
+
+        Args:
+            granularity: "day" or "week"
+            since: Earliest time (its whole bucket is included)
+            period: Only results calculated for this aggregation period (all periods if None)
+            kpi_name: Only this KPI (all KPIs if None)
+
+        Returns:
+            Buckets per KPI name, oldest first; each bucket also has the closing
+            achievement_rate and trend
+        """
+        return self._series("kpi_rollups", "kpi_name", kpi_name, granularity, since, period)
+
+    def _series(
+        self,
+        rollups: str,
+        name_column: str,
+        name: Optional[str],
+        granularity: str,
+        since: datetime,
+        period: Optional[str],
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Read rollup buckets grouped by name; buckets of several periods are merged."""
+        if granularity not in ROLLUP_GRANULARITIES:
+            raise ValueError(f"Unknown rollup granularity: {granularity}")
+        kpi = rollups == "kpi_rollups"
+        columns = "count, value_sum, value_min, value_max, last_value, last_timestamp"
+        if kpi:
+            columns += ", last_achievement_rate, last_trend"
+        sql = f"SELECT {name_column}, bucket, {columns} FROM {rollups} WHERE granularity = ? AND bucket >= ?"
+        params: List[Any] = [granularity, bucket_start(since, granularity).isoformat()]
+        if name is not None:
+            sql += f" AND {name_column} = ?"
+            params.append(name)
+        if period is not None:
+            sql += " AND period = ?"
+            params.append(period)
+        with self._lock:
+            rows = self._conn.execute(sql + f" ORDER BY {name_column}, bucket", params).fetchall()
+
+        series: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            points = series.setdefault(row[0], [])
+            if points and points[-1]["bucket"] == row[1]:
+                point = points[-1]
+                point["count"] += row[2]
+                point["sum"] += row[3]
+                point["min"] = min(point["min"], row[4])
+                point["max"] = max(point["max"], row[5])
+                if row[7] < point["timestamp"]:
+                    continue
+            else:
+                point = {"bucket": row[1], "count": row[2], "sum": row[3], "min": row[4], "max": row[5]}
+                points.append(point)
+            point["last"] = row[6]
+            point["timestamp"] = row[7]
+            if kpi:
+                point["achievement_rate"] = row[8]
+                point["trend"] = row[9]
+        for points in series.values():
+            for point in points:
+                point["average"] = point.pop("sum") / point["count"]
+        return series
+
+    # ------------------------------------------------------------------
+    # System snapshots
+    # ------------------------------------------------------------------
+
+    def record_snapshot(self, when: datetime, values: Dict[str, Any], metadata: str) -> None:
+        """
+        Store a system snapshot.
+
+        Args:
+            when: Time of the snapshot
+            values: Summary columns (total_tokens_saved, cache_hit_rate, ...); missing ones default to 0
+            metadata: Full snapshot as JSON
+        """
+        columns = PARTITION_COLUMNS["system_snapshots"][1:-1]
+        with self._transaction() as conn:
+            self._insert(conn, "system_snapshots", when, [tuple(values.get(c, 0) for c in columns) + (metadata,)])
+
+    def latest_snapshot(self) -> Optional[Tuple[str, str]]:
+        """
+        Get the newest system snapshot.
+
+        Returns:
+            (timestamp, metadata JSON), or None if no snapshot is stored
+        """
+        with self._reading() as conn:
+            for name in reversed(self.partitions("system_snapshots", conn)):
+                row = conn.execute(f"SELECT timestamp, metadata FROM {name} ORDER BY timestamp DESC LIMIT 1").fetchone()
+                if row is not None:
+                    return row[0], row[1]
+        return None
+
+    # ------------------------------------------------------------------
+    # Migration
+    # ------------------------------------------------------------------
+
+    def _migrate_unpartitioned(self):
+        """Move rows of the pre-partitioning tables into partitions and rollups, then drop those tables."""
+        with self._transaction() as conn:
+            legacy = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table' AND name IN (?, ?, ?)",
+                    tuple(PARTITION_SCHEMAS),
+                )
+            }
+            for table in PARTITION_SCHEMAS:
+                if table not in legacy:
+                    continue
+                columns = PARTITION_COLUMNS[table]
+                skipped = 0
+                for row in conn.execute(f"SELECT {', '.join(columns)} FROM {table} ORDER BY timestamp").fetchall():
+                    when = parse_time(row[0])
+                    if when is None:
+                        skipped += 1
+                        continue
+                    self._insert(conn, table, when, [row[1:]])
+                    if table == "aggregated_metrics":
+                        name, category, period, value, unit = row[1:6]
+                        self._roll_up_metric(conn, when, name, period, category, unit, value)
+                    elif table == "kpi_results":
+                        for granularity in ROLLUP_GRANULARITIES:
+                            conn.execute(
+                                _KPI_ROLLUP_UPSERT,
+                                (
+                                    row[1], row[7], granularity, bucket_start(when, granularity).isoformat(),
+                                    row[3], row[3], row[3], row[3], row[5], row[6], when.isoformat(),
+                                ),
+                            )
+                if skipped:
+                    print(f"Warning: dropped {skipped} {table} rows with unreadable timestamps", file=sys.stderr)
+                conn.execute(f"DROP TABLE {table}")
+
+
+_stores: Dict[str, MetricsStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_metrics_store(db_path: str) -> MetricsStore:
+    """
+    Get the shared store for a database file (one connection per process).
+
+    Args:
+        db_path: Path of the SQLite database file
+
+    Returns:
+        MetricsStore instance
+    """
+    key = str(Path(db_path).resolve())
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = MetricsStore(key)
+            _stores[key] = store
+        return store
+
+
+def run_benchmark(days: int = 90, stores_per_day: int = 24, metric_count: int = 15) -> Dict[str, float]:
+    """
+    Compare rollup reads and partition drops with raw-row aggregation and DELETE.
+
+    Args:
+        days: Days of history to generate
+        stores_per_day: Metric stores per day
+        metric_count: Metrics per store
+
+    Returns:
+        Timings in milliseconds and the number of raw rows
+    """
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = MetricsStore(str(Path(temp_dir) / "unified_metrics.db"))
+        now = datetime.now().replace(microsecond=0)
+        names = [f"metric_{i}" for i in range(metric_count)]
+        for step in range(days * stores_per_day):
+            when = now - timedelta(days=days) + timedelta(hours=24 * step / stores_per_day)
+            store.record_metrics(
+                when, "daily", [(name, "performance", "units", float(step % 97)) for name in names], "benchmark"
+            )
+        since = now - timedelta(days=30)
+
+        started = time.perf_counter()
+        store.latest_metric_values(since)
+        for name in names:
+            store.metric_series(name, "day", since)
+        rollup_ms = (time.perf_counter() - started) * 1000
+
+        # What the aggregator did before rollups: re-aggregate every raw row in the window
+        started = time.perf_counter()
+        with store._reading() as conn:
+            for partition in store.partitions("aggregated_metrics", conn):
+                conn.execute(
+                    "SELECT metric_name, substr(timestamp, 1, 10), COUNT(*), AVG(value), MAX(timestamp)"
+                    f" FROM {partition} WHERE timestamp >= ? GROUP BY metric_name, substr(timestamp, 1, 10)",
+                    (since.isoformat(),),
+                ).fetchall()
+        raw_ms = (time.perf_counter() - started) * 1000
+
+        raw_rows = days * stores_per_day * metric_count
+        started = time.perf_counter()
+        store.drop_before("aggregated_metrics", now - timedelta(days=30))
+        drop_ms = (time.perf_counter() - started) * 1000
+        store.close()
+
+    return {
+        "raw_rows": raw_rows,
+        "rollup_read_ms": round(rollup_ms, 2),
+        "raw_aggregate_ms": round(raw_ms, 2),
+        "cleanup_ms": round(drop_ms, 2),
+    }
+
+
+if __name__ == "__main__":
+    print("=== Metrics Store Benchmark ===")
+    results = run_benchmark()
+    print(f"Raw rows:                {results['raw_rows']:,}")
+    print(f"Rollup reads (30 days):  {results['rollup_read_ms']:.2f} ms")
+    print(f"Raw aggregation:         {results['raw_aggregate_ms']:.2f} ms")
+    print(f"Cleanup (partition drop): {results['cleanup_ms']:.2f} ms")
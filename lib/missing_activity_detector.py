@@ -7,12 +7,13 @@ tasks that should be recorded in performance records but are missing.
 """
 import json
 import os
-import subprocess
 import re
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 import uuid
 
+from git_history_cache import get_git_history
+
 
 class MissingActivityDetector:
     def __init__(self, patterns_dir: str = ".claude-patterns"):
@@ -20,6 +21,7 @@ class MissingActivityDetector:
         self.patterns_dir = patterns_dir
         self.performance_records_file = os.path.join(patterns_dir, "performance_records.json")
         self.quality_history_file = os.path.join(patterns_dir, "quality_history.json")
+        self.git_history = get_git_history(patterns_dir)
 
     def load_existing_records(self) -> Dict[str, Any]:
         """Load existing performance records to avoid duplicates."""
@@ -50,57 +52,31 @@ class MissingActivityDetector:
     def get_git_commits_since(self, since_hours: int = 24) -> List[Dict[str, Any]]:
         """Get git commits since specified hours ago."""
         since_date = datetime.now() - timedelta(hours=since_hours)
-        since_date_str = since_date.strftime("%Y-%m-%d %H:%M")
-
-        try:
-            result = subprocess.run(
-                ["git", "log", f"--since={since_date_str}", "--pretty=format:%H|%ad|%s|%an|%ae", "--date=iso", "--no-merges"],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-
-            commits = []
-            for line in result.stdout.strip().split("\n"):
-                if line:
-                    parts = line.split("|")
-                    if len(parts) >= 4:
-                        commits.append(
-                            {
-                                "hash": parts[0],
-                                "date": parts[1],
-                                "message": parts[2],
-                                "author": parts[3],
-                                "email": parts[4] if len(parts) > 4 else "",
-                            }
-                        )
-
-            return commits
-        except subprocess.CalledProcessError:
-            return []
+        return [
+            {
+                "hash": commit["hash"],
+                "date": commit["date"],
+                "message": commit["subject"],
+                "author": commit["author"],
+                "email": commit["email"],
+            }
+            for commit in self.git_history.commits(since=since_date)
+        ]
 
     def get_commit_details(self, commit_hash: str) -> Dict[str, Any]:
         """Get detailed information about a specific commit."""
-        try:
-            # Get files changed and stats
-            result = subprocess.run(
-                ["git", "show", "--stat", "--pretty=format:", commit_hash], capture_output=True, text=True, check=True
-            )
-
-            # Get commit message with full details
-            msg_result = subprocess.run(
-                ["git", "show", "--pretty=format:%B", "--no-patch", commit_hash], capture_output=True, text=True, check=True
-            )
-
-            return {
-                "hash": commit_hash,
-                "stats": result.stdout.strip(),
-                "message": msg_result.stdout.strip(),
-                "files_changed": self.parse_git_stats(result.stdout),
-            }
-        except subprocess.CalledProcessError:
+        commit = self.git_history.get(commit_hash)
+        if commit is None:
             return {}
 
+        files_changed = [dict(file) for file in commit["files"]]
+        return {
+            "hash": commit_hash,
+            "stats": "\n".join(f"{file['filename']} | {file['changes']}" for file in files_changed),
+            "message": commit["message"],
+            "files_changed": files_changed,
+        }
+
     def parse_git_stats(self, stats_output: str) -> List[Dict[str, Any]]:
         """Parse git show --stat output to extract file changes."""
         files = []
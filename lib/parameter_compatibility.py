@@ -28,14 +28,13 @@ class DeprecationWarning(UserWarning):
 
 
 def deprecated(use_instead: str = None):
-"""
+    """
     Decorator to mark functions as deprecated.
 
     Args:
         use_instead: Suggested replacement function
-"""
+    """
 
-"""
     def decorator(func):
         """Decorator."""
         @wraps(func)
@@ -53,28 +52,25 @@ def deprecated(use_instead: str = None):
 
 
 class CompatibilityLayer:
-"""
+    """
     Provides backward compatibility for legacy parameter storage APIs.
-"""
 
     Automatically intercepts calls to old storage systems and redirects them
     to the unified storage system while maintaining the same interface.
-"""
+    """
 
-"""
     def __init__(self, unified_storage: UnifiedParameterStorage, auto_migrate: bool = True):
-"""
+        """
         Initialize compatibility layer.
 
         Args:
             unified_storage: Instance of unified parameter storage
             auto_migrate: Whether to automatically migrate legacy data
-"""
+        """
         self.unified_storage = unified_storage
         self.auto_migrate = auto_migrate
         self._compatibility_cache = {}
 
-"""
     def _show_deprecation_warning(self, old_api: str, new_api: str = None):
         """Show deprecation warning for legacy API usage."""
         msg = f"Using deprecated parameter storage API: {old_api}"
@@ -102,19 +98,17 @@ class CompatibilityLayer:
 
 # Legacy QualityTracker Compatibility
 class QualityTrackerCompatibility:
-"""
+    """
     Compatibility layer for legacy QualityTracker API.
-"""
-"""
+    """
 
-"""
     def __init__(self, tracker_dir: str = ".claude-patterns"):
-"""
+        """
         Initialize compatibility wrapper.
 
         Args:
             tracker_dir: Legacy tracker directory (ignored, uses unified storage)
-"""
+        """
         # Use unified storage from .claude-unified directory
         unified_dir = ".claude-unified"
         self.unified_storage = UnifiedParameterStorage(unified_dir)
@@ -129,7 +123,6 @@ class QualityTrackerCompatibility:
 
         self._ensure_unified_data()
 
-"""
     def _ensure_unified_data(self):
         """Ensure unified storage has data by migrating if necessary."""
         if self.compatibility.auto_migrate:
@@ -148,8 +141,8 @@ class QualityTrackerCompatibility:
                 warnings.warn(f"Failed to auto-migrate: {e}", DeprecationWarning)
 
     @deprecated("UnifiedParameterStorage.set_quality_score()")
-    def record_quality():
-"""
+    def record_quality(self, task_id: str, quality_score: float, metrics: Dict[str, float]) -> bool:
+        """
         
         Record quality assessment (legacy API).
 
@@ -160,7 +153,7 @@ class QualityTrackerCompatibility:
 
         Returns:
             True on success
-"""
+        """
         self.compatibility._ensure_unified_data()
 
         # Convert from legacy 0-1 scale to unified 0-100 scale
@@ -174,10 +167,9 @@ class QualityTrackerCompatibility:
             print(f"Error recording quality: {e}", file=sys.stderr)
             return False
 
-"""
     @deprecated("UnifiedParameterStorage.get_quality_score()")
-    def get_average_quality():
-"""
+    def get_average_quality(self, days: int = 30) -> float:
+        """
         
         Get average quality score (legacy API).
 
@@ -186,7 +178,7 @@ class QualityTrackerCompatibility:
 
         Returns:
             Average quality score (0.0 to 1.0) - legacy format
-"""
+        """
         self.compatibility._ensure_unified_data()
 
         try:
@@ -196,10 +188,9 @@ class QualityTrackerCompatibility:
         except Exception:
             return 0.0
 
-"""
     @deprecated("UnifiedParameterStorage.get_quality_history()")
-    def get_quality_trends():
-"""
+    def get_quality_trends(self, days: int = 30, metric: str = None) -> Dict[str, Any]:
+        """
         
         Get quality trends (legacy API).
 
@@ -209,7 +200,7 @@ class QualityTrackerCompatibility:
 
         Returns:
             Dictionary with trend analysis in legacy format
-"""
+        """
         self.compatibility._ensure_unified_data()
 
         try:
@@ -286,21 +277,18 @@ class QualityTrackerCompatibility:
 
 
 # Legacy ModelPerformanceManager Compatibility
-"""
 class ModelPerformanceManagerCompatibility:
-"""
+    """
     Compatibility layer for legacy ModelPerformanceManager API.
-"""
-"""
+    """
 
-"""
     def __init__(self, patterns_dir: str = ".claude-patterns"):
-"""
+        """
         Initialize compatibility wrapper.
 
         Args:
             patterns_dir: Legacy patterns directory (ignored, uses unified storage)
-"""
+        """
         # Use unified storage from .claude-unified directory
         unified_dir = ".claude-unified"
         self.unified_storage = UnifiedParameterStorage(unified_dir)
@@ -315,7 +303,6 @@ class ModelPerformanceManagerCompatibility:
 
         self._ensure_unified_data()
 
-"""
     def _ensure_unified_data(self):
         """Ensure unified storage has data by migrating if necessary."""
         if self.compatibility.auto_migrate:
@@ -338,7 +325,7 @@ class ModelPerformanceManagerCompatibility:
 
     @deprecated("UnifiedParameterStorage.update_model_performance()")
     def add_performance_score(self, model: str, score: float, task_type: str = "unknown", contribution: float = 0.0):
-"""
+        """
         Add performance score for model (legacy API).
 
         Args:
@@ -346,7 +333,7 @@ class ModelPerformanceManagerCompatibility:
             score: Performance score (0-100)
             task_type: Type of task performed
             contribution: Contribution to project (0-100)
-"""
+        """
         self.compatibility._ensure_unified_data()
 
         try:
@@ -354,10 +341,9 @@ class ModelPerformanceManagerCompatibility:
         except Exception as e:
             print(f"Error adding performance score: {e}", file=sys.stderr)
 
-"""
     @deprecated("UnifiedParameterStorage.get_model_performance()")
-    def get_model_summary():
-"""
+    def get_model_summary(self, model: str) -> Dict[str, Any]:
+        """
         
         Get performance summary for model (legacy API).
 
@@ -366,7 +352,7 @@ class ModelPerformanceManagerCompatibility:
 
         Returns:
             Model performance summary
-"""
+        """
         self.compatibility._ensure_unified_data()
 
         try:
@@ -375,7 +361,6 @@ class ModelPerformanceManagerCompatibility:
             print(f"Error getting model summary: {e}", file=sys.stderr)
             return {"error": f"Failed to get summary for model '{model}'"}
 
-"""
     @deprecated("UnifiedParameterStorage.get_active_model()")
     def get_active_model(self) -> str:
         """Get currently active model."""
@@ -389,19 +374,17 @@ class ModelPerformanceManagerCompatibility:
 
 # Dashboard Data Collector Compatibility
 class DashboardDataCollectorCompatibility:
-"""
+    """
     Compatibility layer for legacy DashboardDataCollector API.
-"""
-"""
+    """
 
-"""
     def __init__(self, patterns_dir: str = ".claude-patterns"):
-"""
+        """
         Initialize compatibility wrapper.
 
         Args:
             patterns_dir: Legacy patterns directory (ignored, uses unified storage)
-"""
+        """
         self._show_deprecation_warning(
             "DashboardDataCollector(patterns_dir)", "UnifiedParameterStorage().get_dashboard_data()"
         )
@@ -411,16 +394,15 @@ class DashboardDataCollectorCompatibility:
         self.unified_storage = UnifiedParameterStorage(unified_dir)
         self.compatibility = CompatibilityLayer(self.unified_storage)
 
-"""
     @deprecated("UnifiedParameterStorage.get_dashboard_data()")
-    def collect_all_data():
-"""
+    def collect_all_data(self) -> Dict[str, Any]:
+        """
         
         Collect all dashboard data (legacy API).
 
         Returns:
             Dictionary with dashboard data
-"""
+        """
         self.compatibility._ensure_unified_data()
 
         try:
@@ -434,15 +416,14 @@ class DashboardDataCollectorCompatibility:
                 "learning": {"patterns": {}, "analytics": {}},
             }
 
-"""
     @deprecated("UnifiedParameterStorage.update_dashboard_metrics()")
     def update_activity_metrics(self, metrics: Dict[str, Any]):
-"""
+        """
         Update activity metrics (legacy API).
 
         Args:
             metrics: Dictionary of metrics to update
-"""
+        """
         self.compatibility._ensure_unified_data()
 
         try:
@@ -452,9 +433,8 @@ class DashboardDataCollectorCompatibility:
 
 
 # Module-level compatibility functions
-"""
-def get_legacy_quality_tracker():
-"""
+def get_legacy_quality_tracker(tracker_dir: str = ".claude-patterns") -> QualityTrackerCompatibility:
+    """
         
         Get legacy QualityTracker with compatibility layer.
 
@@ -463,13 +443,12 @@ def get_legacy_quality_tracker():
 
     Returns:
         Compatibility wrapper for QualityTracker
-"""
+    """
     return QualityTrackerCompatibility(tracker_dir)
 
 
-"""
-def get_legacy_model_performance_manager():
-"""
+def get_legacy_model_performance_manager(patterns_dir: str = ".claude-patterns") -> ModelPerformanceManagerCompatibility:
+    """
         
         Get legacy ModelPerformanceManager with compatibility layer.
 
@@ -478,13 +457,12 @@ def get_legacy_model_performance_manager():
 
     Returns:
         Compatibility wrapper for ModelPerformanceManager
-"""
+    """
     return ModelPerformanceManagerCompatibility(patterns_dir)
 
 
-"""
-def get_legacy_dashboard_collector():
-"""
+def get_legacy_dashboard_collector(patterns_dir: str = ".claude-patterns") -> DashboardDataCollectorCompatibility:
+    """
         
         Get legacy DashboardDataCollector with compatibility layer.
 
@@ -493,20 +471,18 @@ def get_legacy_dashboard_collector():
 
     Returns:
         Compatibility wrapper for DashboardDataCollector
-"""
+    """
     return DashboardDataCollectorCompatibility(patterns_dir)
 
 
 # Auto-patch existing modules
-"""
 def auto_patch_legacy_modules():
-"""
+    """
     Automatically patch imports of legacy modules to use compatibility layer.
 
     This function should be called early in the application startup to ensure
     all legacy module imports are redirected to the compatibility layer.
-"""
-"""
+    """
     import sys
 
     # Create compatibility modules
@@ -576,13 +552,13 @@ def monkey_patch_model_functions():
 
 # Enable compatibility mode
 def enable_compatibility_mode(auto_patch: bool = True, monkey_patch: bool = True):
-"""
+    """
     Enable full compatibility mode for legacy parameter storage APIs.
 
     Args:
         auto_patch: Whether to auto-patch module imports
         monkey_patch: Whether to monkey patch common functions
-"""
+    """
     if auto_patch:
         original_modules = auto_patch_legacy_modules()
         print("Compatibility mode enabled: Legacy modules auto-patched")
@@ -606,7 +582,6 @@ if __name__ != "__main__" and "parameter_compatibility" in sys.modules:
     enable_compatibility_mode(auto_patch=False, monkey_patch=False)
 
 
-"""
 def main():
     """Command-line interface for compatibility layer."""
     import argparse
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Pattern Index for Autonomous Claude Agent Plugin
+
+Persistent inverted keyword index over stored patterns with BM25F ranking.
+Each pattern is a document numbered by its position in the pattern store;
+postings keep per-field term frequencies for "context" and "approach".
+task_type, quality_score and usage_count live in side arrays so filters are
+applied before scoring. The index is saved as pattern_index.json plus an
+append-only pattern_index.log.jsonl, so indexing a new pattern is O(1) I/O.
+Log appends and snapshots hold pattern_index.lock, like the pattern journal.
+"""
+
+import heapq
+import json
+import math
+import re
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from file_utils import atomic_write_bytes
+from pattern_journal import lock_file, unlock_file
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+INDEX_FIELDS = ("context", "approach")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase word tokens.
+
+    Args:
+        text: Free text to tokenize
+
+    Returns:
+        List of tokens in order of appearance
+    """
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def field_text(pattern: Dict[str, Any], field: str) -> str:
+    """Return the searchable text of a pattern field (dict contexts are stringified)."""
+    value = pattern.get(field, "")
+    return value if isinstance(value, str) else str(value)
+
+
+class PatternIndex:
+    """Inverted index with BM25F scoring for pattern retrieval."""
+
+    INDEX_NAME = "pattern_index.json"
+    LOG_NAME = "pattern_index.log.jsonl"
+    LOCK_NAME = "pattern_index.lock"
+    VERSION = 1
+
+    def __init__(
+        self,
+        patterns_dir: str = ".claude-patterns",
+        k1: float = 1.2,
+        b: float = 0.75,
+        field_weights: Optional[Dict[str, float]] = None,
+        save_threshold: int = 500,
+    ):
+        """
+        Initialize the pattern index.
+
+        Args:
+            patterns_dir: Directory path for storing the index (default: .claude-patterns)
+            k1: BM25 term-frequency saturation parameter
+            b: BM25 length normalization parameter
+            field_weights: Relative weight of each indexed field
+            save_threshold: Logged documents after which the index snapshot is rewritten
+        """
+        self.patterns_dir = Path(patterns_dir)
+        self.index_file = self.patterns_dir / self.INDEX_NAME
+        self.log_file = self.patterns_dir / self.LOG_NAME
+        self.lock_path = self.patterns_dir / self.LOCK_NAME
+        self.k1 = k1
+        self.b = b
+        self.field_weights = field_weights or {"context": 1.0, "approach": 1.0}
+        self.save_threshold = save_threshold
+
+        self._lock = threading.RLock()
+        self._reset()
+        self._load()
+
+    # ------------------------------------------------------------------
+    # In-memory structure
+    # ------------------------------------------------------------------
+
+    def _reset(self):
+        """Clear all postings and side arrays."""
+        self.postings: Dict[str, Dict[int, List[int]]] = {}
+        self.pattern_ids: List[Optional[str]] = []
+        self.task_types: List[Optional[str]] = []
+        self.quality_scores: List[float] = []
+        self.usage_counts: List[int] = []
+        self.field_lengths: List[List[int]] = []
+        self.total_field_lengths = [0] * len(INDEX_FIELDS)
+        self._logged_docs = 0
+
+    @property
+    def doc_count(self) -> int:
+        """Number of indexed documents."""
+        return len(self.pattern_ids)
+
+    def _analyze(self, pattern: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the index entry for one pattern."""
+        fields = {field: dict(Counter(tokenize(field_text(pattern, field)))) for field in INDEX_FIELDS}
+        return {
+            "pattern_id": pattern.get("pattern_id"),
+            "task_type": pattern.get("task_type"),
+            "quality_score": pattern.get("quality_score", 0),
+            "usage_count": pattern.get("usage_count", 0),
+            "fields": fields,
+        }
+
+    def _apply_entry(self, entry: Dict[str, Any]):
+        """Add an analyzed entry as the next document."""
+        doc = self.doc_count
+        self.pattern_ids.append(entry["pattern_id"])
+        self.task_types.append(entry["task_type"])
+        self.quality_scores.append(entry["quality_score"])
+        self.usage_counts.append(entry["usage_count"])
+
+        lengths = []
+        for slot, field in enumerate(INDEX_FIELDS):
+            term_counts = entry["fields"].get(field, {})
+            length = sum(term_counts.values())
+            lengths.append(length)
+            self.total_field_lengths[slot] += length
+            for term, tf in term_counts.items():
+                posting = self.postings.setdefault(term, {}).get(doc)
+                if posting is None:
+                    posting = [0] * len(INDEX_FIELDS)
+                    self.postings[term][doc] = posting
+                posting[slot] += tf
+        self.field_lengths.append(lengths)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def _locked(self, exclusive: bool):
+        """Hold the in-process lock and the inter-process index lock."""
+        with self._lock:
+            self.patterns_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.lock_path, "a+", encoding="utf-8") as handle:
+                lock_file(handle, exclusive=exclusive)
+                try:
+                    yield
+                finally:
+                    unlock_file(handle)
+
+    def _load(self):
+        """Load the index snapshot and replay the append log."""
+        with self._locked(exclusive=False):
+            if self.index_file.exists():
+                try:
+                    with open(self.index_file, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                    if data.get("version") == self.VERSION:
+                        self.postings = {
+                            term: {int(doc): tfs for doc, tfs in docs.items()}
+                            for term, docs in data["postings"].items()
+                        }
+                        self.pattern_ids = data["pattern_ids"]
+                        self.task_types = data["task_types"]
+                        self.quality_scores = data["quality_scores"]
+                        self.usage_counts = data["usage_counts"]
+                        self.field_lengths = data["field_lengths"]
+                        self.total_field_lengths = data["total_field_lengths"]
+                except (json.JSONDecodeError, OSError, KeyError) as e:
+                    print(f"Warning: Rebuilding pattern index, could not read {self.index_file}: {e}", file=sys.stderr)
+                    self._reset()
+            self._replay_log()
+
+    def _replay_log(self):
+        """Apply logged documents not yet in memory (caller holds the lock)."""
+        if not self.log_file.exists():
+            return
+        try:
+            with open(self.log_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    # Entries already folded into the snapshot or applied are skipped
+                    if entry.get("doc") == self.doc_count:
+                        self._apply_entry(entry)
+                        self._logged_docs += 1
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"Warning: Ignoring corrupt pattern index log tail: {e}", file=sys.stderr)
+
+    def save(self):
+        """Write the full index snapshot and truncate the append log."""
+        with self._locked(exclusive=True):
+            # Documents other processes logged since our load would be lost with the truncated log
+            self._replay_log()
+            self._save_locked()
+
+    def _save_locked(self):
+        """Write the snapshot and truncate the log (caller holds the exclusive lock)."""
+        data = {
+            "version": self.VERSION,
+            "updated": datetime.now().isoformat(),
+            "postings": self.postings,
+            "pattern_ids": self.pattern_ids,
+            "task_types": self.task_types,
+            "quality_scores": self.quality_scores,
+            "usage_counts": self.usage_counts,
+            "field_lengths": self.field_lengths,
+            "total_field_lengths": self.total_field_lengths,
+        }
+        atomic_write_bytes(self.index_file, json.dumps(data, ensure_ascii=False).encode("utf-8"))
+        with open(self.log_file, "w", encoding="utf-8"):
+            pass
+        self._logged_docs = 0
+
+    def _log_entry(self, entry: Dict[str, Any]):
+        """Append one indexed document to the log."""
+        with self._locked(exclusive=True):
+            with open(self.log_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._logged_docs += 1
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def add_pattern(self, pattern: Dict[str, Any], persist: bool = True) -> int:
+        """
+        Index a newly stored pattern as the next document.
+
+        Args:
+            pattern: Pattern dictionary (position must equal the current doc_count)
+            persist: Append the entry to the on-disk log
+
+        Returns:
+            Document number assigned to the pattern
+        """
+        with self._lock:
+            entry = self._analyze(pattern)
+            entry["doc"] = self.doc_count
+            self._apply_entry(entry)
+            if persist:
+                self._log_entry(entry)
+                if self.save_threshold and self._logged_docs >= self.save_threshold:
+                    self.save()
+            return entry["doc"]
+
+    def rebuild(self, patterns: List[Dict[str, Any]]):
+        """Re-index every pattern from scratch and persist the result."""
+        with self._locked(exclusive=True):
+            self._reset()
+            for pattern in patterns:
+                entry = self._analyze(pattern)
+                entry["doc"] = self.doc_count
+                self._apply_entry(entry)
+            self._save_locked()
+
+    def sync(
+        self,
+        count: int,
+        pattern_id_at: Callable[[int], Optional[str]],
+        fetch: Callable[[int, int], List[Dict[str, Any]]],
+    ):
+        """
+        Bring the index up to date with a pattern store.
+
+        Indexed documents must be a prefix of the store. Only the boundary
+        document is compared, which is enough to detect a store that was
+        rewritten behind the index's back; in that case the index is rebuilt.
+        Otherwise only the missing trailing patterns are indexed.
+
+        Args:
+            count: Number of patterns in the store
+            pattern_id_at: Returns the pattern_id at a store position
+            fetch: Returns the patterns in the store range [start, stop)
+        """
+        with self._lock:
+            doc_count = self.doc_count
+            if doc_count > count or (doc_count and self.pattern_ids[-1] != pattern_id_at(doc_count - 1)):
+                self.rebuild(fetch(0, count))
+                return
+            if doc_count == count:
+                return
+
+            missing = fetch(doc_count, count)
+            if self.save_threshold and len(missing) >= self.save_threshold:
+                for pattern in missing:
+                    self.add_pattern(pattern, persist=False)
+                self.save()
+            else:
+                for pattern in missing:
+                    self.add_pattern(pattern)
+
+    def sync_patterns(self, patterns: List[Dict[str, Any]]):
+        """
+        Bring the index up to date with an in-memory pattern list.
+
+        Usage counts are refreshed from the list as well, since they are
+        mutated in place by usage updates.
+        """
+        with self._lock:
+            self.sync(
+                len(patterns),
+                lambda pos: patterns[pos].get("pattern_id"),
+                lambda start, stop: patterns[start:stop],
+            )
+            for doc, pattern in enumerate(patterns[: self.doc_count]):
+                self.usage_counts[doc] = pattern.get("usage_count", 0)
+
+    def note_usage(self, pattern_id: str):
+        """Bump the usage count side array for the first document with this id."""
+        with self._lock:
+            try:
+                doc = self.pattern_ids.index(pattern_id)
+            except ValueError:
+                return
+            self.usage_counts[doc] += 1
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def search(
+        self, query: str, task_type: Optional[str] = None, min_quality: float = 0.0, limit: int = 5
+    ) -> List[Tuple[int, float]]:
+        """
+        Rank documents for a query with BM25F.
+
+        Args:
+            query: Search keywords
+            task_type: Only consider documents of this task type (optional)
+            min_quality: Minimum quality score
+            limit: Maximum number of results
+
+        Returns:
+            List of (doc, score) sorted by score, quality and usage count
+        """
+        with self._lock:
+            terms = set(tokenize(query))
+            n_docs = self.doc_count
+            if not terms or n_docs == 0:
+                return []
+
+            avg_lengths = [max(total / n_docs, 1e-9) for total in self.total_field_lengths]
+            weights = [self.field_weights.get(field, 1.0) for field in INDEX_FIELDS]
+            scores: Dict[int, float] = {}
+
+            for term in terms:
+                docs = self.postings.get(term)
+                if not docs:
+                    continue
+                idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+                for doc, tfs in docs.items():
+                    # Side-array pre-filters before any scoring work
+                    if task_type and self.task_types[doc] != task_type:
+                        continue
+                    if self.quality_scores[doc] < min_quality:
+                        continue
+
+                    lengths = self.field_lengths[doc]
+                    weighted_tf = 0.0
+                    for slot, tf in enumerate(tfs):
+                        if tf:
+                            norm = 1 - self.b + self.b * lengths[slot] / avg_lengths[slot]
+                            weighted_tf += weights[slot] * tf / norm
+                    scores[doc] = scores.get(doc, 0.0) + idf * weighted_tf / (self.k1 + weighted_tf)
+
+            return heapq.nlargest(
+                limit,
+                scores.items(),
+                key=lambda item: (item[1], self.quality_scores[item[0]], self.usage_counts[item[0]]),
+            )
+
+    def get_status(self) -> Dict[str, Any]:
+        """Return index size information for diagnostics."""
+        with self._lock:
+            return {
+                "documents": self.doc_count,
+                "terms": len(self.postings),
+                "logged_documents": self._logged_docs,
+            }
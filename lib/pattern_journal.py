@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+Pattern Journal for Autonomous Claude Agent Plugin
+
+Append-only JSONL journal backend for PatternStorage. Stores and usage updates
+are O(1) appends to patterns.journal.jsonl; a threshold-triggered compaction
+folds the journal into patterns.snapshot.json. Readers rebuild state from the
+snapshot plus the journal tail and only read the bytes appended since their
+last refresh. The legacy patterns.json format remains the import/export path.
+"""
+
+import copy
+import json
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import platform
+
+from file_utils import atomic_write_bytes, file_signature
+
+# Handle Windows compatibility for file locking
+if platform.system() == "Windows":
+    import msvcrt
+
+    def lock_file(f, exclusive=False):
+        """Windows file locking using msvcrt."""
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK if exclusive else msvcrt.LK_NBLCK, 1)
+
+    def unlock_file(f):
+        """Windows file unlocking."""
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        except:
+            pass
+
+else:
+    import fcntl
+
+    def lock_file(f, exclusive=False):
+        """Unix file locking using fcntl."""
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+
+    def unlock_file(f):
+        """Unix file unlocking."""
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def apply_usage(pattern: Dict[str, Any], success: bool, timestamp: str):
+    """
+    Apply one usage event to a pattern using the running-average success rate.
+
+    Args:
+        pattern: Pattern dictionary to update in place
+        success: Whether the pattern usage was successful
+        timestamp: ISO timestamp recorded as last_used
+    """
+    pattern["usage_count"] = pattern.get("usage_count", 0) + 1
+
+    current_rate = pattern.get("success_rate", 1.0)
+    current_count = pattern["usage_count"]
+
+    if success:
+        pattern["success_rate"] = (current_rate * (current_count - 1) + 1.0) / current_count
+    else:
+        pattern["success_rate"] = (current_rate * (current_count - 1)) / current_count
+
+    pattern["last_used"] = timestamp
+
+
+class PatternJournal:
+    """Journal-backed pattern state: snapshot plus append-only tail."""
+
+    JOURNAL_NAME = "patterns.journal.jsonl"
+    SNAPSHOT_NAME = "patterns.snapshot.json"
+    LOCK_NAME = "patterns.journal.lock"
+
+    def __init__(self, patterns_dir: str = ".claude-patterns", compact_threshold: int = 1000):
+        """
+        Initialize the pattern journal.
+
+        Args:
+            patterns_dir: Directory path for storing patterns (default: .claude-patterns)
+            compact_threshold: Journal records after which a compaction is triggered
+                (0 disables automatic compaction)
+        """
+        self.patterns_dir = Path(patterns_dir)
+        self.journal_file = self.patterns_dir / self.JOURNAL_NAME
+        self.snapshot_file = self.patterns_dir / self.SNAPSHOT_NAME
+        self.lock_path = self.patterns_dir / self.LOCK_NAME
+        self.legacy_file = self.patterns_dir / "patterns.json"
+        self.compact_threshold = compact_threshold
+
+        self._mutex = threading.RLock()
+        self._patterns: List[Dict[str, Any]] = []
+        self._positions: Dict[str, int] = {}
+        self._last_seq = 0
+        self._journal_offset = 0
+        self._tail_records = 0
+        self._snapshot_signature: Optional[Tuple[int, int, int]] = None
+
+        self.patterns_dir.mkdir(parents=True, exist_ok=True)
+        self.lock_path.touch(exist_ok=True)
+        if not self.snapshot_file.exists() and not self.journal_file.exists():
+            self._bootstrap_from_legacy()
+
+    # ------------------------------------------------------------------
+    # Locking and signatures
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def _locked(self, exclusive: bool):
+        """Hold the in-process mutex and the inter-process journal lock."""
+        with self._mutex:
+            with open(self.lock_path, "a+", encoding="utf-8") as handle:
+                lock_file(handle, exclusive=exclusive)
+                try:
+                    yield
+                finally:
+                    unlock_file(handle)
+
+    # ------------------------------------------------------------------
+    # State reconstruction
+    # ------------------------------------------------------------------
+
+    def _reset_state(self):
+        """Clear in-memory state before a full reload."""
+        self._patterns = []
+        self._positions = {}
+        self._last_seq = 0
+        self._journal_offset = 0
+        self._tail_records = 0
+
+    def _index_pattern(self, pattern: Dict[str, Any]):
+        """Append a pattern to in-memory state, keeping the first position per id."""
+        self._patterns.append(pattern)
+        pattern_id = pattern.get("pattern_id")
+        if pattern_id is not None and pattern_id not in self._positions:
+            self._positions[pattern_id] = len(self._patterns) - 1
+
+    def _load_snapshot(self):
+        """Load the compacted snapshot into memory."""
+        self._reset_state()
+        self._snapshot_signature = file_signature(self.snapshot_file)
+        if self._snapshot_signature is None:
+            return
+
+        try:
+            with open(self.snapshot_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"Error: Could not read {self.snapshot_file}: {e}", file=sys.stderr)
+            return
+
+        for pattern in data.get("patterns", []):
+            self._index_pattern(pattern)
+        self._last_seq = data.get("last_seq", 0)
+
+    def _apply_record(self, record: Dict[str, Any]) -> bool:
+        """
+        Apply one journal record to in-memory state.
+
+        Returns:
+            True if the record changed state, False if it was skipped
+        """
+        seq = record.get("seq", 0)
+        if seq <= self._last_seq:
+            # Already folded into the snapshot (crash between snapshot and truncate)
+            return False
+        self._last_seq = seq
+
+        op = record.get("op")
+        if op == "store":
+            self._index_pattern(record["pattern"])
+            return True
+        if op == "usage":
+            position = self._positions.get(record.get("pattern_id"))
+            if position is None:
+                return False
+            pattern = self._patterns[position]
+            apply_usage(pattern, record.get("success", True), record.get("timestamp", ""))
+            return True
+
+        print(f"Warning: Unknown journal op '{op}' (seq {seq})", file=sys.stderr)
+        return False
+
+    def _catch_up(self):
+        """
+        Bring in-memory state up to date with the snapshot and journal tail.
+
+        Must be called with the journal lock held.
+        """
+        if file_signature(self.snapshot_file) != self._snapshot_signature:
+            self._load_snapshot()
+
+        try:
+            size = self.journal_file.stat().st_size
+        except FileNotFoundError:
+            size = 0
+
+        if size < self._journal_offset:
+            # Journal was truncated by a compaction we have not seen yet
+            self._load_snapshot()
+        if size == self._journal_offset:
+            return
+
+        with open(self.journal_file, "rb") as f:
+            f.seek(self._journal_offset)
+            tail = f.read(size - self._journal_offset)
+
+        # Only consume complete lines; a partial trailing line is re-read later
+        consumed = tail.rfind(b"\n") + 1
+        for line in tail[:consumed].splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                print(f"Warning: Skipping corrupt journal line: {e}", file=sys.stderr)
+                continue
+            self._apply_record(record)
+            self._tail_records += 1
+        self._journal_offset += consumed
+
+    def refresh(self):
+        """Synchronize in-memory state with other writers."""
+        with self._locked(exclusive=False):
+            self._catch_up()
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def _append(self, record: Dict[str, Any]):
+        """
+        Append a record to the journal. Must be called with the exclusive lock held.
+        """
+        record["seq"] = self._last_seq + 1
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with open(self.journal_file, "ab") as f:
+            if f.tell() > self._journal_offset:
+                # Terminate a partial line left by a crashed writer
+                f.write(b"\n")
+            f.write(line.encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+            self._journal_offset = f.tell()
+        self._tail_records += 1
+        self._apply_record(record)
+
+    def _maybe_compact(self):
+        """Fold the journal into the snapshot once the threshold is reached."""
+        if self.compact_threshold and self._tail_records >= self.compact_threshold:
+            self._compact_locked()
+
+    def append_pattern(self, pattern: Dict[str, Any]):
+        """
+        Append a validated pattern to the journal.
+
+        Args:
+            pattern: Complete pattern dictionary
+        """
+        with self._locked(exclusive=True):
+            self._catch_up()
+            self._append({"op": "store", "pattern": pattern})
+            self._maybe_compact()
+
+    def record_usage(self, pattern_id: str, success: bool) -> bool:
+        """
+        Append a usage event for a pattern.
+
+        Args:
+            pattern_id: ID of the pattern to update
+            success: Whether the pattern usage was successful
+
+        Returns:
+            True if pattern was found and updated, False otherwise
+        """
+        with self._locked(exclusive=True):
+            self._catch_up()
+            if pattern_id not in self._positions:
+                return False
+            self._append(
+                {
+                    "op": "usage",
+                    "pattern_id": pattern_id,
+                    "success": bool(success),
+                    "timestamp": datetime.now().isoformat(),
+                }
+            )
+            self._maybe_compact()
+            return True
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def read_patterns(self) -> List[Dict[str, Any]]:
+        """
+        Return a copy of all patterns, oldest first.
+
+        Returns:
+            List of pattern dictionaries
+        """
+        with self._locked(exclusive=False):
+            self._catch_up()
+            return copy.deepcopy(self._patterns)
+
+    def get_pattern(self, pattern_id: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of a single pattern by id, or None."""
+        with self._locked(exclusive=False):
+            self._catch_up()
+            position = self._positions.get(pattern_id)
+            if position is None:
+                return None
+            return copy.deepcopy(self._patterns[position])
+
+    def get_patterns_at(self, positions: List[int]) -> List[Dict[str, Any]]:
+        """Return copies of the patterns at the given state positions."""
+        with self._locked(exclusive=False):
+            self._catch_up()
+            return [copy.deepcopy(self._patterns[p]) for p in positions if 0 <= p < len(self._patterns)]
+
+    def pattern_id_at(self, position: int) -> Optional[str]:
+        """Return the pattern_id stored at a state position, or None."""
+        with self._locked(exclusive=False):
+            self._catch_up()
+            if 0 <= position < len(self._patterns):
+                return self._patterns[position].get("pattern_id")
+            return None
+
+    def get_patterns_range(self, start: int, stop: int) -> List[Dict[str, Any]]:
+        """Return copies of the patterns in the state range [start, stop)."""
+        with self._locked(exclusive=False):
+            self._catch_up()
+            return copy.deepcopy(self._patterns[start:stop])
+
+    def __len__(self) -> int:
+        """Number of patterns in the current state."""
+        with self._locked(exclusive=False):
+            self._catch_up()
+            return len(self._patterns)
+
+    # ------------------------------------------------------------------
+    # Compaction and import/export
+    # ------------------------------------------------------------------
+
+    def _compact_locked(self):
+        """Write a snapshot of the current state and truncate the journal."""
+        snapshot = {
+            "version": 1,
+            "last_seq": self._last_seq,
+            "compacted_at": datetime.now().isoformat(),
+            "patterns": self._patterns,
+        }
+        atomic_write_bytes(self.snapshot_file, json.dumps(snapshot, ensure_ascii=False).encode("utf-8"), fsync=True)
+
+        # Records up to last_seq are now in the snapshot; replay skips them if
+        # the truncate below never happens.
+        with open(self.journal_file, "w", encoding="utf-8"):
+            pass
+
+        self._snapshot_signature = file_signature(self.snapshot_file)
+        self._journal_offset = 0
+        self._tail_records = 0
+
+    def compact(self):
+        """Fold the journal into the snapshot now."""
+        with self._locked(exclusive=True):
+            self._catch_up()
+            self._compact_locked()
+
+    def _bootstrap_from_legacy(self):
+        """Seed an empty journal store from an existing patterns.json."""
+        if self.legacy_file.exists():
+            self.import_json(self.legacy_file)
+
+    def import_json(self, path: Path) -> int:
+        """
+        Replace journal state with the patterns in a legacy patterns.json file.
+
+        Args:
+            path: File holding either a JSON array or an object with "patterns"
+
+        Returns:
+            Number of patterns imported
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                content = f.read()
+            data = json.loads(content) if content.strip() else []
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"Error: Could not import {path}: {e}", file=sys.stderr)
+            return 0
+
+        patterns = data.get("patterns", []) if isinstance(data, dict) else data
+        if not isinstance(patterns, list):
+            print(f"Warning: Unexpected format in {path}", file=sys.stderr)
+            return 0
+
+        with self._locked(exclusive=True):
+            self._catch_up()
+            last_seq = self._last_seq
+            self._reset_state()
+            self._last_seq = last_seq
+            for pattern in patterns:
+                self._index_pattern(pattern)
+            self._compact_locked()
+        return len(patterns)
+
+    def export_json(self, path: Optional[Path] = None) -> Path:
+        """
+        Export the current state in the legacy patterns.json format.
+
+        An existing object-style file keeps its other keys and metadata.
+
+        Args:
+            path: Destination file (default: patterns.json in the patterns directory)
+
+        Returns:
+            Path that was written
+        """
+        path = Path(path) if path else self.legacy_file
+        patterns = self.read_patterns()
+
+        existing_structure = None
+        if path.exists():
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    content = f.read()
+                if content.strip():
+                    data = json.loads(content)
+                    if isinstance(data, dict) and "patterns" in data:
+                        existing_structure = data
+            except (json.JSONDecodeError, OSError):
+                pass
+
+        with open(path, "w", encoding="utf-8") as f:
+            lock_file(f, exclusive=True)
+            try:
+                if existing_structure:
+                    existing_structure["patterns"] = patterns
+                    existing_structure.setdefault("metadata", {})
+                    existing_structure["metadata"]["last_updated"] = datetime.now().isoformat()
+                    existing_structure["metadata"]["total_patterns"] = len(patterns)
+                    json.dump(existing_structure, f, indent=2, ensure_ascii=False)
+                else:
+                    json.dump(patterns, f, indent=2, ensure_ascii=False)
+            finally:
+                unlock_file(f)
+        return path
+
+    def get_status(self) -> Dict[str, Any]:
+        """Return journal/snapshot sizes for diagnostics."""
+        with self._locked(exclusive=False):
+            self._catch_up()
+            return {
+                "patterns": len(self._patterns),
+                "last_seq": self._last_seq,
+                "journal_records": self._tail_records,
+                "journal_bytes": self._journal_offset,
+                "compact_threshold": self.compact_threshold,
+            }
@@ -6,14 +6,32 @@ Manages pattern learning data using JSON files. Stores successful task patterns,
 retrieves similar patterns for context-aware recommendations, and
 tracks usage statistics.
 
+Three storage modes are supported:
+    - "json" (default): patterns.json is rewritten on every store/update
+    - "journal": append-only patterns.journal.jsonl plus a compacted snapshot
+      (see pattern_journal.py); patterns.json stays the import/export format
+    - "sqlite": shared WAL-mode patterns.db with FTS5 pattern search
+      (see sqlite_storage_engine.py)
+
+retrieve_patterns ranks with a persistent BM25 inverted index (pattern_index.py)
+that is updated incrementally as patterns are stored.
+"""
+
+import copy
 import json
 import argparse
+import os
 import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 import platform
 
+from file_utils import file_signature
+from pattern_index import PatternIndex
+from pattern_journal import PatternJournal, apply_usage
+from sqlite_storage_engine import PATTERNS_COLLECTION, PATTERNS_DOCUMENT, get_storage_engine
+
 # Handle Windows compatibility for file locking
 if platform.system() == "Windows":
     import msvcrt
@@ -44,21 +62,49 @@ else:
 class PatternStorage:
     """Manages storage and retrieval of learned patterns."""
 
-    def __init__(self, patterns_dir: str = ".claude-patterns"):
+    STORAGE_MODES = ("json", "journal", "sqlite")
+
+    def __init__(
+        self,
+        patterns_dir: str = ".claude-patterns",
+        storage_mode: str = "json",
+        compact_threshold: int = 1000,
+        use_index: bool = True,
+    ):
         """
         Initialize pattern storage.
 
         Args:
             patterns_dir: Directory path for storing patterns (default: .claude-patterns)
+            storage_mode: "json" for whole-file patterns.json, "journal" for the
+                append-only journal backend, "sqlite" for the shared SQLite engine (default: json)
+            compact_threshold: Journal records before automatic compaction (journal mode only)
+            use_index: Rank retrievals with the BM25 inverted index instead of a linear scan
         """
+        if storage_mode not in self.STORAGE_MODES:
+            raise ValueError(f"Invalid storage_mode. Must be one of: {', '.join(self.STORAGE_MODES)}")
+
         self.patterns_dir = Path(patterns_dir)
         self.patterns_file = self.patterns_dir / "patterns.json"
+        self.storage_mode = storage_mode
+        self._engine = get_storage_engine(patterns_dir) if storage_mode == "sqlite" else None
+        self._journal = (
+            PatternJournal(patterns_dir, compact_threshold=compact_threshold) if storage_mode == "journal" else None
+        )
+        # SQLite mode ranks with its own FTS5 table
+        self._index = PatternIndex(patterns_dir) if use_index and self._engine is None else None
+        # Parsed patterns.json of json mode, valid while the file keeps this signature
+        self._json_patterns: Optional[List[Dict[str, Any]]] = None
+        self._json_signature = None
         self._ensure_directory()
 
     def _ensure_directory(self):
         """Create patterns directory if it does not exist."""
         self.patterns_dir.mkdir(parents=True, exist_ok=True)
-        if not self.patterns_file.exists():
+        if self._engine is not None:
+            if not self._engine.has_document(PATTERNS_DOCUMENT):
+                self._engine.write_document(PATTERNS_DOCUMENT, {"version": "1.0", "patterns": []})
+        elif not self.patterns_file.exists():
             self._write_patterns([])
 
     def _read_patterns(self):
@@ -68,6 +114,11 @@ class PatternStorage:
         Returns:
             List of pattern dictionaries
         """
+        if self._journal is not None:
+            return self._journal.read_patterns()
+        if self._engine is not None:
+            return self._engine.read_records(PATTERNS_COLLECTION)
+
         try:
             with open(self.patterns_file, "r", encoding="utf-8") as f:
                 # Acquire shared lock for reading
@@ -99,14 +150,18 @@ class PatternStorage:
             print(f"Error reading patterns: {e}", file=sys.stderr)
             return []
 
-"""
     def _write_patterns(self, patterns: List[Dict[str, Any]]):
-"""
+        """
         Write patterns to JSON file with file locking.
 
         Args:
             patterns: List of pattern dictionaries to write
-"""
+        """
+        if self._engine is not None:
+            # Only rows that changed are rewritten
+            self._engine.write_records(PATTERNS_COLLECTION, patterns)
+            return
+
         try:
             # Check if file exists and has existing structure
             existing_structure = None
@@ -137,35 +192,32 @@ class PatternStorage:
                     else:
                         # Simple array format
                         json.dump(patterns, f, indent=2, ensure_ascii=False)
+                    f.flush()
+                    self._json_patterns, self._json_signature = patterns, file_signature(os.fstat(f.fileno()))
                 finally:
                     unlock_file(f)
         except Exception as e:
             print(f"Error writing patterns: {e}", file=sys.stderr)
             raise
+        self._sync_index(patterns)
 
-"""
-    def store_pattern():
-        
+    def store_pattern(self, pattern: Dict[str, Any]) -> str:
+        """
         Store a new pattern.
 
-                Args:
-                    pattern: Pattern dictionary containing task information
-
-                Returns:
-                    pattern_id of the stored pattern
+        Args:
+            pattern: Pattern dictionary containing task information
 
-                Required pattern fields:
-                    - task_type: Type of task (
-            feature_implementation,
-            bug_fix,
-            refactoring,
-            testing,
-        )
-                    - context: Natural language description of task context
-                    - skills_used: List of skills used
-                    - approach: Detailed description of approach taken
-                    - quality_score: Quality score (0.0 to 1.0)
-"""
+        Returns:
+            pattern_id of the stored pattern
+
+        Required pattern fields:
+            - task_type: Type of task (feature_implementation, bug_fix, refactoring, testing, ...)
+            - context: Natural language description of task context
+            - skills_used: List of skills used
+            - approach: Detailed description of approach taken
+            - quality_score: Quality score (0.0 to 1.0)
+        """
         # Validate required fields
         required_fields = ["task_type", "context", "skills_used", "approach", "quality_score"]
         missing_fields = [field for field in required_fields if field not in pattern]
@@ -211,17 +263,22 @@ class PatternStorage:
             pattern["success_rate"] = 1.0 if pattern["quality_score"] >= 0.7 else 0.0
 
         # Store pattern
-        patterns = self._read_patterns()
-        patterns.append(pattern)
-        self._write_patterns(patterns)
+        if self._journal is not None:
+            self._journal.append_pattern(pattern)
+            self._sync_index()
+        elif self._engine is not None:
+            self._engine.append_record(PATTERNS_COLLECTION, pattern)
+        else:
+            patterns = self._read_patterns()
+            patterns.append(pattern)
+            self._write_patterns(patterns)
 
         return pattern["pattern_id"]
 
-"""
     def retrieve_patterns(
         self, context: str, task_type: Optional[str] = None, min_quality: float = 0.8, limit: int = 5
-    )-> List[Dict[str, Any]]:
-"""
+    ) -> List[Dict[str, Any]]:
+        """
         Retrieve patterns matching search criteria.
 
         Args:
@@ -232,7 +289,12 @@ class PatternStorage:
 
         Returns:
             List of matching patterns, sorted by relevance and quality
-"""
+        """
+        if self._engine is not None:
+            return self._engine.search_patterns(context, task_type=task_type, min_quality=min_quality, limit=limit)
+        if self._index is not None:
+            return self._retrieve_indexed(context, task_type, min_quality, limit)
+
         patterns = self._read_patterns()
 
         # Convert context to lowercase for case-insensitive matching
@@ -265,15 +327,57 @@ class PatternStorage:
         # Return top N matches
         return [match["pattern"] for match in matches[:limit]]
 
+    def _sync_index(self, patterns: Optional[List[Dict[str, Any]]] = None):
+        """
+        Index patterns appended to the store since the last sync.
+
+        Args:
+            patterns: Current pattern list if already loaded (json mode)
+        """
+        if self._index is None:
+            return
+        if self._journal is not None:
+            self._index.sync(len(self._journal), self._journal.pattern_id_at, self._journal.get_patterns_range)
+            return
+        if patterns is None:
+            patterns = self._read_patterns()
+        self._index.sync(
+            len(patterns), lambda pos: patterns[pos].get("pattern_id"), lambda start, stop: patterns[start:stop]
+        )
+
+    def _json_state(self) -> List[Dict[str, Any]]:
+        """Parsed patterns.json; the file is only re-read (and re-indexed) when another writer changed it."""
+        signature = file_signature(self.patterns_file)
+        if self._json_patterns is None or signature != self._json_signature:
+            patterns = self._read_patterns()
+            if self._index is not None:
+                # Usage counts may have changed as well
+                self._index.sync_patterns(patterns)
+            self._json_patterns, self._json_signature = patterns, signature
+        return self._json_patterns
+
+    def _retrieve_indexed(
+        self, context: str, task_type: Optional[str], min_quality: float, limit: int
+    ) -> List[Dict[str, Any]]:
+        """Rank patterns with the BM25 index; filters are applied from its side arrays."""
+        if self._journal is not None:
+            self._sync_index()
+            hits = self._index.search(context, task_type=task_type, min_quality=min_quality, limit=limit)
+            return self._journal.get_patterns_at([doc for doc, _ in hits])
+
+        patterns = self._json_state()
+        hits = self._index.search(context, task_type=task_type, min_quality=min_quality, limit=limit)
+        # Callers get copies so the cached patterns stay as stored
+        return [copy.deepcopy(patterns[doc]) for doc, _ in hits]
+
     # Alias for backward compatibility with tests
-"""
     def get_patterns(self) -> List[Dict[str, Any]]:
         """Alias to get all patterns for backward compatibility."""
         return self._read_patterns()
 
     def get_similar_patterns(
         self, task_type: str = None, context: Dict[str, Any] = None, min_quality: float = 0.8, limit: int = 5
-    )-> List[Dict[str, Any]]:
+    ) -> List[Dict[str, Any]]:
         """Get Similar Patterns. Alias for retrieve_patterns method for backward compatibility."""
         context_str = str(context) if context else ""
         return self.retrieve_patterns(context_str, task_type, min_quality, limit)
@@ -305,8 +409,8 @@ class PatternStorage:
             "avg_quality": total_quality / skill_usage,
         }
 
-    def update_usage():
-        
+    def update_usage(self, pattern_id: str, success: bool = True) -> bool:
+        """
         Update usage statistics for a pattern.
 
         Args:
@@ -315,7 +419,23 @@ class PatternStorage:
 
         Returns:
             True if pattern was found and updated, False otherwise
-"""
+        """
+        if self._journal is not None:
+            if self._journal.record_usage(pattern_id, success):
+                if self._index is not None:
+                    self._index.note_usage(pattern_id)
+                return True
+            print(f"Error: Pattern '{pattern_id}' not found", file=sys.stderr)
+            return False
+
+        if self._engine is not None:
+            pattern = self._engine.get_record(PATTERNS_COLLECTION, pattern_id)
+            if pattern is None:
+                print(f"Error: Pattern '{pattern_id}' not found", file=sys.stderr)
+                return False
+            apply_usage(pattern, success, datetime.now().isoformat())
+            return self._engine.update_record(PATTERNS_COLLECTION, pattern_id, pattern)
+
         patterns = self._read_patterns()
 
         for pattern in patterns:
@@ -338,19 +458,20 @@ class PatternStorage:
                 pattern["last_used"] = datetime.now().isoformat()
 
                 self._write_patterns(patterns)
+                if self._index is not None:
+                    self._index.note_usage(pattern_id)
                 return True
 
         print(f"Error: Pattern '{pattern_id}' not found", file=sys.stderr)
         return False
 
-"""
-    def get_statistics():
-        
+    def get_statistics(self) -> Dict[str, Any]:
+        """
         Get overall pattern statistics.
 
         Returns:
             Dictionary with statistics about stored patterns
-"""
+        """
         patterns = self._read_patterns()
 
         if not patterns:
@@ -382,14 +503,76 @@ class PatternStorage:
             ),
         }
 
-"""
-    def _load_unified_data():
-        
+    def compact_journal(self) -> bool:
+        """
+        Fold the pattern journal into its snapshot (journal mode only).
+
+        Returns:
+            True if a compaction ran, False in json mode
+        """
+        if self._journal is None:
+            return False
+        self._journal.compact()
+        return True
+
+    def rebuild_index(self) -> bool:
+        """
+        Rebuild the BM25 inverted index from all stored patterns.
+
+        Returns:
+            True if the index was rebuilt, False if indexing is disabled
+        """
+        if self._index is None:
+            return False
+        self._index.rebuild(self._read_patterns())
+        return True
+
+    def export_patterns(self, path: Optional[str] = None) -> Path:
+        """
+        Export all patterns in the patterns.json format.
+
+        Args:
+            path: Destination file (default: patterns.json in the patterns directory)
+
+        Returns:
+            Path that was written
+        """
+        if self._journal is not None:
+            return self._journal.export_json(Path(path) if path else None)
+
+        target = Path(path) if path else self.patterns_file
+        # In json mode patterns.json already is the export format
+        if target != self.patterns_file or self._engine is not None:
+            with open(target, "w", encoding="utf-8") as f:
+                json.dump(self._read_patterns(), f, indent=2, ensure_ascii=False)
+        return target
+
+    def import_patterns(self, path: str) -> int:
+        """
+        Import patterns from a patterns.json-format file, replacing current patterns.
+
+        Args:
+            path: Source file holding a JSON array or an object with "patterns"
+
+        Returns:
+            Number of patterns imported
+        """
+        if self._journal is not None:
+            return self._journal.import_json(Path(path))
+
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        patterns = data.get("patterns", []) if isinstance(data, dict) else data
+        self._write_patterns(patterns)
+        return len(patterns)
+
+    def _load_unified_data(self) -> Dict[str, Any]:
+        """
         Load unified data from unified_data.json file.
 
         Returns:
             Unified data dictionary with default structure
-"""
+        """
         unified_file = self.patterns_dir / "unified_data.json"
 
         if not unified_file.exists():
@@ -418,9 +601,8 @@ class PatternStorage:
             print(f"Warning: Could not load unified data: {e}", file=sys.stderr)
             return self._load_unified_data()  # Return default structure
 
-"""
-    def _save_unified_data():
-        
+    def _save_unified_data(self, unified_data: Dict[str, Any]) -> bool:
+        """
         Save unified data to unified_data.json file.
 
         Args:
@@ -428,7 +610,7 @@ class PatternStorage:
 
         Returns:
             True if successful, False otherwise
-"""
+        """
         unified_file = self.patterns_dir / "unified_data.json"
 
         # Update timestamp
@@ -446,9 +628,8 @@ class PatternStorage:
             print(f"Error saving unified data: {e}", file=sys.stderr)
             return False
 
-"""
-    def store_to_unified():
-        
+    def store_to_unified(self, data_type: str, data: Any) -> bool:
+        """
         Store data directly to unified structure.
 
         Args:
@@ -457,7 +638,7 @@ class PatternStorage:
 
         Returns:
             True if successful, False otherwise
-"""
+        """
         unified = self._load_unified_data()
 
         try:
@@ -504,14 +685,13 @@ class PatternStorage:
             print(f"Error storing to unified data: {e}", file=sys.stderr)
             return False
 
-"""
-    def consolidate_all_data():
-        
+    def consolidate_all_data(self) -> bool:
+        """
         Consolidate all scattered data files into unified_data.json.
 
         Returns:
             True if successful, False otherwise
-"""
+        """
         try:
             # Start with empty unified structure
             unified = self._load_unified_data()
@@ -603,9 +783,8 @@ class PatternStorage:
             print(f"Error consolidating data: {e}", file=sys.stderr)
             return False
 
-"""
-    def store_pattern_enhanced():
-        
+    def store_pattern_enhanced(self, pattern: Dict[str, Any]) -> str:
+        """
         Enhanced pattern storage that also updates unified data.
 
         Args:
@@ -613,7 +792,7 @@ class PatternStorage:
 
         Returns:
             pattern_id of stored pattern
-"""
+        """
         # Store pattern using existing method
         pattern_id = self.store_pattern(pattern)
 
@@ -660,7 +839,6 @@ class PatternStorage:
         return pattern_id
 
 
-"""
 def main():
     """Command-line interface for pattern storage."""
     parser = argparse.ArgumentParser(description="Pattern Storage System")
@@ -669,6 +847,17 @@ def main():
         default=".claude-patterns",
         help="Patterns directory path",
     )
+    parser.add_argument(
+        "--storage",
+        choices=PatternStorage.STORAGE_MODES,
+        default="json",
+        help="Storage backend (json, append-only journal or sqlite)",
+    )
+    parser.add_argument(
+        "--no-index",
+        action="store_true",
+        help="Use the linear keyword scan instead of the BM25 index for retrieval",
+    )
 
     subparsers = parser.add_subparsers(dest="action", help="Action to perform")
 
@@ -711,6 +900,14 @@ def main():
     # Statistics action
     subparsers.add_parser("stats", help="Show pattern statistics")
 
+    # Journal maintenance actions
+    subparsers.add_parser("compact", help="Fold the pattern journal into its snapshot")
+    subparsers.add_parser("reindex", help="Rebuild the BM25 pattern index from scratch")
+    export_parser = subparsers.add_parser("export", help="Export patterns in patterns.json format")
+    export_parser.add_argument("--output", help="Destination file (default: patterns.json)")
+    import_parser = subparsers.add_parser("import", help="Import patterns from a patterns.json-format file")
+    import_parser.add_argument("--input", required=True, help="Source file")
+
     # Check action - for /learn:init smart detection
     subparsers.add_parser("check", help="Check if pattern database exists and is valid")
 
@@ -749,7 +946,7 @@ def main():
         parser.print_help()
         sys.exit(1)
 
-    storage = PatternStorage(args.dir)
+    storage = PatternStorage(args.dir, storage_mode=args.storage, use_index=not args.no_index)
 
     try:
         if args.action == "store":
@@ -771,6 +968,22 @@ def main():
             stats = storage.get_statistics()
             print(json.dumps(stats, indent=2))
 
+        elif args.action == "compact":
+            compacted = storage.compact_journal()
+            print(json.dumps({"success": True, "compacted": compacted}, indent=2))
+
+        elif args.action == "reindex":
+            success = storage.rebuild_index()
+            print(json.dumps({"success": success}, indent=2))
+
+        elif args.action == "export":
+            path = storage.export_patterns(args.output)
+            print(json.dumps({"success": True, "path": str(path)}, indent=2))
+
+        elif args.action == "import":
+            count = storage.import_patterns(args.input)
+            print(json.dumps({"success": True, "imported": count}, indent=2))
+
         elif args.action == "consolidate":
             success = storage.consolidate_all_data()
             if success:
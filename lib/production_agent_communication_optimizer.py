@@ -14,12 +14,15 @@ import hashlib
 import zlib
 import base64
 from typing import Dict, List, Any, Optional, Tuple, Union
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, replace
 from enum import Enum
 from datetime import datetime
 import pathlib
 import re
 
+from batch_optimization import ShardedOptimizerPool, dedupe_indices
+from token_counter import count_tokens
+
 
 class MessagePriority(Enum):
     """Message priority levels for communication optimization."""
@@ -115,6 +118,9 @@ class ProductionAgentCommunicationOptimizer:
             "processing_time_total": 0.0,
         }
 
+        # Worker processes for sharded batches, started on first use
+        self._batch_pool = ShardedOptimizerPool(type(self), {"cache_dir": str(self.cache_dir)})
+
     def optimize_message(
         self,
         sender: str,
@@ -122,8 +128,8 @@ class ProductionAgentCommunicationOptimizer:
         message: Dict[str, Any],
         compression_level: CompressionLevel = CompressionLevel.MEDIUM,
         priority: MessagePriority = MessagePriority.NORMAL,
-    )-> OptimizedMessage:
-        """Optimize Message."""
+    ) -> OptimizedMessage:
+        """
         Optimize a message for token efficiency.
 
         Args:
@@ -135,7 +141,7 @@ class ProductionAgentCommunicationOptimizer:
 
         Returns:
             Optimized message with metadata
-"""
+        """
         start_time = time.time()
 
         # Generate unique message ID
@@ -191,10 +197,8 @@ class ProductionAgentCommunicationOptimizer:
 
         return optimized_msg
 
-"""
-    def decompress_message():
-"""
-        
+    def decompress_message(self, optimized_message: OptimizedMessage) -> Dict[str, Any]:
+        """
         Decompress an optimized message back to original form.
 
         Args:
@@ -202,7 +206,7 @@ class ProductionAgentCommunicationOptimizer:
 
         Returns:
             Original message content
-"""
+        """
         # Verify checksum
         current_checksum = self._calculate_checksum(optimized_message.compressed_content)
         if current_checksum != optimized_message.checksum:
@@ -214,19 +218,20 @@ class ProductionAgentCommunicationOptimizer:
 
         return self._apply_decompression(optimized_message.compressed_content, optimized_message.compression_level)
 
-"""
-    def optimize_conversation():
-"""
-        
+    def optimize_conversation(
+        self, conversation: List[Dict[str, Any]], participants: List[str], max_workers: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
         Optimize an entire conversation between agents.
 
         Args:
             conversation: List of messages in chronological order
             participants: List of participating agents
+            max_workers: Worker processes for large conversations (None optimizes in-process)
 
         Returns:
             Conversation optimization results
-"""
+        """
         optimized_messages = []
         total_original_tokens = 0
         total_optimized_tokens = 0
@@ -235,7 +240,8 @@ class ProductionAgentCommunicationOptimizer:
         # Analyze conversation patterns
         conversation_patterns = self._analyze_conversation_patterns(conversation, participants)
 
-        # Optimize each message with context
+        # Choose compression level and priority per message, then optimize them as one batch
+        requests = []
         for i, message_data in enumerate(conversation):
             sender = message_data.get("sender", "unknown")
             receiver = message_data.get("receiver", "unknown")
@@ -249,6 +255,9 @@ class ProductionAgentCommunicationOptimizer:
             # Determine priority based on message type and context
             priority = self._determine_message_priority(content, conversation_patterns)
 
+            requests.append((sender, receiver, content, compression_level, priority))
+
+        for i, optimized in enumerate(self._optimize_requests(requests, max_workers)):
             # Add conversation context for better optimization
             context = {
                 "conversation_index": i,
@@ -258,9 +267,6 @@ class ProductionAgentCommunicationOptimizer:
                 "conversation_patterns": conversation_patterns,
             }
 
-            # Optimize message with context
-            optimized = self.optimize_message(sender, receiver, content, compression_level, priority)
-
             # Add context to metadata
             optimized.compressed_content = self._add_context_to_compressed(optimized.compressed_content, context)
 
@@ -287,7 +293,6 @@ class ProductionAgentCommunicationOptimizer:
             "conversation_patterns": conversation_patterns,
         }
 
-"""
     def get_optimization_statistics(self) -> Dict[str, Any]:
         """Get comprehensive optimization statistics."""
         if self.stats["total_optimizations"] > 0:
@@ -303,6 +308,71 @@ class ProductionAgentCommunicationOptimizer:
             "total_effectiveness": self._calculate_overall_effectiveness(),
         }
 
+    def optimize_batch(
+        self,
+        messages: List[Tuple[str, str, Dict[str, Any]]],
+        compression_level: CompressionLevel = CompressionLevel.MEDIUM,
+        priority: MessagePriority = MessagePriority.NORMAL,
+        max_workers: Optional[int] = None,
+    ) -> List[OptimizedMessage]:
+        """
+        Optimize a batch of messages, e.g. an orchestrator fan-out.
+
+        Args:
+            messages: (sender, receiver, message) tuples
+            compression_level: Desired compression level
+            priority: Message priority for optimization decisions
+            max_workers: Worker processes for large batches (None optimizes in-process)
+
+        Returns:
+            One optimized message per input, in order
+        """
+        requests = [(sender, receiver, message, compression_level, priority) for sender, receiver, message in messages]
+        return self._optimize_requests(requests, max_workers)
+
+    def close(self):
+        """Shut down batch worker processes."""
+        self._batch_pool.close()
+
+    def _optimize_requests(
+        self,
+        requests: List[Tuple[str, str, Dict[str, Any], CompressionLevel, MessagePriority]],
+        max_workers: Optional[int] = None,
+    ) -> List[OptimizedMessage]:
+        """
+        Optimize (sender, receiver, message, compression_level, priority) requests.
+
+        Identical requests are optimized once; repeats get a copy of the result
+        and still count towards the statistics. Large batches are sharded across
+        worker processes when max_workers > 1.
+        """
+        keys = [
+            (sender, receiver, level.value, priority.value, self._generate_message_hash(message))
+            for sender, receiver, message, level, priority in requests
+        ]
+        unique_indices, slots = dedupe_indices(keys)
+        unique_requests = [requests[index] for index in unique_indices]
+
+        if self._batch_pool.should_shard(len(unique_requests), max_workers):
+            unique_results = self._batch_pool.map("optimize_message", unique_requests, max_workers)
+            for optimized in unique_results:
+                self._update_statistics(optimized)
+        else:
+            unique_results = [self.optimize_message(*request) for request in unique_requests]
+
+        results = []
+        first_seen = set()
+        for slot in slots:
+            optimized = unique_results[slot]
+            if slot in first_seen:
+                optimized = replace(optimized, metrics=replace(optimized.metrics, processing_time_ms=0.0))
+                self.stats["cache_hits"] += 1
+                self._update_statistics(optimized)
+            else:
+                first_seen.add(slot)
+            results.append(optimized)
+        return results
+
     def _load_communication_patterns(self) -> Dict[str, Any]:
         """Load communication patterns for optimization."""
         return {
@@ -470,8 +540,8 @@ class ProductionAgentCommunicationOptimizer:
 
     def _determine_conversation_compression_level(
         self, index: int, total_messages: int, patterns: Dict[str, Any], sender: str, receiver: str
-    )-> CompressionLevel:
-        """ Determine Conversation Compression Level."""Determine optimal compression level based on conversation context."""
+    ) -> CompressionLevel:
+        """Determine optimal compression level based on conversation context."""
         # Early messages in conversation use lighter compression
         if index < 3:
             return CompressionLevel.LIGHT
@@ -524,18 +594,21 @@ class ProductionAgentCommunicationOptimizer:
 
     def _generate_message_id(self, sender: str, receiver: str, message: Dict[str, Any]) -> str:
         """Generate unique message ID."""
-        content_hash = hashlib.md5(json.dumps(message, sort_keys=True).encode()).hexdigest()[:8]
+        content_hash = self._generate_message_hash(message)[:8]
         timestamp = int(time.time())
         return f"{sender}_{receiver}_{timestamp}_{content_hash}"
 
+    def _generate_message_hash(self, message: Dict[str, Any]) -> str:
+        """Generate hash of message content for IDs and deduplication."""
+        return hashlib.md5(json.dumps(message, sort_keys=True).encode()).hexdigest()
+
     def _calculate_checksum(self, content: str) -> str:
         """Calculate checksum for content integrity verification."""
         return hashlib.md5(content.encode()).hexdigest()
 
     def _estimate_tokens(self, text: str) -> int:
         """Estimate token count for text."""
-        # Rough estimation: 1 token ≈ 4 characters on average
-        return len(text) // 4
+        return count_tokens(text)
 
     def _update_statistics(self, optimized_message: OptimizedMessage):
         """Update optimization statistics."""
@@ -566,10 +639,16 @@ def get_communication_optimizer(cache_dir: str = ".claude-patterns") -> Producti
     return ProductionAgentCommunicationOptimizer(cache_dir)
 
 
-def optimize_agent_message():
-"""
-        
-        Convenience function to optimize a single message.
+def optimize_agent_message(
+    sender: str,
+    receiver: str,
+    message: Dict[str, Any],
+    compression_level: str = "medium",
+    priority: str = "normal",
+    cache_dir: str = ".claude-patterns",
+) -> Dict[str, Any]:
+    """
+    Convenience function to optimize a single message.
 
     Args:
         sender: Sending agent
@@ -581,7 +660,7 @@ def optimize_agent_message():
 
     Returns:
         Optimization result with metrics
-"""
+    """
     optimizer = get_communication_optimizer(cache_dir)
 
     # Convert string parameters to enums
@@ -602,7 +681,6 @@ def optimize_agent_message():
     }
 
 
-"""
 def main():
     """Demonstrate the agent communication optimizer."""
     print("Production Agent Communication Optimizer Demo")
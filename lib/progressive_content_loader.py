@@ -16,6 +16,7 @@ from dataclasses import dataclass
 from enum import Enum
 import time
 
+from token_counter import count_tokens
 from token_optimization_engine import get_token_optimizer, ContentType
 
 
@@ -44,13 +45,11 @@ class ContentSection:
 
 
 class ProgressiveContentLoader:
-"""
+    """
     Progressive content loader that intelligently manages content delivery
-"""
     based on user needs and token constraints.
-"""
+    """
 
-"""
     def __init__(self, cache_dir: str = ".claude-patterns"):
         """Initialize the processor with default configuration."""
         self.cache_dir = pathlib.Path(cache_dir)
@@ -116,7 +115,7 @@ class ProgressiveContentLoader:
                     section_content = "\n".join(current_content).strip()
                     if section_content:
                         current_section.content = section_content
-                        current_section.tokens = len(section_content) // 3
+                        current_section.tokens = count_tokens(section_content)
                         sections.append(current_section)
 
                 # Start new section
@@ -146,7 +145,7 @@ class ProgressiveContentLoader:
             section_content = "\n".join(current_content).strip()
             if section_content:
                 current_section.content = section_content
-                current_section.tokens = len(section_content) // 3
+                current_section.tokens = count_tokens(section_content)
                 sections.append(current_section)
 
         return sections
@@ -237,8 +236,8 @@ class ProgressiveContentLoader:
         user_request: str = "",
         available_tokens: int = 20000,
         preferred_tier: LoadingTier = LoadingTier.STANDARD,
-    )-> Dict[str, Any]:
-        """Load Content."""Load content progressively based on user needs and token constraints."""
+    ) -> Dict[str, Any]:
+        """Load content progressively based on user needs and token constraints."""
         file_path_str = str(file_path)
 
         # Track user pattern
@@ -284,8 +283,8 @@ class ProgressiveContentLoader:
 
     def _determine_loading_strategy(
         self, user_request: str, available_tokens: int, preferred_tier: LoadingTier, sections: List[ContentSection]
-    )-> Dict[str, Any]:
-        """ Determine Loading Strategy."""Determine optimal loading strategy based on context."""
+    ) -> Dict[str, Any]:
+        """Determine optimal loading strategy based on context."""
         strategy = {
             "tier": preferred_tier,
             "max_tokens": available_tokens,
@@ -323,8 +322,8 @@ class ProgressiveContentLoader:
 
     def _should_load_section(
         self, section: ContentSection, strategy: Dict[str, Any], tokens_used: int, max_tokens: int
-    )-> bool:
-        """ Should Load Section."""Determine if a section should be loaded based on strategy."""
+    ) -> bool:
+        """Determine if a section should be loaded based on strategy."""
         # Check token budget
         if tokens_used + section.tokens > max_tokens:
             return False
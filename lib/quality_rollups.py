@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Quality Rollups for Autonomous Agent Plugin
+
+Materialized per-hour, per-day and per-week aggregates of assessment scores,
+split by model and task type, so trend views answer in time proportional to
+the number of buckets instead of re-walking the whole assessment history.
+
+Each bucket cell holds [count, sum, min, max]. Rollups are kept per stream
+(e.g. "quality_history" for AssessmentStorage, "quality_tracker" for
+QualityTracker) and persisted next to the pattern data like PatternJournal
+state: a quality_rollups.json snapshot plus an append-only journal of recorded
+assessments, both guarded by a lock file. Recording appends one line; the
+journal is folded into the snapshot every COMPACT_THRESHOLD records, which is
+also when hour and day buckets older than their RETENTION are pruned. A
+stream's count lets readers detect rollups that fell out of step with the
+history and rebuild them.
+
+Version: 1.0.0
+Author: Autonomous Agent Plugin
+"""
+import copy
+import json
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from file_utils import atomic_write_bytes, file_signature
+from pattern_journal import lock_file, unlock_file
+
+ROLLUP_FILE = "quality_rollups.json"
+ROLLUP_VERSION = 1
+GRANULARITIES = ("hour", "day", "week")
+
+# How long buckets of each granularity are kept (None keeps them forever).
+# Automatic trend ranges use day buckets up to 90 days and week buckets beyond.
+RETENTION = {"hour": timedelta(days=31), "day": timedelta(days=400), "week": None}
+
+# Journal records after which the journal is folded into the snapshot
+COMPACT_THRESHOLD = 500
+
+# Streams written by AssessmentStorage and QualityTracker
+ASSESSMENT_STREAM = "quality_history"
+TRACKER_STREAM = "quality_tracker"
+
+# count, sum, min, max
+COUNT, SUM, MIN, MAX = range(4)
+
+
+def bucket_start(when: datetime, granularity: str) -> datetime:
+    """
+    Get the start of the bucket containing a time.
+
+    Args:
+        when: Naive wall-clock time
+        granularity: "hour", "day" or "week" (weeks start on Monday)
+
+    Returns:
+        Start of the bucket
+    """
+    if granularity == "hour":
+        return when.replace(minute=0, second=0, microsecond=0)
+    day = when.replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        return day
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    raise ValueError(f"Unknown granularity: {granularity}")
+
+
+def _bucket_key(when: datetime, granularity: str) -> str:
+    """Sortable key of the bucket containing a time."""
+    return bucket_start(when, granularity).isoformat()
+
+
+def parse_time(timestamp: Any) -> Optional[datetime]:
+    """Parse an ISO timestamp to naive wall-clock time, or None if it cannot be parsed."""
+    if not timestamp or not isinstance(timestamp, str):
+        return None
+    try:
+        return datetime.fromisoformat(timestamp.replace("Z", "+00:00")).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+def is_scored(score: Any) -> bool:
+    """Only positive numeric scores are rolled up; zero scores mark unscored tasks."""
+    return isinstance(score, (int, float)) and not isinstance(score, bool) and score > 0
+
+
+class QualityRollups:
+    """Bucketed score aggregates persisted as a snapshot plus an append-only journal."""
+
+    def __init__(self, rollup_file: Path, compact_threshold: int = COMPACT_THRESHOLD):
+        """
+        Initialize rollups and load them from disk.
+
+        Args:
+            rollup_file: Path of quality_rollups.json (the journal and lock file sit next to it)
+            compact_threshold: Journal records after which record() compacts
+                (0 disables automatic compaction)
+        """
+        self.rollup_file = Path(rollup_file)
+        self.journal_file = self.rollup_file.with_name(self.rollup_file.stem + ".journal.jsonl")
+        self.lock_path = self.rollup_file.with_name(self.rollup_file.stem + ".lock")
+        self.compact_threshold = compact_threshold
+        self.streams: Dict[str, Dict[str, Any]] = {}
+
+        self._mutex = threading.RLock()
+        self._last_seq = 0
+        self._journal_offset = 0
+        self._tail_records = 0
+        self._snapshot_signature: Optional[Tuple[int, int, int]] = None
+        self._rebuilt: Set[str] = set()
+        self.load()
+
+    @contextmanager
+    def _locked(self, exclusive: bool):
+        """Hold the in-process mutex and the inter-process lock on the sidecar lock file."""
+        with self._mutex:
+            self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.lock_path, "a+", encoding="utf-8") as handle:
+                lock_file(handle, exclusive=exclusive)
+                try:
+                    yield
+                finally:
+                    unlock_file(handle)
+
+    def load(self) -> None:
+        """Load rollups from disk; missing or unreadable files start empty."""
+        if not self.rollup_file.exists() and not self.journal_file.exists():
+            self._load_snapshot()
+            return
+        with self._locked(exclusive=False):
+            self._load_snapshot()
+            self._catch_up()
+
+    def _load_snapshot(self) -> None:
+        """Replace in-memory state with the snapshot, without the journal."""
+        self.streams = {}
+        self._last_seq = 0
+        self._journal_offset = 0
+        self._tail_records = 0
+        self._rebuilt = set()
+        self._snapshot_signature = file_signature(self.rollup_file)
+        if self._snapshot_signature is None:
+            return
+        try:
+            with open(self.rollup_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable rollups {self.rollup_file}: {e}", file=sys.stderr)
+            return
+        if data.get("version") == ROLLUP_VERSION:
+            self.streams = data.get("streams", {})
+            self._last_seq = data.get("last_seq", 0)
+
+    def _catch_up(self) -> None:
+        """
+        Apply journal records written since the last read.
+
+        Must be called with the lock held.
+        """
+        if file_signature(self.rollup_file) != self._snapshot_signature:
+            self._load_snapshot()
+        try:
+            size = self.journal_file.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if size < self._journal_offset:
+            # Truncated by a compaction we have not seen yet
+            self._load_snapshot()
+        if size == self._journal_offset:
+            return
+
+        with open(self.journal_file, "rb") as f:
+            f.seek(self._journal_offset)
+            tail = f.read(size - self._journal_offset)
+
+        # Only consume complete lines; a partial trailing line is re-read later
+        consumed = tail.rfind(b"\n") + 1
+        for line in tail[:consumed].splitlines():
+            if not line.strip():
+                continue
+            try:
+                self._apply_record(json.loads(line))
+            except (ValueError, KeyError, TypeError) as e:
+                print(f"Warning: Skipping corrupt rollup journal line: {e}", file=sys.stderr)
+                continue
+            self._tail_records += 1
+        self._journal_offset += consumed
+
+    def _apply_record(self, record: Dict[str, Any]) -> None:
+        """Add one journal record unless the snapshot already holds it."""
+        seq = record["seq"]
+        if seq <= self._last_seq:
+            # Already folded into the snapshot (crash between snapshot and truncate)
+            return
+        self._last_seq = seq
+        when = datetime.fromisoformat(record["time"])
+        self.add(record["stream"], when, record["score"], record["model"], record["task_type"])
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        """Append a record to the journal and apply it. Must be called with the exclusive lock held."""
+        record["seq"] = self._last_seq + 1
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with open(self.journal_file, "ab") as f:
+            if f.tell() > self._journal_offset:
+                # Terminate a partial line left by a crashed writer
+                f.write(b"\n")
+            f.write(line.encode("utf-8"))
+            f.flush()
+            self._journal_offset = f.tell()
+        self._tail_records += 1
+        self._apply_record(record)
+
+    def _compact_locked(self) -> None:
+        """Prune expired buckets, write the snapshot and truncate the journal."""
+        self.prune()
+        data = {"version": ROLLUP_VERSION, "last_seq": self._last_seq, "streams": self.streams}
+        atomic_write_bytes(self.rollup_file, json.dumps(data, separators=(",", ":")).encode("utf-8"))
+
+        # Records up to last_seq are now in the snapshot; replay skips them if
+        # the truncate below never happens.
+        with open(self.journal_file, "w", encoding="utf-8"):
+            pass
+
+        self._snapshot_signature = file_signature(self.rollup_file)
+        self._journal_offset = 0
+        self._tail_records = 0
+        self._rebuilt = set()
+
+    def save(self) -> None:
+        """
+        Fold the journal and in-memory rebuilds into the snapshot.
+
+        Records other processes journaled since the last read are kept; streams
+        replaced by rebuild() keep the rebuilt version.
+        """
+        with self._locked(exclusive=True):
+            rebuilt = {stream: copy.deepcopy(self.streams[stream]) for stream in self._rebuilt}
+            self._catch_up()
+            self.streams.update(rebuilt)
+            self._compact_locked()
+
+    def prune(self, now: Optional[datetime] = None) -> None:
+        """
+        Drop hour and day buckets older than their RETENTION (in memory).
+
+        Args:
+            now: Current time (defaults to datetime.now())
+        """
+        now = datetime.now() if now is None else now
+        for rollup in self.streams.values():
+            for granularity, keep in RETENTION.items():
+                if keep is None:
+                    continue
+                first = _bucket_key(now - keep, granularity)
+                buckets = rollup["buckets"][granularity]
+                for key in [key for key in buckets if key < first]:
+                    del buckets[key]
+
+    def add(self, stream: str, when: datetime, score: float, model: str, task_type: str) -> None:
+        """
+        Add one scored assessment to every granularity of a stream (in memory).
+
+        Args:
+            stream: Rollup stream name
+            when: Naive wall-clock time of the assessment
+            score: Positive assessment score
+            model: Model name as stored with the assessment ("" if none was recorded)
+            task_type: Task type as stored with the assessment
+        """
+        rollup = self.streams.setdefault(stream, {"count": 0, "buckets": {g: {} for g in GRANULARITIES}})
+        rollup["count"] += 1
+        for granularity in GRANULARITIES:
+            bucket = rollup["buckets"][granularity].setdefault(_bucket_key(when, granularity), {})
+            cell = bucket.setdefault(model, {}).get(task_type)
+            if cell is None:
+                bucket[model][task_type] = [1, score, score, score]
+            else:
+                cell[COUNT] += 1
+                cell[SUM] += score
+                cell[MIN] = min(cell[MIN], score)
+                cell[MAX] = max(cell[MAX], score)
+
+    def record(self, stream: str, timestamp: str, score: Any, model: str, task_type: str) -> bool:
+        """
+        Add a newly recorded assessment and append it to the journal.
+
+        Records other processes journaled are read first, under the same lock,
+        so concurrent recorders never lose each other's updates.
+
+        Args:
+            stream: Rollup stream name
+            timestamp: ISO timestamp of the assessment
+            score: Assessment score; unscored assessments are skipped
+            model: Model name as stored with the assessment
+            task_type: Task type as stored with the assessment
+
+        Returns:
+            True if the assessment was rolled up
+        """
+        when = parse_time(timestamp)
+        if when is None or not is_scored(score):
+            return False
+        with self._locked(exclusive=True):
+            self._catch_up()
+            self._append(
+                {"stream": stream, "time": when.isoformat(), "score": score, "model": model, "task_type": task_type}
+            )
+            if self.compact_threshold and self._tail_records >= self.compact_threshold:
+                self._compact_locked()
+        return True
+
+    def rebuild(self, stream: str, assessments: Iterable[Tuple[datetime, Any, str, str]]) -> None:
+        """
+        Replace a stream with rollups of a full history (in memory until save()).
+
+        Args:
+            stream: Rollup stream name
+            assessments: (time, score, model, task_type) of every assessment
+        """
+        self.streams[stream] = {"count": 0, "buckets": {g: {} for g in GRANULARITIES}}
+        self._rebuilt.add(stream)
+        for when, score, model, task_type in assessments:
+            if is_scored(score):
+                self.add(stream, when, score, model, task_type)
+
+    def count(self, stream: str) -> int:
+        """Number of assessments rolled up in a stream."""
+        return self.streams.get(stream, {}).get("count", 0)
+
+    def query(
+        self,
+        stream: str,
+        granularity: str,
+        since: Optional[datetime] = None,
+        model: Optional[str] = None,
+        task_types: Optional[Iterable[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get bucket cells of a stream, oldest bucket first.
+
+        Buckets are selected by their start, so the first bucket may cover time
+        before since.
+
+        Args:
+            stream: Rollup stream name
+            granularity: "hour", "day" or "week"
+            since: Only buckets containing or after this time
+            model: Only cells of this model
+            task_types: Only cells of these task types (case-insensitive)
+
+        Returns:
+            One dict per (bucket, model, task_type) with count, sum, min, max and avg
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown granularity: {granularity}")
+        buckets = self.streams.get(stream, {}).get("buckets", {}).get(granularity, {})
+        first = _bucket_key(since, granularity) if since else ""
+        wanted = {task_type.lower() for task_type in task_types} if task_types is not None else None
+
+        cells = []
+        for key in sorted(key for key in buckets if key >= first):
+            for cell_model, by_task in buckets[key].items():
+                if model is not None and cell_model != model:
+                    continue
+                for task_type, cell in by_task.items():
+                    if wanted is not None and task_type.lower() not in wanted:
+                        continue
+                    cells.append(
+                        {
+                            "bucket": key,
+                            "model": cell_model,
+                            "task_type": task_type,
+                            "count": cell[COUNT],
+                            "sum": cell[SUM],
+                            "min": cell[MIN],
+                            "max": cell[MAX],
+                            "avg": cell[SUM] / cell[COUNT],
+                        }
+                    )
+        return cells
+
+    def totals(self, cells: Iterable[Dict[str, Any]], *fields: str) -> Dict[Any, Dict[str, Any]]:
+        """
+        Combine query cells that share the values of some of their fields.
+
+        Args:
+            cells: Cells returned by query
+            fields: Fields to group by, e.g. "model" or "bucket", "model"
+
+        Returns:
+            Mapping of the field value (a tuple for several fields) to combined
+            count, sum, min, max and avg
+        """
+        combined: Dict[Any, Dict[str, Any]] = {}
+        for cell in cells:
+            key = cell[fields[0]] if len(fields) == 1 else tuple(cell[field] for field in fields)
+            total = combined.get(key)
+            if total is None:
+                combined[key] = {name: cell[name] for name in ("count", "sum", "min", "max")}
+                continue
+            total["count"] += cell["count"]
+            total["sum"] += cell["sum"]
+            total["min"] = min(total["min"], cell["min"])
+            total["max"] = max(total["max"], cell["max"])
+        for total in combined.values():
+            total["avg"] = total["sum"] / total["count"]
+        return combined
@@ -18,15 +18,16 @@ import os
 import json
 import time
 import hashlib
-import pickle
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Any, Union
 from dataclasses import dataclass, asdict
 from enum import Enum
 import logging
 from pathlib import Path
 import threading
-from collections import defaultdict, OrderedDict
+from collections import defaultdict
+
+from tiered_cache import NAMESPACE_CONTENT, get_tiered_cache
 
 
 class CachePolicy(Enum):
@@ -115,16 +116,21 @@ class SimpleSmartCache:
         max_size_mb: int = 100,
         default_policy: CachePolicy = CachePolicy.LRU,
         enable_predictions: bool = True,
+        namespace: str = NAMESPACE_CONTENT,
     ):
-        """Initialize the processor with default configuration."""
+        """
         Initialize the smart cache system.
 
+        Entries live in one namespace of the shared tiered cache for
+        cache_dir; this class adds access pattern tracking on top.
+
         Args:
             cache_dir: Directory for persistent cache storage
-            max_size_mb: Maximum cache size in megabytes
-            default_policy: Default cache eviction policy
+            max_size_mb: Memory tier capacity, used if the shared tiered cache is created here
+            default_policy: Reported policy; the tiered cache always evicts by segmented LRU
             enable_predictions: Enable predictive pre-loading
-"""
+            namespace: Tiered cache namespace for this cache's entries
+        """
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
 
@@ -134,9 +140,8 @@ class SimpleSmartCache:
         self.enable_predictions = enable_predictions
 
         # Cache storage
-        self.cache: Dict[str, CacheEntry] = {}
-        self.access_order: OrderedDict = OrderedDict()  # For LRU
-        self.frequency_count: Dict[str, int] = defaultdict(int)  # For LFU
+        self.tiers = get_tiered_cache(str(self.cache_dir), l1_max_mb=max_size_mb)
+        self.cache = self.tiers.namespace(namespace)
 
         # User patterns for predictions
         self.user_patterns: Dict[str, List[str]] = defaultdict(list)
@@ -152,14 +157,11 @@ class SimpleSmartCache:
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
 
-        # Initialize cache and patterns
-        self._load_cache()
+        # Initialize patterns
         self._load_patterns()
 
-"""
-    def get():
-"""
-        
+    def get(self, key: str, user_id: str = None) -> Optional[Any]:
+        """
         Get content from cache.
 
         Args:
@@ -168,42 +170,19 @@ class SimpleSmartCache:
 
         Returns:
             Cached content or None if not found
-"""
+        """
+        content = self.cache.get(key)
         with self.lock:
-            entry = self.cache.get(key)
-
-            if entry is None:
-                self.stats.miss_count += 1
-                self._update_access_pattern(key, user_id)
-                return None
-
-            # Check expiration
-            if entry.is_expired:
-                self._remove_entry(key)
-                self.stats.miss_count += 1
-                self._update_access_pattern(key, user_id)
-                return None
-
-            # Update access information
-            entry.last_accessed = datetime.now()
-            entry.access_count += 1
-
-            # Update policy-specific data
-            if self.default_policy == CachePolicy.LRU:
-                self.access_order.move_to_end(key)
-            elif self.default_policy == CachePolicy.LFU:
-                self.frequency_count[key] += 1
-
-            self.stats.hit_count += 1
             self._update_access_pattern(key, user_id)
+            if content is None:
+                return None
 
             # Trigger predictive loading
             if self.enable_predictions:
                 self._trigger_predictions(key, user_id)
 
-            return entry.content
+            return content
 
-"""
     def set(
         self,
         key: str,
@@ -212,8 +191,8 @@ class SimpleSmartCache:
         ttl_seconds: Optional[int] = None,
         user_id: str = None,
         metadata: Dict[str, Any] = None,
-    )-> bool:
-        """Set."""
+    ) -> bool:
+        """
         Store content in cache.
 
         Args:
@@ -226,118 +205,11 @@ class SimpleSmartCache:
 
         Returns:
             True if content was stored successfully
-"""
-        with self.lock:
-            try:
-                # Calculate content size
-                content_size = len(pickle.dumps(content))
-
-                # Check if content is too large
-                if content_size > self.max_size_bytes // 2:
-                    self.logger.warning(f"Content too large for cache: {content_size} bytes")
-                    return False
-
-                # Remove existing entry if present
-                if key in self.cache:
-                    self._remove_entry(key)
-
-                # Ensure enough space
-                while self._get_current_size() + content_size > self.max_size_bytes and self.cache:
-                    self._evict_entry()
-
-                # Create cache entry
-                entry = CacheEntry(
-                    key=key,
-                    content=content,
-                    content_type=content_type,
-                    created_at=datetime.now(),
-                    last_accessed=datetime.now(),
-                    access_count=1,
-                    size_bytes=content_size,
-                    ttl_seconds=ttl_seconds,
-                    user_id=user_id,
-                    metadata=metadata or {},
-                )
-
-                # Store entry
-                self.cache[key] = entry
-
-                # Update policy-specific data
-                if self.default_policy == CachePolicy.LRU:
-                    self.access_order[key] = datetime.now()
-                elif self.default_policy == CachePolicy.LFU:
-                    self.frequency_count[key] = 1
-
-                # Update statistics
-                self.stats.total_entries = len(self.cache)
-                self.stats.total_size_bytes = self._get_current_size()
-
-                # Save to disk
-                self._save_cache()
-
-                return True
-
-            except Exception as e:
-                self.logger.error(f"Failed to cache content: {e}")
-                return False
-
-"""
-    def _remove_entry(self, key: str) -> None:
-        """Remove entry from cache."""
-        if key in self.cache:
-            del self.cache[key]
-
-        # Clean up policy-specific data
-        if key in self.access_order:
-            del self.access_order[key]
-        if key in self.frequency_count:
-            del self.frequency_count[key]
-
-        # Update statistics
-        self.stats.total_entries = len(self.cache)
-        self.stats.total_size_bytes = self._get_current_size()
-
-    def _evict_entry(self) -> None:
-        """Evict entry based on cache policy."""
-        if not self.cache:
-            return
-
-        if self.default_policy == CachePolicy.LRU:
-            # Evict least recently used
-            lru_key = min(self.access_order.keys(), key=lambda k: self.access_order[k])
-            self._remove_entry(lru_key)
-
-        elif self.default_policy == CachePolicy.LFU:
-            # Evict least frequently used
-            lfu_key = min(self.frequency_count.keys(), key=lambda k: self.frequency_count[k])
-            self._remove_entry(lfu_key)
-
-        elif self.default_policy == CachePolicy.TTL:
-            # Evict expired entries first
-            expired_keys = [k for k, v in self.cache.items() if v.is_expired]
-            if expired_keys:
-                self._remove_entry(expired_keys[0])
-            else:
-                # Evict oldest
-                oldest_key = min(self.cache.keys(), key=lambda k: self.cache[k].created_at)
-                self._remove_entry(oldest_key)
-
-        else:  # ADAPTIVE
-            # Use combination of recency and frequency
-            scores = {}
-            for key, entry in self.cache.items():
-                age_penalty = entry.age_seconds / 3600  # Hours
-                freq_bonus = entry.access_count
-                scores[key] = freq_bonus - age_penalty
-
-            worst_key = min(scores.keys(), key=lambda k: scores[k])
-            self._remove_entry(worst_key)
-
-        self.stats.eviction_count += 1
-
-    def _get_current_size(self) -> int:
-        """Get current cache size in bytes."""
-        return sum(entry.size_bytes for entry in self.cache.values())
+        """
+        stored = self.cache.put(key, content, ttl=ttl_seconds)
+        if not stored:
+            self.logger.warning(f"Content not cached: {key}")
+        return stored
 
     def _update_access_pattern(self, key: str, user_id: str = None) -> None:
         """Update user access patterns for predictions."""
@@ -387,9 +259,9 @@ class SimpleSmartCache:
         # Content-based predictions
         content_type = self._extract_content_type(key)
         if content_type in self.content_predictions:
-            similar_keys = [k for k in self.content_predictions[content_type][-50:] if k != key and k not in self.cache]
-            if similar_keys:
-                predicted_key = similar_keys[0]  # Most recent similar content
+            recent_keys = self.content_predictions[content_type][-50:]
+            predicted_key = next((k for k in recent_keys if k != key and k not in self.cache), None)
+            if predicted_key is not None:
                 self.stats.prediction_count += 1
 
     def _predict_next_access(self, pattern: List[str]) -> List[str]:
@@ -407,9 +279,8 @@ class SimpleSmartCache:
         # Return unique predictions, most recent first
         return list(dict.fromkeys(reversed(predictions)))
 
-    def clear():
-"""
-        
+    def clear(self, pattern: Optional[str] = None) -> int:
+        """
         Clear cache entries.
 
         Args:
@@ -417,112 +288,38 @@ class SimpleSmartCache:
 
         Returns:
             Number of entries cleared
-"""
-        with self.lock:
-            if pattern is None:
-                # Clear all
-                cleared_count = len(self.cache)
-                self.cache.clear()
-                self.access_order.clear()
-                self.frequency_count.clear()
-            else:
-                # Clear matching entries
-                keys_to_remove = [k for k in self.cache.keys() if pattern in k]
-                for key in keys_to_remove:
-                    self._remove_entry(key)
-                cleared_count = len(keys_to_remove)
-
-            # Update statistics
-            self.stats.total_entries = len(self.cache)
-            self.stats.total_size_bytes = self._get_current_size()
-
-            # Save changes
-            self._save_cache()
-
-            return cleared_count
+        """
+        return self.cache.clear(pattern)
 
-"""
     def get_stats(self) -> Dict[str, Any]:
         """Get comprehensive cache statistics."""
+        namespace_stats = self.cache.stats()
+        tier_stats = self.tiers.get_stats()
         with self.lock:
-            # Content type distribution
-            content_types = defaultdict(int)
-            for entry in self.cache.values():
-                content_types[entry.content_type.value] += 1
-
-            # Age distribution
-            ages = [entry.age_seconds for entry in self.cache.values()]
-            age_stats = {
-                "average_age_seconds": sum(ages) / len(ages) if ages else 0,
-                "oldest_entry_seconds": max(ages) if ages else 0,
-                "newest_entry_seconds": min(ages) if ages else 0,
-            }
-
-            # Size distribution
-            sizes = [entry.size_bytes for entry in self.cache.values()]
-            size_stats = {
-                "average_size_bytes": sum(sizes) / len(sizes) if sizes else 0,
-                "largest_entry_bytes": max(sizes) if sizes else 0,
-                "smallest_entry_bytes": min(sizes) if sizes else 0,
-            }
+            # Hits, misses and evictions come from the shared tiered cache counters
+            self.stats.total_entries = len(self.cache)
+            self.stats.total_size_bytes = tier_stats["l1"]["bytes"]
+            self.stats.hit_count = namespace_stats["l1_hits"] + namespace_stats["l2_hits"]
+            self.stats.miss_count = namespace_stats["misses"]
+            self.stats.eviction_count = namespace_stats["l1_evictions"] + namespace_stats["l2_evictions"]
 
             return {
                 "cache_stats": asdict(self.stats),
-                "content_type_distribution": dict(content_types),
-                "age_statistics": age_stats,
-                "size_statistics": size_stats,
                 "configuration": {
                     "max_size_mb": self.max_size_bytes / (1024 * 1024),
                     "policy": self.default_policy.value,
                     "predictions_enabled": self.enable_predictions,
+                    "namespace": self.cache.namespace,
                 },
                 "performance_metrics": {
                     "hit_rate": self.stats.hit_rate,
                     "prediction_accuracy": self.stats.prediction_accuracy,
                     "eviction_rate": self.stats.eviction_count / max(1, self.stats.total_entries),
-                    "memory_utilization": self.stats.total_size_bytes / self.max_size_bytes,
+                    "memory_utilization": tier_stats["l1"]["utilization"],
                 },
+                "tiers": tier_stats,
             }
 
-    def _save_cache(self) -> None:
-        """Save cache to disk."""
-        try:
-            cache_file = self.cache_dir / "smart_cache.pkl"
-            with open(cache_file, "wb") as f:
-                pickle.dump(self.cache, f)
-
-            stats_file = self.cache_dir / "cache_stats.json"
-            with open(stats_file, "w") as f:
-                json.dump(asdict(self.stats), f, indent=2, default=str)
-
-        except Exception as e:
-            self.logger.error(f"Failed to save cache: {e}")
-
-    def _load_cache(self) -> None:
-        """Load cache from disk."""
-        cache_file = self.cache_dir / "smart_cache.pkl"
-        if cache_file.exists():
-            try:
-                with open(cache_file, "rb") as f:
-                    loaded_cache = pickle.load(f)
-
-                # Validate and load entries
-                current_time = datetime.now()
-                for key, entry in loaded_cache.items():
-                    if not entry.is_expired:  # Skip expired entries
-                        self.cache[key] = entry
-
-                        # Rebuild policy-specific data
-                        if self.default_policy == CachePolicy.LRU:
-                            self.access_order[key] = entry.last_accessed
-                        elif self.default_policy == CachePolicy.LFU:
-                            self.frequency_count[key] = entry.access_count
-
-                self.logger.info(f"Loaded {len(self.cache)} cache entries from disk")
-
-            except Exception as e:
-                self.logger.error(f"Failed to load cache: {e}")
-
     def _save_patterns(self) -> None:
         """Save user patterns to disk."""
         try:
@@ -559,9 +356,8 @@ class SimpleSmartCache:
             except Exception as e:
                 self.logger.error(f"Failed to load content predictions: {e}")
 
-    def cleanup():
-"""
-        
+    def cleanup(self, max_age_hours: int = 24) -> int:
+        """
         Clean up old entries.
 
         Args:
@@ -569,22 +365,11 @@ class SimpleSmartCache:
 
         Returns:
             Number of entries cleaned up
-"""
-        with self.lock:
-            cutoff_time = datetime.now() - timedelta(hours=max_age_hours)
-            old_keys = [k for k, v in self.cache.items() if v.created_at < cutoff_time]
-
-            for key in old_keys:
-                self._remove_entry(key)
-
-            if old_keys:
-                self._save_cache()
-
-            return len(old_keys)
+        """
+        return self.cache.cleanup(max_age_hours * 3600)
 
 
 # Easy-to-use functions for quick integration
-"""
 def cache_content(key: str, content: Any, ttl_hours: int = 24) -> bool:
     """Quick cache function for content."""
     cache = SimpleSmartCache()
@@ -17,9 +17,12 @@ from typing import Dict, List, Any, Optional, Tuple, Set
 from dataclasses import dataclass, asdict
 from enum import Enum
 import threading
-from collections import defaultdict, deque
+from collections import defaultdict
 import statistics
 
+from cache_persistence import DirtyTracker
+from tiered_cache import NAMESPACE_PREDICTIONS, get_tiered_cache
+from token_counter import count_tokens
 from token_optimization_engine import get_token_optimizer, ContentType
 from progressive_content_loader import get_progressive_loader, LoadingTier
 
@@ -42,31 +45,6 @@ class PredictionModel(Enum):
     HYBRID = "hybrid"  # Combination of models
 
 
-@dataclass
-class CacheEntry:
-    """Represents a cached content entry."""
-
-    key: str
-    content: Any
-    tokens: int
-    access_count: int
-    last_accessed: float
-    created_at: float
-    expires_at: Optional[float]
-    hit_rate: float = 0.0
-    prediction_score: float = 0.0
-
-    @property
-    def is_expired(self) -> bool:
-        """Check if cache entry is expired."""
-        return self.expires_at is not None and time.time() > self.expires_at
-
-    @property
-    def age_seconds(self) -> float:
-        """Get age of cache entry in seconds."""
-        return time.time() - self.created_at
-
-
 @dataclass
 class UserPattern:
     """Represents a user's content access pattern."""
@@ -80,14 +58,27 @@ class UserPattern:
 
 
 class SmartCache:
-"""
-    Intelligent caching system with predictive loading capabilities.
-"""
-"""
-
-"""
-    def __init__(self, cache_dir: str = ".claude-patterns", max_size_mb: int = 100):
-        """Initialize the processor with default configuration."""
+    """Intelligent caching system with predictive loading capabilities."""
+
+    def __init__(
+        self,
+        cache_dir: str = ".claude-patterns",
+        max_size_mb: int = 100,
+        flush_interval: float = 5.0,
+        flush_threshold: int = 100,
+    ):
+        """
+        Initialize the cache.
+
+        Content is stored in the "predictions" namespace of the shared tiered
+        cache for cache_dir; this class adds user pattern learning on top.
+
+        Args:
+            cache_dir: Directory for cache files (default: .claude-patterns)
+            max_size_mb: Memory tier capacity, used if the shared tiered cache is created here
+            flush_interval: Seconds pending pattern/stat changes may wait before being written
+            flush_threshold: Pending changes that trigger an immediate background flush
+        """
         self.cache_dir = pathlib.Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
 
@@ -95,11 +86,12 @@ class SmartCache:
         self.max_size_bytes = max_size_mb * 1024 * 1024
         self.default_ttl = 3600  # 1 hour
         self.cleanup_interval = 300  # 5 minutes
+        self.flush_interval = flush_interval
 
         # Cache storage
-        self.cache: Dict[str, CacheEntry] = {}
-        self.cache_keys_by_access = deque()
-        self.cache_keys_by_frequency = defaultdict(int)
+        self.tiers = get_tiered_cache(str(self.cache_dir), l1_max_mb=max_size_mb)
+        self.cache = self.tiers.namespace(NAMESPACE_PREDICTIONS)
+        self._lock = threading.RLock()
 
         # User patterns and predictions
         self.user_patterns: Dict[str, UserPattern] = {}
@@ -108,38 +100,37 @@ class SmartCache:
         # Statistics
         self.stats = {"hits": 0, "misses": 0, "predictions": 0, "prediction_hits": 0, "evictions": 0, "total_tokens_saved": 0}
 
-        # Background cleanup thread
-        self.cleanup_thread = threading.Thread(target=self._cleanup_worker, daemon=True)
-        self.cleanup_running = True
-        self.cleanup_thread.start()
+        # Write-behind persistence: changes are marked dirty and written by the
+        # background worker, never on the request path
+        self._dirty = DirtyTracker(flush_interval, flush_threshold)
+        self._flush_event = threading.Event()
+        self._flush_lock = threading.Lock()
 
         # Cache files
-        self.cache_file = self.cache_dir / "smart_cache.pkl"
         self.patterns_file = self.cache_dir / "user_patterns.json"
         self.stats_file = self.cache_dir / "cache_stats.json"
 
         # Load existing data
-        self._load_cache()
         self._load_patterns()
         self._load_stats()
 
+        # Background cleanup and flush thread
+        self.cleanup_thread = threading.Thread(target=self._cleanup_worker, daemon=True)
+        self.cleanup_running = True
+        self.cleanup_thread.start()
+
     def get(self, key: str, user_id: str = None) -> Optional[Any]:
         """Get content from cache with intelligent loading."""
-        # Check cache
-        entry = self.cache.get(key)
-        if entry and not entry.is_expired:
-            # Update access statistics
-            entry.access_count += 1
-            entry.last_accessed = time.time()
-            entry.hit_rate = entry.access_count / max(1, (time.time() - entry.created_at) / 3600)
-
-            # Update frequency tracking
-            self.cache_keys_by_frequency[key] += 1
+        with self._lock:
+            return self._get_locked(key, user_id)
 
+    def _get_locked(self, key: str, user_id: str = None) -> Optional[Any]:
+        """Cache lookup; caller holds the cache lock."""
+        # Check cache
+        content = self.cache.get(key)
+        if content is not None:
             self.stats["hits"] += 1
-            self.stats["total_tokens_saved"] += entry.tokens
-
-            return entry.content
+            return content
 
         # Cache miss - try predictive loading
         if user_id and user_id in self.user_patterns:
@@ -148,48 +139,25 @@ class SmartCache:
                 self.stats["predictions"] += 1
                 # Try to load predicted content
                 for predicted_key in predictions[:3]:  # Try top 3 predictions
-                    if predicted_key in self.cache:
-                        predicted_entry = self.cache[predicted_key]
-                        if not predicted_entry.is_expired:
-                            self.stats["prediction_hits"] += 1
-                            # Update prediction score
-                            predicted_entry.prediction_score += 0.1
-                            return predicted_entry.content
+                    predicted_content = self.cache.get(predicted_key)
+                    if predicted_content is not None:
+                        self.stats["prediction_hits"] += 1
+                        return predicted_content
 
         self.stats["misses"] += 1
         return None
 
     def put(self, key: str, content: Any, user_id: str = None, ttl: Optional[int] = None, priority: int = 1) -> bool:
         """Put content into cache with intelligent management."""
-        # Calculate token count
-        tokens = self._estimate_tokens(content)
-
-        # Check cache size limits
-        if self._should_evict(tokens):
-            self._evict_content(tokens)
+        with self._lock:
+            return self._put_locked(key, content, user_id, ttl)
 
-        # Determine expiration
-        expires_at = None
-        if ttl is not None:
-            expires_at = time.time() + ttl
-        else:
-            expires_at = time.time() + self.default_ttl
-
-        # Create cache entry
-        entry = CacheEntry(
-            key=key,
-            content=content,
-            tokens=tokens,
-            access_count=1,
-            last_accessed=time.time(),
-            created_at=time.time(),
-            expires_at=expires_at,
-        )
-
-        # Store in cache
-        self.cache[key] = entry
-        self.cache_keys_by_access.append(key)
-        self.cache_keys_by_frequency[key] = 1
+    def _put_locked(self, key: str, content: Any, user_id: str = None, ttl: Optional[int] = None) -> bool:
+        """Cache insert; caller holds the cache lock."""
+        # Token count is credited as saved whenever the entry is hit
+        tokens = self._estimate_tokens(content)
+        if not self.cache.put(key, content, ttl=ttl if ttl is not None else self.default_ttl, tokens=tokens):
+            return False
 
         # Update user patterns
         if user_id:
@@ -307,53 +275,12 @@ class SmartCache:
         self._last_user_id = user_id
         pattern.last_updated = time.time()
 
-        self._save_patterns()
+        self._mark_dirty("patterns")
 
-    def _should_evict(self, incoming_tokens: int) -> bool:
-        """Determine if content should be evicted to make space."""
-        current_size = sum(entry.tokens for entry in self.cache.values())
-        return (current_size + incoming_tokens) > self.max_size_bytes
-
-    def _evict_content(self, needed_space: int) -> int:
-        """Evict content to make space for new content."""
-        evicted_count = 0
-        space_freed = 0
-
-        # Sort entries by eviction priority
-        entries = list(self.cache.values())
-
-        # Priority: expired > low access count > old > low hit rate
-        entries.sort(
-            key=lambda x: (
-                not x.is_expired,  # Expired first
-                x.access_count,  # Low access count first
-                x.age_seconds,  # Old first
-                -x.hit_rate,  # Low hit rate first
-            )
-        )
-
-        for entry in entries:
-            if space_freed >= needed_space:
-                break
-
-            # Evict entry
-            key_to_remove = None
-            for cache_key, cache_entry in self.cache.items():
-                if cache_entry == entry:
-                    key_to_remove = cache_key
-                    break
-
-            if key_to_remove:
-                del self.cache[key_to_remove]
-                space_freed += entry.tokens
-                evicted_count += 1
-
-                # Remove from tracking
-                if key_to_remove in self.cache_keys_by_frequency:
-                    del self.cache_keys_by_frequency[key_to_remove]
-
-        self.stats["evictions"] += evicted_count
-        return evicted_count
+    def _mark_dirty(self, item) -> None:
+        """Mark state for the next background flush, waking the worker at the threshold."""
+        if self._dirty.mark(item):
+            self._flush_event.set()
 
     def _should_preload(self, key: str, user_id: str, threshold: float) -> bool:
         """Determine if content should be preloaded."""
@@ -368,90 +295,88 @@ class SmartCache:
 
     def _estimate_tokens(self, content: Any) -> int:
         """Estimate token count for content."""
-        if isinstance(content, str):
-            return len(content) // 3
-        elif isinstance(content, dict):
-            return len(str(content)) // 3
-        elif isinstance(content, list):
-            return sum(len(str(item)) // 3 for item in content)
-        else:
-            return len(str(content)) // 3
+        return count_tokens(content)
 
     def _cleanup_worker(self) -> None:
-        """Background worker for cache cleanup."""
+        """Background worker for cache cleanup and write-behind flushes."""
+        last_cleanup = time.time()
         while self.cleanup_running:
             try:
-                time.sleep(self.cleanup_interval)
-                self._cleanup_expired_entries()
-                self._update_statistics()
+                self._flush_event.wait(self.flush_interval)
+                self._flush_event.clear()
+                if not self.cleanup_running:
+                    break
+                if time.time() - last_cleanup >= self.cleanup_interval:
+                    self._update_statistics()
+                    last_cleanup = time.time()
+                if self._dirty.due():
+                    self.flush()
             except Exception as e:
                 print(f"Cache cleanup error: {e}")
 
-    def _cleanup_expired_entries(self) -> None:
-        """Remove expired entries from cache."""
-        expired_keys = [key for key, entry in self.cache.items() if entry.is_expired]
+    def flush(self) -> int:
+        """
+        Write all pending changes to disk.
 
-        for key in expired_keys:
-            del self.cache[key]
-            if key in self.cache_keys_by_frequency:
-                del self.cache_keys_by_frequency[key]
+        Returns:
+            Number of cached values written to the disk tier
+        """
+        with self._flush_lock:
+            dirty = self._dirty.take()
+            try:
+                if "patterns" in dirty:
+                    self._save_patterns()
+                self._save_stats()
+            except Exception as e:
+                print(f"Error flushing cache: {e}")
+                self._dirty.restore(dirty)
+            return self.tiers.flush()
 
     def _update_statistics(self) -> None:
         """Update cache statistics."""
+        namespace_stats = self.cache.stats()
         self.stats["cache_size"] = len(self.cache)
-        self.stats["total_tokens"] = sum(entry.tokens for entry in self.cache.values())
+        self.stats["evictions"] = namespace_stats["l1_evictions"] + namespace_stats["l2_evictions"]
+        self.stats["total_tokens_saved"] = namespace_stats["tokens_saved"]
         self.stats["hit_rate"] = self.stats["hits"] / max(1, self.stats["hits"] + self.stats["misses"])
         self.stats["prediction_accuracy"] = self.stats["prediction_hits"] / max(1, self.stats["predictions"])
 
-        self._save_stats()
+        self._mark_dirty("stats")
 
     def get_cache_statistics(self) -> Dict[str, Any]:
         """Get comprehensive cache statistics."""
+        self._update_statistics()
+        tier_stats = self.tiers.get_stats()
         return {
             **self.stats,
-            "cache_size": len(self.cache),
-            "total_tokens_cached": sum(entry.tokens for entry in self.cache.values()),
+            "total_bytes_cached": tier_stats["l1"]["bytes"],
+            "max_size_bytes": tier_stats["l1"]["max_bytes"],
             "average_hit_rate": self.stats["hit_rate"],
             "prediction_accuracy": self.stats["prediction_accuracy"],
             "total_tokens_saved": self.stats["total_tokens_saved"],
             "user_patterns_count": len(self.user_patterns),
             "cache_efficiency": self._calculate_efficiency(),
+            "tiers": tier_stats,
         }
 
     def _calculate_efficiency(self) -> float:
         """Calculate overall cache efficiency."""
-        if not self.cache:
+        cache_size = self.stats.get("cache_size", 0)
+        if not cache_size:
             return 0.0
 
-        total_tokens = sum(entry.tokens for entry in self.cache.values())
-        total_accesses = sum(entry.access_count for entry in self.cache.values())
+        namespace_stats = self.cache.stats()
+        total_accesses = namespace_stats["l1_hits"] + namespace_stats["l2_hits"]
 
         if total_accesses == 0:
             return 0.0
 
         # Efficiency based on hit rates and access patterns
         hit_rate = self.stats["hits"] / max(1, self.stats["hits"] + self.stats["misses"])
-        avg_access_per_entry = total_accesses / len(self.cache)
+        avg_access_per_entry = total_accesses / cache_size
 
         return (hit_rate * 0.7) + (min(1.0, avg_access_per_entry / 10) * 0.3)
 
-    def _load_cache(self) -> None:
-        """Load cache from disk."""
-        if self.cache_file.exists():
-            try:
-                with open(self.cache_file, "rb") as f:
-                    self.cache = pickle.load(f)
-            except Exception as e:
-                print(f"Error loading cache: {e}")
-
-    def _save_cache(self) -> None:
-        """Save cache to disk."""
-        try:
-            with open(self.cache_file, "wb") as f:
-                pickle.dump(self.cache, f)
-        except Exception as e:
-            print(f"Error saving cache: {e}")
-
     def _load_patterns(self) -> None:
         """Load user patterns from disk."""
         if self.patterns_file.exists():
@@ -499,22 +424,17 @@ class SmartCache:
     def shutdown(self) -> None:
         """Shutdown the cache system."""
         self.cleanup_running = False
+        self._flush_event.set()
         if self.cleanup_thread.is_alive():
             self.cleanup_thread.join(timeout=5)
 
         # Save final state
-        self._save_cache()
-        self._save_patterns()
-        self._save_stats()
+        self.flush()
 
 
 class PredictiveLoader:
-"""
-    Predictive content loader that anticipates user needs.
-"""
-"""
+    """Predictive content loader that anticipates user needs."""
 
-"""
     def __init__(self, cache: SmartCache):
         """Initialize the processor with default configuration."""
         self.cache = cache
@@ -0,0 +1,643 @@
+#!/usr/bin/env python3
+"""
+SQLite Storage Engine for Autonomous Claude Agent Plugin
+
+Optional storage engine that keeps the .claude-patterns collections in one
+WAL-mode SQLite database (patterns.db) instead of one JSON document per file.
+
+Every JSON document is stored as a small "body" row plus one row per item of
+its large list fields (patterns, quality assessments, task history, feedback
+exchanges, ...). List items carry indexed columns (timestamp, task_type,
+score, key) and agent/skill tags, and pattern text is mirrored into an FTS5
+table. Writing a document only touches rows whose content changed, so an
+append is a point insert rather than a full-file rewrite, and readers never
+block writers.
+
+PatternStorage, QualityTracker, AssessmentStorage, AgentPerformanceTracker and
+AgentFeedbackSystem select this engine with storage_mode="sqlite". Existing
+JSON files are imported with the one-shot migrator:
+
+    python sqlite_storage_engine.py migrate --dir .claude-patterns
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+DATABASE_NAME = "patterns.db"
+
+# Root-level JSON arrays are stored as a list field with this name, unless the
+# document layout has a single list field (patterns.json: [...] is stored like
+# {"patterns": [...]}, so it lands in the collection readers query)
+ROOT_FIELD = "__root__"
+
+# List fields stored as indexed rows, per JSON document
+DOCUMENT_LAYOUTS: Dict[str, List[str]] = {
+    "patterns.json": ["patterns"],
+    "quality_history.json": ["quality_assessments"],
+    "assessments.json": ["assessments"],
+    "agent_metrics.json": ["quality_assessment_tasks", "agent_performance"],
+    "skill_metrics.json": ["skill_usage_history"],
+    "agent_performance.json": ["task_history"],
+    "agent_feedback.json": ["feedback_exchanges"],
+}
+
+PATTERNS_DOCUMENT = "patterns.json"
+PATTERNS_COLLECTION = "patterns.json:patterns"
+
+KEY_FIELDS = ("pattern_id", "assessment_id", "feedback_id", "task_id", "id")
+SCORE_FIELDS = ("quality_score", "overall_score", "score")
+AGENT_FIELDS = ("agent_name", "agent", "from_agent", "to_agent")
+SKILL_FIELDS = ("skill", "skill_name")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    name TEXT PRIMARY KEY,
+    body TEXT NOT NULL,
+    updated TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    collection TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    record_key TEXT,
+    timestamp TEXT,
+    task_type TEXT,
+    score REAL,
+    digest TEXT NOT NULL,
+    data TEXT NOT NULL,
+    UNIQUE (collection, position)
+);
+
+CREATE INDEX IF NOT EXISTS idx_records_key ON records (collection, record_key);
+CREATE INDEX IF NOT EXISTS idx_records_timestamp ON records (collection, timestamp);
+CREATE INDEX IF NOT EXISTS idx_records_task_type ON records (collection, task_type, timestamp);
+
+CREATE TABLE IF NOT EXISTS record_tags (
+    record_id INTEGER NOT NULL REFERENCES records (id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    value TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_record_tags_value ON record_tags (kind, value, record_id);
+CREATE INDEX IF NOT EXISTS idx_record_tags_record ON record_tags (record_id);
+"""
+
+FTS_SCHEMA = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS pattern_fts USING fts5 (context, approach);
+
+CREATE TRIGGER IF NOT EXISTS pattern_fts_insert AFTER INSERT ON records
+WHEN new.collection = '{PATTERNS_COLLECTION}'
+BEGIN
+    INSERT INTO pattern_fts (rowid, context, approach)
+    VALUES (new.id, COALESCE(json_extract(new.data, '$.context'), ''),
+            COALESCE(json_extract(new.data, '$.approach'), ''));
+END;
+
+CREATE TRIGGER IF NOT EXISTS pattern_fts_update AFTER UPDATE OF data ON records
+WHEN new.collection = '{PATTERNS_COLLECTION}'
+BEGIN
+    DELETE FROM pattern_fts WHERE rowid = old.id;
+    INSERT INTO pattern_fts (rowid, context, approach)
+    VALUES (new.id, COALESCE(json_extract(new.data, '$.context'), ''),
+            COALESCE(json_extract(new.data, '$.approach'), ''));
+END;
+
+CREATE TRIGGER IF NOT EXISTS pattern_fts_delete AFTER DELETE ON records
+WHEN old.collection = '{PATTERNS_COLLECTION}'
+BEGIN
+    DELETE FROM pattern_fts WHERE rowid = old.id;
+END;
+"""
+
+
+def collection_name(document: str, field: str) -> str:
+    """Return the records collection that holds a document's list field."""
+    return f"{document}:{field}"
+
+
+def root_field(document: str, list_fields: Optional[List[str]] = None) -> str:
+    """Return the list field a root-level JSON array of a document is stored as."""
+    layout = DOCUMENT_LAYOUTS.get(document, []) if list_fields is None else list_fields
+    return layout[0] if len(layout) == 1 else ROOT_FIELD
+
+
+def root_collection(document: str) -> str:
+    """Return the records collection that holds a root-array document's items."""
+    return collection_name(document, root_field(document))
+
+
+def _first(record: Dict[str, Any], fields: Tuple[str, ...]) -> Any:
+    """Return the first present, non-None value among fields."""
+    for field in fields:
+        value = record.get(field)
+        if value is not None:
+            return value
+    return None
+
+
+def _extract_columns(
+    record: Any,
+) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[float], List[Tuple[str, str]]]:
+    """
+    Extract indexed columns and tags from a list item.
+
+    Returns:
+        Tuple of (record_key, timestamp, task_type, score, tags)
+    """
+    if not isinstance(record, dict):
+        return None, None, None, None, []
+
+    key = _first(record, KEY_FIELDS)
+    timestamp = record.get("timestamp")
+    task_type = record.get("task_type")
+    score = _first(record, SCORE_FIELDS)
+    if not isinstance(score, (int, float)) or isinstance(score, bool):
+        score = None
+
+    tags = set()
+    for agent in record.get("agents_used") or []:
+        if isinstance(agent, str):
+            tags.add(("agent", agent))
+    for field in AGENT_FIELDS:
+        if isinstance(record.get(field), str):
+            tags.add(("agent", record[field]))
+    for skill in record.get("skills_used") or []:
+        if isinstance(skill, str):
+            tags.add(("skill", skill))
+    for field in SKILL_FIELDS:
+        if isinstance(record.get(field), str):
+            tags.add(("skill", record[field]))
+
+    return (
+        str(key) if key is not None else None,
+        str(timestamp) if timestamp is not None else None,
+        str(task_type) if task_type is not None else None,
+        score,
+        sorted(tags),
+    )
+
+
+def _encode(record: Any) -> Tuple[str, str]:
+    """Serialize a list item and return (text, digest)."""
+    text = json.dumps(record, ensure_ascii=False, sort_keys=True)
+    return text, hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class SQLiteStorageEngine:
+    """WAL-mode SQLite store for .claude-patterns documents and records."""
+
+    def __init__(self, db_path: str):
+        """
+        Open (and create if needed) the storage database.
+
+        Args:
+            db_path: Path of the SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        # Transactions are managed explicitly with BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(str(self.db_path), isolation_level=None, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(SCHEMA)
+        self.fts_available = self._init_fts()
+
+    def _init_fts(self) -> bool:
+        """Create the FTS5 pattern table; returns False if FTS5 is not compiled in."""
+        try:
+            self._conn.executescript(FTS_SCHEMA)
+            return True
+        except sqlite3.OperationalError as e:
+            print(f"Warning: FTS5 unavailable, pattern search falls back to LIKE: {e}", file=sys.stderr)
+            return False
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run a block inside one write transaction."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            else:
+                self._conn.execute("COMMIT")
+
+    # ------------------------------------------------------------------
+    # Record rows
+    # ------------------------------------------------------------------
+
+    def _write_row(self, conn: sqlite3.Connection, collection: str, position: int, record: Any, text: str, digest: str):
+        """Insert or replace the row at a collection position, with its tags."""
+        key, timestamp, task_type, score, tags = _extract_columns(record)
+        row = conn.execute(
+            "SELECT id FROM records WHERE collection = ? AND position = ?", (collection, position)
+        ).fetchone()
+        if row is None:
+            cursor = conn.execute(
+                "INSERT INTO records (collection, position, record_key, timestamp, task_type, score, digest, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (collection, position, key, timestamp, task_type, score, digest, text),
+            )
+            record_id = cursor.lastrowid
+        else:
+            record_id = row["id"]
+            conn.execute(
+                "UPDATE records SET record_key = ?, timestamp = ?, task_type = ?, score = ?, digest = ?, data = ? "
+                "WHERE id = ?",
+                (key, timestamp, task_type, score, digest, text, record_id),
+            )
+            conn.execute("DELETE FROM record_tags WHERE record_id = ?", (record_id,))
+        if tags:
+            conn.executemany(
+                "INSERT INTO record_tags (record_id, kind, value) VALUES (?, ?, ?)",
+                [(record_id, kind, value) for kind, value in tags],
+            )
+
+    def _sync_list(self, conn: sqlite3.Connection, collection: str, items: List[Any]) -> int:
+        """
+        Make a collection's rows equal to a list, writing only changed positions.
+
+        Returns:
+            Number of rows written or deleted
+        """
+        existing = dict(
+            conn.execute("SELECT position, digest FROM records WHERE collection = ?", (collection,)).fetchall()
+        )
+        changes = 0
+        for position, item in enumerate(items):
+            text, digest = _encode(item)
+            if existing.get(position) != digest:
+                self._write_row(conn, collection, position, item, text, digest)
+                changes += 1
+        cursor = conn.execute(
+            "DELETE FROM records WHERE collection = ? AND position >= ?", (collection, len(items))
+        )
+        return changes + max(cursor.rowcount, 0)
+
+    def append_record(self, collection: str, record: Any) -> int:
+        """
+        Append one record to a collection.
+
+        Returns:
+            Position assigned to the record
+        """
+        text, digest = _encode(record)
+        with self._transaction() as conn:
+            position = conn.execute(
+                "SELECT COALESCE(MAX(position), -1) + 1 FROM records WHERE collection = ?", (collection,)
+            ).fetchone()[0]
+            self._write_row(conn, collection, position, record, text, digest)
+        return position
+
+    def update_record(self, collection: str, key: str, record: Any) -> bool:
+        """
+        Replace the first record with the given key.
+
+        Returns:
+            True if a record was updated, False if the key was not found
+        """
+        text, digest = _encode(record)
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT position FROM records WHERE collection = ? AND record_key = ? ORDER BY position LIMIT 1",
+                (collection, key),
+            ).fetchone()
+            if row is None:
+                return False
+            self._write_row(conn, collection, row["position"], record, text, digest)
+        return True
+
+    def get_record(self, collection: str, key: str) -> Optional[Any]:
+        """Return the first record with the given key, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM records WHERE collection = ? AND record_key = ? ORDER BY position LIMIT 1",
+                (collection, key),
+            ).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def read_records(self, collection: str) -> List[Any]:
+        """Return all records of a collection in position order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM records WHERE collection = ? ORDER BY position", (collection,)
+            ).fetchall()
+        return [json.loads(row["data"]) for row in rows]
+
+    def write_records(self, collection: str, records: List[Any]) -> int:
+        """
+        Replace a collection with a list, touching only changed rows.
+
+        Returns:
+            Number of rows written or deleted
+        """
+        with self._transaction() as conn:
+            return self._sync_list(conn, collection, records)
+
+    def count_records(self, collection: str) -> int:
+        """Return the number of records in a collection."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM records WHERE collection = ?", (collection,)).fetchone()[0]
+
+    def query_records(
+        self,
+        collection: str,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        task_type: Optional[str] = None,
+        agent: Optional[str] = None,
+        skill: Optional[str] = None,
+        limit: Optional[int] = None,
+        newest_first: bool = False,
+    ) -> List[Any]:
+        """
+        Indexed range query over a collection.
+
+        Args:
+            collection: Collection name (see collection_name)
+            since: Inclusive lower bound on the ISO timestamp
+            until: Exclusive upper bound on the ISO timestamp
+            task_type: Only records of this task type
+            agent: Only records tagged with this agent
+            skill: Only records tagged with this skill
+            limit: Maximum number of records
+            newest_first: Order by timestamp descending instead of ascending
+
+        Returns:
+            Matching records
+        """
+        clauses = ["r.collection = ?"]
+        params: List[Any] = [collection]
+        if since is not None:
+            clauses.append("r.timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("r.timestamp < ?")
+            params.append(until)
+        if task_type is not None:
+            clauses.append("r.task_type = ?")
+            params.append(task_type)
+        for kind, value in (("agent", agent), ("skill", skill)):
+            if value is not None:
+                clauses.append(
+                    "EXISTS (SELECT 1 FROM record_tags t WHERE t.record_id = r.id AND t.kind = ? AND t.value = ?)"
+                )
+                params.extend([kind, value])
+
+        sql = f"SELECT r.data FROM records r WHERE {' AND '.join(clauses)} ORDER BY r.timestamp"
+        sql += " DESC" if newest_first else ""
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(row["data"]) for row in rows]
+
+    # ------------------------------------------------------------------
+    # Documents
+    # ------------------------------------------------------------------
+
+    def has_document(self, name: str) -> bool:
+        """Return True if a document has been written."""
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM documents WHERE name = ?", (name,)).fetchone() is not None
+
+    def read_document(self, name: str, default: Any = None) -> Any:
+        """
+        Reassemble a JSON document from its body and list collections.
+
+        Args:
+            name: Document name (the original JSON file name)
+            default: Value returned when the document does not exist
+
+        Returns:
+            The document as it would have been loaded from the JSON file
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT body FROM documents WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                return default
+            body = json.loads(row["body"])
+            list_fields = body.pop("__list_fields__", [])
+            root = body.pop("__root_field__", ROOT_FIELD if list_fields == [ROOT_FIELD] else None)
+            for field in list_fields:
+                body[field] = self.read_records(collection_name(name, field))
+
+        if root is not None:
+            return body[root]
+        return body
+
+    def write_document(self, name: str, data: Any, list_fields: Optional[List[str]] = None) -> int:
+        """
+        Store a JSON document; list fields become indexed record rows.
+
+        Args:
+            name: Document name (the original JSON file name)
+            data: Document (object or root-level array)
+            list_fields: Fields stored as rows (default: DOCUMENT_LAYOUTS entry)
+
+        Returns:
+            Number of record rows written or deleted
+        """
+        root = None
+        if isinstance(data, list):
+            root = root_field(name, list_fields)
+            body: Dict[str, Any] = {root: data}
+            list_fields = [root]
+        else:
+            body = dict(data)
+            if list_fields is None:
+                list_fields = DOCUMENT_LAYOUTS.get(name, [])
+            list_fields = [field for field in list_fields if isinstance(body.get(field), list)]
+
+        lists = {field: body.pop(field) for field in list_fields}
+        body["__list_fields__"] = list_fields
+        if root is not None:
+            body["__root_field__"] = root
+
+        with self._transaction() as conn:
+            row = conn.execute("SELECT body FROM documents WHERE name = ?", (name,)).fetchone()
+            if row is not None:
+                # List fields the new version no longer has (e.g. an old __root__ layout) are emptied
+                for field in json.loads(row["body"]).get("__list_fields__", []):
+                    lists.setdefault(field, [])
+            conn.execute(
+                "INSERT INTO documents (name, body, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET body = excluded.body, updated = excluded.updated",
+                (name, json.dumps(body, ensure_ascii=False), datetime.now().isoformat()),
+            )
+            return sum(self._sync_list(conn, collection_name(name, field), items) for field, items in lists.items())
+
+    # ------------------------------------------------------------------
+    # Pattern search
+    # ------------------------------------------------------------------
+
+    def search_patterns(
+        self, context: str, task_type: Optional[str] = None, min_quality: float = 0.0, limit: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        Full-text pattern search ranked by FTS5 bm25, then quality and usage.
+
+        Args:
+            context: Search keywords (matched against context and approach)
+            task_type: Filter by task type (optional)
+            min_quality: Minimum quality score
+            limit: Maximum number of results
+
+        Returns:
+            List of matching patterns
+        """
+        terms = [term for term in context.lower().split() if term]
+        if not terms:
+            return []
+
+        filters = "r.collection = ? AND COALESCE(r.score, 0) >= ?"
+        params: List[Any] = [PATTERNS_COLLECTION, min_quality]
+        if task_type:
+            filters += " AND r.task_type = ?"
+            params.append(task_type)
+
+        if self.fts_available:
+            match = " OR ".join('"' + term.replace('"', '""') + '"' for term in terms)
+            sql = (
+                "SELECT r.data FROM pattern_fts JOIN records r ON r.id = pattern_fts.rowid "
+                f"WHERE pattern_fts MATCH ? AND {filters} "
+                "ORDER BY bm25(pattern_fts), r.score DESC, json_extract(r.data, '$.usage_count') DESC LIMIT ?"
+            )
+            params = [match] + params + [limit]
+        else:
+            likes = " OR ".join("LOWER(r.data) LIKE ?" for _ in terms)
+            sql = (
+                f"SELECT r.data FROM records r WHERE {filters} AND ({likes}) "
+                "ORDER BY r.score DESC, json_extract(r.data, '$.usage_count') DESC LIMIT ?"
+            )
+            params = params + [f"%{term}%" for term in terms] + [limit]
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(row["data"]) for row in rows]
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Return per-collection row counts and database size."""
+        with self._lock:
+            collections = {
+                row["collection"]: row["count"]
+                for row in self._conn.execute(
+                    "SELECT collection, COUNT(*) AS count FROM records GROUP BY collection"
+                ).fetchall()
+            }
+            documents = [row["name"] for row in self._conn.execute("SELECT name FROM documents ORDER BY name")]
+        return {
+            "database": str(self.db_path),
+            "size_bytes": self.db_path.stat().st_size if self.db_path.exists() else 0,
+            "fts_available": self.fts_available,
+            "documents": documents,
+            "collections": collections,
+        }
+
+
+_engines: Dict[str, SQLiteStorageEngine] = {}
+_engines_lock = threading.Lock()
+
+
+def get_storage_engine(patterns_dir: str = ".claude-patterns") -> SQLiteStorageEngine:
+    """
+    Get the shared engine for a patterns directory (one connection per process).
+
+    Args:
+        patterns_dir: Directory holding patterns.db
+
+    Returns:
+        SQLiteStorageEngine instance
+    """
+    db_path = str((Path(patterns_dir) / DATABASE_NAME).resolve())
+    with _engines_lock:
+        engine = _engines.get(db_path)
+        if engine is None:
+            engine = SQLiteStorageEngine(db_path)
+            _engines[db_path] = engine
+        return engine
+
+
+def migrate_json_directory(patterns_dir: str = ".claude-patterns", overwrite: bool = False) -> Dict[str, Any]:
+    """
+    One-shot import of the JSON files in a patterns directory into patterns.db.
+
+    JSON files are left in place. Documents that already exist in the database
+    are skipped unless overwrite is set.
+
+    Args:
+        patterns_dir: Directory holding the JSON files
+        overwrite: Replace documents already present in the database
+
+    Returns:
+        Summary with migrated, skipped and failed files
+    """
+    engine = get_storage_engine(patterns_dir)
+    result: Dict[str, Any] = {"migrated": {}, "skipped": [], "errors": {}}
+
+    for name in DOCUMENT_LAYOUTS:
+        path = Path(patterns_dir) / name
+        if not path.exists():
+            continue
+        if engine.has_document(name) and not overwrite:
+            result["skipped"].append(name)
+            continue
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                content = f.read()
+            data = json.loads(content) if content.strip() else []
+            engine.write_document(name, data)
+            count = len(data) if isinstance(data, list) else sum(
+                len(data.get(field, [])) for field in DOCUMENT_LAYOUTS[name] if isinstance(data.get(field), list)
+            )
+            result["migrated"][name] = count
+        except (json.JSONDecodeError, OSError, sqlite3.Error) as e:
+            result["errors"][name] = str(e)
+
+    return result
+
+
+def main():
+    """Command-line interface for the SQLite storage engine."""
+    parser = argparse.ArgumentParser(description="SQLite Storage Engine")
+    parser.add_argument("--dir", default=".claude-patterns", help="Patterns directory path")
+    subparsers = parser.add_subparsers(dest="action", help="Action to perform")
+
+    migrate_parser = subparsers.add_parser("migrate", help="Import JSON files into patterns.db")
+    migrate_parser.add_argument("--overwrite", action="store_true", help="Replace documents already migrated")
+    subparsers.add_parser("stats", help="Show database statistics")
+
+    args = parser.parse_args()
+
+    if args.action == "migrate":
+        print(json.dumps(migrate_json_directory(args.dir, overwrite=args.overwrite), indent=2))
+    elif args.action == "stats":
+        print(json.dumps(get_storage_engine(args.dir).get_statistics(), indent=2))
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
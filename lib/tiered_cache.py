@@ -0,0 +1,774 @@
+#!/usr/bin/env python3
+"""
+Tiered Cache for Autonomous Agent Plugin
+
+One cache subsystem shared by SmartCache, SimpleSmartCache and TokenCache.
+
+- L1 is a bounded in-memory tier evicted by the segmented LRU engine.
+- L2 is a disk tier under .claude-patterns/tiered_cache/: values are stored
+  once per content digest in objects/, and a WAL SQLite index maps
+  (namespace, key) to a digest, so identical content cached under several
+  keys or namespaces takes disk space once. L2 has its own size cap and is
+  evicted least-recently-accessed first.
+- Writes are write-behind: puts land in L1 and a pending set that the
+  background flusher (or flush()) moves to L2 in one transaction.
+- Hit/miss/eviction counters are kept per namespace and merged into the
+  index database on flush, so any process can read the same statistics with
+  read_cache_stats().
+
+Version: 1.0.0
+Author: Autonomous Agent Plugin
+"""
+import atexit
+import hashlib
+import pickle
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from cache_eviction import EvictionEngine
+from cache_persistence import DirtyTracker
+from file_utils import atomic_write_bytes
+
+# Standard namespaces; any word-character name is accepted
+NAMESPACE_ANALYSIS = "analysis"
+NAMESPACE_OPTIMIZED = "optimized"
+NAMESPACE_PREDICTIONS = "predictions"
+NAMESPACE_CONTENT = "content"
+NAMESPACES = (NAMESPACE_ANALYSIS, NAMESPACE_OPTIMIZED, NAMESPACE_PREDICTIONS, NAMESPACE_CONTENT)
+
+NAMESPACE_PATTERN = re.compile(r"^\w+$")
+
+STAT_FIELDS = ("l1_hits", "l2_hits", "misses", "puts", "l1_evictions", "l2_evictions", "tokens_saved")
+
+INDEX_NAME = "index.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    tokens INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    expires_at REAL,
+    last_accessed REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS idx_entries_last_accessed ON entries(last_accessed);
+CREATE INDEX IF NOT EXISTS idx_entries_expires_at ON entries(expires_at);
+CREATE TABLE IF NOT EXISTS objects (
+    digest TEXT PRIMARY KEY,
+    size_bytes INTEGER NOT NULL,
+    refcount INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stats (
+    namespace TEXT PRIMARY KEY,
+    l1_hits INTEGER NOT NULL DEFAULT 0,
+    l2_hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0,
+    puts INTEGER NOT NULL DEFAULT 0,
+    l1_evictions INTEGER NOT NULL DEFAULT 0,
+    l2_evictions INTEGER NOT NULL DEFAULT 0,
+    tokens_saved INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+FullKey = Tuple[str, str]
+
+
+@dataclass
+class TierEntry:
+    """A cached value held in memory."""
+
+    value: Any
+    size_bytes: int
+    expires_at: Optional[float] = None
+    tokens: int = 0
+    created_at: float = field(default_factory=time.time)
+    # Pickled value, kept from put() until the entry is written to L2
+    data: Optional[bytes] = field(default=None, repr=False)
+
+    @property
+    def is_expired(self) -> bool:
+        """Check if the entry is expired."""
+        return self.expires_at is not None and time.time() > self.expires_at
+
+
+def _serialize(value: Any) -> bytes:
+    """Pickle a value for L2 storage."""
+    return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _summarize_stats(counters: Dict[str, Dict[str, int]]) -> Dict[str, Any]:
+    """Add hit rates to per-namespace counters and total them."""
+    namespaces = {}
+    totals = Counter()
+    for namespace, values in sorted(counters.items()):
+        values = {name: int(values.get(name, 0)) for name in STAT_FIELDS}
+        totals.update(values)
+        requests = values["l1_hits"] + values["l2_hits"] + values["misses"]
+        values["hit_rate"] = (values["l1_hits"] + values["l2_hits"]) / requests if requests else 0.0
+        namespaces[namespace] = values
+
+    total = {name: totals.get(name, 0) for name in STAT_FIELDS}
+    requests = total["l1_hits"] + total["l2_hits"] + total["misses"]
+    total["hits"] = total["l1_hits"] + total["l2_hits"]
+    total["hit_rate"] = total["hits"] / requests if requests else 0.0
+    return {"namespaces": namespaces, "total": total}
+
+
+class CacheNamespace:
+    """Dictionary-like view of one namespace of a TieredCache."""
+
+    def __init__(self, cache: "TieredCache", namespace: str):
+        """
+        Initialize the view.
+
+        Args:
+            cache: Backing tiered cache
+            namespace: Namespace served by this view
+        """
+        self.cache = cache
+        self.namespace = namespace
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a value, or default on a miss."""
+        return self.cache.get(self.namespace, key, default)
+
+    def put(self, key: str, value: Any, ttl: Optional[float] = None, tokens: int = 0) -> bool:
+        """Store a value."""
+        return self.cache.put(self.namespace, key, value, ttl=ttl, tokens=tokens)
+
+    def delete(self, key: str) -> bool:
+        """Remove a key."""
+        return self.cache.delete(self.namespace, key)
+
+    def clear(self, pattern: Optional[str] = None) -> int:
+        """Remove every key (or every key containing pattern)."""
+        return self.cache.clear(self.namespace, pattern)
+
+    def cleanup(self, max_age_seconds: float) -> int:
+        """Remove entries created more than max_age_seconds ago."""
+        return self.cache.cleanup(self.namespace, max_age_seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return this namespace's counters."""
+        namespaces = self.cache.get_stats()["namespaces"]
+        if self.namespace not in namespaces:
+            return _summarize_stats({self.namespace: {}})["namespaces"][self.namespace]
+        return namespaces[self.namespace]
+
+    def __contains__(self, key: str) -> bool:
+        """Check whether a live value is cached for key."""
+        return self.cache.contains(self.namespace, key)
+
+    def __len__(self) -> int:
+        """Number of keys in the namespace."""
+        return self.cache.count(self.namespace)
+
+
+class TieredCache:
+    """Two-tier (memory + content-addressed disk) cache with namespaces."""
+
+    DIR_NAME = "tiered_cache"
+
+    def __init__(
+        self,
+        cache_dir: str = ".claude-patterns",
+        l1_max_mb: float = 64,
+        l2_max_mb: float = 512,
+        flush_interval: float = 5.0,
+        flush_threshold: int = 100,
+        background: bool = True,
+    ):
+        """
+        Initialize the tiered cache.
+
+        Args:
+            cache_dir: Directory for cache files (default: .claude-patterns)
+            l1_max_mb: Memory tier capacity in megabytes of serialized values
+            l2_max_mb: Disk tier capacity in megabytes of stored objects
+            flush_interval: Seconds pending writes may wait before reaching L2
+            flush_threshold: Pending changes that trigger an immediate flush
+            background: Run a daemon thread that flushes pending writes
+        """
+        self.root = Path(cache_dir) / self.DIR_NAME
+        self.objects_dir = self.root / "objects"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.l1_max_bytes = int(l1_max_mb * 1024 * 1024)
+        self.l2_max_bytes = int(l2_max_mb * 1024 * 1024)
+        self.flush_interval = flush_interval
+
+        # L1 plus write-behind state; all guarded by _lock
+        self._lock = threading.RLock()
+        self._l1: Dict[FullKey, TierEntry] = {}
+        self._eviction = EvictionEngine(self.l1_max_bytes)
+        self._pending: Dict[FullKey, TierEntry] = {}
+        self._pending_deletes: Set[FullKey] = set()
+        self._inflight: Dict[FullKey, TierEntry] = {}
+        self._inflight_deletes: Set[FullKey] = set()
+        self._touched: Dict[FullKey, float] = {}
+        self._stat_deltas: Dict[str, Counter] = defaultdict(Counter)
+        self._dirty = DirtyTracker(flush_interval, flush_threshold)
+
+        # L2 index
+        self._db_lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.root / INDEX_NAME), isolation_level=None, check_same_thread=False, timeout=30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+        self._flush_event = threading.Event()
+        self._closed = False
+        self._running = background
+        self._flush_thread = None
+        if background:
+            self._flush_thread = threading.Thread(target=self._flush_worker, daemon=True)
+            self._flush_thread.start()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def namespace(self, name: str) -> CacheNamespace:
+        """Return a dictionary-like view of one namespace."""
+        self._check_namespace(name)
+        return CacheNamespace(self, name)
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        """
+        Look a key up in L1, then pending writes, then L2.
+
+        L2 hits are promoted into L1.
+
+        Args:
+            namespace: Cache namespace
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            Cached value or default
+        """
+        full = (namespace, key)
+        with self._lock:
+            entry = self._l1.get(full)
+            if entry is not None:
+                if not entry.is_expired:
+                    self._eviction.touch(full)
+                    self._touched[full] = time.time()
+                    self._count(namespace, "l1_hits", tokens_saved=entry.tokens)
+                    return entry.value
+                self._drop_l1(full)
+
+            entry = self._pending.get(full) or self._inflight.get(full)
+            if entry is not None and not entry.is_expired:
+                self._admit(full, entry)
+                self._count(namespace, "l1_hits", tokens_saved=entry.tokens)
+                return entry.value
+            if full in self._pending_deletes or full in self._inflight_deletes:
+                self._count(namespace, "misses")
+                return default
+
+        entry = self._read_l2(full)
+        with self._lock:
+            # A put or delete may have landed while L2 was being read
+            current = self._l1.get(full) or self._pending.get(full) or self._inflight.get(full)
+            if current is not None:
+                entry = None if current.is_expired else current
+            elif full in self._pending_deletes or full in self._inflight_deletes:
+                entry = None
+            if entry is None:
+                self._count(namespace, "misses")
+                return default
+            self._admit(full, entry)
+            self._touched[full] = time.time()
+            self._count(namespace, "l2_hits", tokens_saved=entry.tokens)
+            return entry.value
+
+    def put(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None, tokens: int = 0) -> bool:
+        """
+        Store a value in L1 and queue it for L2.
+
+        Args:
+            namespace: Cache namespace
+            key: Cache key
+            value: Picklable value
+            ttl: Time to live in seconds (None for no expiry)
+            tokens: Token cost of producing the value, credited as saved on hits
+
+        Returns:
+            True if the value was cached
+        """
+        self._check_namespace(namespace)
+        try:
+            data = _serialize(value)
+        except Exception as e:
+            print(f"Warning: Cannot cache unpicklable value for {namespace}:{key}: {e}", file=sys.stderr)
+            return False
+        if len(data) > self.l2_max_bytes:
+            return False
+
+        full = (namespace, key)
+        expires_at = time.time() + ttl if ttl is not None else None
+        entry = TierEntry(value=value, size_bytes=len(data), expires_at=expires_at, tokens=tokens, data=data)
+        with self._lock:
+            self._drop_l1(full)
+            self._admit(full, entry)
+            self._pending[full] = entry
+            self._pending_deletes.discard(full)
+            self._count(namespace, "puts")
+            self._mark_dirty(full)
+        return True
+
+    def delete(self, namespace: str, key: str) -> bool:
+        """
+        Remove a key from both tiers.
+
+        Returns:
+            True if the key was cached
+        """
+        existed = self.contains(namespace, key)
+        full = (namespace, key)
+        with self._lock:
+            self._drop_l1(full)
+            self._pending.pop(full, None)
+            self._pending_deletes.add(full)
+            self._mark_dirty(full)
+        return existed
+
+    def contains(self, namespace: str, key: str) -> bool:
+        """Check whether a live value is cached, without counting a hit or miss."""
+        full = (namespace, key)
+        with self._lock:
+            for tier in (self._l1, self._pending, self._inflight):
+                entry = tier.get(full)
+                if entry is not None:
+                    return not entry.is_expired
+            if full in self._pending_deletes or full in self._inflight_deletes:
+                return False
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT expires_at FROM entries WHERE namespace = ? AND key = ?", full
+            ).fetchone()
+        return row is not None and (row[0] is None or row[0] > time.time())
+
+    def count(self, namespace: str) -> int:
+        """Number of keys in a namespace across both tiers."""
+        with self._lock:
+            written = {k for k in list(self._pending) + list(self._inflight) if k[0] == namespace}
+            deleted = {k for k in self._pending_deletes | self._inflight_deletes if k[0] == namespace} - written
+        with self._db_lock:
+            stored = self._conn.execute("SELECT COUNT(*) FROM entries WHERE namespace = ?", (namespace,)).fetchone()[0]
+            in_l2 = {
+                full
+                for full in written | deleted
+                if self._conn.execute("SELECT 1 FROM entries WHERE namespace = ? AND key = ?", full).fetchone()
+            }
+        return stored + len(written - in_l2) - len(deleted & in_l2)
+
+    def clear(self, namespace: str, pattern: Optional[str] = None) -> int:
+        """
+        Remove every key of a namespace, or every key containing pattern.
+
+        Returns:
+            Number of keys removed
+        """
+        def matches(full: FullKey, entry: TierEntry) -> bool:
+            return full[0] == namespace and (pattern is None or pattern in full[1])
+
+        if pattern is None:
+            return self._remove_where(matches, "namespace = ?", (namespace,))
+        return self._remove_where(matches, "namespace = ? AND instr(key, ?) > 0", (namespace, pattern))
+
+    def cleanup(self, namespace: str, max_age_seconds: float) -> int:
+        """
+        Remove entries of a namespace created more than max_age_seconds ago.
+
+        Returns:
+            Number of keys removed
+        """
+        cutoff = time.time() - max_age_seconds
+
+        def matches(full: FullKey, entry: TierEntry) -> bool:
+            return full[0] == namespace and entry.created_at < cutoff
+
+        return self._remove_where(matches, "namespace = ? AND created_at < ?", (namespace, cutoff))
+
+    def flush(self) -> int:
+        """
+        Move pending writes and deletes to L2 and persist statistics.
+
+        Returns:
+            Number of values written to L2
+        """
+        with self._flush_lock:
+            with self._lock:
+                writes, self._pending = self._pending, {}
+                deletes, self._pending_deletes = self._pending_deletes, set()
+                touched, self._touched = self._touched, {}
+                deltas, self._stat_deltas = self._stat_deltas, defaultdict(Counter)
+                self._inflight, self._inflight_deletes = writes, deletes
+                self._dirty.take()
+            try:
+                self._write_l2(writes, deletes, touched, deltas)
+            except Exception as e:
+                print(f"Error flushing tiered cache: {e}", file=sys.stderr)
+                with self._lock:
+                    # Requeue without overriding anything written since
+                    for full, entry in writes.items():
+                        if full not in self._pending and full not in self._pending_deletes:
+                            self._pending[full] = entry
+                    self._pending_deletes.update(deletes - set(self._pending))
+                    for namespace, counter in deltas.items():
+                        self._stat_deltas[namespace].update(counter)
+                    for full in writes.keys() | deletes:
+                        self._dirty.mark(full, count=False)
+                return 0
+            finally:
+                with self._lock:
+                    self._inflight, self._inflight_deletes = {}, set()
+            # Written entries stay in L1 as values only
+            for entry in writes.values():
+                entry.data = None
+            return len(writes)
+
+    def close(self) -> None:
+        """Stop the background flusher, flush and close the index."""
+        if self._closed:
+            return
+        self._closed = True
+        self._running = False
+        self._flush_event.set()
+        if self._flush_thread is not None and self._flush_thread.is_alive():
+            self._flush_thread.join(timeout=5)
+        self.flush()
+        with self._db_lock:
+            self._conn.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Return the unified statistics of every namespace and tier.
+
+        Persisted counters (from every process) are combined with this
+        process's unflushed counters.
+        """
+        with self._db_lock:
+            counters = _read_counters(self._conn)
+            l2_entries = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            l2_objects, l2_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM objects"
+            ).fetchone()
+        with self._lock:
+            for namespace, counter in self._stat_deltas.items():
+                target = counters.setdefault(namespace, {})
+                for name, value in counter.items():
+                    target[name] = target.get(name, 0) + value
+            l1 = {
+                "entries": len(self._l1),
+                "bytes": self._eviction.total_bytes,
+                "max_bytes": self.l1_max_bytes,
+                "utilization": self._eviction.total_bytes / self.l1_max_bytes if self.l1_max_bytes else 0.0,
+            }
+            pending = len(self._pending) + len(self._pending_deletes)
+
+        stats = _summarize_stats(counters)
+        stats["l1"] = l1
+        stats["l2"] = {
+            "entries": l2_entries,
+            "objects": l2_objects,
+            "bytes": l2_bytes,
+            "max_bytes": self.l2_max_bytes,
+            "utilization": l2_bytes / self.l2_max_bytes if self.l2_max_bytes else 0.0,
+            "pending_changes": pending,
+        }
+        return stats
+
+    # ------------------------------------------------------------------
+    # L1 and write-behind helpers (caller holds _lock)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _check_namespace(namespace: str) -> None:
+        """Reject namespace names that are not plain words."""
+        if not NAMESPACE_PATTERN.match(namespace or ""):
+            raise ValueError(f"Invalid cache namespace: {namespace!r}")
+
+    def _count(self, namespace: str, name: str, tokens_saved: int = 0) -> None:
+        """Increment an unflushed counter."""
+        counter = self._stat_deltas[namespace]
+        counter[name] += 1
+        if tokens_saved:
+            counter["tokens_saved"] += tokens_saved
+
+    def _mark_dirty(self, full: FullKey) -> None:
+        """Queue a change, waking the flusher at the threshold."""
+        if self._dirty.mark(full):
+            self._flush_event.set()
+
+    def _admit(self, full: FullKey, entry: TierEntry) -> None:
+        """Place an entry in L1, evicting as needed; oversized entries stay out of L1."""
+        if entry.size_bytes > self.l1_max_bytes:
+            return
+        self._drop_l1(full)
+        for victim in self._eviction.victims():
+            if not self._eviction.needs_eviction(entry.size_bytes):
+                break
+            self._drop_l1(victim)
+            self._stat_deltas[victim[0]]["l1_evictions"] += 1
+        self._l1[full] = entry
+        self._eviction.add(full, entry.size_bytes, entry.expires_at)
+
+    def _drop_l1(self, full: FullKey) -> None:
+        """Remove a key from L1 only; pending writes keep the value for L2."""
+        if self._l1.pop(full, None) is not None:
+            self._eviction.remove(full)
+
+    def _remove_where(self, matches: Callable[[FullKey, TierEntry], bool], where: str, params: tuple) -> int:
+        """Delete every key matching a predicate in memory and a WHERE clause in L2."""
+        with self._db_lock:
+            stored = {
+                (namespace, key)
+                for namespace, key in self._conn.execute(f"SELECT namespace, key FROM entries WHERE {where}", params)
+            }
+        with self._lock:
+            removed = set(stored) - self._pending_deletes - self._inflight_deletes
+            for tier in (self._l1, self._pending, self._inflight):
+                for full, entry in list(tier.items()):
+                    if matches(full, entry):
+                        removed.add(full)
+            for full in removed:
+                self._drop_l1(full)
+                self._pending.pop(full, None)
+                self._pending_deletes.add(full)
+                self._mark_dirty(full)
+        return len(removed)
+
+    # ------------------------------------------------------------------
+    # L2
+    # ------------------------------------------------------------------
+
+    def _object_path(self, digest: str) -> Path:
+        """Path of a content-addressed object."""
+        return self.objects_dir / digest[:2] / digest
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run a block inside one write transaction."""
+        with self._db_lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            else:
+                self._conn.execute("COMMIT")
+
+    def _read_l2(self, full: FullKey) -> Optional[TierEntry]:
+        """Read a live entry from L2; stale or unreadable entries are queued for deletion."""
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT digest, size_bytes, tokens, created_at, expires_at FROM entries "
+                "WHERE namespace = ? AND key = ?",
+                full,
+            ).fetchone()
+        if row is None:
+            return None
+        digest, size_bytes, tokens, created_at, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            value_ok = False
+        else:
+            try:
+                with open(self._object_path(digest), "rb") as f:
+                    value = pickle.loads(f.read())
+                value_ok = True
+            except Exception:
+                # Objects can vanish when another process evicts them; treat as a miss
+                value_ok = False
+        if not value_ok:
+            with self._lock:
+                if full not in self._pending:
+                    self._pending_deletes.add(full)
+                    self._mark_dirty(full)
+            return None
+        return TierEntry(
+            value=value, size_bytes=size_bytes, expires_at=expires_at, tokens=tokens, created_at=created_at
+        )
+
+    def _delete_row(self, conn: sqlite3.Connection, full: FullKey, orphans: List[str]) -> int:
+        """Delete an index row and release its object; returns bytes freed."""
+        row = conn.execute("SELECT digest FROM entries WHERE namespace = ? AND key = ?", full).fetchone()
+        if row is None:
+            return 0
+        conn.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", full)
+        digest = row[0]
+        conn.execute("UPDATE objects SET refcount = refcount - 1 WHERE digest = ?", (digest,))
+        obj = conn.execute("SELECT size_bytes, refcount FROM objects WHERE digest = ?", (digest,)).fetchone()
+        if obj is not None and obj[1] <= 0:
+            conn.execute("DELETE FROM objects WHERE digest = ?", (digest,))
+            orphans.append(digest)
+            return obj[0]
+        return 0
+
+    def _write_l2(
+        self,
+        writes: Dict[FullKey, TierEntry],
+        deletes: Set[FullKey],
+        touched: Dict[FullKey, float],
+        deltas: Dict[str, Counter],
+    ) -> None:
+        """Apply one batch of changes to L2 in a single transaction."""
+        now = time.time()
+        rows = []
+        for full, entry in writes.items():
+            data = entry.data if entry.data is not None else _serialize(entry.value)
+            digest = hashlib.sha256(data).hexdigest()
+            path = self._object_path(digest)
+            if not path.exists():
+                path.parent.mkdir(exist_ok=True)
+                atomic_write_bytes(path, data)
+            rows.append((full, digest, len(data), entry))
+
+        orphans: List[str] = []
+        with self._transaction() as conn:
+            for full in deletes:
+                self._delete_row(conn, full, orphans)
+            for full, digest, size_bytes, entry in rows:
+                self._delete_row(conn, full, orphans)
+                if digest in orphans:
+                    orphans.remove(digest)
+                conn.execute(
+                    "INSERT INTO objects (digest, size_bytes, refcount) VALUES (?, ?, 1) "
+                    "ON CONFLICT(digest) DO UPDATE SET refcount = refcount + 1",
+                    (digest, size_bytes),
+                )
+                conn.execute(
+                    "INSERT INTO entries (namespace, key, digest, size_bytes, tokens, created_at, expires_at, "
+                    "last_accessed) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (*full, digest, size_bytes, entry.tokens, entry.created_at, entry.expires_at, now),
+                )
+            conn.executemany(
+                "UPDATE entries SET last_accessed = ? WHERE namespace = ? AND key = ?",
+                [(accessed, *full) for full, accessed in touched.items()],
+            )
+
+            # Expired rows, then least recently accessed rows beyond the size cap
+            expired = conn.execute(
+                "SELECT namespace, key FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+            ).fetchall()
+            for full in expired:
+                self._delete_row(conn, tuple(full), orphans)
+            self._enforce_l2_cap(conn, orphans, deltas)
+
+            for namespace, counter in deltas.items():
+                values = [counter.get(name, 0) for name in STAT_FIELDS]
+                conn.execute(
+                    f"INSERT INTO stats (namespace, {', '.join(STAT_FIELDS)}) VALUES (?{', ?' * len(STAT_FIELDS)}) "
+                    f"ON CONFLICT(namespace) DO UPDATE SET "
+                    + ", ".join(f"{name} = {name} + excluded.{name}" for name in STAT_FIELDS),
+                    (namespace, *values),
+                )
+
+        for digest in orphans:
+            try:
+                self._object_path(digest).unlink()
+            except FileNotFoundError:
+                pass
+
+    def _enforce_l2_cap(self, conn: sqlite3.Connection, orphans: List[str], deltas: Dict[str, Counter]) -> None:
+        """Evict least recently accessed L2 entries until stored objects fit the cap."""
+        total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM objects").fetchone()[0]
+        while total > self.l2_max_bytes:
+            batch = conn.execute("SELECT namespace, key FROM entries ORDER BY last_accessed LIMIT 256").fetchall()
+            if not batch:
+                break
+            for full in batch:
+                total -= self._delete_row(conn, tuple(full), orphans)
+                deltas[full[0]]["l2_evictions"] += 1
+                if total <= self.l2_max_bytes:
+                    break
+
+    def _flush_worker(self) -> None:
+        """Background worker that flushes pending writes when due."""
+        while self._running:
+            try:
+                self._flush_event.wait(self.flush_interval)
+                self._flush_event.clear()
+                if self._dirty.due() or self._stat_deltas:
+                    self.flush()
+            except Exception as e:
+                print(f"Tiered cache flush error: {e}", file=sys.stderr)
+
+
+def _read_counters(conn: sqlite3.Connection) -> Dict[str, Dict[str, int]]:
+    """Read persisted per-namespace counters."""
+    rows = conn.execute(f"SELECT namespace, {', '.join(STAT_FIELDS)} FROM stats").fetchall()
+    return {row[0]: dict(zip(STAT_FIELDS, row[1:])) for row in rows}
+
+
+def read_cache_stats(cache_dir: str = ".claude-patterns") -> Dict[str, Any]:
+    """
+    Read the persisted cache statistics without opening a cache.
+
+    Counters are those flushed by every process using the cache directory.
+
+    Args:
+        cache_dir: Directory holding tiered_cache/
+
+    Returns:
+        Dictionary with per-namespace counters, totals and L2 size
+    """
+    db_path = Path(cache_dir) / TieredCache.DIR_NAME / INDEX_NAME
+    if not db_path.exists():
+        stats = _summarize_stats({})
+        stats["l2"] = {"entries": 0, "objects": 0, "bytes": 0}
+        return stats
+    conn = sqlite3.connect(str(db_path), timeout=30)
+    try:
+        conn.executescript(SCHEMA)
+        stats = _summarize_stats(_read_counters(conn))
+        entries = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        objects, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM objects").fetchone()
+        stats["l2"] = {"entries": entries, "objects": objects, "bytes": size}
+        return stats
+    finally:
+        conn.close()
+
+
+# Shared instance per cache directory
+_caches: Dict[str, TieredCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_tiered_cache(cache_dir: str = ".claude-patterns", **kwargs) -> TieredCache:
+    """
+    Get the shared tiered cache for a directory (one L1 per process).
+
+    Keyword arguments configure the cache only when it is first created.
+
+    Args:
+        cache_dir: Directory for cache files
+
+    Returns:
+        TieredCache instance
+    """
+    path = str(Path(cache_dir).resolve())
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = TieredCache(cache_dir, **kwargs)
+            _caches[path] = cache
+            # Pending write-behind changes must reach disk before the process exits
+            atexit.register(cache.close)
+        return cache
@@ -11,6 +11,7 @@ Features:
 - Optimization algorithms for token efficiency
 - Budget alerts and constraints
 - Multi-level budget hierarchy (global, project, task, agent)
+"""
 import os
 import json
 import sqlite3
@@ -24,6 +25,8 @@ import statistics
 import math
 from collections import defaultdict, deque
 
+from budget_ledger import BudgetLedger
+
 
 class BudgetLevel(Enum):
     """Budget hierarchy levels."""
@@ -118,10 +121,15 @@ class BudgetAllocation:
 
     def _calculate_status(self) -> BudgetStatus:
         """Calculate budget status based on usage percentage."""
-        if self.allocated == 0:
+        return self.status_for(self.used, self.allocated)
+
+    @staticmethod
+    def status_for(used: int, allocated: int) -> BudgetStatus:
+        """Budget status of an allocation with the given usage."""
+        if allocated == 0:
             return BudgetStatus.DEPLETED
 
-        usage_percent = (self.used / self.allocated) * 100
+        usage_percent = (used / allocated) * 100
 
         if usage_percent >= 100:
             return BudgetStatus.DEPLETED
@@ -175,10 +183,16 @@ class TokenBudgetManager:
         self.db_path = db_path
         self.conn = sqlite3.connect(str(db_path), check_same_thread=False)
         self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
 
         # Initialize database
         self._init_database()
 
+        # Authoritative balances live in the ledger; its changes are journaled and
+        # flushed in batches over a dedicated connection
+        self._ledger_conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self.ledger = BudgetLedger(Path(str(db_path)).with_suffix(".ledger.jsonl"), self._persist_ledger_entries)
+
         # Budget constraints storage
         self.constraints: Dict[str, BudgetConstraint] = {}
         self.allocations: Dict[str, BudgetAllocation] = {}
@@ -200,8 +214,9 @@ class TokenBudgetManager:
         self.default_task_budget = 10000  # 10K tokens per task
         self.optimization_threshold = 0.8  # Trigger optimization at 80% usage
 
-        # Load existing constraints
+        # Load existing constraints, then replay changes the database does not have yet
         self._load_constraints()
+        self._recover_ledger()
 
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
@@ -294,9 +309,18 @@ class TokenBudgetManager:
 """
         )
 
+        # Ledger state (newest persisted journal sequence number of each ledger writer)
+        cursor.execute(
+"""
+            CREATE TABLE IF NOT EXISTS ledger_state (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )
+"""
+        )
+
         self.conn.commit()
 
-"""
     def _setup_default_alerts(self) -> None:
         """Setup default budget alerts."""
         default_alerts = [
@@ -370,6 +394,7 @@ class TokenBudgetManager:
         )
 
         self.allocations[constraint_id] = allocation
+        self.ledger.open_account(constraint_id, allocation.allocated)
 
         # Save to database
         cursor = self.conn.cursor()
@@ -404,36 +429,222 @@ class TokenBudgetManager:
             return False, 0
 
         allocation = self.allocations[constraint_id]
+        previous_status = allocation.status
 
-        # Check if allocation is possible
-        available = allocation.available
+        with self.ledger.lock:
+            # Check if allocation is possible
+            available = self.ledger.balance(constraint_id)["available"]
 
-        # Apply optimization if needed
-        if requested > available:
-            optimized_requested = self._optimize_request(constraint_id, requested, task_type)
-            if optimized_requested > available:
-                self._check_and_trigger_alerts(constraint_id)
-                return False, 0
-            requested = optimized_requested
+            # Apply optimization if needed
+            if requested > available:
+                requested = self._optimize_request(constraint_id, requested, task_type)
 
-        # Update allocation
-        allocation.used += requested
-        allocation.available = allocation.allocated - allocation.used
-        allocation.last_updated = datetime.now()
-        allocation.status = allocation._calculate_status()
+            # Reserve and commit in one step; the usage is journaled and persisted by the next flush
+            granted = requested <= available and self.ledger.allocate(
+                constraint_id, requested, task_type=task_type, agent_name=agent_name, context=context or {}
+            ) is not None
+            if granted:
+                self._sync_allocation(constraint_id)
+
+        if not granted:
+            self._check_and_trigger_alerts(constraint_id)
+            return False, 0
 
         # Record usage
         self._record_usage(constraint_id, requested, task_type, agent_name, context)
 
-        # Save to database
-        self._update_allocation_in_db(allocation)
-
-        # Check for optimization opportunities
-        if allocation.status.value in ["warning", "critical"]:
+        # Regenerate optimization recommendations when entering a warning or critical state
+        if allocation.status != previous_status and allocation.status.value in ["warning", "critical"]:
             self._generate_optimization_recommendations(constraint_id)
 
         return True, requested
 
+    def reserve_tokens(self, constraint_id: str, tokens: int) -> Optional[str]:
+        """
+        Hold tokens for a task whose actual usage is known later.
+
+        Args:
+            constraint_id: Budget constraint to draw from
+            tokens: Tokens to hold
+
+        Returns:
+            Reservation ID for commit_reservation/release_reservation, or None if the budget cannot cover it
+        """
+        if constraint_id not in self.allocations:
+            return None
+
+        with self.ledger.lock:
+            reservation_id = self.ledger.reserve(constraint_id, tokens)
+            if reservation_id is not None:
+                self._sync_allocation(constraint_id)
+
+        return reservation_id
+
+    def commit_reservation(
+        self,
+        reservation_id: str,
+        tokens: Optional[int] = None,
+        task_type: str = "unknown",
+        agent_name: str = "unknown",
+        context: Dict[str, Any] = None,
+    ) -> int:
+        """
+        Record the usage of reserved tokens and return the rest of the reservation to the budget.
+
+        Args:
+            reservation_id: Reservation from reserve_tokens
+            tokens: Tokens actually used (defaults to, and is capped at, the reserved amount)
+            task_type: Task type recorded with the usage
+            agent_name: Agent recorded with the usage
+            context: Additional context recorded with the usage
+
+        Returns:
+            Tokens used
+        """
+        with self.ledger.lock:
+            reservation = self.ledger.reservation(reservation_id)
+            if reservation is None:
+                raise KeyError(f"Unknown reservation: {reservation_id}")
+            constraint_id = reservation.account_id
+            if constraint_id not in self.allocations:
+                # The constraint expired while the tokens were reserved
+                self.ledger.release(reservation_id)
+                return 0
+            allocation = self.allocations[constraint_id]
+            previous_status = allocation.status
+            used = self.ledger.commit(
+                reservation_id, tokens, task_type=task_type, agent_name=agent_name, context=context or {}
+            )
+            self._sync_allocation(constraint_id)
+
+        self._record_usage(constraint_id, used, task_type, agent_name, context)
+
+        # Regenerate optimization recommendations when entering a warning or critical state
+        if allocation.status != previous_status and allocation.status.value in ["warning", "critical"]:
+            self._generate_optimization_recommendations(constraint_id)
+
+        return used
+
+    def release_reservation(self, reservation_id: str) -> int:
+        """
+        Return reserved tokens to the budget without using them.
+
+        Args:
+            reservation_id: Reservation from reserve_tokens
+
+        Returns:
+            Tokens released (0 if the reservation was already committed or released)
+        """
+        with self.ledger.lock:
+            reservation = self.ledger.reservation(reservation_id)
+            released = self.ledger.release(reservation_id)
+            if reservation is not None and reservation.account_id in self.allocations:
+                self._sync_allocation(reservation.account_id)
+
+        return released
+
+    def flush(self) -> int:
+        """
+        Persist every ledger change now (normally done periodically in the background).
+
+        Returns:
+            Number of changes persisted
+        """
+        return self.ledger.flush()
+
+    def _sync_allocation(self, constraint_id: str) -> BudgetAllocation:
+        """Refresh an allocation from the ledger (caller holds the ledger lock)."""
+        allocation = self.allocations[constraint_id]
+        balance = self.ledger.balance(constraint_id)
+        allocation.used = balance["used"]
+        allocation.available = balance["available"]
+        allocation.last_updated = datetime.now()
+        allocation.status = allocation._calculate_status()
+        return allocation
+
+    def _persist_ledger_entries(self, entries: List[Dict[str, Any]]) -> None:
+        """Write a batch of ledger changes in one transaction (called by the ledger's flush)."""
+        usage_rows = [
+            (
+                entry["account_id"],
+                datetime.fromtimestamp(entry["timestamp"]).isoformat(),
+                entry["tokens"],
+                entry.get("task_type", "unknown"),
+                entry.get("agent_name", "unknown"),
+                json.dumps(entry.get("context", {})),
+            )
+            for entry in entries
+            if entry["op"] == "use"
+        ]
+        # Applied as deltas, so processes sharing the database add up instead of overwriting
+        # each other; a reset starts the constraint over from the tokens used after it
+        changes: Dict[str, List[Any]] = {}
+        for entry in entries:
+            change = changes.setdefault(entry["account_id"], [False, 0, entry["timestamp"]])
+            if entry["op"] == "reset":
+                change[0], change[1] = True, 0
+            else:
+                change[1] += entry["tokens"]
+            change[2] = entry["timestamp"]
+        # Sequence numbers are per ledger writer
+        last_seqs: Dict[str, int] = {}
+        for entry in entries:
+            last_seqs[entry["writer"]] = max(last_seqs.get(entry["writer"], 0), entry["seq"])
+
+        with self._ledger_conn:
+            # Take the write lock before reading, so the status is computed from the
+            # balances the deltas are applied to
+            self._ledger_conn.execute("BEGIN IMMEDIATE")
+            balances = {
+                row[0]: (row[1], row[2])
+                for row in self._ledger_conn.execute("SELECT constraint_id, used, allocated FROM budget_allocations")
+            }
+            statuses = {}
+            for account_id, (reset, tokens, _) in changes.items():
+                used, allocated = balances.get(account_id, (0, 0))
+                statuses[account_id] = BudgetAllocation.status_for(tokens if reset else used + tokens, allocated)
+
+            self._ledger_conn.executemany(
+                "INSERT INTO usage_history (constraint_id, timestamp, tokens_used, task_type, agent_name, context)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                usage_rows,
+            )
+            self._ledger_conn.executemany(
+                "UPDATE budget_allocations SET used = CASE WHEN ? THEN ? ELSE used + ? END,"
+                " available = allocated - CASE WHEN ? THEN ? ELSE used + ? END, status = ?, last_updated = ?"
+                " WHERE constraint_id = ?",
+                [
+                    (
+                        reset,
+                        tokens,
+                        tokens,
+                        reset,
+                        tokens,
+                        tokens,
+                        statuses[account_id].value,
+                        datetime.fromtimestamp(when).isoformat(),
+                        account_id,
+                    )
+                    for account_id, (reset, tokens, when) in changes.items()
+                ],
+            )
+            self._ledger_conn.executemany(
+                "INSERT OR REPLACE INTO ledger_state (key, value) VALUES (?, ?)",
+                [(f"last_seq:{writer}", seq) for writer, seq in last_seqs.items()],
+            )
+
+    def _recover_ledger(self) -> None:
+        """Replay journaled ledger changes that were not flushed before the last shutdown."""
+        rows = self.conn.execute("SELECT key, value FROM ledger_state WHERE key LIKE 'last_seq:%'").fetchall()
+        replayed = self.ledger.recover({row["key"][len("last_seq:"):]: row["value"] for row in rows})
+        if not replayed:
+            return
+
+        with self.ledger.lock:
+            for constraint_id in self.allocations:
+                self._sync_allocation(constraint_id)
+        self.ledger.flush()
+
     def _optimize_request(self, constraint_id: str, requested: int, task_type: str) -> int:
         """Optimize token request based on budget constraints."""
         # Get optimization recommendations for this constraint
@@ -458,20 +669,7 @@ class TokenBudgetManager:
     def _record_usage(
         self, constraint_id: str, tokens_used: int, task_type: str, agent_name: str, context: Dict[str, Any] = None
     ) -> None:
-        """Record token usage in history."""
-        cursor = self.conn.cursor()
-        cursor.execute(
-"""
-            INSERT INTO usage_history
-            (constraint_id, timestamp, tokens_used, task_type, agent_name, context)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """,
-            (constraint_id, datetime.now().isoformat(), tokens_used, task_type, agent_name, json.dumps(context or {})),
-        )
-
-        self.conn.commit()
-
-        # Add to in-memory history
+        """Record token usage in the in-memory history (the ledger persists it to usage_history)."""
         self.usage_history.append(
             {
                 "constraint_id": constraint_id,
@@ -483,18 +681,17 @@ class TokenBudgetManager:
         )
 
     def _update_allocation_in_db(self, allocation: BudgetAllocation) -> None:
-        """Update allocation in database."""
+        """Update allocation status and efficiency in database (used tokens are persisted by the ledger)."""
         cursor = self.conn.cursor()
         cursor.execute(
 """
             UPDATE budget_allocations
-            SET used = ?, available = ?, status = ?, last_updated = ?
+            SET status = ?, efficiency_score = ?, last_updated = ?
             WHERE constraint_id = ?
         """,
             (
-                allocation.used,
-                allocation.available,
                 allocation.status.value,
+                allocation.efficiency_score,
                 allocation.last_updated.isoformat(),
                 allocation.constraint_id,
             ),
@@ -541,8 +738,8 @@ class TokenBudgetManager:
         allocation = self.allocations[constraint_id]
         constraint = self.constraints[constraint_id]
 
-        # Analyze usage patterns
-        recent_usage = self._get_recent_usage(constraint_id, limit=50)
+        # Analyze usage patterns (in-memory history, no database round trip)
+        recent_usage = [usage for usage in list(self.usage_history) if usage["constraint_id"] == constraint_id][-50:]
 
         if recent_usage:
             avg_task_usage = statistics.mean([u["tokens_used"] for u in recent_usage])
@@ -596,6 +793,9 @@ class TokenBudgetManager:
 
     def _get_recent_usage(self, constraint_id: str, limit: int = 50) -> List[Dict]:
         """Get recent usage history for constraint."""
+        # Read-your-writes: persist journaled usage before querying it
+        self.ledger.flush()
+
         cursor = self.conn.cursor()
         cursor.execute(
 """
@@ -724,17 +924,10 @@ class TokenBudgetManager:
         if constraint_id not in self.allocations:
             return False
 
-        allocation = self.allocations[constraint_id]
-        constraint = self.constraints[constraint_id]
-
-        # Reset allocation
-        allocation.used = 0
-        allocation.available = constraint.limit
-        allocation.status = BudgetStatus.HEALTHY
-        allocation.last_updated = datetime.now()
-
-        # Update database
-        self._update_allocation_in_db(allocation)
+        # Reset allocation (journaled, persisted by the next flush)
+        with self.ledger.lock:
+            self.ledger.reset(constraint_id)
+            self._sync_allocation(constraint_id)
 
         self.logger.info(f"Reset budget for constraint: {constraint_id}")
         return True
@@ -748,9 +941,10 @@ class TokenBudgetManager:
             constraint_id = row["id"]
 
             constraint = BudgetConstraint(
+                id=constraint_id,
                 level=BudgetLevel(row["level"]),
                 scope=BudgetScope(row["scope"]),
-                limit=row["limit"],
+                limit=row["token_limit"],
                 used=row["used"],
                 period_start=datetime.fromisoformat(row["period_start"]) if row["period_start"] else None,
                 period_end=datetime.fromisoformat(row["period_end"]) if row["period_end"] else None,
@@ -775,6 +969,7 @@ class TokenBudgetManager:
                 )
 
                 self.allocations[constraint_id] = allocation
+                self.ledger.open_account(constraint_id, allocation.allocated, allocation.used)
             else:
                 self._initialize_allocation(constraint_id)
 
@@ -908,6 +1103,7 @@ class TokenBudgetManager:
             self.constraints.pop(constraint_id, None)
             self.allocations.pop(constraint_id, None)
             self.optimization_cache.pop(constraint_id, None)
+            self.ledger.close_account(constraint_id)
 
             # Remove from database
             cursor = self.conn.cursor()
@@ -923,14 +1119,16 @@ class TokenBudgetManager:
         return expired_count
 
     def __del__(self):
-        """Cleanup database connection."""
+        """Flush the ledger and cleanup database connections."""
+        if hasattr(self, "ledger"):
+            self.ledger.close()
+            self._ledger_conn.close()
         if hasattr(self, "conn"):
             self.conn.close()
 
 
 def main():
     """CLI interface for token budget manager."""
-"""
     import argparse
 
     parser = argparse.ArgumentParser(description="Token Budget Management System")
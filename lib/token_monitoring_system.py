@@ -23,6 +23,7 @@ import sqlite3
 from token_optimization_engine import get_token_optimizer
 from smart_caching_system import get_smart_cache
 from agent_communication_optimizer import get_communication_optimizer
+from group_commit import GroupCommitQueue
 
 
 class MetricType(Enum):
@@ -88,15 +89,14 @@ class TokenBudget:
     end_time: Optional[float]
     alerts_triggered: List[str]
     efficiency_score: float
+    user_id: Optional[str] = None
 
 
 class TokenMonitoringSystem:
-"""
+    """
     Comprehensive token usage monitoring and analytics system.
-"""
-"""
+    """
 
-"""
     def __init__(self, db_path: str = None, cache_dir: str = ".claude-patterns"):
         self.cache_dir = pathlib.Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
@@ -109,6 +109,12 @@ class TokenMonitoringSystem:
 
         self._init_database()
 
+        # Metrics are written in batches by one writer thread; alert checks run there too
+        self._writer_conn = None
+        self.metric_queue = GroupCommitQueue(
+            self._write_metric_batch, after_batch=self._process_metric_batch, name="token-metrics-writer"
+        )
+
         # Monitoring configuration
         self.alert_thresholds = {
             MetricType.CONSUMPTION: {
@@ -155,62 +161,66 @@ class TokenMonitoringSystem:
 
     def _init_database(self) -> None:
         """Initialize SQLite database for metrics storage."""
-        self.conn = sqlite3.connect(str(self.db_path))
-        self.conn.execute(
-"""
-            CREATE TABLE IF NOT EXISTS token_metrics (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp REAL NOT NULL,
-                metric_type TEXT NOT NULL,
-                value REAL NOT NULL,
-                tags TEXT,
-                source TEXT NOT NULL,
-                context TEXT,
-                created_at REAL DEFAULT (strftime('%s', 'now'))
+        # Shared with the metrics writer thread (alerts are saved from there), so every use holds db_lock;
+        # WAL lets reads run during the writer connection's batch commits
+        self.db_lock = threading.RLock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30)
+        with self.db_lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS token_metrics (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp REAL NOT NULL,
+                    metric_type TEXT NOT NULL,
+                    value REAL NOT NULL,
+                    tags TEXT,
+                    source TEXT NOT NULL,
+                    context TEXT,
+                    created_at REAL DEFAULT (strftime('%s', 'now'))
+                )
+                """
             )
-"""
-        )
 
-        self.conn.execute(
-"""
-            CREATE TABLE IF NOT EXISTS token_budgets (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                budget_id TEXT UNIQUE NOT NULL,
-                total_budget INTEGER NOT NULL,
-                used_tokens INTEGER DEFAULT 0,
-                remaining_tokens INTEGER NOT NULL,
-                start_time REAL NOT NULL,
-                end_time REAL,
-                alerts_triggered TEXT,
-                efficiency_score REAL DEFAULT 0.0,
-                created_at REAL DEFAULT (strftime('%s', 'now'))
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS token_budgets (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    budget_id TEXT UNIQUE NOT NULL,
+                    total_budget INTEGER NOT NULL,
+                    used_tokens INTEGER DEFAULT 0,
+                    remaining_tokens INTEGER NOT NULL,
+                    start_time REAL NOT NULL,
+                    end_time REAL,
+                    alerts_triggered TEXT,
+                    efficiency_score REAL DEFAULT 0.0,
+                    created_at REAL DEFAULT (strftime('%s', 'now'))
+                )
+                """
             )
-"""
-        )
 
-        self.conn.execute(
-"""
-            CREATE TABLE IF NOT EXISTS alerts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                level TEXT NOT NULL,
-                message TEXT NOT NULL,
-                metric_type TEXT NOT NULL,
-                threshold REAL NOT NULL,
-                current_value REAL NOT NULL,
-                timestamp REAL NOT NULL,
-                recommendations TEXT,
-                resolved BOOLEAN DEFAULT 0,
-                created_at REAL DEFAULT (strftime('%s', 'now'))
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS alerts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    level TEXT NOT NULL,
+                    message TEXT NOT NULL,
+                    metric_type TEXT NOT NULL,
+                    threshold REAL NOT NULL,
+                    current_value REAL NOT NULL,
+                    timestamp REAL NOT NULL,
+                    recommendations TEXT,
+                    resolved BOOLEAN DEFAULT 0,
+                    created_at REAL DEFAULT (strftime('%s', 'now'))
+                )
+                """
             )
-"""
-        )
 
-        # Create indexes for better performance
-        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_metrics_timestamp ON token_metrics(timestamp)")
-        self.start_time = time.time()
-        self.conn.commit()
+            # Create indexes for better performance
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_metrics_timestamp ON token_metrics(timestamp)")
+            self.start_time = time.time()
+            self.conn.commit()
 
-"""
     def record_metric(
         self,
         metric_type: MetricType,
@@ -219,7 +229,7 @@ class TokenMonitoringSystem:
         tags: Dict[str, str] = None,
         context: Dict[str, Any] = None,
     ) -> None:
-        """Record a token metric."""
+        """Record a token metric (written and checked for alerts by the metrics writer thread)."""
         if tags is None:
             tags = {}
 
@@ -230,32 +240,50 @@ class TokenMonitoringSystem:
             timestamp=time.time(), metric_type=metric_type, value=value, tags=tags, source=source, context=context
         )
 
-        # Store in database
-        cursor = self.conn.cursor()
-        cursor.execute(
-"""
-            INSERT INTO token_metrics (timestamp, metric_type, value, tags, source, context)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """,
-            (
-                metric.timestamp,
-                metric.metric_type.value,
-                metric.value,
-                json.dumps(metric.tags),
-                metric.source,
-                json.dumps(metric.context),
-            ),
-        )
-        self.conn.commit()
+        self.metric_queue.put(metric)
+
+    def flush_metrics(self, timeout: float = None) -> bool:
+        """Wait until every metric recorded so far is stored and has been checked for alerts."""
+        return self.metric_queue.flush(timeout)
+
+    def _write_metric_batch(self, metrics: List[TokenMetric]) -> None:
+        """Store a batch of metrics in one transaction (metrics writer thread)."""
+        if self._writer_conn is None:
+            self._writer_conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30)
+            self._writer_conn.execute("PRAGMA journal_mode=WAL")
+            self._writer_conn.execute("PRAGMA synchronous=NORMAL")
+
+        with self._writer_conn:
+            self._writer_conn.executemany(
+                """
+                INSERT INTO token_metrics (timestamp, metric_type, value, tags, source, context)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        metric.timestamp,
+                        metric.metric_type.value,
+                        metric.value,
+                        json.dumps(metric.tags),
+                        metric.source,
+                        json.dumps(metric.context),
+                    )
+                    for metric in metrics
+                ],
+            )
 
-        # Add to buffer
-        self.metrics_buffer.append(metric)
+    def _process_metric_batch(self, metrics: List[TokenMetric]) -> None:
+        """Buffer a written batch, check it for alerts and update the stats cache (metrics writer thread)."""
+        for metric in metrics:
+            # Add to buffer
+            self.metrics_buffer.append(metric)
 
-        # Check for alerts
-        self._check_alerts(metric)
+            # Check for alerts
+            self._check_alerts(metric)
 
         # Update stats cache
-        self._update_stats_cache(metric_type)
+        for metric_type in {metric.metric_type for metric in metrics}:
+            self._update_stats_cache(metric_type)
 
     def create_budget(self, budget_id: str, total_budget: int, user_id: str = None, duration: int = None) -> str:
         """Create a new token budget."""
@@ -268,29 +296,31 @@ class TokenMonitoringSystem:
             end_time=time.time() + duration if duration else None,
             alerts_triggered=[],
             efficiency_score=0.0,
+            user_id=user_id,
         )
 
         self.active_budgets[budget_id] = budget
 
         # Store in database
-        cursor = self.conn.cursor()
-        cursor.execute(
-"""
-            INSERT INTO token_budgets (budget_id, total_budget, used_tokens, remaining_tokens, start_time, end_time, alerts_triggered, efficiency_score)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-            (
-                budget.budget_id,
-                budget.total_budget,
-                budget.used_tokens,
-                budget.remaining_tokens,
-                budget.start_time,
-                budget.end_time,
-                json.dumps(budget.alerts_triggered),
-                budget.efficiency_score,
-            ),
-        )
-        self.conn.commit()
+        with self.db_lock:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                """
+                INSERT INTO token_budgets (budget_id, total_budget, used_tokens, remaining_tokens, start_time, end_time, alerts_triggered, efficiency_score)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    budget.budget_id,
+                    budget.total_budget,
+                    budget.used_tokens,
+                    budget.remaining_tokens,
+                    budget.start_time,
+                    budget.end_time,
+                    json.dumps(budget.alerts_triggered),
+                    budget.efficiency_score,
+                ),
+            )
+            self.conn.commit()
 
         return budget_id
 
@@ -318,23 +348,24 @@ class TokenMonitoringSystem:
         budget.efficiency_score = budget.used_tokens / budget.total_budget
 
         # Store in database
-        cursor = self.conn.cursor()
-        cursor.execute(
-"""
-            UPDATE token_budgets
-            SET used_tokens = ?, remaining_tokens = ?, efficiency_score = ?
-            WHERE budget_id = ?
-        """,
-            (budget.used_tokens, budget.remaining_tokens, budget.efficiency_score, budget.budget_id),
-        )
-        self.conn.commit()
+        with self.db_lock:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                """
+                UPDATE token_budgets
+                SET used_tokens = ?, remaining_tokens = ?, efficiency_score = ?
+                WHERE budget_id = ?
+                """,
+                (budget.used_tokens, budget.remaining_tokens, budget.efficiency_score, budget.budget_id),
+            )
+            self.conn.commit()
 
         # Record metric
         self.record_metric(
             MetricType.CONSUMPTION,
             tokens,
             f"budget_{budget_id}",
-            {"budget_id": budget_id, "user_id": user_id or "default"},
+            {"budget_id": budget_id, "user_id": budget.user_id or "default"},
             context,
         )
 
@@ -367,25 +398,28 @@ class TokenMonitoringSystem:
 
     def get_analytics(self, metric_type: MetricType = None, time_range: int = 3600, limit: int = 1000) -> Dict[str, Any]:
         """Get analytics for token usage."""
+        self.flush_metrics()
+
         if metric_type is None:
             return self._get_overall_analytics(time_range, limit)
 
         # Get recent metrics from database
-        cursor = self.conn.cursor()
-        since_time = time.time() - time_range
+        with self.db_lock:
+            cursor = self.conn.cursor()
+            since_time = time.time() - time_range
 
-        cursor.execute(
-"""
-            SELECT timestamp, value, tags, source, context
-            FROM token_metrics
-            WHERE metric_type = ? AND timestamp > ?
-            ORDER BY timestamp DESC
-            LIMIT ?
-        """,
-            (metric_type.value, since_time, limit),
-        )
+            cursor.execute(
+                """
+                SELECT timestamp, value, tags, source, context
+                FROM token_metrics
+                WHERE metric_type = ? AND timestamp > ?
+                ORDER BY timestamp DESC
+                LIMIT ?
+                """,
+                (metric_type.value, since_time, limit),
+            )
 
-        rows = cursor.fetchall()
+            rows = cursor.fetchall()
         metrics = []
         for row in rows:
             metrics.append(
@@ -419,31 +453,34 @@ class TokenMonitoringSystem:
 
     def _get_overall_analytics(self, time_range: int, limit: int) -> Dict[str, Any]:
         """Get overall analytics across all metric types."""
+        self.flush_metrics()
+
         analytics = {"overview": {}, "metrics_by_type": {}, "alerts_summary": {}, "budget_summary": {}, "recommendations": []}
 
         # Overview statistics
-        cursor = self.conn.cursor()
-        since_time = time.time() - time_range
-
-        for metric_type in MetricType:
-            cursor.execute(
-"""
-                SELECT COUNT(*), AVG(value), MIN(value), MAX(value), SUM(value)
-                FROM token_metrics
-                WHERE metric_type = ? AND timestamp > ?
-            """,
-                (metric_type.value, since_time),
-            )
+        with self.db_lock:
+            cursor = self.conn.cursor()
+            since_time = time.time() - time_range
+
+            for metric_type in MetricType:
+                cursor.execute(
+                    """
+                    SELECT COUNT(*), AVG(value), MIN(value), MAX(value), SUM(value)
+                    FROM token_metrics
+                    WHERE metric_type = ? AND timestamp > ?
+                    """,
+                    (metric_type.value, since_time),
+                )
 
-            row = cursor.fetchone()
-            if row and row[0] > 0:
-                analytics["metrics_by_type"][metric_type.value] = {
-                    "count": row[0],
-                    "avg_value": row[1],
-                    "min_value": row[2],
-                    "max_value": row[3],
-                    "total_value": row[4],
-                }
+                row = cursor.fetchone()
+                if row and row[0] > 0:
+                    analytics["metrics_by_type"][metric_type.value] = {
+                        "count": row[0],
+                        "avg_value": row[1],
+                        "min_value": row[2],
+                        "max_value": row[3],
+                        "total_value": row[4],
+                    }
 
         # Alerts summary
         active_alerts = [alert for alert in self.alerts if not alert.resolved]
@@ -494,6 +531,7 @@ class TokenMonitoringSystem:
 - **Average Efficiency**: {analytics['budget_summary']['average_efficiency']:.2%}
 
 ## Metrics by Type
+"""
 
         for metric_type, data in analytics["metrics_by_type"].items():
             report_content += f"""
@@ -502,6 +540,7 @@ class TokenMonitoringSystem:
 - **Average**: {data['avg_value']:.2f}
 - **Range**: {data['min_value']:.2f} - {data['max_value']:.2f}
 - **Total**: {data['total_value']:,}
+"""
 
         report_content += f"""
 ## Budget Summary
@@ -523,6 +562,7 @@ class TokenMonitoringSystem:
   - Info: {analytics['alerts_summary']['by_level'].get('info', 0)}
 
 ## Recommendations
+"""
 
         for recommendation in analytics["recommendations"]:
             report_content += f"- {recommendation}\n"
@@ -535,6 +575,8 @@ class TokenMonitoringSystem:
 ---
 
 *Report generated by Token Monitoring System*
+"""
+
         # Write report to file
         with open(report_path, "w") as f:
             f.write(report_content)
@@ -545,7 +587,8 @@ class TokenMonitoringSystem:
         """Check if metric triggers any alerts."""
         thresholds = self.alert_thresholds.get(metric.metric_type, {})
 
-        for alert_level, threshold in thresholds.items():
+        for level_name, threshold in thresholds.items():
+            alert_level = AlertLevel(level_name)
             if self._should_trigger_alert(metric, threshold, alert_level):
                 alert = Alert(
                     level=alert_level,
@@ -577,7 +620,7 @@ class TokenMonitoringSystem:
 
     def _generate_alert_message(self, metric: TokenMetric, level: AlertLevel) -> str:
         """Generate alert message."""
-        return f"{level.title()} Alert: {metric.metric_type.value()} - Current: {metric.value:.2f}"
+        return f"{level.value.title()} Alert: {metric.metric_type.value} - Current: {metric.value:.2f}"
 
     def _generate_alert_recommendations(self, metric: TokenMetric, level: AlertLevel) -> List[str]:
         """Generate recommendations for alert."""
@@ -734,9 +777,10 @@ class TokenMonitoringSystem:
 
     def _load_alerts(self) -> None:
         """Load alerts from database."""
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM alerts ORDER BY timestamp DESC")
-        rows = cursor.fetchall()
+        with self.db_lock:
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT * FROM alerts ORDER BY timestamp DESC")
+            rows = cursor.fetchall()
 
         for row in rows:
             alert = Alert(
@@ -753,6 +797,11 @@ class TokenMonitoringSystem:
 
     def _save_alerts(self) -> None:
         """Save alerts to database."""
+        with self.db_lock:
+            self._save_alerts_locked()
+
+    def _save_alerts_locked(self) -> None:
+        """Save alerts to database (caller holds db_lock)."""
         cursor = self.conn.cursor()
         # Clear resolved alerts older than 7 days
         cutoff_time = time.time() - (7 * 24 * 3600)
@@ -762,11 +811,11 @@ class TokenMonitoringSystem:
         # Save current alerts
         for alert in self.alerts:
             cursor.execute(
-"""
+                """
                 INSERT OR REPLACE INTO alerts
                 (level, message, metric_type, threshold, current_value, timestamp, recommendations, resolved, id)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
                 (
                     alert.level.value,
                     alert.message,
@@ -865,9 +914,10 @@ class TokenMonitoringSystem:
         self._save_alerts()
 
         # Clean old metrics
-        cursor = self.conn.cursor()
-        cursor.execute("DELETE FROM token_metrics WHERE timestamp < ?", (cutoff_time,))
-        self.conn.commit()
+        with self.db_lock:
+            cursor = self.conn.cursor()
+            cursor.execute("DELETE FROM token_metrics WHERE timestamp < ?", (cutoff_time,))
+            self.conn.commit()
 
     def add_alert_handler(self, metric_type: MetricType, handler: Callable) -> None:
         """Add custom alert handler for specific metric type."""
@@ -891,18 +941,18 @@ class TokenMonitoringSystem:
         cutoff_time = time.time() - (days * 24 * 3600)
 
         # Clear old metrics
-        cursor = self.conn.cursor()
-        cursor.execute("DELETE FROM token_metrics WHERE timestamp < ?", (cutoff_time,))
-        cursor.execute("DELETE FROM alerts WHERE timestamp < ? AND resolved = 1", (cutoff_time,))
-        cursor.execute("DELETE FROM token_budgets WHERE end_time < ? AND end_time < ?", (cutoff_time, cutoff_time))
+        with self.db_lock:
+            cursor = self.conn.cursor()
+            cursor.execute("DELETE FROM token_metrics WHERE timestamp < ?", (cutoff_time,))
+            cursor.execute("DELETE FROM alerts WHERE timestamp < ? AND resolved = 1", (cutoff_time,))
+            cursor.execute("DELETE FROM token_budgets WHERE end_time < ? AND end_time < ?", (cutoff_time, cutoff_time))
+            self.conn.commit()
 
         # Clean up old files
         for file_path in self.reports_dir.glob("*.md"):
             if file_path.stat().st_mtime < cutoff_time:
                 file_path.unlink()
 
-        self.conn.commit()
-
     def export_data(self, format_type: str = "json", time_range: int = 86400) -> str:
         """Export monitoring data."""
         timestamp = time.strftime("%Y%m%d_%H%M%S")
@@ -930,6 +980,7 @@ class TokenMonitoringSystem:
             "database_connection": self.conn is not None,
             "alerts_active": len(self.get_active_alerts()),
             "metrics_buffer_size": len(self.metrics_buffer),
+            "metrics_pending": self.metric_queue.pending,
             "active_budgets": len(self.active_budgets),
             "cache_status": "healthy",
             "last_cleanup": time.time(),
@@ -951,7 +1002,6 @@ def get_token_monitoring() -> TokenMonitoringSystem:
 if __name__ == "__main__":
     monitor = get_token_monitoring()
 
-"""
     # Test basic functionality
     monitor.record_metric(MetricType.CONSUMPTION, 1500, "test", {"test": True})
     monitor.record_metric(MetricType.EFFICIENCY, 0.7, "test", {"test": True})
@@ -17,6 +17,8 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import pathlib
 
+from token_counter import count_tokens
+
 
 class ContentType(Enum):
     """Content type categories for optimization strategies."""
@@ -47,12 +49,8 @@ class ContentItem:
 
 
 class TokenOptimizer:
-"""
-    Advanced token optimization engine with progressive loading and smart caching.
-"""
-"""
+    """Advanced token optimization engine with progressive loading and smart caching."""
 
-"""
     def __init__(self, cache_dir: str = ".claude-patterns"):
         self.cache_dir = pathlib.Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
@@ -180,8 +178,7 @@ class TokenOptimizer:
 
     def _estimate_tokens(self, content: str) -> int:
         """Estimate token count for content."""
-        # Rough estimation: ~1 token per 3-4 characters for technical content
-        return len(content) // 3
+        return count_tokens(content)
 
     def _load_file_content(self, path: str) -> str:
         """Load content from file."""
@@ -373,7 +370,6 @@ def register_project_content():
     """Register all project content for token optimization."""
     optimizer = get_token_optimizer()
 
-"""
     # Register main documentation
     claude_content = pathlib.Path("CLAUDE.md").read_text(encoding="utf-8") if pathlib.Path("CLAUDE.md").exists() else ""
     if claude_content:
@@ -1,11 +1,9 @@
-"""
 #    Token Optimization Integration System
 """
 Integrates all token optimization components into a unified system for
 maximum token efficiency across the autonomous agent platform.
 
 Components Integrated:
-"""
 - Token Optimization Engine
 - Progressive Content Loader
 - Autonomous Token Optimizer
@@ -14,6 +12,7 @@ Components Integrated:
 - Token Monitoring System
 - Token Budget Manager
 - Advanced Token Optimizer
+"""
 import os
 import json
 import asyncio
@@ -23,9 +22,12 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import logging
 from pathlib import Path
+import statistics
 import threading
 import time
 
+from token_counter import count_tokens
+
 # Import all optimization components
 try:
     from token_optimization_engine import TokenOptimizer, ContentType, ContentItem
@@ -143,10 +145,6 @@ class TokenOptimizationIntegration:
         self.data_dir = Path(config.data_directory)
         self.data_dir.mkdir(exist_ok=True)
 
-        # Initialize all components
-        self.components = {}
-        self._initialize_components()
-
         # Integration state
         self.active = False
         self.start_time = None
@@ -183,6 +181,10 @@ class TokenOptimizationIntegration:
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
 
+        # Initialize all components (reports into the status and logger above)
+        self.components = {}
+        self._initialize_components()
+
     def _initialize_components(self) -> None:
         """Initialize all optimization components."""
         try:
@@ -653,7 +655,7 @@ class TokenOptimizationIntegration:
     def process_task_request(self, task_type: str, content: str, context: Dict[str, Any] = None) -> Tuple[str, int]:
         """Process a task request with optimization."""
         if not self.active or self.config.mode == IntegrationMode.MONITORING_ONLY:
-            return content, len(content.split())  # Return original content
+            return content, count_tokens(content)  # Return original content
 
         tokens_saved = 0
         optimized_content = content
@@ -665,7 +667,7 @@ class TokenOptimizationIntegration:
                 tier = LoadingTier.ESSENTIAL if self.config.level == OptimizationLevel.MINIMAL else LoadingTier.STANDARD
                 loaded_content = progressive_loader.load_content(task_type, tier, context or {})
                 optimized_content = loaded_content.get("content", content)
-                tokens_saved += len(content.split()) - len(optimized_content.split())
+                tokens_saved += count_tokens(content) - count_tokens(optimized_content)
 
             # 2. Apply caching
             smart_cache = self.components.get("smart_cache")
@@ -698,7 +700,7 @@ class TokenOptimizationIntegration:
                     # Try to allocate tokens
                     success, allocated = budget_manager.allocate_tokens(
                         constraint_id="task_default",  # Use default task constraint
-                        requested=len(optimized_content.split()),
+                        requested=count_tokens(optimized_content),
                         task_type=task_type,
                         context=context,
                     )
@@ -706,7 +708,7 @@ class TokenOptimizationIntegration:
                     if not success:
                         # Budget exceeded, apply aggressive optimization
                         optimized_content = self._emergency_optimization(optimized_content)
-                        tokens_saved += len(content.split()) - len(optimized_content.split())
+                        tokens_saved += count_tokens(content) - count_tokens(optimized_content)
 
             return optimized_content, tokens_saved
 
@@ -855,7 +857,6 @@ class TokenOptimizationIntegration:
 
 def main():
     """CLI interface for token optimization integration."""
-"""
     import argparse
 
     parser = argparse.ArgumentParser(description="Token Optimization Integration System")
@@ -932,9 +933,9 @@ def main():
 
             optimized_content, tokens_saved = integration.process_task_request(args.process_task, content)
 
-            print(f"Original tokens: {len(content.split())}")
+            print(f"Original tokens: {count_tokens(content)}")
             print(f"Tokens saved: {tokens_saved}")
-            print(f"Optimization ratio: {tokens_saved / len(content.split()):.2%}")
+            print(f"Optimization ratio: {tokens_saved / count_tokens(content):.2%}")
             print(f"\nOptimized content:\n{optimized_content}")
 
             integration.stop()
@@ -36,6 +36,7 @@ try:
     from token_monitoring_system import TokenMonitoringSystem, MetricType, AlertLevel
     from token_budget_manager import TokenBudgetManager, BudgetLevel, BudgetScope
     from advanced_token_optimizer import AdvancedTokenOptimizer, OptimizationObjective, AlgorithmType
+    from token_counter import count_tokens
     from token_optimization_integration import (
         TokenOptimizationIntegration,
         IntegrationMode,
@@ -519,7 +520,7 @@ class TestPerformanceOptimization(unittest.TestCase):
         saved_tokens = 0
 
         for task_type, content in tasks:
-            content_tokens = len(content.split())
+            content_tokens = count_tokens(content)
             original_tokens += content_tokens
 
             optimized_content, tokens_saved = self.integration.process_task_request(task_type, content, {"priority": "high"})
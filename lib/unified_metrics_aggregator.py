@@ -1,18 +1,22 @@
-"""
 #    Unified Metrics Aggregator for Token Optimization Framework
 """
 Centralizes metrics from all optimization systems and provides KPI tracking
-# import sqlite3
-# import json
-# import time
-# import logging
-# from datetime import datetime, timedelta
-# from typing import Dict, List, Any, Optional, Tuple
-# from dataclasses import dataclass, asdict
-# from enum import Enum
-# import threading
-# from pathlib import Path
-# class MetricPeriod(Enum):
+and trend analysis.
+"""
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional
+from dataclasses import dataclass
+from enum import Enum
+import threading
+from pathlib import Path
+
+from metrics_store import get_metrics_store
+
+
+class MetricPeriod(Enum):
+    """Aggregation periods for metrics"""
 
     HOURLY = "hourly"
     DAILY = "daily"
@@ -61,6 +65,9 @@ class KpiDefinition:
 class UnifiedMetricsAggregator:
     """Centralizes metrics aggregation from all optimization systems"""
 
+    # Dashboard reads reuse a stored system snapshot for this long instead of collecting a new one
+    SNAPSHOT_MAX_AGE_SECONDS = 300
+
     def __init__(self, db_path: str = None, cache_dir: str = ".claude-patterns"):
         self.db_path = db_path or f"{cache_dir}/unified_metrics.db"
         self.cache_dir = Path(cache_dir)
@@ -86,74 +93,9 @@ class UnifiedMetricsAggregator:
         self.logger.info("Unified Metrics Aggregator initialized")
 
     def _init_database(self):
-        """Initialize SQLite database for metrics storage"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-
-            # Aggregated metrics table
-            cursor.execute(
-"""
-                CREATE TABLE IF NOT EXISTS aggregated_metrics (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TEXT NOT NULL,
-                    metric_name TEXT NOT NULL,
-                    category TEXT NOT NULL,
-                    period TEXT NOT NULL,
-                    value REAL NOT NULL,
-                    unit TEXT NOT NULL,
-                    source_system TEXT NOT NULL,
-                    metadata TEXT,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
-                )
-"""
-            )
-
-            # KPI results table
-            cursor.execute(
-"""
-                CREATE TABLE IF NOT EXISTS kpi_results (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TEXT NOT NULL,
-                    kpi_name TEXT NOT NULL,
-                    category TEXT NOT NULL,
-                    value REAL NOT NULL,
-                    target_value REAL NOT NULL,
-                    achievement_rate REAL NOT NULL,
-                    trend TEXT,
-                    period TEXT NOT NULL,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
-                )
-"""
-            )
-
-            # System snapshots table
-            cursor.execute(
-"""
-                CREATE TABLE IF NOT EXISTS system_snapshots (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TEXT NOT NULL,
-                    total_tokens_saved INTEGER DEFAULT 0,
-                    total_cost_savings REAL DEFAULT 0.0,
-                    overall_effectiveness REAL DEFAULT 0.0,
-                    cache_hit_rate REAL DEFAULT 0.0,
-                    compression_ratio REAL DEFAULT 0.0,
-                    user_satisfaction REAL DEFAULT 0.0,
-                    system_health_score REAL DEFAULT 0.0,
-                    metadata TEXT,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
-                )
-"""
-            )
+        """Open the shared metrics store (partitioned tables, rollups and indexes)"""
+        self.store = get_metrics_store(self.db_path)
 
-            # Create indexes
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_metrics_timestamp ON aggregated_metrics(timestamp)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_metrics_name ON aggregated_metrics(metric_name)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_kpi_timestamp ON kpi_results(timestamp)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_snapshot_timestamp ON system_snapshots(timestamp)")
-
-            conn.commit()
-
-"""
     def _init_kpi_definitions(self):
         """Initialize KPI definitions with targets"""
         self.kpi_definitions = {
@@ -325,23 +267,23 @@ class UnifiedMetricsAggregator:
             return {"error": f"Progressive loader error: {str(e)}"}
 
     def _collect_smart_cache_metrics(self) -> Dict[str, Any]:
-        """Collect metrics from smart cache system"""
+        """Collect metrics from the shared tiered cache (all cache front-ends)"""
         try:
-            # Try to import smart cache
-            from smart_cache_system_simple import SimpleSmartCache
+            # Persisted counters cover every process using the cache directory
+            from tiered_cache import read_cache_stats
 
-            cache = SimpleSmartCache(max_size_mb=100)
-            stats = cache.get_stats()
+            stats = read_cache_stats(str(self.cache_dir))
+            total = stats["total"]
 
             return {
-                "hit_rate": stats.get("hit_rate", 0.0),
-                "total_hits": stats.get("hit_count", 0),
-                "total_misses": stats.get("miss_count", 0),
-                "cache_size": len(cache.cache),
-                "memory_usage": stats.get("memory_usage", 0),
-                "prediction_accuracy": stats.get("prediction_accuracy", 0.0),
-                "policy_performance": stats.get("policy_performance", {}),
-                "evictions": stats.get("evictions", 0),
+                "hit_rate": total["hit_rate"],
+                "total_hits": total["hits"],
+                "total_misses": total["misses"],
+                "cache_size": stats["l2"]["entries"],
+                "memory_usage": stats["l2"]["bytes"],
+                "tokens_saved": total["tokens_saved"],
+                "evictions": total["l1_evictions"] + total["l2_evictions"],
+                "namespaces": stats["namespaces"],
             }
         except ImportError:
             return {"error": "Smart cache not available"}
@@ -465,37 +407,20 @@ class UnifiedMetricsAggregator:
         return aggregated
 
     def store_aggregated_metrics(self, metrics: Dict[str, Any], period: MetricPeriod = MetricPeriod.DAILY):
-        """Store aggregated metrics in database"""
-        with self.lock:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                timestamp = datetime.now().isoformat()
+        """Store aggregated metrics, update their daily/weekly rollups and record the resulting KPI scores"""
+        rows = [
+            (metric_name, self._categorize_metric(metric_name).value, self._get_metric_unit(metric_name), float(value))
+            for metric_name, value in metrics.items()
+            if isinstance(value, (int, float)) and metric_name != "timestamp"
+        ]
 
-                # Store each aggregated metric
-                for metric_name, value in metrics.items():
-                    if isinstance(value, (int, float)) and metric_name != "timestamp":
-                        # Determine category
-                        category = self._categorize_metric(metric_name)
+        with self.lock:
+            self.store.record_metrics(
+                datetime.now(), period.value, rows, "unified_aggregator", {"source": "aggregation"}
+            )
 
-                        cursor.execute(
-"""
-                            INSERT INTO aggregated_metrics
-                            (timestamp, metric_name, category, period, value, unit, source_system, metadata)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                        """,
-                            (
-                                timestamp,
-                                metric_name,
-                                category.value,
-                                period.value,
-                                float(value),
-                                self._get_metric_unit(metric_name),
-                                "unified_aggregator",
-                                json.dumps({"source": "aggregation"}),
-                            ),
-                        )
-
-                conn.commit()
+            # KPI results are recorded when metrics arrive, so dashboard reads never write
+            self.calculate_kpi_scores(period)
 
         self.logger.info(f"Stored {len(metrics)} aggregated metrics for {period.value} period")
 
@@ -534,106 +459,105 @@ class UnifiedMetricsAggregator:
             return "units"
 
     def calculate_kpi_scores(self, period: MetricPeriod = MetricPeriod.DAILY) -> Dict[str, Any]:
-        """Calculate KPI scores and achievement rates"""
+        """Calculate KPI scores and achievement rates, and record them"""
         with self.lock:
-            # Get recent metrics
-            recent_metrics = self._get_recent_metrics(period)
-
-            kpi_results = {}
-            overall_score = 0.0
-            total_weight = 0.0
-
-            for kpi_name, kpi_def in self.kpi_definitions.items():
-                # Get current value for this KPI
-                current_value = self._get_kpi_value(kpi_name, recent_metrics)
-
-                if current_value is not None:
-                    # Calculate achievement rate
-                    achievement_rate = self._calculate_achievement_rate(
-                        current_value, kpi_def.target_value, kpi_def.minimum_acceptable
-                    )
-
-                    # Calculate trend
-                    trend = self._calculate_kpi_trend(kpi_name, period)
-
-                    kpi_results[kpi_name] = {
-                        "current_value": current_value,
-                        "target_value": kpi_def.target_value,
-                        "minimum_acceptable": kpi_def.minimum_acceptable,
-                        "optimal_value": kpi_def.optimal_value,
-                        "achievement_rate": achievement_rate,
-                        "trend": trend,
-                        "category": kpi_def.category.value,
-                        "weight": kpi_def.weight,
-                        "unit": kpi_def.unit,
-                        "status": self._get_kpi_status(achievement_rate),
-                    }
+            kpi_scores = self._score_kpis(period)
 
-                    # Store in database
-                    self._store_kpi_result(
-                        kpi_name, kpi_def.category, current_value, kpi_def.target_value, achievement_rate, trend, period
-                    )
+            # Store in database
+            self.store.record_kpi_results(
+                datetime.now(),
+                period.value,
+                [
+                    {
+                        "kpi_name": kpi_name,
+                        "category": result["category"],
+                        "value": result["current_value"],
+                        "target_value": result["target_value"],
+                        "achievement_rate": result["achievement_rate"],
+                        "trend": result["trend"],
+                    }
+                    for kpi_name, result in kpi_scores["individual_kpis"].items()
+                ],
+            )
 
-                    # Add to overall score
-                    overall_score += achievement_rate * kpi_def.weight
-                    total_weight += kpi_def.weight
+            return kpi_scores
 
-            # Calculate overall score
-            overall_achievement = overall_score / total_weight if total_weight > 0 else 0.0
+    def _score_kpis(self, period: MetricPeriod) -> Dict[str, Any]:
+        """Score the KPIs from the metric and KPI rollups without writing anything"""
+        # Get recent metrics
+        recent_metrics = self._get_recent_metrics(period)
+        trends = self._calculate_kpi_trends(period)
 
-            return {
-                "individual_kpis": kpi_results,
-                "overall_score": overall_achievement,
-                "overall_achievement_rate": overall_achievement,
-                "total_kpis_tracked": len(kpi_results),
-                "period": period.value,
-                "calculated_at": datetime.now().isoformat(),
-            }
+        kpi_results = {}
+        overall_score = 0.0
+        total_weight = 0.0
 
-    def _get_recent_metrics(self, period: MetricPeriod, limit: int = 100) -> List[AggregatedMetric]:
-        """Get recent metrics for the specified period"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-
-            # Calculate time threshold based on period
-            time_threshold = datetime.now()
-            if period == MetricPeriod.HOURLY:
-                time_threshold -= timedelta(hours=24)
-            elif period == MetricPeriod.DAILY:
-                time_threshold -= timedelta(days=30)
-            elif period == MetricPeriod.WEEKLY:
-                time_threshold -= timedelta(weeks=12)
-            elif period == MetricPeriod.MONTHLY:
-                time_threshold -= timedelta(days=365)
-
-            cursor.execute(
-"""
-                SELECT * FROM aggregated_metrics
-                WHERE timestamp >= ?
-                ORDER BY timestamp DESC
-                LIMIT ?
-            """,
-                (time_threshold.isoformat(), limit),
-            )
+        for kpi_name, kpi_def in self.kpi_definitions.items():
+            # Get current value for this KPI
+            current_value = self._get_kpi_value(kpi_name, recent_metrics)
 
-            rows = cursor.fetchall()
-            metrics = []
-
-            for row in rows:
-                metrics.append(
-                    AggregatedMetric(
-                        timestamp=datetime.fromisoformat(row[1]),
-                        metric_name=row[2],
-                        category=KpiCategory(row[3]),
-                        period=MetricPeriod(row[4]),
-                        value=row[5],
-                        unit=row[6],
-                        source_system=row[7],
-                        metadata=json.loads(row[8]) if row[8] else {},
-                    )
+            if current_value is not None:
+                # Calculate achievement rate
+                achievement_rate = self._calculate_achievement_rate(
+                    current_value, kpi_def.target_value, kpi_def.minimum_acceptable
                 )
 
-            return metrics
+                kpi_results[kpi_name] = {
+                    "current_value": current_value,
+                    "target_value": kpi_def.target_value,
+                    "minimum_acceptable": kpi_def.minimum_acceptable,
+                    "optimal_value": kpi_def.optimal_value,
+                    "achievement_rate": achievement_rate,
+                    "trend": trends.get(kpi_name, "insufficient_data"),
+                    "category": kpi_def.category.value,
+                    "weight": kpi_def.weight,
+                    "unit": kpi_def.unit,
+                    "status": self._get_kpi_status(achievement_rate),
+                }
+
+                # Add to overall score
+                overall_score += achievement_rate * kpi_def.weight
+                total_weight += kpi_def.weight
+
+        # Calculate overall score
+        overall_achievement = overall_score / total_weight if total_weight > 0 else 0.0
+
+        return {
+            "individual_kpis": kpi_results,
+            "overall_score": overall_achievement,
+            "overall_achievement_rate": overall_achievement,
+            "total_kpis_tracked": len(kpi_results),
+            "period": period.value,
+            "calculated_at": datetime.now().isoformat(),
+        }
+
+    def _get_recent_metrics(self, period: MetricPeriod, limit: int = 100) -> List[AggregatedMetric]:
+        """Get the latest value of each metric recorded within the period's window, newest first"""
+        # Calculate time threshold based on period
+        time_threshold = datetime.now()
+        if period == MetricPeriod.HOURLY:
+            time_threshold -= timedelta(hours=24)
+        elif period == MetricPeriod.DAILY:
+            time_threshold -= timedelta(days=30)
+        elif period == MetricPeriod.WEEKLY:
+            time_threshold -= timedelta(weeks=12)
+        elif period == MetricPeriod.MONTHLY:
+            time_threshold -= timedelta(days=365)
+
+        # One row per metric from the daily rollups instead of every raw row in the window
+        return [
+            AggregatedMetric(
+                timestamp=datetime.fromisoformat(latest["timestamp"]),
+                metric_name=latest["metric_name"],
+                category=KpiCategory(latest["category"]),
+                period=MetricPeriod(latest["period"]),
+                value=latest["value"],
+                unit=latest["unit"],
+                source_system="metric_rollups",
+                metadata={},
+            )
+            for latest in self.store.latest_metric_values(time_threshold)[:limit]
+        ]
 
     def _get_kpi_value(self, kpi_name: str, metrics: List[AggregatedMetric]) -> Optional[float]:
         """Get current value for a specific KPI from metrics"""
@@ -688,47 +612,40 @@ class UnifiedMetricsAggregator:
             else:
                 return 0.0
 
-    def _calculate_kpi_trend(self, kpi_name: str, period: MetricPeriod) -> str:
-        """Calculate trend for a KPI"""
-        # Get historical values for this KPI
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-
-            # Calculate time threshold based on period
-            time_threshold = datetime.now()
-            if period == MetricPeriod.DAILY:
-                time_threshold -= timedelta(days=7)  # Last 7 days
-            elif period == MetricPeriod.WEEKLY:
-                time_threshold -= timedelta(weeks=4)  # Last 4 weeks
-            elif period == MetricPeriod.MONTHLY:
-                time_threshold -= timedelta(days=90)  # Last 3 months
-
-            cursor.execute(
-"""
-                SELECT value FROM kpi_results
-                WHERE kpi_name = ? AND timestamp >= ?
-                ORDER BY timestamp ASC
-            """,
-                (kpi_name, time_threshold.isoformat()),
-            )
-
-            rows = cursor.fetchall()
-
-            if len(rows) < 2:
-                return "insufficient_data"
-
-            values = [row[0] for row in rows]
+    def _calculate_kpi_trends(self, period: MetricPeriod) -> Dict[str, str]:
+        """Calculate the trend of every KPI from its rollup buckets"""
+        # Calculate time threshold based on period
+        time_threshold = datetime.now()
+        granularity = "day"
+        if period == MetricPeriod.DAILY:
+            time_threshold -= timedelta(days=7)  # Last 7 days
+        elif period == MetricPeriod.WEEKLY:
+            time_threshold -= timedelta(weeks=4)  # Last 4 weeks
+            granularity = "week"
+        elif period == MetricPeriod.MONTHLY:
+            time_threshold -= timedelta(days=90)  # Last 3 months
+            granularity = "week"
+
+        trends = {}
+        for kpi_name, buckets in self.store.kpi_series(granularity, time_threshold).items():
+            if len(buckets) < 2:
+                trends[kpi_name] = "insufficient_data"
+                continue
+
+            values = [bucket["average"] for bucket in buckets]
 
             # Simple trend calculation
             recent_avg = sum(values[-3:]) / min(3, len(values[-3:]))
             earlier_avg = sum(values[:3]) / min(3, len(values[:3]))
 
             if recent_avg > earlier_avg * 1.05:
-                return "improving"
+                trends[kpi_name] = "improving"
             elif recent_avg < earlier_avg * 0.95:
-                return "declining"
+                trends[kpi_name] = "declining"
             else:
-                return "stable"
+                trends[kpi_name] = "stable"
+
+        return trends
 
     def _get_kpi_status(self, achievement_rate: float) -> str:
         """Get status based on achievement rate"""
@@ -743,40 +660,6 @@ class UnifiedMetricsAggregator:
         else:
             return "critical"
 
-    def _store_kpi_result(
-        self,
-        kpi_name: str,
-        category: KpiCategory,
-        current_value: float,
-        target_value: float,
-        achievement_rate: float,
-        trend: str,
-        period: MetricPeriod,
-    ):
-        """Store KPI result in database"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-
-            cursor.execute(
-"""
-                INSERT INTO kpi_results
-                (timestamp, kpi_name, category, value, target_value, achievement_rate, trend, period)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    datetime.now().isoformat(),
-                    kpi_name,
-                    category.value,
-                    current_value,
-                    target_value,
-                    achievement_rate,
-                    trend,
-                    period.value,
-                ),
-            )
-
-            conn.commit()
-
     def create_system_snapshot(self) -> Dict[str, Any]:
         """Create a comprehensive system snapshot"""
         # Collect all current metrics
@@ -813,33 +696,33 @@ class UnifiedMetricsAggregator:
 
     def _store_system_snapshot(self, snapshot: Dict[str, Any]):
         """Store system snapshot in database"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-
-            aggregated = snapshot.get("metrics", {}).get("aggregated", {})
-            kpi_scores = snapshot.get("kpi_scores", {})
+        aggregated = snapshot.get("metrics", {}).get("aggregated", {})
+        kpi_scores = snapshot.get("kpi_scores", {})
+
+        self.store.record_snapshot(
+            datetime.fromisoformat(snapshot["timestamp"]),
+            {
+                "total_tokens_saved": aggregated.get("total_tokens_saved", 0),
+                "total_cost_savings": aggregated.get("total_cost_savings", 0.0),
+                "overall_effectiveness": kpi_scores.get("overall_achievement_rate", 0.0),
+                "cache_hit_rate": aggregated.get("overall_cache_hit_rate", 0.0),
+                "compression_ratio": aggregated.get("overall_compression_ratio", 0.0),
+                "user_satisfaction": 0.0,  # User satisfaction - would need integration
+                "system_health_score": kpi_scores.get("overall_score", 0.0),
+            },
+            json.dumps(snapshot),
+        )
 
-            cursor.execute(
-"""
-                INSERT INTO system_snapshots
-                (timestamp, total_tokens_saved, total_cost_savings, overall_effectiveness,
-                 cache_hit_rate, compression_ratio, user_satisfaction, system_health_score, metadata)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    snapshot["timestamp"],
-                    aggregated.get("total_tokens_saved", 0),
-                    aggregated.get("total_cost_savings", 0.0),
-                    kpi_scores.get("overall_achievement_rate", 0.0),
-                    aggregated.get("overall_cache_hit_rate", 0.0),
-                    aggregated.get("overall_compression_ratio", 0.0),
-                    0.0,  # User satisfaction - would need integration
-                    kpi_scores.get("overall_score", 0.0),
-                    json.dumps(snapshot),
-                ),
-            )
+    def _get_recent_snapshot(self) -> Dict[str, Any]:
+        """Reuse the latest stored system snapshot while it is fresh, otherwise create one"""
+        latest = self.store.latest_snapshot()
+        if latest is not None:
+            timestamp, metadata = latest
+            age = (datetime.now() - datetime.fromisoformat(timestamp)).total_seconds()
+            if 0 <= age < self.SNAPSHOT_MAX_AGE_SECONDS:
+                return json.loads(metadata)
 
-            conn.commit()
+        return self.create_system_snapshot()
 
     def _generate_recommendations(self, kpi_scores: Dict[str, Any]) -> List[str]:
         """Generate recommendations based on KPI scores"""
@@ -921,15 +804,15 @@ class UnifiedMetricsAggregator:
         return actions
 
     def get_kpi_dashboard_data(self, period: MetricPeriod = MetricPeriod.DAILY) -> Dict[str, Any]:
-        """Get comprehensive KPI dashboard data"""
+        """Get comprehensive KPI dashboard data from the rollups"""
         # Calculate current KPI scores
-        kpi_scores = self.calculate_kpi_scores(period)
+        kpi_scores = self._score_kpis(period)
 
         # Get historical trends
         historical_data = self._get_historical_kpi_data(period)
 
         # Get system snapshot
-        snapshot = self.create_system_snapshot()
+        snapshot = self._get_recent_snapshot()
 
         return {
             "current_scores": kpi_scores,
@@ -951,39 +834,25 @@ class UnifiedMetricsAggregator:
         }
 
     def _get_historical_kpi_data(self, period: MetricPeriod, days: int = 30) -> Dict[str, List[Dict[str, Any]]]:
-        """Get historical KPI data for trend analysis"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-
-            # Calculate time threshold
-            time_threshold = datetime.now() - timedelta(days=days)
-
-            cursor.execute(
-"""
-                SELECT kpi_name, timestamp, value, achievement_rate, trend
-                FROM kpi_results
-                WHERE timestamp >= ? AND period = ?
-                ORDER BY timestamp ASC
-            """,
-                (time_threshold.isoformat(), period.value),
-            )
-
-            rows = cursor.fetchall()
-
-            # Organize by KPI name
-            historical_data = {}
-
-            for row in rows:
-                kpi_name, timestamp, value, achievement_rate, trend = row
+        """Get historical KPI data for trend analysis: each day's closing result"""
+        # Calculate time threshold
+        time_threshold = datetime.now() - timedelta(days=days)
 
-                if kpi_name not in historical_data:
-                    historical_data[kpi_name] = []
+        # Organize by KPI name
+        historical_data = {}
 
-                historical_data[kpi_name].append(
-                    {"timestamp": timestamp, "value": value, "achievement_rate": achievement_rate, "trend": trend}
-                )
+        for kpi_name, buckets in self.store.kpi_series("day", time_threshold, period=period.value).items():
+            historical_data[kpi_name] = [
+                {
+                    "timestamp": bucket["timestamp"],
+                    "value": bucket["last"],
+                    "achievement_rate": bucket["achievement_rate"],
+                    "trend": bucket["trend"],
+                }
+                for bucket in buckets
+            ]
 
-            return historical_data
+        return historical_data
 
     def generate_performance_report(self, period: MetricPeriod = MetricPeriod.DAILY) -> str:
         """Generate comprehensive performance report"""
@@ -1004,6 +873,7 @@ class UnifiedMetricsAggregator:
 - **Active Recommendations**: {dashboard_data['summary']['total_recommendations']}
 
 ## KPI Performance Analysis
+"""
 
         individual_kpis = dashboard_data["current_scores"]["individual_kpis"]
 
@@ -1021,6 +891,7 @@ class UnifiedMetricsAggregator:
 - **Achievement Rate**: {kpi_data['achievement_rate']:.1f}%
 - **Status**: {kpi_data.get('status', 'unknown').title()}
 - **Trend**: {kpi_data.get('trend', 'unknown').title()}
+"""
 
         # Add recommendations
         recommendations = dashboard_data["system_snapshot"]["recommendations"]
@@ -1040,6 +911,7 @@ class UnifiedMetricsAggregator:
 - **Expected Impact**: {action['expected_impact']}
 - **Effort**: {action['effort'].title()}
 - **Timeline**: {action['timeline']}
+"""
 
         return report
 
@@ -1049,30 +921,22 @@ class UnifiedMetricsAggregator:
         return json.dumps(dashboard_data, indent=2, default=str)
 
     def cleanup_old_data(self, days_to_keep: int = 90):
-        """Clean up old metrics data"""
+        """Clean up old metrics data by dropping whole monthly partitions"""
         with self.lock:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-
-                cutoff_date = (datetime.now() - timedelta(days=days_to_keep)).isoformat()
-
-                # Clean up old aggregated metrics
-                cursor.execute("DELETE FROM aggregated_metrics WHERE timestamp < ?", (cutoff_date,))
-                metrics_deleted = cursor.rowcount
-
-                # Clean up old KPI results
-                cursor.execute("DELETE FROM kpi_results WHERE timestamp < ?", (cutoff_date,))
-                kpis_deleted = cursor.rowcount
-
-                # Clean up old system snapshots (keep fewer of these)
-                snapshot_cutoff = (datetime.now() - timedelta(days=30)).isoformat()
-                cursor.execute("DELETE FROM system_snapshots WHERE timestamp < ?", (snapshot_cutoff,))
-                snapshots_deleted = cursor.rowcount
+            now = datetime.now()
+            cutoff = now - timedelta(days=days_to_keep)
 
-                conn.commit()
+            # Clean up old aggregated metrics, KPI results and their rollups
+            metrics = self.store.drop_before("aggregated_metrics", cutoff)
+            kpis = self.store.drop_before("kpi_results", cutoff)
+            buckets = self.store.trim_rollups(cutoff)
 
-                self.logger.info(f"Cleaned up {metrics_deleted} metrics, {kpis_deleted} KPIs, {snapshots_deleted} snapshots")
+            # Clean up old system snapshots (keep fewer of these)
+            snapshots = self.store.drop_before("system_snapshots", now - timedelta(days=30))
 
+            partitions = metrics["partitions"] + kpis["partitions"] + snapshots["partitions"]
+            rows = metrics["rows"] + kpis["rows"] + snapshots["rows"]
+            self.logger.info(f"Cleaned up {partitions} partitions, {rows} rows and {buckets} rollup buckets")
 
 def main():
     """Demonstrate the unified metrics aggregator"""
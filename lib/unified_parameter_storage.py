@@ -1,13 +1,12 @@
 #!/usr/bin/env python3
-#     Unified Parameter Storage System for Autonomous Agent Plugin
 """
+Unified Parameter Storage System for Autonomous Agent Plugin
 
 Centralizes all parameter storage including quality scores, model performance,
 success rates, learning patterns, and dashboard metrics. Provides thread-safe
 access, backward compatibility, and migration capabilities.
 
 Features:
-"""
 - Thread-safe read/write operations with file locking
 - Version-controlled parameter schemas
 - Automatic migration from scattered storage
@@ -18,7 +17,10 @@ Features:
 
 Version: 1.0.0
 Author: Autonomous Agent Development Team
+"""
+
 import json
+import os
 import sys
 import threading
 import time
@@ -29,6 +31,9 @@ from typing import Dict, List, Any, Optional, Union, Callable
 from collections import defaultdict
 import platform
 
+from file_utils import file_signature
+from delta_backup import DeltaBackupStore
+
 # Handle Windows compatibility for file locking
 if platform.system() == "Windows":
     import msvcrt
@@ -56,6 +61,31 @@ else:
         fcntl.flock(f.fileno(), fcntl.LOCK_UN)
 
 
+class _FileSnapshot:
+    """Parsed contents of one storage file, shared by every storage instance in the process."""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.generation = 0  # Bumped by every write and every re-read of a changed file
+        self.signature = None  # (mtime_ns, size, inode) of the file the data was parsed from
+        self.data = None
+        self.backups = None  # DeltaBackupStore shared by instances in "delta" backup mode
+
+
+_snapshots: Dict[str, _FileSnapshot] = {}
+_snapshots_lock = threading.Lock()
+
+
+def _get_snapshot(storage_file: Path) -> _FileSnapshot:
+    """Get the shared snapshot for a storage file."""
+    key = os.path.abspath(storage_file)
+    with _snapshots_lock:
+        snapshot = _snapshots.get(key)
+        if snapshot is None:
+            snapshot = _snapshots[key] = _FileSnapshot()
+        return snapshot
+
+
 class ParameterSchema:
     """Parameter schema definition and validation."""
 
@@ -137,33 +167,40 @@ class ParameterSchema:
 
 
 class UnifiedParameterStorage:
-"""
+    """
     Centralized parameter storage system for the Autonomous Agent Plugin.
-"""
 
     Provides thread-safe access to all parameters with automatic migration
-"""
     from legacy storage systems.
-"""
+    """
 
-"""
-    def __init__(self, storage_dir: str = ".claude-unified"):
-"""
+    def __init__(self, storage_dir: str = ".claude-unified", backup_mode: str = "delta"):
+        """
         Initialize unified parameter storage.
 
         Args:
             storage_dir: Directory for unified parameter storage
-"""
+            backup_mode: "delta" to keep periodic snapshots plus per-write deltas,
+                "full" to copy the whole file before every write
+        """
+        if backup_mode not in ("delta", "full"):
+            raise ValueError(f"Unknown backup mode: {backup_mode}")
+
         self.storage_dir = Path(storage_dir)
         self.storage_file = self.storage_dir / "unified_parameters.json"
         self.backup_dir = self.storage_dir / "backups"
         self.lock_file = self.storage_dir / "storage.lock"
 
-        # Thread safety
-        self._lock = threading.RLock()
-        self._cache = {}
-        self._cache_timestamp = 0
-        self._cache_ttl = 30  # 30 seconds cache TTL
+        # Parsed data is shared with other instances on the same file and
+        # revalidated with a stat instead of a TTL; the lock is shared too
+        self._snapshot = _get_snapshot(self.storage_file)
+        self._lock = self._snapshot.lock
+
+        self.backup_mode = backup_mode
+        with self._lock:
+            if self._snapshot.backups is None:
+                self._snapshot.backups = DeltaBackupStore(self.backup_dir, "unified_parameters")
+            self._delta_backups = self._snapshot.backups
 
         # Migration status
         self._migration_completed = False
@@ -171,7 +208,6 @@ class UnifiedParameterStorage:
         self._ensure_directories()
         self._initialize_storage()
 
-"""
     def _ensure_directories(self):
         """Create necessary directories."""
         self.storage_dir.mkdir(parents=True, exist_ok=True)
@@ -233,31 +269,42 @@ class UnifiedParameterStorage:
             }
             self._write_data(default_data)
 
-    def _read_data():
-"""
+    def _read_data(self, use_cache: bool = True) -> Dict[str, Any]:
+        """
         
         Read unified parameter data with caching support.
 
+        The cached data is reused while the file's (mtime_ns, size, inode) is
+        unchanged, so a stat decides freshness and writes from other processes
+        are seen on the next read. In-process writes update the cache directly.
+
         Args:
             use_cache: Whether to use cached data if available
 
         Returns:
             Dictionary containing unified parameters
-"""
-        current_time = time.time()
+        """
+        snapshot = self._snapshot
 
         # Check cache
-        if use_cache and self._cache and current_time - self._cache_timestamp < self._cache_ttl:
-            return self._cache
+        if use_cache and self._cache_is_current():
+            return snapshot.data
 
         with self._lock:
+            # An in-process write may have finished while waiting for the lock
+            if use_cache and self._cache_is_current():
+                return snapshot.data
+
             try:
                 with open(self.storage_file, "r", encoding="utf-8") as f:
                     lock_file(f, exclusive=False)
                     try:
                         data = json.load(f)
-                        self._cache = data
-                        self._cache_timestamp = current_time
+                        signature = file_signature(os.fstat(f.fileno()))
+                        if signature != snapshot.signature:
+                            snapshot.generation += 1
+                        snapshot.data = data
+                        snapshot.signature = signature
                         return data
                     finally:
                         unlock_file(f)
@@ -274,19 +321,44 @@ class UnifiedParameterStorage:
                 print(f"Error reading unified parameters: {e}", file=sys.stderr)
                 return self._get_default_data()
 
-"""
+    def _cache_is_current(self) -> bool:
+        """Check with a stat whether the cached data matches the storage file."""
+        if self._snapshot.data is None:
+            return False
+        signature = self._stat_signature()
+        return signature is not None and signature == self._snapshot.signature
+
+    def _stat_signature(self) -> Optional[tuple]:
+        """Get the signature of the storage file, or None if it cannot be stat'ed."""
+        return file_signature(self.storage_file)
+
+    def get_generation(self) -> int:
+        """
+        Get the data generation, revalidating the cache first.
+
+        The generation changes whenever the parameters change, whether written
+        in this process or by another one, so callers can key derived data on it.
+
+        Returns:
+            Current data generation
+        """
+        self._read_data()
+        return self._snapshot.generation
+
     def _write_data(self, data: Dict[str, Any], create_backup: bool = True):
-"""
+        """
         Write unified parameter data with backup support.
 
         Args:
             data: Parameter data to write
             create_backup: Whether to create backup before writing
-"""
+        """
         with self._lock:
             try:
                 # Create backup if requested
-                if create_backup and self.storage_file.exists():
+                base_signature = self._stat_signature()
+                create_backup = create_backup and base_signature is not None
+                if create_backup:
                     self._create_backup()
 
                 # Update metadata
@@ -296,22 +368,39 @@ class UnifiedParameterStorage:
                     lock_file(f, exclusive=True)
                     try:
                         json.dump(data, f, indent=2, ensure_ascii=False)
-                        # Update cache
-                        self._cache = data
-                        self._cache_timestamp = time.time()
+                        f.flush()
+                        # Update cache so in-process readers see the write immediately
+                        self._snapshot.generation += 1
+                        self._snapshot.data = data
+                        self._snapshot.signature = file_signature(os.fstat(f.fileno()))
                     finally:
                         unlock_file(f)
 
+                if create_backup and self.backup_mode == "delta":
+                    self._record_delta(data, base_signature)
+
             except Exception as e:
                 print(f"Error writing unified parameters: {e}", file=sys.stderr)
                 raise
 
-"""
     def _create_backup(self):
-        """Create a backup of the current storage file."""
+        """
+        Create a backup of the current storage file.
+
+        In "delta" mode this only takes a full snapshot when the delta chain is
+        full, too old, or no longer matches the file; otherwise the write that
+        follows is recorded as a delta by _record_delta.
+        """
         if not self.storage_file.exists():
             return
 
+        if self.backup_mode == "delta":
+            try:
+                self._delta_backups.prepare(self.storage_file, self._stat_signature())
+            except Exception as e:
+                print(f"Warning: Failed to create backup: {e}", file=sys.stderr)
+            return
+
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_file = self.backup_dir / f"unified_parameters_{timestamp}.json"
 
@@ -322,6 +411,20 @@ class UnifiedParameterStorage:
         except Exception as e:
             print(f"Warning: Failed to create backup: {e}", file=sys.stderr)
 
+    def _record_delta(self, data: Dict[str, Any], base_signature: Optional[tuple]):
+        """
+        Append the change made by a write to the current delta chain.
+
+        Args:
+            data: Parameter data that was written
+            base_signature: Signature of the storage file before the write
+        """
+        try:
+            self._delta_backups.record(data, base_signature, self._snapshot.signature)
+        except Exception as e:
+            self._delta_backups.invalidate()
+            print(f"Warning: Failed to record backup delta: {e}", file=sys.stderr)
+
     def _cleanup_old_backups(self):
         """Keep only the most recent backups."""
         backups = sorted(self.backup_dir.glob("unified_parameters_*.json"))
@@ -332,28 +435,39 @@ class UnifiedParameterStorage:
                 except Exception as e:
                     print(f"Warning: Failed to delete old backup {old_backup}: {e}", file=sys.stderr)
 
-    def _restore_from_backup():
-"""
+    def _restore_from_backup(self, timestamp: Optional[datetime] = None):
+        """
         
-        Restore data from the most recent backup.
+        Restore data from backups, replaying recorded deltas onto the latest snapshot.
+
+        Args:
+            timestamp: Point in time to restore (None for the most recent backed up state)
 
         Returns:
             True if restoration was successful
-"""
-        backups = sorted(self.backup_dir.glob("unified_parameters_*.json"))
-        if not backups:
-            return False
-
-        latest_backup = backups[-1]
+        """
         try:
-            shutil.copy2(latest_backup, self.storage_file)
-            print(f"Restored from backup: {latest_backup}", file=sys.stderr)
+            data = self._delta_backups.rebuild(timestamp)
+            if data is None:
+                return False
+
+            with self._lock:
+                with open(self.storage_file, "w", encoding="utf-8") as f:
+                    lock_file(f, exclusive=True)
+                    try:
+                        json.dump(data, f, indent=2, ensure_ascii=False)
+                    finally:
+                        unlock_file(f)
+                self._snapshot.data = None
+                # The restored file is not the chain head; the next write snapshots it
+                self._delta_backups.invalidate()
+
+            print(f"Restored from backup ({timestamp or 'latest'})", file=sys.stderr)
             return True
         except Exception as e:
             print(f"Failed to restore from backup: {e}", file=sys.stderr)
             return False
 
-"""
     def _get_default_data(self) -> Dict[str, Any]:
         """Get default parameter structure."""
         return {
@@ -374,13 +488,13 @@ class UnifiedParameterStorage:
 
     # Quality parameter methods
     def set_quality_score(self, score: float, metrics: Dict[str, float] = None):
-"""
+        """
         Set current quality score with optional detailed metrics.
 
         Args:
             score: Quality score (0-100)
             metrics: Optional detailed metrics dictionary
-"""
+        """
         if not isinstance(score, (int, float)) or not (0 <= score <= 100):
             raise ValueError("Quality score must be a number between 0 and 100")
 
@@ -406,14 +520,13 @@ class UnifiedParameterStorage:
 
         self._write_data(data)
 
-"""
     def get_quality_score(self) -> float:
         """Get current quality score."""
         data = self._read_data()
         return data["parameters"]["quality"]["scores"]["current"]
 
-    def get_quality_history():
-"""
+    def get_quality_history(self, days: int = 30) -> List[Dict[str, Any]]:
+        """
         
         Get quality score history.
 
@@ -422,7 +535,7 @@ class UnifiedParameterStorage:
 
         Returns:
             List of historical quality records
-"""
+        """
         data = self._read_data()
         all_history = data["parameters"]["quality"]["scores"]["history"]
 
@@ -440,14 +553,13 @@ class UnifiedParameterStorage:
         return filtered_history
 
     # Model parameter methods
-"""
     def set_active_model(self, model: str):
-"""
+        """
         Set the currently active model.
 
         Args:
             model: Model name (e.g., "Claude", "OpenAI", "GLM")
-"""
+        """
         data = self._read_data()
 
         # Track model switch if different from current
@@ -460,21 +572,20 @@ class UnifiedParameterStorage:
 
         self._write_data(data)
 
-"""
     def get_active_model(self) -> str:
         """Get the currently active model."""
         data = self._read_data()
         return data["parameters"]["models"]["active_model"]
 
     def update_model_performance(self, model: str, score: float, task_type: str = "unknown"):
-"""
+        """
         Update performance metrics for a specific model.
 
         Args:
             model: Model name
             score: Performance score (0-100)
             task_type: Type of task performed
-"""
+        """
         if not isinstance(score, (int, float)) or not (0 <= score <= 100):
             raise ValueError("Performance score must be a number between 0 and 100")
 
@@ -509,9 +620,8 @@ class UnifiedParameterStorage:
 
         self._write_data(data)
 
-"""
-    def get_model_performance():
-"""
+    def get_model_performance(self, model: str) -> Dict[str, Any]:
+        """
         
         Get performance data for a specific model.
 
@@ -520,7 +630,7 @@ class UnifiedParameterStorage:
 
         Returns:
             Dictionary with model performance data
-"""
+        """
         data = self._read_data()
 
         if model not in data["parameters"]["models"]["performance"]:
@@ -529,21 +639,19 @@ class UnifiedParameterStorage:
         return data["parameters"]["models"]["performance"][model]
 
     # Dashboard parameter methods
-"""
     def update_dashboard_metrics(self, metrics: Dict[str, Any]):
-"""
+        """
         Update dashboard metrics.
 
         Args:
             metrics: Dictionary of dashboard metrics to update
-"""
+        """
         data = self._read_data()
         data["parameters"]["dashboard"]["metrics"].update(metrics)
         data["parameters"]["dashboard"]["real_time"]["last_activity"] = datetime.now().isoformat()
 
         self._write_data(data)
 
-"""
     def get_dashboard_data(self) -> Dict[str, Any]:
         """Get all dashboard data."""
         data = self._read_data()
@@ -556,18 +664,17 @@ class UnifiedParameterStorage:
 
     # Learning parameter methods
     def update_learning_patterns(self, patterns: Dict[str, Any]):
-"""
+        """
         Update learning patterns data.
 
         Args:
             patterns: Learning patterns data
-"""
+        """
         data = self._read_data()
         data["parameters"]["learning"]["patterns"].update(patterns)
 
         self._write_data(data)
 
-"""
     def get_learning_patterns(self) -> Dict[str, Any]:
         """Get learning patterns data."""
         data = self._read_data()
@@ -575,26 +682,25 @@ class UnifiedParameterStorage:
 
     # Auto-fix parameter methods
     def update_autofix_patterns(self, patterns: Dict[str, Any]):
-"""
+        """
         Update auto-fix patterns data.
 
         Args:
             patterns: Auto-fix patterns data
-"""
+        """
         data = self._read_data()
         data["parameters"]["autofix"]["patterns"].update(patterns)
 
         self._write_data(data)
 
-"""
     def get_autofix_patterns(self) -> Dict[str, Any]:
         """Get auto-fix patterns data."""
         data = self._read_data()
         return data["parameters"]["autofix"]["patterns"]
 
     # Migration methods
-    def migrate_from_legacy_storage():
-"""
+    def migrate_from_legacy_storage(self, force: bool = False) -> Dict[str, Any]:
+        """
         
         Migrate data from legacy storage systems.
 
@@ -603,7 +709,7 @@ class UnifiedParameterStorage:
 
         Returns:
             Migration result dictionary
-"""
+        """
         if self._migration_completed and not force:
             return {"status": "already_completed", "migrated_items": 0}
 
@@ -657,7 +763,6 @@ class UnifiedParameterStorage:
 
         return migration_result
 
-"""
     def _migrate_quality_history(self, source_path: Path, data: Dict[str, Any], result: Dict[str, Any]):
         """Migrate quality history from legacy file."""
         try:
@@ -749,6 +854,7 @@ class UnifiedParameterStorage:
             "migration_count": len(data["metadata"]["migration_history"]),
             "storage_size": self.storage_file.stat().st_size if self.storage_file.exists() else 0,
             "backup_count": len(list(self.backup_dir.glob("*.json"))),
+            "backup_mode": self.backup_mode,
             "parameter_counts": {},
         }
 
@@ -788,8 +894,8 @@ class UnifiedParameterStorage:
 
         return validation_result
 
-    def export_data():
-"""
+    def export_data(self, export_path: str, format: str = "json") -> bool:
+        """
         
         Export unified data to external file.
 
@@ -799,7 +905,7 @@ class UnifiedParameterStorage:
 
         Returns:
             True if export was successful
-"""
+        """
         try:
             data = self._read_data()
             export_file = Path(export_path)
@@ -809,7 +915,6 @@ class UnifiedParameterStorage:
                     json.dump(data, f, indent=2, ensure_ascii=False)
             elif format.lower() == "csv":
                 # Export quality scores as CSV
-"""
                 import csv
 
                 with open(export_file, "w", newline="", encoding="utf-8") as f:
@@ -827,8 +932,8 @@ class UnifiedParameterStorage:
             print(f"Export failed: {e}", file=sys.stderr)
             return False
 
-    def import_data():
-"""
+    def import_data(self, import_path: str, merge_strategy: str = "merge") -> bool:
+        """
         
         Import data from external file.
 
@@ -838,7 +943,7 @@ class UnifiedParameterStorage:
 
         Returns:
             True if import was successful
-"""
+        """
         try:
             import_file = Path(import_path)
             if not import_file.exists():
@@ -871,7 +976,6 @@ class UnifiedParameterStorage:
             print(f"Import failed: {e}", file=sys.stderr)
             return False
 
-"""
     def _deep_merge(self, base: Dict[str, Any], update: Dict[str, Any]):
         """Deep merge two dictionaries."""
         for key, value in update.items():
@@ -883,7 +987,6 @@ class UnifiedParameterStorage:
 
 def main():
     """Command-line interface for unified parameter storage."""
-"""
     import argparse
 
     parser = argparse.ArgumentParser(description="Unified Parameter Storage System")
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Word Map Rewriter for Autonomous Agent Plugin
+
+Compiled whole-word replacement engine for the communication optimizers.
+The optimizers used to rewrite messages by looping over their abbreviation
+maps and running one case-insensitive ``\\b<word>\\b`` substitution per entry,
+which costs one full scan of the message per map entry.
+
+WordMapRewriter compiles a map once into a single lookup table and rewrites a
+message in one ``\\w+`` scan. Because ``\\b`` boundaries always enclose whole
+``\\w+`` runs, the sequential loop is equivalent to replacing each run with the
+result of following its mapping chain (e.g. information -> info -> inf) through
+entries that come later in the map. The output is identical to the loop; maps
+that the single pass cannot reproduce exactly fall back to the loop.
+
+Version: 1.0.0
+Author: Autonomous Agent Plugin
+"""
+import json
+import re
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_WORD_RE = re.compile(r"\w+")
+
+# Non-ASCII characters that re.IGNORECASE treats as equal to ASCII letters but
+# that str.lower() does not map to them
+_CASE_FOLD = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s", "\u212a": "k"})
+
+
+def _fold(word: str) -> str:
+    """Fold a word to the lowercase ASCII form re.IGNORECASE compares against."""
+    if word.isascii():
+        return word.lower()
+    return word.translate(_CASE_FOLD).lower()
+
+
+class WordMapRewriter:
+    """Single-pass whole-word rewriter equivalent to sequential per-word re.sub."""
+
+    def __init__(self, mappings: Dict[str, str]):
+        """
+        Compile a word map.
+
+        Args:
+            mappings: Ordered mapping of full words to replacements, applied as
+                case-insensitive whole-word substitutions in insertion order
+        """
+        self.mappings: List[Tuple[str, str]] = list(mappings.items())
+        self._patterns: Optional[List[Tuple["re.Pattern", str]]] = None
+        self._table = self._compile(self.mappings)
+
+    @property
+    def single_pass(self) -> bool:
+        """Whether the map compiled to a single-pass lookup table."""
+        return self._table is not None
+
+    def rewrite(self, text: str) -> str:
+        """
+        Apply the word map to text.
+
+        Args:
+            text: Text to rewrite
+
+        Returns:
+            Text with every mapped whole word replaced
+        """
+        table = self._table
+        if table is None:
+            return self._rewrite_sequential(text)
+
+        def replace(match: "re.Match") -> str:
+            word = match.group()
+            return table.get(_fold(word), word)
+
+        return _WORD_RE.sub(replace, text)
+
+    def _rewrite_sequential(self, text: str) -> str:
+        """Apply the map one entry at a time with precompiled patterns."""
+        if self._patterns is None:
+            self._patterns = [
+                (re.compile(r"\b" + re.escape(full_word) + r"\b", re.IGNORECASE), replacement)
+                for full_word, replacement in self.mappings
+            ]
+        for pattern, replacement in self._patterns:
+            text = pattern.sub(replacement, text)
+        return text
+
+    @staticmethod
+    def _compile(mappings: List[Tuple[str, str]]) -> Optional[Dict[str, str]]:
+        """
+        Build the folded word -> final replacement table.
+
+        Returns:
+            Lookup table, or None when the map needs the sequential fallback
+        """
+        position: Dict[str, int] = {}
+        multi_word: List[int] = []
+        for index, (full_word, replacement) in enumerate(mappings):
+            # Replacements are re.sub templates; only plain words keep run boundaries intact
+            if not full_word.isascii() or not _WORD_RE.fullmatch(replacement):
+                return None
+            key = full_word.lower()
+            if key in position:
+                return None
+            position[key] = index
+            if not _WORD_RE.fullmatch(full_word):
+                multi_word.append(index)
+
+        # A key spanning several runs (e.g. "on-time") can only match if none of
+        # its runs was already rewritten by an earlier entry and not regenerated since
+        for index in multi_word:
+            if not WordMapRewriter._is_dead(mappings, position, index):
+                return None
+
+        table: Dict[str, str] = {}
+        for key, index in position.items():
+            if index in multi_word:
+                continue
+            final = mappings[index][1]
+            current = index
+            while True:
+                later = position.get(final.lower())
+                if later is None or later <= current:
+                    break
+                final = mappings[later][1]
+                current = later
+            table[key] = final
+        return table
+
+    @staticmethod
+    def _is_dead(mappings: List[Tuple[str, str]], position: Dict[str, int], index: int) -> bool:
+        """Check whether a multi-run key can never match when its turn comes."""
+        for run in _WORD_RE.findall(mappings[index][0].lower()):
+            earlier = position.get(run)
+            if earlier is None or earlier >= index or mappings[earlier][1].lower() == run:
+                continue
+            if not any(mappings[j][1].lower() == run for j in range(earlier + 1, index)):
+                return True
+        return False
+
+
+def _sample_payloads() -> List[str]:
+    """Representative inter-agent messages, serialized as the optimizers see them."""
+    messages = [
+        {
+            "type": "task_assignment",
+            "content": {
+                "task": "comprehensive_security_and_performance_analysis",
+                "description": "Please perform a thorough security vulnerability assessment and performance "
+                "optimization analysis of the provided codebase. The analysis should include SQL injection "
+                "vulnerabilities, cross-site scripting issues, authentication and authorization problems, "
+                "input validation weaknesses, and potential data exposure risks.",
+                "file_path": "/application/src/main/controller/user_management.py",
+                "context": {
+                    "project_framework": "django",
+                    "database_system": "postgresql",
+                    "deployment_environment": "production",
+                    "compliance_standards": ["OWASP", "SOC2", "GDPR"],
+                },
+            },
+            "metadata": {"timestamp": "2024-11-05T15:30:00Z", "request_id": "REQ-SEC-2024-001"},
+        },
+        {
+            "type": "status_update",
+            "content": {
+                "status": "in_progress",
+                "progress": 65,
+                "current_phase": "security_scanning",
+                "message": "Completed the initial configuration review. Continuing with the dependency analysis "
+                "and performance testing of the database query implementation.",
+            },
+        },
+        {
+            "type": "data_transfer",
+            "content": {
+                "analysis_results": {"vulnerabilities_found": 3, "performance_issues": 5},
+                "recommendations": [
+                    "Implement parameterized queries for every database operation",
+                    "Add input validation to the authentication endpoint",
+                    "Introduce caching for frequently requested configuration values",
+                ],
+            },
+        },
+        {
+            "type": "result_report",
+            "content": {
+                "summary": "The optimization improved the average response time by 35 percent. Memory usage "
+                "remains stable and the test coverage requirement is satisfied.",
+                "quality_score": 92,
+                "next_steps": ["documentation update", "deployment verification", "monitoring configuration"],
+            },
+        },
+    ]
+    return [json.dumps(message) for message in messages]
+
+
+def _legacy_rewrite(mappings: Dict[str, str], text: str) -> str:
+    """The original per-entry substitution loop, kept as the benchmark baseline."""
+    for full_word, abbreviation in mappings.items():
+        pattern = r"\b" + re.escape(full_word) + r"\b"
+        text = re.sub(pattern, abbreviation, text, flags=re.IGNORECASE)
+    return text
+
+
+def run_benchmark(
+    mappings: Optional[Dict[str, str]] = None, payloads: Optional[Iterable[str]] = None, duration: float = 2.0
+) -> Dict[str, float]:
+    """
+    Measure messages/sec of the legacy loop and the compiled rewriter.
+
+    Args:
+        mappings: Word map to benchmark (default: the enhanced optimizer's map)
+        payloads: Serialized messages to rewrite (default: sample agent messages)
+        duration: Approximate seconds spent timing each implementation
+
+    Returns:
+        Throughput of both implementations and the speedup
+    """
+    if mappings is None:
+        from enhanced_agent_communication_optimizer import EnhancedAgentCommunicationOptimizer
+
+        mappings = EnhancedAgentCommunicationOptimizer().word_mappings
+    payloads = list(payloads) if payloads is not None else _sample_payloads()
+    rewriter = WordMapRewriter(mappings)
+
+    for payload in payloads:
+        if rewriter.rewrite(payload) != _legacy_rewrite(mappings, payload):
+            raise AssertionError("compiled rewriter output differs from the legacy loop")
+
+    def throughput(rewrite) -> float:
+        processed = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < duration:
+            for payload in payloads:
+                rewrite(payload)
+            processed += len(payloads)
+        return processed / (time.perf_counter() - start)
+
+    legacy = throughput(lambda payload: _legacy_rewrite(mappings, payload))
+    compiled = throughput(rewriter.rewrite)
+    return {
+        "map_entries": len(mappings),
+        "single_pass": rewriter.single_pass,
+        "legacy_msgs_per_sec": round(legacy, 1),
+        "compiled_msgs_per_sec": round(compiled, 1),
+        "speedup": round(compiled / legacy, 1),
+    }
+
+
+if __name__ == "__main__":
+    print("=== Word Map Rewriter Benchmark ===")
+    results = run_benchmark()
+    print(f"Map entries: {results['map_entries']} (single pass: {results['single_pass']})")
+    print(f"Legacy loop:    {results['legacy_msgs_per_sec']:>10,.1f} messages/sec")
+    print(f"Compiled pass:  {results['compiled_msgs_per_sec']:>10,.1f} messages/sec")
+    print(f"Speedup:        {results['speedup']:.1f}x")
@@ -290,6 +290,57 @@ class TestUnifiedParameterStorage(unittest.TestCase):
         restored_score = self.storage.get_quality_score()
         self.assertEqual(restored_score, 92.0)
 
+    def test_point_in_time_restore(self):
+        """Test that delta backups rebuild earlier states without a copy per write."""
+        self.storage.set_quality_score(70.0)
+        time.sleep(0.01)
+        checkpoint = datetime.now()
+        time.sleep(0.01)
+        self.storage.set_quality_score(75.0)
+        self.storage.set_quality_score(80.0)
+
+        self.assertEqual(len(list(self.storage.backup_dir.glob("*.json"))), 1)
+        self.assertEqual(len(list(self.storage.backup_dir.glob("*.deltas.jsonl"))), 1)
+
+        self.assertTrue(self.storage._restore_from_backup(checkpoint))
+        self.assertEqual(self.storage.get_quality_score(), 70.0)
+
+        # Full copies per write are still available as an explicit mode
+        full = UnifiedParameterStorage(self.test_dir, backup_mode="full")
+        self.assertEqual(full.get_storage_stats()["backup_mode"], "full")
+        with self.assertRaises(ValueError):
+            UnifiedParameterStorage(self.test_dir, backup_mode="none")
+
+    def test_cache_revalidated_by_file_signature(self):
+        """Test that external writes are seen on the next read without a TTL."""
+        self.storage.set_quality_score(80.0)
+        self.assertEqual(self.storage.get_quality_score(), 80.0)
+
+        # Rewrite the file behind the storage's back, as another process would
+        with open(self.storage.storage_file, 'r') as f:
+            data = json.load(f)
+        data["parameters"]["quality"]["scores"]["current"] = 55.5
+        with open(self.storage.storage_file, 'w') as f:
+            json.dump(data, f)
+
+        self.assertEqual(self.storage.get_quality_score(), 55.5)
+
+        # Unchanged file is served from the cache
+        data1 = self.storage._read_data(use_cache=True)
+        data2 = self.storage._read_data(use_cache=True)
+        self.assertIs(data1, data2)
+
+    def test_generation_shared_across_instances(self):
+        """Test that in-process writes are visible to other instances immediately."""
+        other = UnifiedParameterStorage(self.test_dir)
+        generation = other.get_generation()
+
+        self.storage.set_quality_score(91.0)
+
+        self.assertEqual(other.get_quality_score(), 91.0)
+        self.assertEqual(other.get_generation(), generation + 1)
+        self.assertEqual(self.storage.get_generation(), other.get_generation())
+
 
 class TestThreadSafety(unittest.TestCase):
     """Test thread safety of unified parameter storage."""
@@ -431,6 +482,9 @@ class TestMigrationSystem(unittest.TestCase):
             self.skipTest("Unified parameter storage not available")
 
         self.test_dir = tempfile.mkdtemp(prefix="migration_test_")
+        # Legacy sources, backups and archives are resolved against the working directory
+        self.original_cwd = os.getcwd()
+        os.chdir(self.test_dir)
         self.unified_storage = UnifiedParameterStorage(self.test_dir)
         self.migration_manager = MigrationManager(self.unified_storage)
 
@@ -439,6 +493,8 @@ class TestMigrationSystem(unittest.TestCase):
 
     def tearDown(self):
         """Clean up test environment."""
+        if hasattr(self, 'original_cwd'):
+            os.chdir(self.original_cwd)
         if hasattr(self, 'test_dir') and os.path.exists(self.test_dir):
             shutil.rmtree(self.test_dir)
 
@@ -607,10 +663,15 @@ class TestCompatibilityLayer(unittest.TestCase):
             self.skipTest("Unified parameter storage not available")
 
         self.test_dir = tempfile.mkdtemp(prefix="compatibility_test_")
+        # The compatibility wrappers open the default .claude-unified directory
+        self.original_cwd = os.getcwd()
+        os.chdir(self.test_dir)
         self.unified_storage = UnifiedParameterStorage(self.test_dir)
 
     def tearDown(self):
         """Clean up test environment."""
+        if hasattr(self, 'original_cwd'):
+            os.chdir(self.original_cwd)
         if hasattr(self, 'test_dir') and os.path.exists(self.test_dir):
             shutil.rmtree(self.test_dir)
 
@@ -0,0 +1,125 @@
+"""
+Unit tests for Activity Feed Pagination
+
+Tests newest-first cursor pagination over time-ordered sources:
+- Cursor encoding and validation
+- Pages that neither overlap nor skip records, including timestamp ties
+- K-way merging of several sources and filtering while merging
+"""
+
+import pytest
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Add lib directory to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
+
+from activity_feed import decode_cursor, encode_cursor, newest_first, paginate
+
+BASE = datetime(2025, 1, 1, 12, 0, 0)
+
+
+def _source(name, minutes):
+    """Build a time-ordered source with one item per minute offset (duplicates allowed)"""
+    items = [{"source": name, "seq": seq, "time": BASE + timedelta(minutes=m)} for seq, m in enumerate(sorted(minutes))]
+    return [item["time"] for item in items], items
+
+
+def _streams(sources, after=None, since=None):
+    """Newest-first streams of several sources"""
+    return [
+        newest_first(name, times, items, lambda item: item["seq"], after, since)
+        for name, (times, items) in sources.items()
+    ]
+
+
+def _walk(sources, limit, predicate=None):
+    """Collect every page of a feed"""
+    collected, cursor = [], None
+    while True:
+        after = decode_cursor(cursor) if cursor else None
+        page, cursor = paginate(_streams(sources, after), limit, predicate)
+        collected.extend(page)
+        if cursor is None:
+            return collected
+
+
+@pytest.mark.unit
+class TestCursors:
+    """Test cursor encoding"""
+
+    def test_round_trip(self):
+        """A cursor decodes to the key it was made from"""
+        key = (BASE, "git_history", 42)
+        cursor = encode_cursor(key)
+        assert "/" not in cursor and "=" not in cursor
+        assert decode_cursor(cursor) == key
+
+    def test_invalid_cursor(self):
+        """Malformed cursors raise ValueError"""
+        for cursor in ("not-a-cursor", encode_cursor((BASE, "x", 1))[:-3], ""):
+            with pytest.raises(ValueError):
+                decode_cursor(cursor)
+
+
+@pytest.mark.unit
+class TestPagination:
+    """Test newest-first pages over merged sources"""
+
+    def test_single_source_pages(self):
+        """Pages cover the source newest first without overlap"""
+        sources = {"a": _source("a", range(10))}
+        page, cursor = paginate(_streams(sources), 4)
+        assert [item["seq"] for item in page] == [9, 8, 7, 6]
+        assert cursor is not None
+        assert [item["seq"] for item in _walk(sources, 4)] == list(range(9, -1, -1))
+
+    def test_last_page_has_no_cursor(self):
+        """A page that reaches the end of the feed has no next cursor"""
+        page, cursor = paginate(_streams({"a": _source("a", range(3))}), 3)
+        assert len(page) == 3 and cursor is None
+
+    def test_merges_sources_with_ties(self):
+        """Items sharing timestamps across and within sources are neither repeated nor lost"""
+        sources = {
+            "assessments": _source("assessments", [0, 1, 1, 1, 5, 5, 9]),
+            "git": _source("git", [1, 1, 5, 7, 9, 9]),
+        }
+        for limit in (1, 2, 3, 5):
+            walked = _walk(sources, limit)
+            assert len(walked) == 13
+            assert len({(item["source"], item["seq"]) for item in walked}) == 13
+            times = [item["time"] for item in walked]
+            assert times == sorted(times, reverse=True)
+
+    def test_filter_while_merging(self):
+        """The predicate is applied before cutting the page"""
+        sources = {"a": _source("a", range(0, 20, 2)), "b": _source("b", range(1, 20, 2))}
+        walked = _walk(sources, 3, predicate=lambda item: item["source"] == "b")
+        assert [item["seq"] for item in walked] == list(range(9, -1, -1))
+
+    def test_since_stops_iteration(self):
+        """Items older than since are not returned"""
+        times, items = _source("a", range(10))
+        stream = newest_first("a", times, items, lambda item: item["seq"], since=BASE + timedelta(minutes=7))
+        assert [item["seq"] for _, item in stream] == [9, 8, 7]
+
+    def test_first_page_reads_only_what_it_needs(self):
+        """The merge is lazy: a page consumes about page_size items from the sources"""
+        consumed = []
+
+        def counted(stream):
+            for pair in stream:
+                consumed.append(pair)
+                yield pair
+
+        sources = {name: _source(name, range(10000)) for name in ("a", "b", "c")}
+        page, _ = paginate([counted(stream) for stream in _streams(sources)], 20)
+        assert len(page) == 20
+        assert len(consumed) <= 21 + len(sources)
+
+    def test_rejects_non_positive_limit(self):
+        """Page sizes must be positive"""
+        with pytest.raises(ValueError):
+            paginate([], 0)
@@ -0,0 +1,163 @@
+"""
+Unit tests for Batch Optimization
+
+Tests the helpers behind the communication optimizers' batch APIs:
+- Deduplication of identical payloads within a batch
+- Sharding decisions and ordered results from the process pool
+- optimize_batch of each optimizer matching per-message optimize_message
+"""
+
+import pytest
+import os
+import json
+import sys
+
+# Add lib directory to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
+
+from batch_optimization import ShardedOptimizerPool, dedupe_indices
+
+
+class TestDedupeIndices:
+    """Test suite for dedupe_indices"""
+
+    @pytest.mark.unit
+    def test_first_occurrences_and_slots(self):
+        """Each distinct key is kept once and every item points at its key"""
+        unique, slots = dedupe_indices(["a", "b", "a", "c", "b", "a"])
+        assert unique == [0, 1, 3]
+        assert slots == [0, 1, 0, 2, 1, 0]
+
+    @pytest.mark.unit
+    def test_empty_batch(self):
+        """An empty batch has no distinct keys"""
+        assert dedupe_indices([]) == ([], [])
+
+
+class TestShardedOptimizerPool:
+    """Test suite for ShardedOptimizerPool class"""
+
+    @pytest.mark.unit
+    def test_should_shard(self):
+        """Only large batches with more than one worker go to the pool"""
+        pool = ShardedOptimizerPool(json.JSONEncoder, min_shard_batch=10)
+        assert not pool.should_shard(100, None)
+        assert not pool.should_shard(100, 1)
+        assert not pool.should_shard(9, 4)
+        assert pool.should_shard(10, 2)
+
+    @pytest.mark.unit
+    def test_map_preserves_order_across_workers(self):
+        """Workers build the object once and results come back in call order"""
+        pool = ShardedOptimizerPool(json.JSONEncoder, {"sort_keys": True}, min_shard_batch=1)
+        calls = [({"index": i, "b": 1, "a": 2},) for i in range(50)]
+        try:
+            results = pool.map("encode", calls, max_workers=2)
+            assert results == [json.dumps(args[0], sort_keys=True) for args in calls]
+            assert pool.map("encode", [], max_workers=2) == []
+        finally:
+            pool.close()
+        pool.close()
+
+
+@pytest.mark.unit
+def test_enhanced_optimizer_batch_matches_single_messages(temp_directory):
+    """Sharded batches give the results of optimizing one message at a time"""
+    from enhanced_agent_communication_optimizer import EnhancedAgentCommunicationOptimizer, OptimizationLevel
+    from word_map_rewriter import _sample_payloads
+
+    templates = [json.loads(payload) for payload in _sample_payloads()]
+    distinct = [dict(templates[i % len(templates)], batch_index=i) for i in range(150)]
+    batch = distinct + distinct[:50]
+
+    def comparable(result):
+        return {key: value for key, value in vars(result).items() if key != "processing_time_ms"}
+
+    single = EnhancedAgentCommunicationOptimizer(os.path.join(temp_directory, "single"))
+    expected = [comparable(single.optimize_message(message)) for message in batch]
+
+    batched = EnhancedAgentCommunicationOptimizer(os.path.join(temp_directory, "batched"))
+    try:
+        results = batched.optimize_batch(batch, OptimizationLevel.STANDARD, max_workers=2)
+    finally:
+        batched.close()
+    assert [comparable(result) for result in results] == expected
+    assert batched.get_statistics()["cache_hits"] == single.get_statistics()["cache_hits"] == 50
+
+
+def _batch_messages():
+    """Sender/receiver/message tuples across agent groups, with repeated payloads"""
+    from word_map_rewriter import _sample_payloads
+
+    templates = [json.loads(payload) for payload in _sample_payloads()]
+    agents = ["code-analyzer", "quality-controller", "test-engineer", "orchestrator"]
+    distinct = [
+        (agents[i % len(agents)], agents[(i + 1) % len(agents)], dict(templates[i % len(templates)], batch_index=i))
+        for i in range(40)
+    ]
+    return distinct + distinct[:10]
+
+
+@pytest.mark.unit
+def test_agent_optimizer_batch_matches_single_messages(temp_directory):
+    """AgentCommunicationOptimizer.optimize_batch gives the per-message results"""
+    from agent_communication_optimizer import AgentCommunicationOptimizer
+
+    def comparable(result):
+        return {key: value for key, value in vars(result).items() if key != "created_at"}
+
+    batch = _batch_messages()
+    single = AgentCommunicationOptimizer(os.path.join(temp_directory, "single"))
+    expected = [comparable(single.optimize_message(*message)) for message in batch]
+
+    batched = AgentCommunicationOptimizer(os.path.join(temp_directory, "batched"))
+    assert [comparable(result) for result in batched.optimize_batch(batch)] == expected
+    assert batched.stats == single.stats
+
+
+@pytest.mark.unit
+def test_effective_optimizer_batch_matches_single_messages(temp_directory):
+    """EffectiveAgentCommunicationOptimizer.optimize_batch gives the per-message results"""
+    from effective_agent_communication_optimizer import EffectiveAgentCommunicationOptimizer, OptimizationLevel
+
+    def comparable(result):
+        return {key: value for key, value in vars(result).items() if key != "processing_time_ms"}
+
+    batch = [message for _, _, message in _batch_messages()]
+    single = EffectiveAgentCommunicationOptimizer(os.path.join(temp_directory, "single"))
+    expected = [comparable(single.optimize_message(message, OptimizationLevel.AGGRESSIVE)) for message in batch]
+
+    batched = EffectiveAgentCommunicationOptimizer(os.path.join(temp_directory, "batched"))
+    try:
+        results = batched.optimize_batch(batch, OptimizationLevel.AGGRESSIVE)
+    finally:
+        batched.close()
+    assert [comparable(result) for result in results] == expected
+    assert batched.get_statistics()["total_tokens_saved"] == single.get_statistics()["total_tokens_saved"]
+
+
+@pytest.mark.unit
+def test_production_optimizer_batch_matches_single_messages(temp_directory):
+    """ProductionAgentCommunicationOptimizer.optimize_batch gives the per-message results"""
+    from production_agent_communication_optimizer import ProductionAgentCommunicationOptimizer
+
+    def comparable(result):
+        metrics = {
+            key: value
+            for key, value in vars(result.metrics).items()
+            if key not in ("processing_time_ms", "timestamp")
+        }
+        fields = {key: value for key, value in vars(result).items() if key not in ("message_id", "metrics")}
+        return fields, metrics, result.message_id.rsplit("_", 1)[1]
+
+    batch = _batch_messages()
+    single = ProductionAgentCommunicationOptimizer(os.path.join(temp_directory, "single"))
+    expected = [comparable(single.optimize_message(*message)) for message in batch]
+
+    batched = ProductionAgentCommunicationOptimizer(os.path.join(temp_directory, "batched"))
+    try:
+        results = batched.optimize_batch(batch)
+    finally:
+        batched.close()
+    assert [comparable(result) for result in results] == expected
+    assert batched.stats["total_tokens_saved"] == single.stats["total_tokens_saved"]
@@ -0,0 +1,214 @@
+"""
+Unit tests for the Budget Arena
+
+Tests the shared token accounting behind DynamicBudgetManager:
+- Per-component charges and borrowing from donor components
+- Lease reserve/commit/release and expiry
+- Exact totals under concurrent threads
+- Coalescing of rebalancing triggers
+"""
+
+import pytest
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add lib directory to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
+
+from budget_arena import BudgetArena, CoalescingWorker, get_budget_arena
+
+
+@pytest.fixture
+def arena(temp_directory):
+    """Arena in a temporary directory"""
+    arena = BudgetArena(str(Path(temp_directory) / "budget_arena.db"))
+    yield arena
+    arena.close()
+
+
+@pytest.mark.unit
+class TestCharges:
+    """Test use() accounting"""
+
+    def test_use_within_allocation(self, arena):
+        """Charges succeed until the allocation is spent"""
+        assert arena.register("loader", 100) == (100, 0, 0)
+        assert arena.use("loader", 60)
+        assert not arena.use("loader", 50)
+        assert arena.counters("loader") == (100, 60, 0)
+
+    def test_register_keeps_existing_counters(self, arena):
+        """A second registration (e.g. another process) does not reset the component"""
+        arena.register("loader", 100)
+        arena.use("loader", 30)
+        assert arena.register("loader", 500) == (100, 30, 0)
+
+    def test_borrow_from_donors(self, arena):
+        """A short component takes unused allocation from donors"""
+        arena.register("critical", 100)
+        arena.register("low", 100)
+        arena.use("low", 40)
+
+        assert arena.use("critical", 150, donors=["low"])
+        assert arena.counters("critical") == (150, 150, 0)
+        assert arena.counters("low") == (50, 40, 0)
+
+        # Donors without enough spare leave everything untouched
+        assert not arena.use("critical", 50, donors=["low"])
+        assert arena.counters("low") == (50, 40, 0)
+
+    def test_unknown_component(self, arena):
+        """Unknown components are rejected"""
+        assert not arena.use("missing", 1)
+        with pytest.raises(KeyError):
+            arena.counters("missing")
+
+    def test_allocations_never_below_usage(self, arena):
+        """Allocations are clamped to the used and reserved tokens"""
+        arena.register("loader", 100)
+        arena.use("loader", 60)
+        arena.acquire("loader", 20)
+        arena.set_allocations({"loader": 10})
+        assert arena.counters("loader") == (80, 60, 20)
+
+    def test_scale_allocations(self, arena):
+        """Allocations are scaled to the total without dropping below usage"""
+        arena.register("loader", 300)
+        arena.register("cache", 100)
+        arena.use("cache", 90)
+        assert arena.scale_allocations(200) == {"loader": (150, 0, 0), "cache": (90, 90, 0)}
+        assert arena.scale_allocations(240) == {"loader": (150, 0, 0), "cache": (90, 90, 0)}
+
+
+@pytest.mark.unit
+class TestLeases:
+    """Test acquire/commit/release semantics"""
+
+    def test_commit_returns_unused(self, arena):
+        """Committing less than leased returns the rest"""
+        arena.register("loader", 100)
+        lease = arena.acquire("loader", 80)
+        assert arena.counters("loader") == (100, 0, 80)
+        assert arena.acquire("loader", 30) is None
+
+        assert arena.commit(lease, 50) == 50
+        assert arena.counters("loader") == (100, 50, 0)
+
+    def test_release(self, arena):
+        """Released leases give their tokens back once"""
+        arena.register("loader", 100)
+        lease = arena.acquire("loader", 80)
+        assert arena.release(lease)
+        assert not arena.release(lease)
+        assert arena.counters("loader") == (100, 0, 0)
+
+    def test_expired_leases_are_reclaimed(self, arena):
+        """Tokens of an expired lease become available again"""
+        arena.register("loader", 100)
+        lease = arena.acquire("loader", 100, ttl=0.01)
+        time.sleep(0.05)
+
+        assert arena.acquire("loader", 60) is not None
+        assert arena.counters("loader") == (100, 0, 60)
+
+        # A late commit still records the usage but frees nothing twice
+        assert arena.commit(lease, 10) == 10
+        assert arena.counters("loader") == (100, 10, 60)
+
+
+@pytest.mark.unit
+class TestConcurrency:
+    """Test totals under concurrent access"""
+
+    def test_threads_never_overdraw(self, arena):
+        """Concurrent charges grant exactly the allocation"""
+        arena.register("shared", 200)
+        granted = []
+
+        def charge():
+            granted.append(sum(1 for _ in range(100) if arena.use("shared", 1)))
+            arena.close()
+
+        threads = [threading.Thread(target=charge) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sum(granted) == 200
+        assert arena.counters("shared") == (200, 200, 0)
+
+    def test_charges_wait_for_rebalance(self, arena):
+        """Charges made while a rebalancing plans wait for it and are never overwritten"""
+        arena.register("loader", 100)
+        arena.use("loader", 80)
+        granted = []
+
+        def charge():
+            granted.append(arena.use("loader", 10))
+            arena.close()
+
+        thread = threading.Thread(target=charge)
+
+        def plan(counters):
+            assert counters["loader"] == (100, 80, 0)
+            thread.start()
+            time.sleep(0.1)
+            return {"loader": 50}
+
+        assert arena.rebalance(plan) == {"loader": (80, 80, 0)}
+        thread.join()
+        assert granted == [False]
+        assert arena.counters("loader") == (80, 80, 0)
+
+    def test_shared_instance_per_path(self, temp_directory):
+        """get_budget_arena returns one arena per database file"""
+        path = str(Path(temp_directory) / "shared.db")
+        assert get_budget_arena(path) is get_budget_arena(path)
+
+
+@pytest.mark.unit
+class TestCoalescingWorker:
+    """Test trigger coalescing"""
+
+    def test_pending_triggers_merge(self):
+        """Triggers arriving during a run are merged into one follow-up run"""
+        started = threading.Event()
+        proceed = threading.Event()
+        reasons = []
+
+        def job(reason):
+            reasons.append(reason)
+            started.set()
+            proceed.wait(5)
+
+        worker = CoalescingWorker(job)
+        worker.trigger("first")
+        assert started.wait(5)
+        for reason in ("a", "b", "a"):
+            worker.trigger(reason)
+        proceed.set()
+
+        assert worker.wait_idle(5)
+        assert reasons == ["first", "a,b"]
+        assert worker.triggers == 4
+        assert worker.runs == 2
+
+    def test_job_errors_do_not_stop_worker(self):
+        """A failing run does not kill the worker thread"""
+        calls = []
+
+        def job(reason):
+            calls.append(reason)
+            if reason == "bad":
+                raise RuntimeError("boom")
+
+        worker = CoalescingWorker(job)
+        worker.trigger("bad")
+        assert worker.wait_idle(5)
+        worker.trigger("good")
+        assert worker.wait_idle(5)
+        assert calls == ["bad", "good"]
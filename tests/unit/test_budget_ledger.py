@@ -0,0 +1,321 @@
+"""
+Unit tests for the Budget Ledger
+
+Tests the in-memory ledger behind TokenBudgetManager.allocate_tokens:
+- Atomic reserve/commit/release accounting
+- Batched persistence of journaled changes
+- Exact totals after a crash (journal replay)
+- Writers sharing a journal directory keep to their own segments
+- Allocation status persisted with each flush
+"""
+
+import pytest
+import os
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+# Add lib directory to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
+
+import budget_ledger
+from budget_ledger import BudgetLedger
+
+
+class _Store:
+    """persist function recording the batches it was given"""
+
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    def __call__(self, entries):
+        if self.fail:
+            raise sqlite3.OperationalError("database is locked")
+        self.batches.append(list(entries))
+
+    @property
+    def entries(self):
+        return [entry for batch in self.batches for entry in batch]
+
+
+@pytest.fixture
+def journal_path(temp_directory):
+    """Journal path in a temporary directory"""
+    return Path(temp_directory) / "token_budgets.ledger.jsonl"
+
+
+@pytest.mark.unit
+class TestAccounting:
+    """Test reserve/commit/release semantics"""
+
+    def test_reserve_commit_release(self, journal_path):
+        """Reservations hold tokens; commits use them; releases give them back"""
+        ledger = BudgetLedger(journal_path, _Store(), flush_interval=60)
+        ledger.open_account("global", 1000)
+
+        first = ledger.reserve("global", 600)
+        assert ledger.balance("global") == {"allocated": 1000, "used": 0, "reserved": 600, "available": 400}
+        assert ledger.reserve("global", 500) is None
+
+        # Committing less than reserved returns the rest
+        assert ledger.commit(first, 250, task_type="analysis") == 250
+        assert ledger.balance("global")["available"] == 750
+
+        second = ledger.reserve("global", 100)
+        assert ledger.release(second) == 100
+        assert ledger.release(second) == 0
+        assert ledger.balance("global") == {"allocated": 1000, "used": 250, "reserved": 0, "available": 750}
+
+        assert ledger.allocate("global", 700) == 950
+        assert ledger.allocate("global", 100) is None
+        with pytest.raises(KeyError):
+            ledger.commit(first)
+        ledger.close()
+
+    def test_concurrent_allocations_never_overdraw(self, journal_path):
+        """Totals stay exact when threads race for the last tokens"""
+        ledger = BudgetLedger(journal_path, _Store(), flush_interval=60)
+        ledger.open_account("global", 5000)
+        granted = []
+
+        def allocate():
+            for _ in range(200):
+                if ledger.allocate("global", 10) is not None:
+                    granted.append(10)
+
+        threads = [threading.Thread(target=allocate) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sum(granted) == 5000
+        assert ledger.balance("global")["used"] == 5000
+        ledger.close()
+
+    def test_rejects_bad_arguments(self, journal_path):
+        """Flush interval must be positive and reservations non-negative"""
+        with pytest.raises(ValueError):
+            BudgetLedger(journal_path, _Store(), flush_interval=0)
+        ledger = BudgetLedger(journal_path, _Store())
+        ledger.open_account("global", 100)
+        with pytest.raises(ValueError):
+            ledger.reserve("global", -1)
+
+
+@pytest.mark.unit
+class TestPersistence:
+    """Test the journal, batched flushes and recovery"""
+
+    def test_flush_persists_one_batch(self, journal_path):
+        """Changes reach persist in order, in one batch, with their details"""
+        store = _Store()
+        ledger = BudgetLedger(journal_path, store, flush_interval=60)
+        ledger.open_account("global", 1000)
+        for _ in range(5):
+            ledger.allocate("global", 10, agent_name="planner")
+        ledger.reset("global")
+        assert store.batches == [] and ledger.pending_entries == 6
+
+        assert ledger.flush() == 6
+        assert len(store.batches) == 1
+        assert [entry["seq"] for entry in store.entries] == [1, 2, 3, 4, 5, 6]
+        assert [entry["used"] for entry in store.entries] == [10, 20, 30, 40, 50, 0]
+        assert store.entries[0]["agent_name"] == "planner" and store.entries[-1]["op"] == "reset"
+        # Persisted segments are removed, and the writer's lock file on close
+        assert ledger.pending_entries == 0
+        assert list(journal_path.parent.glob("token_budgets.ledger*")) == [ledger._owner_path]
+        ledger.close()
+        assert list(journal_path.parent.glob("token_budgets.ledger*")) == []
+
+    def test_failed_flush_is_retried(self, journal_path, capsys):
+        """A failing persist keeps the changes for the next flush"""
+        store = _Store(fail=True)
+        ledger = BudgetLedger(journal_path, store, flush_interval=60)
+        ledger.open_account("global", 1000)
+        ledger.allocate("global", 10)
+
+        assert ledger.flush() == 0
+        assert "database is locked" in capsys.readouterr().err
+        ledger.allocate("global", 20)
+
+        store.fail = False
+        assert ledger.flush() == 2
+        assert [entry["used"] for entry in store.entries] == [10, 30]
+        ledger.close()
+
+    def test_recover_after_crash(self, journal_path):
+        """Unflushed changes are replayed from the journal, exactly once"""
+        store = _Store()
+        crashed = BudgetLedger(journal_path, store, flush_interval=60)
+        crashed.open_account("global", 1000)
+        crashed.allocate("global", 100)
+        crashed.flush()
+        crashed.allocate("global", 50)
+        crashed.allocate("global", 25)
+        # Simulate a crash: no flush or close, and a torn final write
+        with open(crashed.active_path, "a", encoding="utf-8") as f:
+            f.write('{"op": "use", "account_id": "glo')
+
+        # The crashed writer still holds its lock: its segments are left alone
+        live = BudgetLedger(journal_path, store, flush_interval=60)
+        live.open_account("global", 1000, used=100)
+        assert live.recover({crashed.writer_id: 1}) == 0
+        live.close()
+        _crash(crashed)
+
+        # The database has the first change: used 100, last sequence number 1 of that writer
+        recovered = BudgetLedger(journal_path, store, flush_interval=60)
+        recovered.open_account("global", 1000, used=100)
+        assert recovered.recover({crashed.writer_id: 1}) == 2
+        assert recovered.balance("global")["used"] == 175
+
+        recovered.flush()
+        assert [(entry["writer"], entry["seq"]) for entry in store.batches[-1]] == [
+            (crashed.writer_id, 2), (crashed.writer_id, 3)
+        ]
+        # New changes are numbered by the new writer
+        recovered.allocate("global", 5)
+        recovered.flush()
+        assert store.entries[-1]["writer"] == recovered.writer_id
+        assert store.entries[-1]["seq"] == 1 and store.entries[-1]["tokens"] == 5
+
+        restarted = BudgetLedger(journal_path, store, flush_interval=60)
+        restarted.open_account("global", 1000, used=180)
+        assert restarted.recover({crashed.writer_id: 3, recovered.writer_id: 1}) == 0
+        assert restarted.balance("global")["used"] == 180
+        recovered.close()
+        restarted.close()
+        assert list(journal_path.parent.glob("token_budgets.ledger*")) == []
+
+    def test_concurrent_writers_keep_their_segments(self, journal_path):
+        """Writers sharing a journal name never seal or persist each other's changes"""
+        first_store, second_store = _Store(), _Store()
+        first = BudgetLedger(journal_path, first_store, flush_interval=60)
+        second = BudgetLedger(journal_path, second_store, flush_interval=60)
+        for ledger in (first, second):
+            ledger.open_account("global", 1000)
+        first.allocate("global", 10)
+        second.allocate("global", 20)
+        first.allocate("global", 30)
+
+        assert first.flush() == 2
+        assert second.flush() == 1
+        assert [entry["tokens"] for entry in first_store.entries] == [10, 30]
+        assert [(entry["writer"], entry["seq"]) for entry in second_store.entries] == [(second.writer_id, 1)]
+        first.close()
+        second.close()
+
+    def test_failed_seal_keeps_entries(self, journal_path, monkeypatch, capsys):
+        """A journal that cannot be sealed stays active and is sealed by a later flush"""
+        store = _Store()
+        ledger = BudgetLedger(journal_path, store, flush_interval=60)
+        ledger.open_account("global", 1000)
+        ledger.allocate("global", 10)
+
+        replace = os.replace
+        monkeypatch.setattr(budget_ledger.os, "replace", lambda *args: (_ for _ in ()).throw(OSError("busy")))
+        assert ledger.flush() == 0
+        assert "could not seal" in capsys.readouterr().err
+        ledger.allocate("global", 20)
+
+        monkeypatch.setattr(budget_ledger.os, "replace", replace)
+        assert ledger.flush() == 2
+        assert [entry["used"] for entry in store.entries] == [10, 30]
+        ledger.close()
+
+    def test_flusher_survives_errors(self, journal_path, monkeypatch, capsys):
+        """An unexpected flush error is reported and the flusher keeps running"""
+        store = _Store()
+        ledger = BudgetLedger(journal_path, store, flush_interval=0.01)
+        ledger.open_account("global", 1000)
+        failures = []
+        flush = ledger.flush
+
+        def failing_flush():
+            if not failures:
+                failures.append(1)
+                raise RuntimeError("boom")
+            return flush()
+
+        monkeypatch.setattr(ledger, "flush", failing_flush)
+        ledger.allocate("global", 10)
+        for _ in range(200):
+            if store.entries:
+                break
+            threading.Event().wait(0.01)
+        assert [entry["tokens"] for entry in store.entries] == [10]
+        assert "boom" in capsys.readouterr().err
+        ledger.close()
+
+
+def _crash(ledger):
+    """Stop a ledger as a dying process would: nothing flushed, its lock released"""
+    ledger._closed = True
+    budget_ledger._open_ledgers.discard(ledger)
+    os.close(ledger._journal_fd)
+    os.close(ledger._owner_fd)
+
+
+@pytest.mark.unit
+def test_managers_sharing_a_database(temp_directory):
+    """Usage of two managers adds up in the database, and a crashed one is replayed once"""
+    from token_budget_manager import BudgetLevel, BudgetScope, TokenBudgetManager
+
+    db_path = os.path.join(temp_directory, "token_budgets.db")
+    first = TokenBudgetManager(db_path=db_path, data_dir=temp_directory)
+    constraint_id = first.create_budget_constraint(BudgetLevel.GLOBAL, BudgetScope.DAILY, 10000)
+    second = TokenBudgetManager(db_path=db_path, data_dir=temp_directory)
+    first.allocate_tokens(constraint_id, 100)
+    second.allocate_tokens(constraint_id, 50)
+    first.flush()
+    second.flush()
+
+    def persisted_used():
+        return first.conn.execute("SELECT used FROM budget_allocations").fetchone()[0]
+
+    assert persisted_used() == 150
+
+    second.allocate_tokens(constraint_id, 30)
+    _crash(second.ledger)
+    restarted = TokenBudgetManager(db_path=db_path, data_dir=temp_directory)
+    assert restarted.ledger.balance(constraint_id)["used"] == 180
+    assert persisted_used() == 180
+    again = TokenBudgetManager(db_path=db_path, data_dir=temp_directory)
+    assert again.ledger.balance(constraint_id)["used"] == 180
+    for manager in (first, restarted, again):
+        manager.ledger.close()
+
+
+@pytest.mark.unit
+def test_flush_persists_allocation_status(temp_directory):
+    """The status column follows the persisted usage of every manager sharing the database"""
+    from token_budget_manager import BudgetLevel, BudgetScope, TokenBudgetManager
+
+    db_path = os.path.join(temp_directory, "token_budgets.db")
+    first = TokenBudgetManager(db_path=db_path, data_dir=temp_directory)
+    constraint_id = first.create_budget_constraint(BudgetLevel.GLOBAL, BudgetScope.DAILY, 1000)
+    second = TokenBudgetManager(db_path=db_path, data_dir=temp_directory)
+
+    def persisted_status():
+        return first.conn.execute("SELECT status FROM budget_allocations").fetchone()[0]
+
+    first.allocate_tokens(constraint_id, 500)
+    first.flush()
+    assert persisted_status() == "healthy"
+
+    # 500 + 150 from another manager crosses into warning
+    second.allocate_tokens(constraint_id, 150)
+    second.flush()
+    assert persisted_status() == "warning"
+
+    first.allocate_tokens(constraint_id, 200)
+    first.flush()
+    assert persisted_status() == "critical"
+
+    restarted = TokenBudgetManager(db_path=db_path, data_dir=temp_directory)
+    assert restarted.allocations[constraint_id].status.value == "critical"
+    for manager in (first, second, restarted):
+        manager.ledger.close()
@@ -0,0 +1,153 @@
+"""
+Unit tests for the Budget Solver
+
+Tests the constrained allocation behind DynamicBudgetManager rebalancing:
+- Allocations add up to the budget and respect the bounds
+- Infeasible budgets fall back to the bounds
+- The NumPy and pure Python paths agree
+"""
+
+import pytest
+import os
+import random
+import sys
+
+# Add lib directory to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
+
+import budget_solver
+from budget_solver import solve_allocation
+
+
+@pytest.fixture(params=["python", "numpy"])
+def solver_path(request, monkeypatch):
+    """Run a test on both solver paths"""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    monkeypatch.setattr(budget_solver, "NUMPY_AVAILABLE", request.param == "numpy")
+    return request.param
+
+
+@pytest.mark.unit
+class TestSolveAllocation:
+    """Test solve_allocation results"""
+
+    def test_targets_that_fit_are_kept(self, solver_path):
+        """Targets within the bounds that add up to the budget are returned as is"""
+        assert solve_allocation(1000, [500, 300, 200], [1, 1, 1], [0, 0, 0], [1000, 1000, 1000]) == [500, 300, 200]
+
+    def test_difference_follows_weights(self, solver_path):
+        """Surplus is shared in proportion to the weights"""
+        result = solve_allocation(1300, [400, 400, 200], [2, 1, 1], [0, 0, 0], [2000, 2000, 2000])
+        assert result == [550, 475, 275]
+
+    def test_bounds_bind(self, solver_path):
+        """Clipped components push the rest of the difference onto the others"""
+        result = solve_allocation(1000, [100, 100, 100], [1, 1, 1], [0, 0, 0], [150, 2000, 2000])
+        assert result == [150, 425, 425]
+
+        result = solve_allocation(300, [500, 500, 500], [1, 1, 1], [200, 0, 0], [1000, 1000, 1000])
+        assert result == [200, 50, 50]
+
+    def test_infeasible_budgets(self, solver_path):
+        """Budgets outside the bounds return the bounds"""
+        assert solve_allocation(100, [50, 50], [1, 1], [100, 100], [200, 200]) == [100, 100]
+        assert solve_allocation(1000, [50, 50], [1, 1], [100, 100], [200, 200]) == [200, 200]
+
+    def test_rounding_preserves_budget(self, solver_path):
+        """Integer allocations still add up to the budget"""
+        result = solve_allocation(1000, [1, 1, 1], [1, 1, 1], [0, 0, 0], [1000, 1000, 1000])
+        assert sum(result) == 1000
+        assert max(result) - min(result) == 1
+
+    def test_empty(self, solver_path):
+        """No components, no allocations"""
+        assert solve_allocation(1000, [], [], [], []) == []
+
+    def test_random_problems(self, solver_path):
+        """Random problems stay within the bounds and the budget"""
+        rng = random.Random(3)
+        for _ in range(50):
+            size = rng.randint(1, 40)
+            lower = [rng.randint(0, 500) for _ in range(size)]
+            upper = [low + rng.randint(0, 1000) for low in lower]
+            budget = rng.randint(sum(lower), sum(upper))
+            targets = [rng.uniform(0, 1500) for _ in range(size)]
+            weights = [rng.uniform(0.5, 2) for _ in range(size)]
+
+            result = solve_allocation(budget, targets, weights, lower, upper)
+            assert sum(result) == budget
+            assert all(low <= value <= high for value, low, high in zip(result, lower, upper))
+
+
+@pytest.mark.unit
+def test_numpy_matches_python(monkeypatch):
+    """Both paths compute the same allocations"""
+    pytest.importorskip("numpy")
+    rng = random.Random(5)
+    for _ in range(20):
+        size = rng.randint(1, 200)
+        lower = [rng.randint(0, 500) for _ in range(size)]
+        upper = [low + rng.randint(0, 1000) for low in lower]
+        budget = rng.randint(sum(lower), sum(upper))
+        targets = [rng.uniform(0, 1500) for _ in range(size)]
+        weights = [rng.uniform(0.5, 2) for _ in range(size)]
+
+        monkeypatch.setattr(budget_solver, "NUMPY_AVAILABLE", True)
+        vectorized = solve_allocation(budget, targets, weights, lower, upper)
+        monkeypatch.setattr(budget_solver, "NUMPY_AVAILABLE", False)
+        assert solve_allocation(budget, targets, weights, lower, upper) == vectorized
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("strategy_name", ["EQUAL", "PERFORMANCE_BASED", "NEEDS_BASED", "EFFICIENCY_BASED", "PREDICTIVE"])
+def test_manager_rebalancing_constraints(temp_directory, strategy_name):
+    """Rebalancing uses the whole budget without cutting CRITICAL or used tokens"""
+    from dynamic_budget_manager import BudgetStrategy, DynamicBudgetManager, PriorityLevel
+
+    manager = DynamicBudgetManager(20000, os.path.join(temp_directory, "budget_metrics.db"))
+    manager.arena.set_allocations({comp_id: 4000 for comp_id in manager.components})
+    manager._refresh_components()
+    manager.use_tokens("smart_cache", 2500)
+    manager.update_performance_metrics("comm_optimizer", 90, 90)
+    manager.strategy = BudgetStrategy[strategy_name]
+
+    allocations = manager._plan_rebalancing()
+    assert sum(allocations.values()) == 20000
+    assert allocations["smart_cache"] >= 2500
+    for comp_id, comp in manager.components.items():
+        assert allocations[comp_id] >= manager.min_budget_allocation
+        if comp.priority == PriorityLevel.CRITICAL:
+            assert allocations[comp_id] >= 4000
+
+
+@pytest.mark.unit
+def test_manager_fits_persisted_arena(temp_directory):
+    """A manager scales counters left in the arena by an earlier run to its own budget"""
+    from dynamic_budget_manager import DynamicBudgetManager
+
+    db_path = os.path.join(temp_directory, "budget_metrics.db")
+    first = DynamicBudgetManager(100000, db_path)
+    first.use_tokens("smart_cache", 2500)
+
+    second = DynamicBudgetManager(20000, db_path)
+    assert sum(comp.allocated_tokens for comp in second.components.values()) == 20000
+    assert second.components["smart_cache"].used_tokens == 2500
+    assert second.components["smart_cache"].allocated_tokens >= 2500
+
+
+@pytest.mark.unit
+def test_manager_rebalance_publishes_plan(temp_directory):
+    """A rebalancing writes its plan to the arena and records the changes"""
+    from dynamic_budget_manager import BudgetStrategy, DynamicBudgetManager
+
+    manager = DynamicBudgetManager(20000, os.path.join(temp_directory, "budget_metrics.db"))
+    manager.use_tokens("smart_cache", 2500)
+    manager.strategy = BudgetStrategy.NEEDS_BASED
+    manager._rebalance_budgets("test")
+
+    counters = manager.arena.snapshot()
+    assert sum(allocated for allocated, _, _ in counters.values()) == 20000
+    assert all(counters[comp_id][0] == comp.allocated_tokens for comp_id, comp in manager.components.items())
+    assert counters["smart_cache"][0] >= 2500
+    assert manager.components["smart_cache"].adjustment_history
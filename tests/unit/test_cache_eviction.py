@@ -0,0 +1,89 @@
+"""
+Unit tests for the Cache Eviction Engine
+
+Tests the segmented LRU index used by SmartCache:
+- Byte-accurate sizing of cached content
+- Running byte counter across add/replace/remove
+- Victim order: expired, probation LRU, protected LRU
+- Expiry heap with lazy deletion
+"""
+
+import pytest
+import os
+import sys
+
+# Add lib directory to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
+
+from cache_eviction import EvictionEngine, measure_bytes
+
+
+class TestEvictionEngine:
+    """Test suite for EvictionEngine class"""
+
+    @pytest.mark.unit
+    def test_measure_bytes(self):
+        """Strings are measured as UTF-8, other objects by their pickle"""
+        assert measure_bytes("abc") == 3
+        assert measure_bytes("é") == 2
+        assert measure_bytes(b"\x00" * 10) == 10
+        assert measure_bytes({"key": "value" * 100}) > 500
+
+    @pytest.mark.unit
+    def test_byte_counter_tracks_add_replace_remove(self):
+        """total_bytes stays exact without rescanning entries"""
+        engine = EvictionEngine(max_bytes=1000)
+        engine.add("a", 100)
+        engine.add("b", 200)
+        engine.add("a", 50)
+        assert engine.total_bytes == 250
+        assert len(engine) == 2
+
+        engine.touch("b")
+        assert engine.remove("b") == 200
+        assert engine.remove("missing") == 0
+        assert engine.total_bytes == 50
+        assert engine.protected_bytes == 0
+        assert engine.needs_eviction(951)
+        assert not engine.needs_eviction(950)
+
+    @pytest.mark.unit
+    def test_victim_order(self):
+        """Expired entries go first, then probation LRU, then protected LRU"""
+        engine = EvictionEngine(max_bytes=1000)
+        now = 1000.0
+        engine.add("hot", 10, now + 100)
+        engine.add("cold1", 10, now + 100)
+        engine.add("cold2", 10, now + 100)
+        engine.add("stale", 10, now - 1)
+        engine.touch("hot")
+
+        order = []
+        for key in engine.victims(now):
+            order.append(key)
+            engine.remove(key)
+        assert order == ["stale", "cold1", "cold2", "hot"]
+        assert engine.total_bytes == 0
+
+    @pytest.mark.unit
+    def test_expired_keys_skip_stale_heap_entries(self):
+        """Removed or re-added keys do not surface with their old expiry"""
+        engine = EvictionEngine(max_bytes=1000)
+        engine.add("a", 10, 5.0)
+        engine.add("b", 10, 5.0)
+        engine.remove("a")
+        engine.add("b", 10, 50.0)
+
+        assert list(engine.expired_keys(now=10.0)) == []
+        assert list(engine.expired_keys(now=60.0)) == ["b"]
+
+    @pytest.mark.unit
+    def test_protected_segment_is_bounded(self):
+        """Promotions beyond the protected share demote the protected LRU"""
+        engine = EvictionEngine(max_bytes=100, protected_ratio=0.5)
+        for key in ("a", "b", "c"):
+            engine.add(key, 20)
+            engine.touch(key)
+
+        assert engine.protected_bytes <= 50
+        assert next(engine.victims()) == "a"
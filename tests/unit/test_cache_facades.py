@@ -0,0 +1,94 @@
+"""
+Unit tests for the cache facades over the Tiered Cache
+
+Tests that TokenCache and SimpleSmartCache keep no store of their own:
+- Writes through either facade land in its namespace of the shared tiered cache
+- Values put into the tiered cache are read back through the facade
+- Clearing and statistics go through the same namespace
+"""
+
+import pytest
+import os
+import sys
+
+# Add lib directory to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
+
+from tiered_cache import NAMESPACE_ANALYSIS, NAMESPACE_CONTENT, NAMESPACE_OPTIMIZED, get_tiered_cache
+from cache_integration import TokenCache
+from smart_cache_system_simple import SimpleSmartCache
+
+
+@pytest.fixture(autouse=True)
+def flush_shared_cache(temp_directory):
+    """Flush write-behind entries before the temporary directory is removed"""
+    yield
+    get_tiered_cache(temp_directory).flush()
+
+
+class TestTokenCache:
+    """Test suite for TokenCache delegation"""
+
+    @pytest.mark.unit
+    def test_shares_tiered_cache(self, temp_directory):
+        """The facade wraps the shared tiered cache for its directory"""
+        cache = TokenCache(temp_directory)
+        assert cache.tiers is get_tiered_cache(temp_directory)
+
+    @pytest.mark.unit
+    def test_optimized_content_round_trip(self, temp_directory):
+        """Optimized content is stored in and served from the optimized namespace"""
+        cache = TokenCache(temp_directory)
+        optimized = get_tiered_cache(temp_directory).namespace(NAMESPACE_OPTIMIZED)
+
+        cache.store_optimized_content("long text", "short", context={"level": 1})
+        key = cache._content_key("optimized", "long text", {"level": 1}, "default")
+        assert optimized.get(key) == "short"
+
+        optimized.put(cache._content_key("optimized", "other", None, "default"), "o")
+        assert cache.get_optimized_content("other") == "o"
+        assert cache.get_optimized_content("unknown") is None
+        assert cache.get_cache_efficiency()["cache_hits"] == 1
+
+    @pytest.mark.unit
+    def test_analysis_result_round_trip(self, temp_directory):
+        """Analysis results are stored in the analysis namespace and reused"""
+        cache = TokenCache(temp_directory)
+        analysis = get_tiered_cache(temp_directory).namespace(NAMESPACE_ANALYSIS)
+
+        assert cache.cache_analysis_result("syntax", "x = 1", {"ok": True}) == {"ok": True}
+        assert analysis.get(cache._analysis_key("syntax", "x = 1", "default")) == {"ok": True}
+        assert cache.cache_analysis_result("syntax", "x = 1", {"ok": False}) == {"ok": True}
+        assert cache.get_analysis_result("syntax", "x = 1") == {"ok": True}
+        assert len(get_tiered_cache(temp_directory).namespace(NAMESPACE_OPTIMIZED)) == 0
+
+
+class TestSimpleSmartCache:
+    """Test suite for SimpleSmartCache delegation"""
+
+    @pytest.mark.unit
+    def test_set_get_through_content_namespace(self, temp_directory):
+        """Entries set on the facade live in the content namespace and vice versa"""
+        cache = SimpleSmartCache(temp_directory, enable_predictions=False)
+        content = get_tiered_cache(temp_directory).namespace(NAMESPACE_CONTENT)
+        assert cache.tiers is get_tiered_cache(temp_directory)
+
+        assert cache.set("docs/intro.md", {"text": "hello"})
+        assert content.get("docs/intro.md") == {"text": "hello"}
+
+        content.put("docs/usage.md", "usage")
+        assert cache.get("docs/usage.md") == "usage"
+        assert cache.get("docs/missing.md") is None
+
+    @pytest.mark.unit
+    def test_clear_and_stats_use_namespace(self, temp_directory):
+        """Clearing removes the namespace entries; stats count them"""
+        cache = SimpleSmartCache(temp_directory, enable_predictions=False)
+        content = get_tiered_cache(temp_directory).namespace(NAMESPACE_CONTENT)
+        cache.set("a", "first")
+        cache.set("b", "second")
+        assert cache.get_stats()["cache_stats"]["total_entries"] == len(content) == 2
+
+        cache.clear()
+        assert len(content) == 0
+        assert cache.get("a") is None
@@ -0,0 +1,46 @@
+"""
+Unit tests for Cache Persistence
+
+Tests the write-behind helpers used by the cache subsystem:
+- Dirty-state coalescing by interval and change threshold
+"""
+
+import pytest
+import os
+import sys
+
+# Add lib directory to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
+
+from cache_persistence import DirtyTracker
+
+
+class TestDirtyTracker:
+    """Test suite for DirtyTracker class"""
+
+    @pytest.mark.unit
+    def test_threshold_and_interval(self):
+        """A flush is due at the change threshold or after the interval"""
+        tracker = DirtyTracker(flush_interval=60.0, flush_threshold=3)
+        assert not tracker.due()
+
+        assert tracker.mark(1) is False
+        assert tracker.mark(1) is False
+        assert not tracker.due()
+        assert tracker.due(now=tracker.last_flush + 61)
+        assert tracker.mark("patterns") is True
+        assert tracker.due()
+
+        assert tracker.take() == {1, "patterns"}
+        assert tracker.pending == 0
+        assert not tracker.due(now=tracker.last_flush + 61)
+
+    @pytest.mark.unit
+    def test_uncounted_marks_and_restore(self):
+        """Uncounted marks wait for the interval; failed flushes can be restored"""
+        tracker = DirtyTracker(flush_interval=60.0, flush_threshold=1)
+        assert tracker.mark(5, count=False) is False
+        assert not tracker.due()
+
+        tracker.restore(tracker.take() | {"stats"})
+        assert tracker.pending == 2
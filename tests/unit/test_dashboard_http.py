@@ -0,0 +1,122 @@
+"""
+Unit tests for Dashboard HTTP Caching
+
+Tests the conditional-GET and compression helpers of the dashboard API:
+- Data generations that change with the pattern store and the clock
+- Weak ETag construction and If-None-Match matching
+- Accept-Encoding negotiation and gzip thresholds
+"""
+
+import pytest
+import os
+import gzip
+import sys
+
+# Add lib directory to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
+
+from dashboard_http import (
+    GZIP_MIN_SIZE,
+    accepts_gzip,
+    compress,
+    data_generation,
+    etag_matches,
+    make_etag,
+)
+from dashboard_stream import DirectoryWatcher
+
+
+def _write(path, text):
+    """Write a file and bump its mtime so the change is seen on any filesystem"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.mark.unit
+class TestDataGeneration:
+    """Test data generations"""
+
+    def test_stable_until_data_changes(self, temp_directory):
+        """The generation only changes when a watched file changes"""
+        data_file = os.path.join(temp_directory, "quality_history.json")
+        _write(data_file, "{}")
+        watcher = DirectoryWatcher(temp_directory)
+
+        first = data_generation(watcher, now=1000.0)
+        assert data_generation(watcher, now=1001.0) == first
+
+        _write(data_file, '{"quality_assessments": []}')
+        assert data_generation(watcher, now=1001.0) != first
+
+    def test_changes_with_clock_period(self, temp_directory):
+        """Time-relative windows get a new generation every period"""
+        watcher = DirectoryWatcher(temp_directory)
+        assert data_generation(watcher, period=300, now=0.0) == data_generation(watcher, period=300, now=299.0)
+        assert data_generation(watcher, period=300, now=0.0) != data_generation(watcher, period=300, now=300.0)
+
+    def test_extra_paths(self, temp_directory):
+        """Adding a file to an extra directory changes the generation"""
+        reports = os.path.join(temp_directory, "reports")
+        os.makedirs(reports)
+        watcher = DirectoryWatcher(temp_directory)
+        first = data_generation(watcher, [reports], now=0.0)
+
+        _write(os.path.join(reports, "validation-1.md"), "report")
+        stat = os.stat(reports)
+        os.utime(reports, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert data_generation(watcher, [reports], now=0.0) != first
+
+    def test_extra_values(self, temp_directory):
+        """A new git HEAD changes the generation"""
+        watcher = DirectoryWatcher(temp_directory)
+        first = data_generation(watcher, extra_values=["abc123"], now=0.0)
+        assert data_generation(watcher, extra_values=["abc123"], now=0.0) == first
+        assert data_generation(watcher, extra_values=["def456"], now=0.0) != first
+
+
+@pytest.mark.unit
+class TestEtags:
+    """Test ETag construction and matching"""
+
+    def test_etag_depends_on_generation_and_resource(self):
+        """Different resources or generations never share a tag"""
+        etag = make_etag("gen1", "/api/overview?")
+        assert etag.startswith('W/"') and etag.endswith('"')
+        assert etag == make_etag("gen1", "/api/overview?")
+        assert etag != make_etag("gen2", "/api/overview?")
+        assert etag != make_etag("gen1", "/api/skills?")
+
+    def test_if_none_match(self):
+        """Weak comparison, lists of tags and the wildcard are supported"""
+        etag = make_etag("gen", "/api/bundle?")
+        opaque = etag[2:]
+        assert etag_matches(etag, etag)
+        assert etag_matches(opaque, etag)
+        assert etag_matches(f'"other", {etag}', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches(None, etag)
+        assert not etag_matches('"other"', etag)
+
+
+@pytest.mark.unit
+class TestCompression:
+    """Test gzip negotiation and compression"""
+
+    def test_accepts_gzip(self):
+        """gzip or * is accepted unless refused with q=0"""
+        assert accepts_gzip("gzip, deflate, br")
+        assert accepts_gzip("br;q=1.0, gzip;q=0.8")
+        assert accepts_gzip("*")
+        assert not accepts_gzip("gzip;q=0")
+        assert not accepts_gzip("br")
+        assert not accepts_gzip(None)
+
+    def test_compress_only_large_bodies(self):
+        """Small bodies are sent as they are; large ones round-trip through gzip"""
+        assert compress(b"{}") is None
+        body = b'{"values": [' + b"1, " * GZIP_MIN_SIZE + b"1]}"
+        compressed = compress(body)
+        assert compressed is not None and len(compressed) < len(body)
+        assert gzip.decompress(compressed) == body
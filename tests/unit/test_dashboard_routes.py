@@ -0,0 +1,144 @@
+"""
+Unit tests for the Dashboard API Routes
+
+Smoke tests of the dashboard app against a temporary patterns directory:
+- The module imports and every overview route answers
+- Bundles, cursors and conditional GETs of the rewired routes
+"""
+
+import pytest
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add lib directory to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
+
+pytest.importorskip("flask")
+pytest.importorskip("flask_cors")
+
+import dashboard
+from dashboard_startup import LazyObject
+
+OVERVIEW_ROUTES = [
+    "/api/overview",
+    "/api/quality-trends?days=30",
+    "/api/skills",
+    "/api/agents",
+    "/api/task-distribution",
+    "/api/recent-activity",
+    "/api/system-health",
+    "/api/recent-performance-records",
+    "/api/current-model",
+    "/api/models",
+    "/api/quality-timeline?days=7",
+    "/api/temporal-performance",
+    "/api/debugging-performance",
+]
+
+
+@pytest.fixture
+def client(temp_directory, monkeypatch):
+    """Test client of the dashboard app reading a temporary unified_data.json"""
+    patterns_dir = Path(temp_directory) / ".claude-patterns"
+    patterns_dir.mkdir()
+    now = datetime.now()
+    assessments = [
+        {
+            "timestamp": (now - timedelta(hours=hour)).isoformat(),
+            "task_type": "debugging" if hour % 2 else "refactoring",
+            "overall_score": 70 + hour,
+            "details": {"model_used": "sonnet"},
+            "pass": True,
+        }
+        for hour in range(20)
+    ]
+    with open(patterns_dir / "unified_data.json", "w", encoding="utf-8") as f:
+        json.dump({"quality_history": {"quality_assessments": assessments}, "patterns": []}, f)
+
+    monkeypatch.setattr(dashboard.DashboardDataCollector, "_cached_patterns_dir", lambda self: patterns_dir)
+    monkeypatch.setattr(dashboard.DashboardDataCollector, "_discover_project_root", lambda self: Path(temp_directory))
+    collector = LazyObject(lambda: dashboard.DashboardDataCollector(str(patterns_dir)))
+    monkeypatch.setattr(dashboard, "data_collector", collector)
+    monkeypatch.setattr(dashboard, "stream_hub", LazyObject(lambda: dashboard.create_stream_hub(collector)))
+    return dashboard.app.test_client()
+
+
+@pytest.mark.unit
+class TestRoutes:
+    """Test the routes answer"""
+
+    def test_homepage(self, client):
+        """The page template renders"""
+        response = client.get("/")
+        assert response.status_code == 200
+        assert b"<html" in response.data
+
+    @pytest.mark.parametrize("path", OVERVIEW_ROUTES)
+    def test_overview_routes(self, client, path):
+        """Every overview route returns JSON"""
+        response = client.get(path)
+        assert response.status_code == 200
+        assert isinstance(response.get_json(), dict)
+
+    def test_bundle(self, client):
+        """The bundle holds the requested panels and rejects unknown ones"""
+        bundle = client.get("/api/bundle?panels=overview,recent-activity").get_json()
+        assert set(bundle) == {"overview", "recent-activity"}
+        assert client.get("/api/bundle?panels=missing").status_code == 400
+
+    def test_activity_cursor(self, client):
+        """Following next_cursor pages through the history without repeats"""
+        first = client.get("/api/recent-activity?limit=5").get_json()
+        assert len(first["activities"]) == 5
+        second = client.get(f"/api/recent-activity?limit=5&cursor={first['next_cursor']}").get_json()
+        timestamps = [activity["timestamp"] for activity in first["activities"] + second["activities"]]
+        assert timestamps == sorted(set(timestamps), reverse=True)
+
+    def test_conditional_get(self, client):
+        """Unchanged data is answered with 304"""
+        # The first request opens the unified storage, which writes unified_parameters.json
+        client.get("/api/overview")
+        response = client.get("/api/overview")
+        etag = response.headers["ETag"]
+        assert client.get("/api/overview", headers={"If-None-Match": etag}).status_code == 304
+
+    def test_new_commit_changes_etag(self, client, temp_directory):
+        """Git activity is not hidden behind 304s once HEAD moves"""
+        git_dir = Path(temp_directory) / ".git"
+        git_dir.mkdir()
+        (git_dir / "HEAD").write_text("1" * 40 + "\n")
+        client.get("/api/recent-activity")
+        etag = client.get("/api/recent-activity").headers["ETag"]
+
+        (git_dir / "HEAD").write_text("2" * 40 + "\n")
+        response = client.get("/api/recent-activity", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_conditional_get_only_on_covered_routes(self, client):
+        """Routes reading data outside the generation are never tagged or answered with 304"""
+        assert dashboard.CONDITIONAL_GET_ENDPOINTS <= set(dashboard.app.view_functions)
+        response = client.get("/api/consistency-dashboard")
+        assert response.status_code == 200
+        assert "ETag" not in response.headers
+        assert client.get("/api/consistency-dashboard", headers={"If-None-Match": "*"}).status_code == 200
+
+    def test_unified_storage_write_changes_etag(self, client, temp_directory, monkeypatch):
+        """Writes to a unified storage outside the pattern directory are not hidden behind 304s"""
+        from unified_parameter_storage import UnifiedParameterStorage
+
+        storage_dir = Path(temp_directory) / ".claude-unified"
+        UnifiedParameterStorage(str(storage_dir)).set_quality_score(80.0)
+        monkeypatch.setattr(dashboard.DashboardDataCollector, "_storage_candidates", lambda self: [storage_dir])
+        client.get("/api/overview")
+        etag = client.get("/api/overview").headers["ETag"]
+
+        storage = dashboard.data_collector.unified_storage
+        assert storage.storage_dir == storage_dir
+        storage.set_quality_score(55.0)
+        response = client.get("/api/overview", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
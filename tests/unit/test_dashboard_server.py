@@ -0,0 +1,85 @@
+"""
+Unit tests for the Multi-Worker Dashboard Server
+
+Tests serving a WSGI app from forked worker processes:
+- Requests answered by several workers on one port
+- Shutdown of all workers with the supervisor
+- Argument validation and gunicorn detection
+"""
+
+import pytest
+import json
+import os
+import signal
+import sys
+import time
+import urllib.request
+
+# Add lib directory to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
+
+from dashboard_server import _free_port, fork_available, gunicorn_available, run_prefork, run_workers
+
+
+def _pid_app(environ, start_response):
+    """WSGI app answering with the pid of the process serving it"""
+    start_response("200 OK", [("Content-Type", "application/json")])
+    return [json.dumps({"pid": os.getpid()}).encode("utf-8")]
+
+
+@pytest.mark.unit
+class TestRunWorkers:
+    """Test server selection"""
+
+    def test_rejects_bad_arguments(self):
+        """Unknown servers and worker counts below one are refused"""
+        with pytest.raises(ValueError):
+            run_workers(_pid_app, "127.0.0.1", 0, 2, server="uwsgi")
+        with pytest.raises(ValueError):
+            run_workers(_pid_app, "127.0.0.1", 0, 0)
+
+    def test_gunicorn_detected_without_importing_it(self, monkeypatch):
+        """Availability is a module lookup, so gunicorn is never imported just to check"""
+        import importlib.util
+
+        looked_up = []
+        monkeypatch.setattr(importlib.util, "find_spec", lambda name: looked_up.append(name))
+        assert gunicorn_available() is False
+        assert looked_up == ["gunicorn"]
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(not fork_available(), reason="worker processes need fork()")
+class TestPrefork:
+    """Test the built-in pre-fork server"""
+
+    def test_workers_share_the_port(self):
+        """Requests are spread over worker processes that exit with the supervisor"""
+        pytest.importorskip("werkzeug")
+        port = _free_port("127.0.0.1")
+        supervisor = os.fork()
+        if supervisor == 0:
+            try:
+                run_prefork(_pid_app, "127.0.0.1", port, 3)
+            finally:
+                os._exit(0)
+
+        try:
+            pids = set()
+            deadline = time.time() + 10
+            while time.time() < deadline and len(pids) < 3:
+                try:
+                    with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=5) as response:
+                        pids.add(json.loads(response.read())["pid"])
+                except OSError:
+                    time.sleep(0.05)
+            assert len(pids) == 3
+            assert supervisor not in pids
+        finally:
+            os.kill(supervisor, signal.SIGTERM)
+            _, status = os.waitpid(supervisor, 0)
+
+        assert os.WIFEXITED(status)
+        for pid in pids:
+            with pytest.raises(ProcessLookupError):
+                os.kill(pid, 0)
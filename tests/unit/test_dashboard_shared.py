@@ -0,0 +1,158 @@
+"""
+Unit tests for the Shared Dashboard Snapshot
+
+Tests the memory-mapped snapshot shared by dashboard worker processes:
+- Section round trip and format validation
+- Remapping when the builder replaces the file
+- Unpickled unified data snapshots with their derived values
+- Rebuilds only when the data generation changes
+"""
+
+import pytest
+import json
+import os
+import pickle
+import sys
+from pathlib import Path
+
+# Add lib directory to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
+
+from dashboard_shared import (
+    UNIFIED_SECTION,
+    SharedSnapshot,
+    SharedSnapshotReader,
+    SharedUnifiedLoader,
+    SnapshotBuilder,
+    write_snapshot,
+)
+from dashboard_snapshot import UnifiedDataSnapshot
+
+
+def _unified_snapshot(count):
+    """Unified data snapshot with count assessments"""
+    assessments = [
+        {"timestamp": f"2025-01-0{i + 1}T10:00:00", "task_type": "review", "overall_score": 80 + i}
+        for i in range(count)
+    ]
+    return UnifiedDataSnapshot(
+        {"quality_history": {"quality_assessments": assessments}}, None, lambda t: t, lambda m: m
+    )
+
+
+@pytest.mark.unit
+class TestSnapshotFile:
+    """Test the snapshot file format"""
+
+    def test_round_trip(self, temp_directory):
+        """Sections are read back by name"""
+        path = Path(temp_directory) / "snapshot.bin"
+        write_snapshot(path, {"panel:overview": b'{"a":1}\n', "empty": b"", "generation": b"abc"})
+
+        snapshot = SharedSnapshot(path)
+        assert snapshot.names == ["panel:overview", "empty", "generation"]
+        assert snapshot.get("panel:overview") == b'{"a":1}\n'
+        assert snapshot.get("empty") == b""
+        assert snapshot.get("missing") is None
+        assert snapshot.generation == "abc"
+
+    def test_rejects_other_files(self, temp_directory):
+        """Files that are not snapshots are refused"""
+        path = Path(temp_directory) / "snapshot.bin"
+        path.write_bytes(json.dumps({"not": "a snapshot"}).encode("utf-8"))
+        with pytest.raises(ValueError):
+            SharedSnapshot(path)
+        path.write_bytes(b"DASH")
+        with pytest.raises(ValueError):
+            SharedSnapshot(path)
+
+    def test_reader_remaps_replaced_file(self, temp_directory):
+        """Readers keep one mapping per file version"""
+        path = Path(temp_directory) / "snapshot.bin"
+        reader = SharedSnapshotReader(path)
+        assert reader.get() is None
+
+        write_snapshot(path, {"generation": b"1"})
+        first = reader.get()
+        assert reader.get() is first
+        write_snapshot(path, {"generation": b"2"})
+        assert reader.get().generation == "2"
+        # The earlier mapping stays readable for requests still using it
+        assert first.generation == "1"
+        assert reader.remaps == 2
+
+    def test_reader_keeps_last_good_snapshot(self, temp_directory):
+        """A corrupt replacement does not take the current snapshot out of service"""
+        path = Path(temp_directory) / "snapshot.bin"
+        reader = SharedSnapshotReader(path)
+        write_snapshot(path, {"generation": b"1"})
+        assert reader.get().generation == "1"
+
+        # Replaced like the builder does; mapped files are never rewritten in place
+        corrupt = Path(temp_directory) / "corrupt.bin"
+        corrupt.write_bytes(b"garbage that is long enough")
+        os.replace(corrupt, path)
+        assert reader.get().generation == "1"
+
+
+@pytest.mark.unit
+class TestSharedUnifiedLoader:
+    """Test unified data shared through the snapshot file"""
+
+    def test_unpickles_once_per_file(self, temp_directory):
+        """Workers get the builder's snapshot, including values derived while building it"""
+        path = Path(temp_directory) / "snapshot.bin"
+        built = _unified_snapshot(3)
+        built.memo("overview", lambda: {"total": 3})
+        write_snapshot(path, {UNIFIED_SECTION: pickle.dumps(built)})
+
+        loader = SharedUnifiedLoader(SharedSnapshotReader(path))
+        snapshot = loader.get()
+        assert [entry.raw["overall_score"] for entry in snapshot.entries] == [80, 81, 82]
+        assert [entry.index for entry in snapshot.select(model="Claude Sonnet 4.5")] == [0, 1, 2]
+        assert snapshot.memo("overview", lambda: pytest.fail("recomputed")) == {"total": 3}
+        assert loader.get() is snapshot
+        assert loader.rebuilds == 1
+
+        write_snapshot(path, {UNIFIED_SECTION: pickle.dumps(_unified_snapshot(1))})
+        assert len(loader.get().entries) == 1
+
+    def test_missing_section(self, temp_directory):
+        """Without shared unified data there is no snapshot"""
+        path = Path(temp_directory) / "snapshot.bin"
+        write_snapshot(path, {"generation": b"1"})
+        assert SharedUnifiedLoader(SharedSnapshotReader(path)).get() is None
+
+
+@pytest.mark.unit
+class TestSnapshotBuilder:
+    """Test snapshot rebuilding"""
+
+    def test_builds_only_for_new_generations(self, temp_directory):
+        """The snapshot is rebuilt when the generation changes and tagged with it"""
+        path = Path(temp_directory) / "snapshot.bin"
+        state = {"generation": "g1", "builds": 0}
+
+        def build():
+            state["builds"] += 1
+            return {"panel:overview": str(state["builds"]).encode("ascii")}
+
+        builder = SnapshotBuilder(path, build, lambda: state["generation"])
+        assert builder.build_once() is True
+        assert builder.build_once() is False
+        state["generation"] = "g2"
+        assert builder.build_once() is True
+
+        snapshot = SharedSnapshot(path)
+        assert snapshot.generation == "g2"
+        assert snapshot.get("panel:overview") == b"2"
+        assert builder.builds == state["builds"] == 2
+
+    def test_rebuilds_deleted_file(self, temp_directory):
+        """A removed snapshot file is written again"""
+        path = Path(temp_directory) / "snapshot.bin"
+        builder = SnapshotBuilder(path, lambda: {}, lambda: "g1")
+        builder.build_once()
+        path.unlink()
+        assert builder.build_once() is True
+        assert path.exists()
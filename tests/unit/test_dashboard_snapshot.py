@@ -0,0 +1,132 @@
+"""
+Unit tests for Dashboard Data Snapshot
+
+Tests the shared snapshot of unified_data.json behind the dashboard APIs:
+- Rebuilding only when the file's stat signature changes
+- Pre-parsed, time-ordered history and its indexes
+- Per-snapshot memoization of derived values
+"""
+
+import pytest
+import os
+import json
+import sys
+from datetime import date, datetime
+
+# Add lib directory to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
+
+from dashboard_snapshot import UnifiedSnapshotLoader, parse_timestamp
+
+
+def _assessment(timestamp, task_type, model, score=80):
+    """Build a minimal quality assessment"""
+    return {
+        "timestamp": timestamp,
+        "task_type": task_type,
+        "overall_score": score,
+        "details": {"model_used": model},
+    }
+
+
+def _write_unified(path, assessments):
+    """Write a unified_data.json holding the given assessments"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"quality_history": {"quality_assessments": assessments}, "patterns": [{"task_type": "x"}]}, f)
+
+
+@pytest.fixture
+def unified_file(temp_directory):
+    """unified_data.json with an out-of-order history"""
+    path = os.path.join(temp_directory, 'unified_data.json')
+    _write_unified(path, [
+        _assessment("2025-01-03T10:00:00", "Debugging", "glm-4.6"),
+        _assessment("2025-01-01T09:00:00Z", "refactoring", "sonnet"),
+        _assessment("not a timestamp", "debugging", "sonnet"),
+        _assessment("2025-01-02T12:30:00+00:00", "debug", "sonnet"),
+    ])
+    return path
+
+
+def _loader(path):
+    """Loader with recognizable normalizers"""
+    return UnifiedSnapshotLoader(path, lambda ts: ts.replace("Z", "+00:00"), lambda model: model.upper())
+
+
+class TestUnifiedSnapshotLoader:
+    """Test suite for UnifiedSnapshotLoader class"""
+
+    @pytest.mark.unit
+    def test_unchanged_file_is_parsed_once(self, unified_file):
+        """Every call shares one snapshot until the file changes"""
+        loader = _loader(unified_file)
+        snapshot = loader.get()
+        assert loader.get() is snapshot
+        assert loader.rebuilds == 1
+        assert snapshot.unified["patterns"] == [{"task_type": "x"}]
+
+        _write_unified(unified_file, [_assessment("2025-02-01T00:00:00", "testing", "opus")] * 2)
+        changed = loader.get()
+        assert changed is not snapshot
+        assert len(changed.entries) == 2
+        assert loader.rebuilds == 2
+
+    @pytest.mark.unit
+    def test_unreadable_file_keeps_previous_snapshot(self, unified_file, temp_directory):
+        """A half-written file does not blank the dashboard"""
+        loader = _loader(unified_file)
+        snapshot = loader.get()
+        with open(unified_file, 'w', encoding='utf-8') as f:
+            f.write('{"quality_history": ')
+        assert loader.get() is snapshot
+        assert _loader(os.path.join(temp_directory, 'missing.json')).get() is None
+
+
+class TestUnifiedDataSnapshot:
+    """Test suite for UnifiedDataSnapshot class"""
+
+    @pytest.mark.unit
+    def test_entries_are_parsed_and_ordered(self, unified_file):
+        """History is time-ordered with normalized copies and untouched raw records"""
+        snapshot = _loader(unified_file).get()
+        assert [entry.time for entry in snapshot.entries] == [
+            datetime(2025, 1, 1, 9), datetime(2025, 1, 2, 12, 30), datetime(2025, 1, 3, 10)
+        ]
+        first = snapshot.entries[0]
+        assert first.record["timestamp"] == "2025-01-01T09:00:00+00:00"
+        assert first.record["details"]["model_used"] == "SONNET"
+        assert first.raw["details"]["model_used"] == "sonnet"
+        assert set(snapshot.by_day) == {date(2025, 1, 1), date(2025, 1, 2), date(2025, 1, 3)}
+
+    @pytest.mark.unit
+    def test_select_uses_indexes(self, unified_file):
+        """Cutoff, task type and model filters return entries in time order"""
+        snapshot = _loader(unified_file).get()
+        since = datetime(2025, 1, 2)
+        assert [e.task_type for e in snapshot.select(since=since)] == ["debug", "debugging"]
+        assert [e.time.day for e in snapshot.select(task_types=["DEBUGGING", "debug", "none"])] == [2, 3]
+        assert [e.time.day for e in snapshot.select(task_types=["debug", "debugging"], model="SONNET")] == [2]
+        assert [e.time.day for e in snapshot.select(model="SONNET")] == [1, 2]
+        assert snapshot.select(model="missing") == []
+
+    @pytest.mark.unit
+    def test_memo_computes_once(self, unified_file):
+        """Derived values are computed once per snapshot"""
+        snapshot = _loader(unified_file).get()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return len(snapshot.entries)
+
+        assert snapshot.memo("count", compute) == 3
+        assert snapshot.memo("count", compute) == 3
+        assert len(calls) == 1
+
+    @pytest.mark.unit
+    def test_parse_timestamp(self):
+        """Timestamps keep their wall-clock time and bad values are rejected"""
+        assert parse_timestamp("2025-01-01T09:00:00Z") == datetime(2025, 1, 1, 9)
+        assert parse_timestamp("2025-01-01T09:00:00+05:00") == datetime(2025, 1, 1, 9)
+        assert parse_timestamp("yesterday") is None
+        assert parse_timestamp(None) is None
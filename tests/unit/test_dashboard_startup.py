@@ -0,0 +1,151 @@
+"""
+Unit tests for Dashboard Startup Helpers
+
+Tests the pieces that keep dashboard start-up cheap:
+- Lazily built singletons and section registries
+- Persisted discovery results and their invalidation
+- Cold-start budget checks
+"""
+
+import pytest
+import json
+import os
+import sys
+from pathlib import Path
+
+# Add lib directory to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
+
+from dashboard_startup import DiscoveryCache, LazyObject, LazyRegistry, check_budget, run_benchmark
+
+
+class _Collector:
+    """Stand-in for an expensive singleton"""
+
+    instances = 0
+
+    def __init__(self):
+        _Collector.instances += 1
+        self.patterns_dir = Path(".claude-patterns")
+
+    def overview(self):
+        return {"total": 1}
+
+
+@pytest.mark.unit
+class TestLazyObjects:
+    """Test lazily built objects"""
+
+    def test_built_on_first_use_only(self):
+        """The factory runs once, on the first attribute access"""
+        _Collector.instances = 0
+        collector = LazyObject(_Collector)
+        assert not collector.lazy_built
+        assert _Collector.instances == 0
+
+        assert collector.overview() == {"total": 1}
+        assert collector.patterns_dir == Path(".claude-patterns")
+        assert collector.lazy_built
+        assert _Collector.instances == 1
+
+    def test_missing_attributes(self):
+        """Unknown attributes raise AttributeError from the built object"""
+        collector = LazyObject(_Collector)
+        with pytest.raises(AttributeError):
+            collector.not_an_attribute
+
+    def test_registry_builds_on_lookup(self):
+        """Registered values are built when they are first looked up"""
+        built = []
+        registry = LazyRegistry({name: (lambda name=name: built.append(name) or name.upper()) for name in ("a", "b")})
+        assert len(registry) == 2 and list(registry) == ["a", "b"]
+        assert built == []
+
+        assert registry.get("a") == "A"
+        assert registry["a"] == "A"
+        assert registry.get("missing") is None
+        assert built == ["a"] and registry.built == ["a"]
+
+
+@pytest.mark.unit
+class TestDiscoveryCache:
+    """Test persisted discovery results"""
+
+    def _compute(self, calls, value):
+        def compute():
+            calls.append(value)
+            return value
+
+        return compute
+
+    def test_reused_while_files_unchanged(self, temp_directory):
+        """A result is computed once and reused across cache instances"""
+        cache_file = Path(temp_directory) / "cache" / "discovery.json"
+        data_file = Path(temp_directory) / "unified_data.json"
+        data_file.write_text(json.dumps({"quality_history": {}}))
+        calls = []
+
+        assert DiscoveryCache(cache_file).cached("has_data", self._compute(calls, True), [data_file]) is True
+        other = DiscoveryCache(cache_file)
+        assert other.cached("has_data", self._compute(calls, False), [data_file]) is True
+        assert calls == [True]
+        assert other.hits == 1 and other.misses == 0
+
+    def test_invalidated_by_changes(self, temp_directory):
+        """Changed, created or removed files make the result stale"""
+        cache = DiscoveryCache(Path(temp_directory) / "discovery.json")
+        data_file = Path(temp_directory) / "unified_data.json"
+        calls = []
+
+        cache.cached("has_data", self._compute(calls, False), [data_file])
+        data_file.write_text("{}")
+        cache.cached("has_data", self._compute(calls, True), [data_file])
+        data_file.write_text('{"quality_history": {"quality_assessments": [1]}}')
+        cache.cached("has_data", self._compute(calls, True), [data_file])
+        data_file.unlink()
+        cache.cached("has_data", self._compute(calls, False), [data_file])
+        assert calls == [False, True, True, False]
+
+    def test_exists_only(self, temp_directory):
+        """Existence checks ignore content changes"""
+        cache = DiscoveryCache(Path(temp_directory) / "discovery.json")
+        marker = Path(temp_directory) / "config.json"
+        marker.write_text("{}")
+        calls = []
+
+        cache.cached("patterns_dir", self._compute(calls, "a"), [marker], exists_only=True)
+        marker.write_text('{"changed": true}')
+        assert cache.cached("patterns_dir", self._compute(calls, "b"), [marker], exists_only=True) == "a"
+        marker.unlink()
+        assert cache.cached("patterns_dir", self._compute(calls, "b"), [marker], exists_only=True) == "b"
+
+    def test_unreadable_cache_file(self, temp_directory):
+        """A corrupt cache file is ignored and replaced"""
+        cache_file = Path(temp_directory) / "discovery.json"
+        cache_file.write_text("not json")
+        assert DiscoveryCache(cache_file).cached("key", lambda: 42, []) == 42
+        assert DiscoveryCache(cache_file).cached("key", lambda: 0, []) == 42
+
+
+@pytest.mark.unit
+class TestBudget:
+    """Test the cold-start budget check"""
+
+    def test_within_and_over_budget(self):
+        """Measurements above a budget are reported"""
+        assert check_budget({"import_s": 0.4, "cold_start_s": 0.9}, 1.0, 2.0) == []
+        problems = check_budget({"import_s": 1.5, "cold_start_s": 2.5}, 1.0, 2.0)
+        assert len(problems) == 2
+        assert "import took 1.500s" in problems[0]
+
+    def test_failed_cold_start_is_reported(self):
+        """A module that cannot be imported raises RuntimeError instead of a subprocess error"""
+        with pytest.raises(RuntimeError, match="ModuleNotFoundError"):
+            run_benchmark(runs=1, module="no_such_dashboard_module")
+
+    def test_dashboard_cold_start(self):
+        """dashboard.py imports and answers its first request in a fresh interpreter"""
+        pytest.importorskip("flask")
+        pytest.importorskip("flask_cors")
+        measured = run_benchmark(runs=1)
+        assert measured["cold_start_s"] >= measured["import_s"] > 0
@@ -0,0 +1,152 @@
+"""
+Unit tests for Dashboard Live Stream
+
+Tests the server-sent event stream behind /api/stream:
+- Change detection by file stat signatures
+- Snapshot on subscribe, then JSON-patch deltas only for changed panels
+- Event formatting
+"""
+
+import pytest
+import os
+import json
+import sys
+
+# Add lib directory to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
+
+from dashboard_stream import DirectoryWatcher, PanelStreamHub, format_sse
+from delta_backup import apply_patch
+
+
+def _write(path, data):
+    """Write JSON data and bump the mtime so the change is seen on any filesystem"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def _parse(event):
+    """Split a formatted event into its name and payload"""
+    lines = event.strip().split("\n")
+    return lines[0][len("event: "):], json.loads(lines[1][len("data: "):])
+
+
+def _drain(subscriber):
+    """Get all events queued for a subscriber"""
+    events = []
+    while not subscriber.empty():
+        events.append(_parse(subscriber.get_nowait()))
+    return events
+
+
+@pytest.mark.unit
+class TestDirectoryWatcher:
+    """Test stat-signature change detection"""
+
+    def test_poll_reports_created_modified_and_deleted_files(self, temp_directory):
+        """Only files that changed since the last poll are reported"""
+        _write(os.path.join(temp_directory, "a.json"), {"v": 1})
+        _write(os.path.join(temp_directory, "b.json"), {"v": 1})
+        watcher = DirectoryWatcher(temp_directory)
+        assert watcher.poll() == set()
+
+        _write(os.path.join(temp_directory, "a.json"), {"v": 2})
+        _write(os.path.join(temp_directory, "c.jsonl"), {"v": 1})
+        os.remove(os.path.join(temp_directory, "b.json"))
+        assert watcher.poll() == {"a.json", "b.json", "c.jsonl"}
+        assert watcher.poll() == set()
+
+    def test_ignores_unwatched_and_temporary_files(self, temp_directory):
+        """Other suffixes and dot-files (atomic write temporaries) are not watched"""
+        watcher = DirectoryWatcher(temp_directory)
+        _write(os.path.join(temp_directory, "notes.txt"), {})
+        _write(os.path.join(temp_directory, ".rollups_x.json"), {})
+        assert watcher.poll() == set()
+
+    def test_extra_versions(self, temp_directory):
+        """A changed extra version (e.g. a new git HEAD) is reported like a file"""
+        versions = {"git HEAD": "abc123"}
+        watcher = DirectoryWatcher(temp_directory, extra=lambda: dict(versions))
+        assert watcher.poll() == set()
+
+        versions["git HEAD"] = "def456"
+        assert watcher.poll() == {"git HEAD"}
+        assert watcher.poll() == set()
+
+
+@pytest.mark.unit
+class TestPanelStreamHub:
+    """Test snapshot and delta events"""
+
+    def _hub(self, temp_directory, state):
+        """Hub with one panel reading a JSON file and one static panel"""
+        data_file = os.path.join(temp_directory, "data.json")
+        _write(data_file, state)
+
+        def read():
+            with open(data_file, encoding="utf-8") as f:
+                return json.load(f)
+
+        panels = {"data": read, "static": lambda: {"fixed": True}}
+        # Long interval so the background thread never polls during the test
+        return data_file, PanelStreamHub(DirectoryWatcher(temp_directory), panels, interval=60)
+
+    def test_subscribe_sends_snapshot_of_every_panel(self, temp_directory):
+        """A new subscriber first gets the full data of every panel"""
+        _, hub = self._hub(temp_directory, {"items": [1]})
+        subscriber = hub.subscribe()
+        events = _drain(subscriber)
+        assert events == [
+            ("snapshot", {"panel": "data", "data": {"items": [1]}}),
+            ("snapshot", {"panel": "static", "data": {"fixed": True}}),
+        ]
+        hub.unsubscribe(subscriber)
+
+    def test_changes_send_deltas_for_changed_panels_only(self, temp_directory):
+        """Deltas patch the previous panel data into the new data"""
+        data_file, hub = self._hub(temp_directory, {"items": [1], "total": 1})
+        subscriber = hub.subscribe()
+        state = {event["panel"]: event["data"] for _, event in _drain(subscriber)}
+
+        _write(data_file, {"items": [1, 2], "total": 2})
+        assert hub.watcher.poll() == {"data.json"}
+        assert hub.publish_changes() == 1
+
+        events = _drain(subscriber)
+        assert [(name, event["panel"]) for name, event in events] == [("delta", "data")]
+        ops = events[0][1]["ops"]
+        assert {"op": "add", "path": "/items/-", "value": 2} in ops
+        assert apply_patch(state["data"], ops) == {"items": [1, 2], "total": 2}
+        hub.unsubscribe(subscriber)
+
+    def test_unchanged_data_sends_nothing(self, temp_directory):
+        """Recomputing panels with the same data queues no events"""
+        _, hub = self._hub(temp_directory, {"items": [1]})
+        subscriber = hub.subscribe()
+        _drain(subscriber)
+        assert hub.publish_changes() == 0
+        assert subscriber.empty()
+        hub.unsubscribe(subscriber)
+
+    def test_failing_panel_is_reported_as_null(self, temp_directory, capsys):
+        """A panel that raises does not break the others"""
+        hub = PanelStreamHub(
+            DirectoryWatcher(temp_directory),
+            {"broken": lambda: 1 / 0, "ok": lambda: [1]},
+            interval=60,
+        )
+        subscriber = hub.subscribe()
+        assert _drain(subscriber) == [
+            ("snapshot", {"panel": "broken", "data": None}),
+            ("snapshot", {"panel": "ok", "data": [1]}),
+        ]
+        assert "broken" in capsys.readouterr().err
+        hub.unsubscribe(subscriber)
+
+
+@pytest.mark.unit
+def test_format_sse():
+    """Events are a named event line, a compact data line and a blank line"""
+    assert format_sse("delta", {"panel": "x", "ops": []}) == 'event: delta\ndata: {"panel":"x","ops":[]}\n\n'
@@ -0,0 +1,151 @@
+"""
+Unit tests for Delta Backups
+
+Tests the incremental backup store used by unified parameter storage:
+- JSON-patch diffs and their application
+- Delta chains on top of full snapshots
+- Point-in-time rebuilds and snapshot retention
+"""
+
+import pytest
+import os
+import json
+import sys
+import time
+from datetime import datetime
+
+# Add lib directory to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
+
+from delta_backup import DeltaBackupStore, apply_patch, json_diff
+
+
+def _write(path, data):
+    """Write data to path and return the file signature."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+class TestJsonDiff:
+    """Test suite for json_diff and apply_patch"""
+
+    @pytest.mark.unit
+    def test_round_trip(self):
+        """Applying the diff to a copy of old yields new"""
+        old = {"a": 1, "b": {"c": [1, 2, 3]}, "gone": True, "x/y~z": "k"}
+        new = {"a": 2, "b": {"c": [1, 2, 3, 4]}, "added": None, "x/y~z": "v"}
+        ops = json_diff(old, new)
+        assert apply_patch(json.loads(json.dumps(old)), ops) == new
+        assert {"op": "add", "path": "/b/c/-", "value": 4} in ops
+        assert {"op": "replace", "path": "/x~1y~0z", "value": "v"} in ops
+
+    @pytest.mark.unit
+    def test_rolling_history_is_incremental(self):
+        """A list trimmed at the front and appended to is not replaced whole"""
+        old = {"history": list(range(100))}
+        new = {"history": list(range(2, 103))}
+        ops = json_diff(old, new)
+        assert len(ops) == 5
+        assert apply_patch(json.loads(json.dumps(old)), ops) == new
+
+    @pytest.mark.unit
+    def test_type_change_and_unchanged(self):
+        """Type changes replace the value and equal values produce no ops"""
+        assert json_diff({"a": 1}, {"a": 1}) == []
+        assert json_diff({"a": 1}, {"a": 1.0}) == [{"op": "replace", "path": "/a", "value": 1.0}]
+        assert apply_patch({"a": 1}, [{"op": "replace", "path": "", "value": [1]}]) == [1]
+
+
+class TestDeltaBackupStore:
+    """Test suite for DeltaBackupStore class"""
+
+    @pytest.mark.unit
+    def test_deltas_between_snapshots(self, temp_directory):
+        """Writes append deltas until the chain is full, then a snapshot is taken"""
+        source = os.path.join(temp_directory, 'data.json')
+        store = DeltaBackupStore(os.path.join(temp_directory, 'backups'), 'data', snapshot_every=3)
+
+        signature = _write(source, {"value": 0})
+        for value in range(1, 6):
+            store.prepare(source, signature)
+            base, signature = signature, _write(source, {"value": value})
+            store.record({"value": value}, base, signature)
+
+        snapshots = store.list_snapshots()
+        assert len(snapshots) == 2
+        chain = store._chain_for(snapshots[0][1])
+        with open(chain, encoding='utf-8') as f:
+            assert len(f.readlines()) == 3
+        assert store.rebuild() == {"value": 5}
+
+    @pytest.mark.unit
+    def test_external_change_starts_new_snapshot(self, temp_directory):
+        """A chain is only extended from the state it ends with"""
+        source = os.path.join(temp_directory, 'data.json')
+        store = DeltaBackupStore(os.path.join(temp_directory, 'backups'), 'data')
+
+        signature = _write(source, {"value": 0})
+        assert store.prepare(source, signature)
+        base, signature = signature, _write(source, {"value": 1})
+        assert store.record({"value": 1}, base, signature) == 1
+        assert not store.prepare(source, signature)
+
+        time.sleep(0.01)
+        signature = _write(source, {"value": 2, "external": True})
+        assert store.record({"value": 3}, None, signature) == 0
+        assert store.prepare(source, signature)
+        assert store.rebuild() == {"value": 2, "external": True}
+
+    @pytest.mark.unit
+    def test_point_in_time_rebuild(self, temp_directory):
+        """Deltas recorded after the requested time are not replayed"""
+        source = os.path.join(temp_directory, 'data.json')
+        store = DeltaBackupStore(os.path.join(temp_directory, 'backups'), 'data')
+
+        signature = _write(source, {"history": []})
+        checkpoints = []
+        for value in range(4):
+            store.prepare(source, signature)
+            data = {"history": list(range(value + 1))}
+            base, signature = signature, _write(source, data)
+            store.record(data, base, signature)
+            time.sleep(0.01)
+            checkpoints.append(datetime.now())
+
+        assert store.rebuild(checkpoints[1]) == {"history": [0, 1]}
+        assert store.rebuild(checkpoints[-1]) == {"history": [0, 1, 2, 3]}
+        assert store.rebuild(datetime(2000, 1, 1)) is None
+
+    @pytest.mark.unit
+    def test_torn_delta_line_is_skipped(self, temp_directory):
+        """An interrupted append does not prevent rebuilding earlier state"""
+        source = os.path.join(temp_directory, 'data.json')
+        store = DeltaBackupStore(os.path.join(temp_directory, 'backups'), 'data')
+
+        signature = _write(source, {"value": 0})
+        store.prepare(source, signature)
+        base, signature = signature, _write(source, {"value": 1})
+        store.record({"value": 1}, base, signature)
+        with open(store._chain_path, 'a', encoding='utf-8') as f:
+            f.write('{"timestamp": "2')
+
+        assert store.rebuild() == {"value": 1}
+
+    @pytest.mark.unit
+    def test_cleanup_keeps_recent_snapshots(self, temp_directory):
+        """Old snapshots are removed together with their delta chains"""
+        source = os.path.join(temp_directory, 'data.json')
+        backup_dir = os.path.join(temp_directory, 'backups')
+        store = DeltaBackupStore(backup_dir, 'data', snapshot_every=1, keep_snapshots=2)
+
+        signature = _write(source, {"value": 0})
+        for value in range(1, 5):
+            store.prepare(source, signature)
+            base, signature = signature, _write(source, {"value": value})
+            store.record({"value": value}, base, signature)
+
+        assert len(store.list_snapshots()) == 2
+        assert len([name for name in os.listdir(backup_dir) if name.endswith('.deltas.jsonl')]) == 2
+        assert store.rebuild() == {"value": 4}
@@ -0,0 +1,86 @@
+"""
+Unit tests for Chart Downsampling
+
+Tests LTTB downsampling of dashboard chart series:
+- Bounded output that keeps the endpoints and extremes
+- Budget sharing between series
+- Argument validation
+"""
+
+import pytest
+import os
+import math
+import sys
+
+# Add lib directory to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
+
+from downsampling import downsample, lttb, lttb_indices
+
+
+def _points(n, model="A"):
+    """Build n trend points with a smooth curve"""
+    return [{"i": i, "score": 50 + 40 * math.sin(i / 25), "model_used": model} for i in range(n)]
+
+
+@pytest.mark.unit
+class TestLttb:
+    """Test single-series LTTB"""
+
+    def test_short_series_unchanged(self):
+        """Series within the budget are returned as they are"""
+        points = _points(10)
+        assert lttb(points, 10, lambda p: p["score"]) == points
+        assert downsample(points, 50, lambda p: p["score"]) == points
+
+    def test_bounded_and_keeps_endpoints(self):
+        """Output has exactly max_points points, in order, including first and last"""
+        points = _points(10000)
+        sampled = lttb(points, 200, lambda p: p["score"])
+        assert len(sampled) == 200
+        assert sampled[0] is points[0] and sampled[-1] is points[-1]
+        assert [p["i"] for p in sampled] == sorted(p["i"] for p in sampled)
+
+    def test_keeps_spikes(self):
+        """A single outlier in a flat series survives downsampling"""
+        values = [70.0] * 5000
+        values[3210] = 5.0
+        assert 3210 in lttb_indices(values, 50)
+
+    def test_missing_values_count_as_zero(self):
+        """Points without a numeric value do not break the selection"""
+        points = [{"score": None}, {"score": "n/a"}] + [{"score": i} for i in range(100)]
+        assert len(lttb(points, 10, lambda p: p["score"])) == 10
+
+    def test_rejects_tiny_budget(self):
+        """At least three points are needed to form triangles"""
+        with pytest.raises(ValueError):
+            lttb_indices([1.0, 2.0, 3.0, 4.0], 2)
+        with pytest.raises(ValueError):
+            downsample(_points(10), 1, lambda p: p["score"])
+
+
+@pytest.mark.unit
+class TestSeriesDownsampling:
+    """Test downsampling of several series together"""
+
+    def test_budget_shared_per_series(self):
+        """Each series is reduced on its own and keeps its endpoints"""
+        points = sorted(_points(3000, "A") + _points(1000, "B"), key=lambda p: (p["i"], p["model_used"]))
+        sampled = downsample(points, 400, lambda p: p["score"], lambda p: p["model_used"])
+
+        by_model = {}
+        for point in sampled:
+            by_model.setdefault(point["model_used"], []).append(point["i"])
+        assert len(by_model["A"]) == 300
+        assert len(by_model["B"]) == 100
+        assert by_model["A"][0] == 0 and by_model["A"][-1] == 2999
+        assert by_model["B"][0] == 0 and by_model["B"][-1] == 999
+        # Original order is kept across series
+        assert sampled == [p for p in points if p in sampled]
+
+    def test_small_series_keep_minimum(self):
+        """Tiny series still keep at least three points"""
+        points = _points(2000, "A") + _points(5, "B")
+        sampled = downsample(points, 100, lambda p: p["score"], lambda p: p["model_used"])
+        assert sum(1 for p in sampled if p["model_used"] == "B") == 3
@@ -0,0 +1,81 @@
+"""
+Unit tests for the File Utilities
+
+Tests the file helpers shared by the caches, stores and dashboard:
+- Atomic file replacement, including racing and failed writers
+- File signatures from paths and stat results
+"""
+
+import pytest
+import os
+import threading
+from pathlib import Path
+import sys
+
+# Add lib directory to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
+
+from file_utils import atomic_write_bytes, file_signature
+
+
+class TestAtomicWrite:
+    """Test suite for atomic_write_bytes"""
+
+    @pytest.mark.unit
+    def test_replaces_file_without_leaving_temp(self, temp_directory):
+        """The target is replaced and no temporary file remains"""
+        path = Path(temp_directory) / "object"
+        atomic_write_bytes(path, b"first")
+        atomic_write_bytes(path, b"second")
+        assert path.read_bytes() == b"second"
+        assert os.listdir(temp_directory) == ["object"]
+
+    @pytest.mark.unit
+    def test_concurrent_writers(self, temp_directory):
+        """Writers racing on one file each leave a complete version behind"""
+        path = Path(temp_directory) / "object"
+        errors = []
+
+        def write(n):
+            try:
+                for _ in range(50):
+                    atomic_write_bytes(path, bytes([n]) * 4096)
+            except OSError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not errors
+        data = path.read_bytes()
+        assert len(data) == 4096 and len(set(data)) == 1
+        assert os.listdir(temp_directory) == ["object"]
+
+    @pytest.mark.unit
+    def test_failed_write_removes_temp(self, temp_directory):
+        """A write that fails leaves neither a temporary file nor a changed target"""
+        path = Path(temp_directory) / "object"
+        atomic_write_bytes(path, b"first")
+        with pytest.raises(TypeError):
+            atomic_write_bytes(path, "not bytes")
+        assert path.read_bytes() == b"first"
+        assert os.listdir(temp_directory) == ["object"]
+
+
+class TestFileSignature:
+    """Test suite for file_signature"""
+
+    @pytest.mark.unit
+    def test_signature_tracks_rewrites(self, temp_directory):
+        """Paths and stat results give the same signature, which changes on rewrite"""
+        path = Path(temp_directory) / "object"
+        assert file_signature(path) is None
+
+        atomic_write_bytes(path, b"first")
+        signature = file_signature(path)
+        assert signature == file_signature(os.stat(path)) == file_signature(str(path))
+
+        atomic_write_bytes(path, b"second!")
+        assert file_signature(path) != signature
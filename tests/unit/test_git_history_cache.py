@@ -0,0 +1,148 @@
+"""
+Unit tests for Git History Cache
+
+Tests the shared git history cache:
+- Parsing of git log -z --numstat output
+- No git process while HEAD is unchanged
+- Incremental extension from the cached HEAD and rebuilds after history rewrites
+- Persistence shared between cache instances
+"""
+
+import pytest
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+# Add lib directory to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
+
+from git_history_cache import CACHE_FILE, GitHistoryCache, parse_log, read_head, repo_head
+
+requires_git = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+def _git(repo, *args):
+    """Run git in a test repository"""
+    return subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True, text=True).stdout
+
+
+def _commit(repo, filename, content, message):
+    """Write a file and commit it"""
+    with open(os.path.join(repo, filename), "w", encoding="utf-8") as f:
+        f.write(content)
+    _git(repo, "add", filename)
+    _git(repo, "commit", "-q", "-m", message)
+
+
+@pytest.fixture
+def repo(temp_directory):
+    """Git repository with two commits"""
+    path = os.path.join(temp_directory, "repo")
+    os.makedirs(path)
+    _git(path, "init", "-q")
+    _git(path, "config", "user.email", "dev@example.com")
+    _git(path, "config", "user.name", "Dev")
+    _commit(path, "a.txt", "one\n", "feat: first")
+    _commit(path, "b.txt", "one\ntwo\n", "fix: second\n\nWith a body")
+    return path
+
+
+def _cache(temp_directory, repo):
+    """Cache stored in a pattern directory next to the repository"""
+    return GitHistoryCache(Path(temp_directory) / ".claude-patterns" / CACHE_FILE, Path(repo))
+
+
+@pytest.mark.unit
+class TestParseLog:
+    """Test parsing of the cache's git log format"""
+
+    def test_parses_fields_files_and_renames(self):
+        """Headers, numstat lines, binary files and renames are parsed"""
+        output = (
+            "\x1eabc\x1fp1\x1f2025-01-01 12:00:00 +0000\x1f1735732800\x1fDev\x1fdev@example.com\x1f"
+            "fix: thing\n\nbody\n\x1d\n3\t1\tlib/a.py\x00-\t-\timg.png\x00"
+            "0\t0\t\x00old.py\x00new.py\x00\x00"
+            "\x1edef\x1fp2 p3\x1f2025-01-01 11:00:00 +0000\x1f1735729200\x1fDev\x1fdev@example.com\x1fMerge\x1d"
+        )
+        first, merge = parse_log(output)
+        assert first["hash"] == "abc"
+        assert first["subject"] == "fix: thing"
+        assert first["message"] == "fix: thing\n\nbody"
+        assert first["committed"] == 1735732800
+        assert first["files"] == [
+            {"filename": "lib/a.py", "additions": 3, "deletions": 1, "changes": 4},
+            {"filename": "img.png", "additions": 0, "deletions": 0, "changes": 0},
+            {"filename": "new.py", "additions": 0, "deletions": 0, "changes": 0},
+        ]
+        assert merge["parents"] == ["p2", "p3"] and merge["files"] == []
+
+
+@requires_git
+@pytest.mark.unit
+class TestGitHistoryCache:
+    """Test the cache against a real repository"""
+
+    def test_reads_history_once(self, temp_directory, repo):
+        """The first query runs one git log; later queries with the same HEAD run none"""
+        cache = _cache(temp_directory, repo)
+        commits = cache.commits()
+        assert [commit["subject"] for commit in commits] == ["fix: second", "feat: first"]
+        assert commits[0]["files"] == [{"filename": "b.txt", "additions": 2, "deletions": 0, "changes": 2}]
+        assert cache.spawns == 1
+
+        cache.commits()
+        cache.get(commits[1]["hash"][:8])
+        assert cache.spawns == 1
+
+    def test_head_read_without_git(self, repo):
+        """HEAD is resolved from loose and packed refs"""
+        head = _git(repo, "rev-parse", "HEAD").strip()
+        assert read_head(Path(repo) / ".git") == head
+        _git(repo, "pack-refs", "--all")
+        assert read_head(Path(repo) / ".git") == head
+
+    def test_repo_head_from_subdirectory(self, temp_directory, repo):
+        """repo_head finds the repository above a directory; outside one it is None"""
+        subdirectory = Path(repo) / ".claude-patterns"
+        subdirectory.mkdir()
+        assert repo_head(subdirectory) == _git(repo, "rev-parse", "HEAD").strip()
+        assert repo_head(Path(temp_directory)) is None
+
+    def test_extends_incrementally(self, temp_directory, repo):
+        """New commits are read from the cached HEAD on"""
+        cache = _cache(temp_directory, repo)
+        cache.commits()
+        _commit(repo, "c.txt", "x\n", "docs: third")
+
+        commits = cache.commits()
+        assert [commit["subject"] for commit in commits] == ["docs: third", "fix: second", "feat: first"]
+        # Ancestry check plus one log of the new range
+        assert cache.spawns == 3
+
+    def test_rebuilds_after_rewrite(self, temp_directory, repo):
+        """Rewritten history replaces the cached commits"""
+        cache = _cache(temp_directory, repo)
+        cache.commits()
+        _git(repo, "commit", "-q", "--amend", "-m", "fix: reworded")
+
+        assert [commit["subject"] for commit in cache.commits()] == ["fix: reworded", "feat: first"]
+
+    def test_shared_through_cache_file(self, temp_directory, repo):
+        """Another instance (e.g. another process) answers from the persisted cache"""
+        _cache(temp_directory, repo).commits()
+        other = _cache(temp_directory, repo)
+        assert len(other.commits()) == 2
+        assert other.spawns == 0
+
+    def test_since_limit_and_lookup(self, temp_directory, repo):
+        """Queries filter by commit time and count; lookups accept hash prefixes"""
+        from datetime import datetime, timedelta
+
+        cache = _cache(temp_directory, repo)
+        assert cache.commits(since=datetime.now() + timedelta(hours=1)) == []
+        newest = cache.commits(limit=1)
+        assert len(newest) == 1
+        assert cache.get(newest[0]["hash"][:10])["subject"] == "fix: second"
+        assert cache.get("0000000") is None
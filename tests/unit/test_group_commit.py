@@ -0,0 +1,150 @@
+"""
+Unit tests for the Group-Commit Write Queue
+
+Tests the write queue behind TokenMonitoringSystem.record_metric:
+- Items written in batches by one writer thread
+- flush() as a barrier for deterministic reads
+- Bounded capacity, failure isolation and shutdown
+"""
+
+import pytest
+import os
+import sqlite3
+import sys
+import threading
+
+# Add lib directory to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
+
+import group_commit
+from group_commit import GroupCommitQueue
+
+
+class _Recorder:
+    """write_batch/after_batch pair recording what the writer did"""
+
+    def __init__(self, fail=False):
+        self.batches = []
+        self.processed = []
+        self.threads = set()
+        self.fail = fail
+
+    def write(self, batch):
+        self.threads.add(threading.current_thread().name)
+        if self.fail:
+            raise sqlite3.OperationalError("database is locked")
+        self.batches.append(list(batch))
+
+    def after(self, batch):
+        self.processed.extend(batch)
+
+
+@pytest.mark.unit
+class TestGroupCommitQueue:
+    """Test the group-commit write queue"""
+
+    def test_flush_writes_everything_in_batches(self):
+        """Items are written off the caller's thread, in order, at most max_batch at a time"""
+        recorder = _Recorder()
+        queue = GroupCommitQueue(recorder.write, max_batch=10, flush_interval=1.0, after_batch=recorder.after)
+        for i in range(25):
+            queue.put(i)
+        assert queue.flush(timeout=5)
+
+        assert [item for batch in recorder.batches for item in batch] == list(range(25))
+        assert max(len(batch) for batch in recorder.batches) == 10
+        assert recorder.processed == list(range(25))
+        assert recorder.threads == {"group-commit-writer"}
+        assert queue.stats()["written"] == 25 and queue.pending == 0
+        queue.close()
+
+    def test_concurrent_producers(self):
+        """Items from several threads all arrive exactly once"""
+        recorder = _Recorder()
+        queue = GroupCommitQueue(recorder.write, capacity=50, max_batch=20)
+
+        def produce(offset):
+            for i in range(offset, offset + 500):
+                queue.put(i)
+
+        threads = [threading.Thread(target=produce, args=(n * 500,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        queue.flush(timeout=5)
+
+        written = [item for batch in recorder.batches for item in batch]
+        assert sorted(written) == list(range(2000))
+        queue.close()
+
+    def test_failed_writes_are_isolated(self, capsys):
+        """A failing write is reported and does not stop the writer or the after-batch hook"""
+        recorder = _Recorder(fail=True)
+        queue = GroupCommitQueue(recorder.write, after_batch=recorder.after)
+        queue.put("metric")
+        assert queue.flush(timeout=5)
+
+        assert queue.stats()["failed"] == 1
+        assert recorder.processed == ["metric"]
+        assert "database is locked" in capsys.readouterr().err
+        queue.close()
+
+    def test_close_and_writes_after_close(self):
+        """close() drains the queue; later items are written synchronously"""
+        recorder = _Recorder()
+        queue = GroupCommitQueue(recorder.write, flush_interval=10.0)
+        queue.put(1)
+        queue.close(timeout=5)
+        assert recorder.batches == [[1]]
+
+        queue.put(2)
+        assert recorder.batches == [[1], [2]]
+        assert queue.flush() is True
+
+    def test_exit_hook_tracks_open_queues(self):
+        """Running queues are closed at exit; closed ones are no longer held"""
+        recorder = _Recorder()
+        queue = GroupCommitQueue(recorder.write, flush_interval=10.0)
+        queue.put(1)
+        assert queue in group_commit._open_queues
+
+        group_commit._close_open_queues()
+        assert recorder.batches == [[1]]
+        assert queue not in group_commit._open_queues
+
+    def test_rejects_bad_arguments(self):
+        """Capacity, batch size and interval must be positive"""
+        with pytest.raises(ValueError):
+            GroupCommitQueue(lambda batch: None, capacity=0)
+        with pytest.raises(ValueError):
+            GroupCommitQueue(lambda batch: None, flush_interval=0)
+
+
+@pytest.mark.unit
+def test_token_monitoring_writes_and_alerts(temp_directory, monkeypatch):
+    """record_metric rows are stored and checked for alerts once flush_metrics returns"""
+    # The monitor's optimizer and cache singletons use .claude-patterns in the working directory
+    monkeypatch.chdir(temp_directory)
+    from token_monitoring_system import AlertLevel, MetricType, TokenMonitoringSystem
+
+    monitor = TokenMonitoringSystem(cache_dir=os.path.join(temp_directory, "monitoring"))
+    handled = []
+    monitor.add_alert_handler(MetricType.CONSUMPTION, handled.append)
+    try:
+        for _ in range(200):
+            monitor.record_metric(MetricType.CONSUMPTION, 1000, "agent")
+        monitor.record_metric(MetricType.CONSUMPTION, 60000, "spike")
+        monitor.create_budget("session", 5000, user_id="dev")
+        assert monitor.use_budget("session", 100)
+        assert monitor.flush_metrics(timeout=10)
+
+        conn = sqlite3.connect(str(monitor.db_path))
+        try:
+            assert conn.execute("SELECT COUNT(*) FROM token_metrics").fetchone()[0] == 202
+        finally:
+            conn.close()
+        assert [alert.level for alert in monitor.get_active_alerts()] == [AlertLevel.WARNING]
+        assert [alert.current_value for alert in handled] == [60000]
+    finally:
+        monitor.metric_queue.close(timeout=5)
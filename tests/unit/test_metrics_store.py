@@ -0,0 +1,243 @@
+"""
+Unit tests for the Metrics Store
+
+Tests the storage behind UnifiedMetricsAggregator:
+- Daily and weekly rollups maintained with the raw rows
+- KPI result series and the latest system snapshot
+- Retention by dropping monthly partitions
+- Migration of databases written before partitioning
+- UnifiedMetricsAggregator storing, scoring and reading back through the store
+"""
+
+import pytest
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add lib directory to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
+
+from metrics_store import MetricsStore, get_metrics_store, partition_name
+from unified_metrics_aggregator import UnifiedMetricsAggregator
+
+
+@pytest.fixture
+def store(temp_directory):
+    """Create a store on a temporary database"""
+    store = MetricsStore(os.path.join(temp_directory, "unified_metrics.db"))
+    yield store
+    store.close()
+
+
+def _kpi(name, value, achievement_rate, trend="stable"):
+    """KPI result as passed to record_kpi_results"""
+    return {
+        "kpi_name": name,
+        "category": "performance",
+        "value": value,
+        "target_value": 60.0,
+        "achievement_rate": achievement_rate,
+        "trend": trend,
+    }
+
+
+@pytest.mark.unit
+class TestMetricRollups:
+    """Test metric storage and rollups"""
+
+    def test_wal_mode_and_shared_connection(self, temp_directory):
+        """One WAL-mode store per database file"""
+        db_path = os.path.join(temp_directory, "unified_metrics.db")
+        store = get_metrics_store(db_path)
+        assert get_metrics_store(os.path.join(temp_directory, ".", "unified_metrics.db")) is store
+        assert store._conn.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal"
+
+    def test_rollups_track_raw_rows(self, store):
+        """Daily buckets hold count, average, extremes and the newest value"""
+        day = datetime(2026, 10, 14, 9, 0)
+        for hour, value in ((0, 40.0), (2, 70.0), (1, 55.0)):
+            store.record_metrics(
+                day + timedelta(hours=hour), "daily", [("cache_hit_rate", "performance", "%", value)], "test"
+            )
+        store.record_metrics(day + timedelta(days=1), "daily", [("cache_hit_rate", "performance", "%", 90.0)], "test")
+
+        series = store.metric_series("cache_hit_rate", "day", day - timedelta(days=1))
+        assert [point["bucket"] for point in series] == ["2026-10-14T00:00:00", "2026-10-15T00:00:00"]
+        first = series[0]
+        assert (first["count"], first["average"], first["min"], first["max"]) == (3, 55.0, 40.0, 70.0)
+        # Recorded out of order: the newest measurement closes the bucket
+        assert first["last"] == 70.0
+
+        weekly = store.metric_series("cache_hit_rate", "week", day)
+        assert len(weekly) == 1 and weekly[0]["bucket"] == "2026-10-12T00:00:00" and weekly[0]["count"] == 4
+
+        raw = store._conn.execute(f"SELECT COUNT(*) FROM {partition_name('aggregated_metrics', day)}").fetchone()[0]
+        assert raw == 4
+
+    def test_latest_values(self, store):
+        """The newest value of each metric in the window, newest first"""
+        now = datetime.now()
+        store.record_metrics(now - timedelta(days=40), "daily", [("error_rate", "system_health", "%", 9.0)], "test")
+        store.record_metrics(now - timedelta(hours=2), "daily", [("error_rate", "system_health", "%", 2.0)], "test")
+        store.record_metrics(now - timedelta(hours=1), "weekly", [("cache_hit_rate", "performance", "%", 80.0)], "test")
+
+        latest = store.latest_metric_values(now - timedelta(days=30))
+        assert [(entry["metric_name"], entry["value"]) for entry in latest] == [
+            ("cache_hit_rate", 80.0),
+            ("error_rate", 2.0),
+        ]
+        assert latest[0]["period"] == "weekly"
+        assert store.latest_metric_values(now - timedelta(minutes=30)) == []
+
+
+@pytest.mark.unit
+class TestKpisAndSnapshots:
+    """Test KPI result series and system snapshots"""
+
+    def test_kpi_series(self, store):
+        """KPI buckets carry the closing achievement rate and trend"""
+        day = datetime(2026, 10, 14, 9, 0)
+        store.record_kpi_results(day, "daily", [_kpi("cache_hit_rate", 50.0, 80.0), _kpi("error_rate", 1.0, 120.0)])
+        store.record_kpi_results(day + timedelta(hours=3), "daily", [_kpi("cache_hit_rate", 70.0, 110.0, "improving")])
+        store.record_kpi_results(day + timedelta(hours=4), "weekly", [_kpi("cache_hit_rate", 10.0, 20.0)])
+
+        series = store.kpi_series("day", day, period="daily")
+        assert sorted(series) == ["cache_hit_rate", "error_rate"]
+        point = series["cache_hit_rate"][0]
+        assert (point["average"], point["last"], point["achievement_rate"], point["trend"]) == (
+            60.0,
+            70.0,
+            110.0,
+            "improving",
+        )
+        # Without a period filter, buckets of all periods are merged
+        merged = store.kpi_series("day", day, kpi_name="cache_hit_rate")["cache_hit_rate"][0]
+        assert merged["count"] == 3 and merged["last"] == 10.0
+
+    def test_latest_snapshot(self, store):
+        """The newest snapshot is found across partitions"""
+        assert store.latest_snapshot() is None
+        store.record_snapshot(datetime(2026, 9, 30, 23, 0), {"total_tokens_saved": 5}, '{"n": 1}')
+        store.record_snapshot(datetime(2026, 10, 1, 1, 0), {"cache_hit_rate": 75.0}, '{"n": 2}')
+        assert store.latest_snapshot() == ("2026-10-01T01:00:00", '{"n": 2}')
+
+    def test_unknown_granularity(self, store):
+        """Only daily and weekly rollups exist"""
+        with pytest.raises(ValueError):
+            store.kpi_series("hour", datetime.now())
+
+
+@pytest.mark.unit
+class TestRetention:
+    """Test partition drops and rollup trimming"""
+
+    def test_drop_before(self, store):
+        """Whole months are dropped and only the cutoff's month is trimmed"""
+        for when in (datetime(2026, 7, 20), datetime(2026, 8, 5), datetime(2026, 8, 25), datetime(2026, 9, 10)):
+            store.record_metrics(when, "daily", [("error_rate", "system_health", "%", 1.0)], "test")
+
+        result = store.drop_before("aggregated_metrics", datetime(2026, 8, 15))
+        assert result == {"partitions": 1, "rows": 1}
+        assert store.partitions("aggregated_metrics") == [
+            "aggregated_metrics_p202608",
+            "aggregated_metrics_p202609",
+        ]
+
+        removed = store.trim_rollups(datetime(2026, 8, 15))
+        series = store.metric_series("error_rate", "day", datetime(2026, 1, 1))
+        assert [point["bucket"][:10] for point in series] == ["2026-08-25", "2026-09-10"]
+        # Two daily buckets, plus the weekly buckets of July 20 and August 5
+        assert removed == 4
+
+
+@pytest.mark.unit
+class TestMigration:
+    """Test migration of unpartitioned databases"""
+
+    def test_migrates_unpartitioned_tables(self, temp_directory):
+        """Rows of the old tables move into partitions and rollups"""
+        db_path = Path(temp_directory) / "unified_metrics.db"
+        conn = sqlite3.connect(str(db_path))
+        conn.execute(
+            "CREATE TABLE aggregated_metrics (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL,"
+            " metric_name TEXT NOT NULL, category TEXT NOT NULL, period TEXT NOT NULL, value REAL NOT NULL,"
+            " unit TEXT NOT NULL, source_system TEXT NOT NULL, metadata TEXT, created_at TEXT)"
+        )
+        conn.execute(
+            "CREATE TABLE kpi_results (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL,"
+            " kpi_name TEXT NOT NULL, category TEXT NOT NULL, value REAL NOT NULL, target_value REAL NOT NULL,"
+            " achievement_rate REAL NOT NULL, trend TEXT, period TEXT NOT NULL, created_at TEXT)"
+        )
+        conn.executemany(
+            "INSERT INTO aggregated_metrics (timestamp, metric_name, category, period, value, unit, source_system)"
+            " VALUES (?, 'error_rate', 'system_health', 'daily', ?, '%', 'unified_aggregator')",
+            [("2026-09-30T10:00:00", 3.0), ("2026-10-01T10:00:00", 1.0)],
+        )
+        conn.execute(
+            "INSERT INTO kpi_results (timestamp, kpi_name, category, value, target_value, achievement_rate, trend,"
+            " period) VALUES ('2026-10-01T10:00:00', 'error_rate', 'system_health', 1.0, 2.0, 125.0, 'stable', 'daily')"
+        )
+        conn.commit()
+        conn.close()
+
+        store = MetricsStore(str(db_path))
+        try:
+            assert store.partitions("aggregated_metrics") == [
+                "aggregated_metrics_p202609",
+                "aggregated_metrics_p202610",
+            ]
+            series = store.metric_series("error_rate", "week", datetime(2026, 9, 28))
+            assert series[0]["count"] == 2 and series[0]["last"] == 1.0
+            assert store.kpi_series("day", datetime(2026, 10, 1))["error_rate"][0]["achievement_rate"] == 125.0
+            tables = {row[0] for row in store._conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            assert "aggregated_metrics" not in tables and "kpi_results" not in tables
+        finally:
+            store.close()
+
+
+@pytest.mark.unit
+class TestUnifiedMetricsAggregator:
+    """Test the aggregator reading and writing through the store"""
+
+    @pytest.fixture
+    def aggregator(self, temp_directory):
+        """Create an aggregator whose database lives in a temporary directory"""
+        aggregator = UnifiedMetricsAggregator(cache_dir=temp_directory)
+        yield aggregator
+        aggregator.store.close()
+
+    def test_uses_shared_store(self, temp_directory, aggregator):
+        """The aggregator opens the shared store for its database file"""
+        assert aggregator.store is get_metrics_store(os.path.join(temp_directory, "unified_metrics.db"))
+
+    def test_stored_metrics_feed_kpis(self, aggregator):
+        """Stored metrics reach the rollups and are scored and recorded as KPI results"""
+        since = datetime.now() - timedelta(days=1)
+        aggregator.store_aggregated_metrics({"overall_cache_hit_rate": 85.0, "error_rate": 0.5, "timestamp": "now"})
+
+        latest = {row["metric_name"]: row for row in aggregator.store.latest_metric_values(since)}
+        assert sorted(latest) == ["error_rate", "overall_cache_hit_rate"]
+        assert (latest["overall_cache_hit_rate"]["category"], latest["overall_cache_hit_rate"]["unit"]) == (
+            "performance",
+            "%",
+        )
+
+        kpis = aggregator.store.kpi_series("day", since, period="daily")
+        assert kpis["cache_hit_rate"][0]["last"] == 85.0
+        assert kpis["error_rate"][0]["last"] == 0.5
+
+        scores = aggregator.get_kpi_dashboard_data()["current_scores"]["individual_kpis"]
+        assert scores["cache_hit_rate"]["current_value"] == 85.0
+
+    def test_dashboard_reuses_fresh_snapshot(self, aggregator):
+        """Dashboard reads return the stored snapshot instead of collecting a new one"""
+        aggregator.store.record_snapshot(
+            datetime.now(), {"cache_hit_rate": 75.0}, json.dumps({"recommendations": ["a"], "next_actions": []})
+        )
+
+        data = aggregator.get_kpi_dashboard_data()
+        assert data["system_snapshot"] == {"recommendations": ["a"], "next_actions": []}
+        assert data["summary"]["total_recommendations"] == 1
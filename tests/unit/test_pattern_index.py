@@ -0,0 +1,162 @@
+"""
+Unit tests for the Pattern Index
+
+Tests the BM25 inverted index used by PatternStorage.retrieve_patterns:
+- Tokenization and per-field postings
+- BM25 ranking and side-array filters
+- Incremental persistence through the append log
+- Sync and rebuild against a pattern store
+"""
+
+import pytest
+import os
+import sys
+
+# Add lib directory to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
+
+from pattern_index import PatternIndex, tokenize
+
+
+def make_pattern(pattern_id, context, approach="", task_type="feature_implementation", quality_score=0.9):
+    """Build a minimal stored pattern"""
+    return {
+        "pattern_id": pattern_id,
+        "task_type": task_type,
+        "context": context,
+        "approach": approach,
+        "quality_score": quality_score,
+        "usage_count": 0,
+    }
+
+
+class TestPatternIndex:
+    """Test suite for PatternIndex class"""
+
+    @pytest.fixture
+    def index(self, temp_directory):
+        """Create an empty PatternIndex in a temporary directory"""
+        return PatternIndex(temp_directory)
+
+    @pytest.mark.unit
+    def test_tokenize(self):
+        """Tokens are lowercase words without punctuation"""
+        assert tokenize("Add JWT-based Auth, v2!") == ["add", "jwt", "based", "auth", "v2"]
+
+    @pytest.mark.unit
+    def test_search_ranks_by_bm25(self, index):
+        """Documents with more and rarer matching terms rank first"""
+        index.add_pattern(make_pattern("p1", "database connection pooling", "pooling"))
+        index.add_pattern(make_pattern("p2", "user authentication with JWT tokens", "JWT implementation"))
+        index.add_pattern(make_pattern("p3", "JWT refresh", "tokens"))
+
+        hits = index.search("jwt authentication")
+        assert [doc for doc, _ in hits] == [1, 2]
+        assert hits[0][1] > hits[1][1] > 0
+
+    @pytest.mark.unit
+    def test_search_applies_filters(self, index):
+        """task_type and min_quality filters exclude documents before scoring"""
+        index.add_pattern(make_pattern("p1", "cache layer", quality_score=0.95))
+        index.add_pattern(make_pattern("p2", "cache layer", task_type="bug_fix", quality_score=0.95))
+        index.add_pattern(make_pattern("p3", "cache layer", quality_score=0.5))
+
+        assert [doc for doc, _ in index.search("cache", min_quality=0.8)] == [0, 1]
+        assert [doc for doc, _ in index.search("cache", task_type="bug_fix")] == [1]
+        assert index.search("unrelated") == []
+
+    @pytest.mark.unit
+    def test_ties_break_on_quality_then_usage(self, index):
+        """Equal BM25 scores fall back to quality score, then usage count"""
+        index.add_pattern(make_pattern("p1", "retry logic", quality_score=0.8))
+        index.add_pattern(make_pattern("p2", "retry logic", quality_score=0.9))
+        index.add_pattern(make_pattern("p3", "retry logic", quality_score=0.8))
+        index.note_usage("p3")
+
+        assert [doc for doc, _ in index.search("retry", limit=3)] == [1, 2, 0]
+
+    @pytest.mark.unit
+    def test_persistence_via_log_and_snapshot(self, temp_directory):
+        """Indexed documents survive a reload, before and after a snapshot save"""
+        index = PatternIndex(temp_directory, save_threshold=2)
+        index.add_pattern(make_pattern("p1", "alpha"))
+        index.add_pattern(make_pattern("p2", "beta"))
+        index.add_pattern(make_pattern("p3", "gamma"))
+
+        assert index.index_file.exists()
+        reloaded = PatternIndex(temp_directory)
+        assert reloaded.doc_count == 3
+        assert [doc for doc, _ in reloaded.search("gamma")] == [2]
+
+    @pytest.mark.unit
+    def test_sync_indexes_tail_and_rebuilds_on_mismatch(self, index):
+        """sync adds only missing patterns and rebuilds a stale index"""
+        patterns = [make_pattern("p1", "alpha"), make_pattern("p2", "beta")]
+        index.sync_patterns(patterns)
+        assert index.doc_count == 2
+
+        patterns.append(make_pattern("p3", "gamma"))
+        index.sync_patterns(patterns)
+        assert index.doc_count == 3
+
+        replaced = [make_pattern("x1", "delta")]
+        index.sync_patterns(replaced)
+        assert index.pattern_ids == ["x1"]
+        assert index.search("alpha") == []
+
+    @pytest.mark.unit
+    def test_save_keeps_documents_logged_by_another_instance(self, temp_directory):
+        """A snapshot folds in log entries another process appended instead of truncating them away"""
+        first = PatternIndex(temp_directory)
+        second = PatternIndex(temp_directory)
+        first.add_pattern(make_pattern("p1", "alpha"))
+
+        second.save()
+        assert second.doc_count == 1
+        assert PatternIndex(temp_directory).pattern_ids == ["p1"]
+
+
+@pytest.mark.unit
+class TestIndexedRetrieval:
+    """Test PatternStorage retrieval through the index"""
+
+    def stored(self, temp_directory):
+        """PatternStorage in json mode holding three patterns"""
+        from pattern_storage import PatternStorage
+
+        storage = PatternStorage(temp_directory)
+        for n, context in enumerate(["oauth login flow", "database migration", "login rate limiting"]):
+            pattern = make_pattern(f"p{n}", context, approach="steps")
+            pattern["skills_used"] = ["testing"]
+            storage.store_pattern(pattern)
+        return storage
+
+    def test_repeated_retrievals_do_not_reread(self, temp_directory, monkeypatch):
+        """Queries are served from the parsed patterns until patterns.json changes"""
+        storage = self.stored(temp_directory)
+        reads = []
+        read_patterns = storage._read_patterns
+        monkeypatch.setattr(storage, "_read_patterns", lambda: reads.append(1) or read_patterns())
+
+        for _ in range(3):
+            results = storage.retrieve_patterns("login", min_quality=0.5)
+        assert sorted(p["pattern_id"] for p in results) == ["p0", "p2"]
+        assert reads == []
+
+        # Results are copies of the cached patterns
+        results[0]["context"] = "changed"
+        assert storage.retrieve_patterns("changed") == []
+
+    def test_sees_other_writers(self, temp_directory):
+        """Patterns stored and used by another instance are picked up"""
+        from pattern_storage import PatternStorage
+
+        storage = self.stored(temp_directory)
+        assert storage.retrieve_patterns("login", min_quality=0.5, limit=1)[0]["pattern_id"] == "p0"
+
+        other = PatternStorage(temp_directory)
+        other.update_usage("p2")
+        other.store_pattern(dict(make_pattern("p3", "kerberos ticket"), skills_used=["testing"]))
+
+        assert storage.retrieve_patterns("login", min_quality=0.5, limit=1)[0]["pattern_id"] == "p2"
+        assert [p["pattern_id"] for p in storage.retrieve_patterns("kerberos")] == ["p3"]
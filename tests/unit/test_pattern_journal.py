@@ -0,0 +1,192 @@
+"""
+Unit tests for the Pattern Journal backend
+
+Tests the append-only journal storage used by PatternStorage journal mode:
+- O(1) appends for stores and usage updates
+- Snapshot compaction and replay of the journal tail
+- Cross-instance visibility of appended records
+- Import/export of the legacy patterns.json format
+"""
+
+import pytest
+import json
+import os
+from pathlib import Path
+import sys
+
+# Add lib directory to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
+
+from pattern_journal import PatternJournal
+
+
+def make_pattern(pattern_id, quality_score=0.9):
+    """Build a minimal stored pattern"""
+    return {
+        "pattern_id": pattern_id,
+        "task_type": "feature_implementation",
+        "context": f"context for {pattern_id}",
+        "skills_used": ["testing"],
+        "approach": "approach",
+        "quality_score": quality_score,
+        "usage_count": 0,
+        "success_rate": 1.0,
+    }
+
+
+class TestPatternJournal:
+    """Test suite for PatternJournal class"""
+
+    @pytest.fixture
+    def journal(self, temp_directory):
+        """Create a PatternJournal with automatic compaction disabled"""
+        return PatternJournal(temp_directory, compact_threshold=0)
+
+    @pytest.mark.unit
+    def test_append_is_journaled_not_rewritten(self, journal):
+        """Stores append one line to the journal without writing a snapshot"""
+        journal.append_pattern(make_pattern("p1"))
+        journal.append_pattern(make_pattern("p2"))
+
+        lines = journal.journal_file.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 2
+        assert json.loads(lines[1])["op"] == "store"
+        assert not journal.snapshot_file.exists()
+        assert [p["pattern_id"] for p in journal.read_patterns()] == ["p1", "p2"]
+
+    @pytest.mark.unit
+    def test_record_usage(self, journal):
+        """Usage events update the running success rate"""
+        journal.append_pattern(make_pattern("p1"))
+
+        assert journal.record_usage("p1", success=True) is True
+        assert journal.record_usage("p1", success=False) is True
+        assert journal.record_usage("missing", success=True) is False
+
+        pattern = journal.get_pattern("p1")
+        assert pattern["usage_count"] == 2
+        assert pattern["success_rate"] == 0.5
+        assert "last_used" in pattern
+
+    @pytest.mark.unit
+    def test_threshold_compaction(self, temp_directory):
+        """Reaching the threshold folds the journal into the snapshot"""
+        journal = PatternJournal(temp_directory, compact_threshold=3)
+        for i in range(4):
+            journal.append_pattern(make_pattern(f"p{i}"))
+
+        snapshot = json.loads(journal.snapshot_file.read_text(encoding="utf-8"))
+        assert len(snapshot["patterns"]) == 3
+        assert journal.get_status()["journal_records"] == 1
+        assert len(journal.read_patterns()) == 4
+
+    @pytest.mark.unit
+    def test_other_instance_sees_tail_and_compaction(self, temp_directory):
+        """Readers replay the tail and reload after another writer compacts"""
+        writer = PatternJournal(temp_directory, compact_threshold=0)
+        reader = PatternJournal(temp_directory, compact_threshold=0)
+
+        writer.append_pattern(make_pattern("p1"))
+        assert len(reader) == 1
+
+        writer.compact()
+        writer.append_pattern(make_pattern("p2"))
+        writer.record_usage("p1", success=True)
+
+        patterns = reader.read_patterns()
+        assert [p["pattern_id"] for p in patterns] == ["p1", "p2"]
+        assert patterns[0]["usage_count"] == 1
+
+    @pytest.mark.unit
+    def test_replay_skips_records_already_in_snapshot(self, journal):
+        """A journal left behind by an interrupted compaction is not applied twice"""
+        journal.append_pattern(make_pattern("p1"))
+        journal.record_usage("p1", success=True)
+        stale_journal = journal.journal_file.read_bytes()
+
+        journal.compact()
+        journal.journal_file.write_bytes(stale_journal)
+
+        fresh = PatternJournal(journal.patterns_dir, compact_threshold=0)
+        patterns = fresh.read_patterns()
+        assert len(patterns) == 1
+        assert patterns[0]["usage_count"] == 1
+
+    @pytest.mark.unit
+    def test_partial_trailing_line_is_ignored(self, journal):
+        """A torn write at the end of the journal does not break readers or writers"""
+        journal.append_pattern(make_pattern("p1"))
+        with open(journal.journal_file, "a", encoding="utf-8") as f:
+            f.write('{"op": "store", "pat')
+
+        fresh = PatternJournal(journal.patterns_dir, compact_threshold=0)
+        assert len(fresh) == 1
+        fresh.append_pattern(make_pattern("p2"))
+        assert [p["pattern_id"] for p in PatternJournal(journal.patterns_dir).read_patterns()] == ["p1", "p2"]
+
+    @pytest.mark.unit
+    def test_bootstrap_from_legacy_patterns_file(self, temp_directory):
+        """An existing patterns.json seeds the journal store"""
+        legacy = Path(temp_directory) / "patterns.json"
+        legacy.write_text(json.dumps({"version": "1.0", "patterns": [make_pattern("old")]}), encoding="utf-8")
+
+        journal = PatternJournal(temp_directory)
+        assert [p["pattern_id"] for p in journal.read_patterns()] == ["old"]
+
+    @pytest.mark.unit
+    def test_export_preserves_object_structure(self, temp_directory):
+        """Export writes the legacy format and keeps extra top-level keys"""
+        legacy = Path(temp_directory) / "patterns.json"
+        legacy.write_text(json.dumps({"version": "1.0", "patterns": []}), encoding="utf-8")
+
+        journal = PatternJournal(temp_directory, compact_threshold=0)
+        journal.append_pattern(make_pattern("p1"))
+        journal.export_json()
+
+        data = json.loads(legacy.read_text(encoding="utf-8"))
+        assert data["version"] == "1.0"
+        assert data["metadata"]["total_patterns"] == 1
+        assert data["patterns"][0]["pattern_id"] == "p1"
+
+
+@pytest.mark.unit
+class TestJournalStorageMode:
+    """Test PatternStorage running on the journal backend"""
+
+    def test_store_retrieve_compact(self, temp_directory):
+        """Stored patterns are retrievable before and after compaction, also from a new instance"""
+        from pattern_storage import PatternStorage
+
+        storage = PatternStorage(temp_directory, storage_mode="journal")
+        for n in range(3):
+            pattern = make_pattern(f"p{n}")
+            pattern["context"] = f"fix login session bug {n}"
+            storage.store_pattern(pattern)
+        assert storage.update_usage("p1", success=False)
+        assert sorted(p["pattern_id"] for p in storage.retrieve_patterns("login", limit=5)) == ["p0", "p1", "p2"]
+
+        assert storage.compact_journal()
+        assert (Path(temp_directory) / "patterns.journal.jsonl").stat().st_size == 0
+
+        reopened = PatternStorage(temp_directory, storage_mode="journal")
+        patterns = {p["pattern_id"]: p for p in reopened.get_patterns()}
+        assert set(patterns) == {"p0", "p1", "p2"}
+        assert patterns["p1"]["usage_count"] == 1
+        assert patterns["p1"]["success_rate"] == 0.0
+        assert reopened.retrieve_patterns("session bug 2", limit=1)[0]["pattern_id"] == "p2"
+
+    def test_cli_storage_flag(self, temp_directory, monkeypatch, capsys):
+        """--storage journal stores through the journal and compact folds it"""
+        import pattern_storage
+
+        pattern = make_pattern("cli")
+        for argv in (
+            ["--dir", temp_directory, "--storage", "journal", "store", "--pattern", json.dumps(pattern)],
+            ["--dir", temp_directory, "--storage", "journal", "compact"],
+        ):
+            monkeypatch.setattr(sys, "argv", ["pattern_storage.py"] + argv)
+            pattern_storage.main()
+        output = capsys.readouterr().out
+        assert '"pattern_id": "cli"' in output
+        assert '"compacted": true' in output
+        assert [p["pattern_id"] for p in PatternJournal(temp_directory).read_patterns()] == ["cli"]
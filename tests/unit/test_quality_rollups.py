@@ -0,0 +1,212 @@
+"""
+Unit tests for Quality Rollups
+
+Tests the bucketed score aggregates behind the dashboard trend views:
+- Hour, day and week bucketing split by model and task type
+- Incremental recording through the journal, compaction and retention
+- Concurrent recorders sharing one rollup file
+- Rebuilding and combining buckets
+"""
+
+import pytest
+import json
+import os
+import sys
+import threading
+from datetime import datetime, timedelta
+
+# Add lib directory to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
+
+from quality_rollups import (
+    ASSESSMENT_STREAM,
+    GRANULARITIES,
+    RETENTION,
+    ROLLUP_FILE,
+    TRACKER_STREAM,
+    QualityRollups,
+    bucket_start,
+    parse_time,
+)
+from assessment_storage import AssessmentStorage
+from quality_tracker import QualityTracker
+
+
+class TestBucketStart:
+    """Test suite for bucket_start"""
+
+    @pytest.mark.unit
+    def test_granularities(self):
+        """Buckets start on the hour, at midnight and on Monday"""
+        when = datetime(2025, 1, 2, 13, 45, 10)  # a Thursday
+        assert bucket_start(when, "hour") == datetime(2025, 1, 2, 13)
+        assert bucket_start(when, "day") == datetime(2025, 1, 2)
+        assert bucket_start(when, "week") == datetime(2024, 12, 30)
+        with pytest.raises(ValueError):
+            bucket_start(when, "month")
+
+
+class TestQualityRollups:
+    """Test suite for QualityRollups class"""
+
+    @pytest.mark.unit
+    def test_record_persists_and_aggregates(self, temp_directory):
+        """Recorded scores are aggregated per bucket, model and task type and survive reloads"""
+        path = os.path.join(temp_directory, ROLLUP_FILE)
+        rollups = QualityRollups(path)
+        assert rollups.record("s", "2025-01-02T10:15:00+00:00", 80, "glm", "debugging")
+        assert rollups.record("s", "2025-01-02T10:45:00Z", 90, "glm", "debugging")
+        assert rollups.record("s", "2025-01-02T11:05:00", 70, "opus", "testing")
+        assert not rollups.record("s", "2025-01-02T12:00:00", 0, "opus", "testing")
+        assert not rollups.record("s", "not a time", 50, "opus", "testing")
+
+        reloaded = QualityRollups(path)
+        assert reloaded.count("s") == 3
+        hours = reloaded.query("s", "hour")
+        assert [(c["bucket"], c["model"], c["count"], c["avg"]) for c in hours] == [
+            ("2025-01-02T10:00:00", "glm", 2, 85.0),
+            ("2025-01-02T11:00:00", "opus", 1, 70.0),
+        ]
+        days = reloaded.query("s", "day")
+        assert reloaded.totals(days, "bucket") == {
+            "2025-01-02T00:00:00": {"count": 3, "sum": 240, "min": 70, "max": 90, "avg": 80.0}
+        }
+
+    @pytest.mark.unit
+    def test_query_filters(self, temp_directory):
+        """Queries select buckets from the one containing since and filter cells"""
+        rollups = QualityRollups(os.path.join(temp_directory, ROLLUP_FILE))
+        rollups.add("s", datetime(2025, 1, 1, 9), 60, "glm", "Debugging")
+        rollups.add("s", datetime(2025, 1, 3, 9), 80, "glm", "testing")
+        rollups.add("s", datetime(2025, 1, 3, 10), 100, "opus", "debugging")
+
+        assert [c["bucket"][:10] for c in rollups.query("s", "day", since=datetime(2025, 1, 1, 12))] == [
+            "2025-01-01", "2025-01-03", "2025-01-03"
+        ]
+        assert [c["avg"] for c in rollups.query("s", "day", task_types=["DEBUGGING"])] == [60, 100]
+        assert [c["avg"] for c in rollups.query("s", "week", model="opus")] == [100]
+        assert rollups.query("other", "day") == []
+        with pytest.raises(ValueError):
+            rollups.query("s", "minute")
+
+    @pytest.mark.unit
+    def test_rebuild_replaces_stream(self, temp_directory):
+        """Rebuilding a stream from history leaves other streams alone"""
+        rollups = QualityRollups(os.path.join(temp_directory, ROLLUP_FILE))
+        rollups.add("a", datetime(2025, 1, 1), 50, "", "unknown")
+        rollups.add("b", datetime(2025, 1, 1), 50, "", "unknown")
+        rollups.rebuild("a", [(datetime(2025, 1, 2), 70, "glm", "x"), (datetime(2025, 1, 2), None, "glm", "x")])
+
+        assert rollups.count("a") == 1
+        assert rollups.count("b") == 1
+        assert rollups.totals(rollups.query("a", "day"), "bucket", "model") == {
+            ("2025-01-02T00:00:00", "glm"): {"count": 1, "sum": 70, "min": 70, "max": 70, "avg": 70.0}
+        }
+
+    @pytest.mark.unit
+    def test_unreadable_file_starts_empty(self, temp_directory):
+        """A corrupt rollup file is ignored so readers rebuild it"""
+        path = os.path.join(temp_directory, ROLLUP_FILE)
+        with open(path, 'w') as f:
+            f.write('{"version": 1, "str')
+        assert QualityRollups(path).count("s") == 0
+
+    @pytest.mark.unit
+    def test_record_appends_and_compacts(self, temp_directory):
+        """Records go to the journal until the threshold folds them into the snapshot"""
+        path = os.path.join(temp_directory, ROLLUP_FILE)
+        rollups = QualityRollups(path, compact_threshold=3)
+        rollups.record("s", "2025-01-02T10:00:00", 80, "glm", "x")
+        rollups.record("s", "2025-01-02T11:00:00", 90, "glm", "x")
+        assert not os.path.exists(path)
+        assert QualityRollups(path).count("s") == 2
+
+        rollups.record("s", "2025-01-02T12:00:00", 70, "glm", "x")
+        assert os.path.getsize(rollups.journal_file) == 0
+        reloaded = QualityRollups(path)
+        assert reloaded.count("s") == 3
+        # Day buckets of 2025 are past retention by now; weeks are kept
+        assert reloaded.query("s", "day") == []
+        assert reloaded.totals(reloaded.query("s", "week"), "bucket")["2024-12-30T00:00:00"]["sum"] == 240
+
+    @pytest.mark.unit
+    def test_concurrent_recorders(self, temp_directory):
+        """Recorders with their own instances never lose each other's updates"""
+        path = os.path.join(temp_directory, ROLLUP_FILE)
+
+        def work(n):
+            rollups = QualityRollups(path, compact_threshold=7)
+            for i in range(25):
+                rollups.record(f"s{n % 2}", f"2025-01-02T{i % 24:02d}:00:00", 50 + n, "glm", "x")
+
+        threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        reloaded = QualityRollups(path)
+        assert reloaded.count("s0") == reloaded.count("s1") == 50
+
+    @pytest.mark.unit
+    def test_save_keeps_journaled_records(self, temp_directory):
+        """Saving a rebuilt stream keeps what other recorders journaled meanwhile"""
+        path = os.path.join(temp_directory, ROLLUP_FILE)
+        reader = QualityRollups(path)
+        QualityRollups(path).record("other", "2025-01-02T10:00:00", 80, "glm", "x")
+
+        reader.rebuild("s", [(datetime(2025, 1, 2), 70, "glm", "x")])
+        reader.save()
+        reloaded = QualityRollups(path)
+        assert reloaded.count("s") == 1
+        assert reloaded.count("other") == 1
+
+    @pytest.mark.unit
+    def test_retention(self, temp_directory):
+        """Compaction prunes hour and day buckets past their retention and keeps weeks"""
+        now = datetime(2025, 6, 1, 12)
+        rollups = QualityRollups(os.path.join(temp_directory, ROLLUP_FILE))
+        rollups.add("s", now - RETENTION["day"] - timedelta(days=1), 60, "glm", "x")
+        rollups.add("s", now - RETENTION["hour"] - timedelta(days=1), 70, "glm", "x")
+        rollups.add("s", now, 80, "glm", "x")
+        rollups.prune(now)
+
+        assert [c["avg"] for c in rollups.query("s", "hour")] == [80]
+        assert [c["avg"] for c in rollups.query("s", "day")] == [70, 80]
+        assert [c["avg"] for c in rollups.query("s", "week")] == [60, 70, 80]
+        assert rollups.count("s") == 3
+
+
+class TestRecordingHooks:
+    """Test suite for the rollup updates of the quality writers"""
+
+    def assert_rolled_up(self, path, stream, timestamp, score, task_type):
+        """The record landed in the hour, day and week bucket containing its timestamp"""
+        rollups = QualityRollups(path)
+        assert rollups.count(stream) == 1
+        when = parse_time(timestamp)
+        for granularity in GRANULARITIES:
+            cells = rollups.query(stream, granularity)
+            assert [(c["bucket"], c["task_type"], c["count"], c["avg"]) for c in cells] == [
+                (bucket_start(when, granularity).isoformat(), task_type, 1, score)
+            ]
+
+    @pytest.mark.unit
+    def test_store_assessment_updates_rollups(self, temp_directory):
+        """Storing an assessment adds it to the assessment stream"""
+        storage = AssessmentStorage(temp_directory)
+        assert storage.store_assessment(
+            {"command_name": "quality-check", "task_type": "testing", "overall_score": 88, "details": {}}
+        )
+
+        with open(os.path.join(temp_directory, "assessments.json")) as f:
+            timestamp = json.load(f)["assessments"][0]["timestamp"]
+        self.assert_rolled_up(os.path.join(temp_directory, ROLLUP_FILE), ASSESSMENT_STREAM, timestamp, 88, "testing")
+
+    @pytest.mark.unit
+    def test_record_quality_updates_rollups(self, temp_directory):
+        """Tracker records are rolled up on the 0-100 scale of assessments"""
+        tracker = QualityTracker(temp_directory)
+        assert tracker.record_quality("task-1", 0.75, {"code_quality": 0.8})
+
+        timestamp = tracker.get_recent_records()[0]["timestamp"]
+        self.assert_rolled_up(os.path.join(temp_directory, ROLLUP_FILE), TRACKER_STREAM, timestamp, 75.0, "unknown")
@@ -0,0 +1,72 @@
+"""
+Unit tests for the Smart Caching System
+
+Tests SmartCache on top of the shared tiered cache:
+- Put/get round trips and hit/miss statistics
+- Eviction from the memory tier with values still served from disk
+- Write-behind flushes of user patterns and statistics
+"""
+
+import pytest
+import json
+import os
+import sys
+
+# Add lib directory to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
+
+from smart_caching_system import SmartCache
+
+
+class TestSmartCache:
+    """Test suite for SmartCache class"""
+
+    @pytest.fixture
+    def cache(self, temp_directory):
+        """Create a cache with a 10 KB memory tier and no timed flushes"""
+        cache = SmartCache(temp_directory, max_size_mb=0.01, flush_interval=60)
+        yield cache
+        cache.shutdown()
+
+    @pytest.mark.unit
+    def test_put_get(self, cache):
+        """Stored content reads back; unknown keys count as misses"""
+        assert cache.put("docs/intro.md", {"text": "hello"})
+        assert cache.get("docs/intro.md") == {"text": "hello"}
+        assert cache.get("docs/missing.md") is None
+
+        stats = cache.get_cache_statistics()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["cache_size"] == 1
+
+    @pytest.mark.unit
+    def test_evicted_values_served_from_disk(self, cache):
+        """Entries evicted from memory are still returned once flushed"""
+        for i in range(20):
+            assert cache.put(f"key{i}", "x" * 2048)
+        cache.flush()
+
+        assert cache.get_cache_statistics()["evictions"] > 0
+        assert all(cache.get(f"key{i}") == "x" * 2048 for i in range(20))
+
+    @pytest.mark.unit
+    def test_flush_writes_patterns_and_stats(self, temp_directory, cache):
+        """User patterns and statistics reach disk on flush and load in a new cache"""
+        cache.put("a", "first", user_id="dev")
+        cache.put("b", "second", user_id="dev")
+        cache.get("a")
+        assert not os.path.exists(os.path.join(temp_directory, "user_patterns.json"))
+
+        cache.flush()
+        with open(os.path.join(temp_directory, "user_patterns.json")) as f:
+            assert "dev" in json.load(f)
+        with open(os.path.join(temp_directory, "cache_stats.json")) as f:
+            assert json.load(f)["hits"] == 1
+
+        reloaded = SmartCache(temp_directory, flush_interval=60)
+        try:
+            assert "dev" in reloaded.user_patterns
+            assert reloaded.get("b") == "second"
+        finally:
+            reloaded.shutdown()
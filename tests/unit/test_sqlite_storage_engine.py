@@ -0,0 +1,174 @@
+"""
+Unit tests for the SQLite Storage Engine
+
+Tests the optional WAL-mode SQLite engine for .claude-patterns data:
+- Document round-trips with list fields stored as indexed rows
+- Point appends/updates and changed-row-only document writes
+- Indexed range queries by timestamp, task type, agent and skill
+- FTS5 pattern search and the one-shot JSON migrator
+"""
+
+import pytest
+import json
+import os
+from pathlib import Path
+import sys
+
+# Add lib directory to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
+
+from sqlite_storage_engine import (
+    PATTERNS_COLLECTION,
+    SQLiteStorageEngine,
+    collection_name,
+    migrate_json_directory,
+)
+
+
+class TestSQLiteStorageEngine:
+    """Test suite for SQLiteStorageEngine class"""
+
+    @pytest.fixture
+    def engine(self, temp_directory):
+        """Create an engine on a temporary database"""
+        engine = SQLiteStorageEngine(os.path.join(temp_directory, "patterns.db"))
+        yield engine
+        engine.close()
+
+    @pytest.mark.unit
+    def test_wal_mode_enabled(self, engine):
+        """The database runs in WAL mode for concurrent readers"""
+        mode = engine._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode.lower() == "wal"
+
+    @pytest.mark.unit
+    def test_document_round_trip(self, engine):
+        """Objects and root-level arrays read back exactly as written"""
+        document = {
+            "version": "1.0.0",
+            "metadata": {"total": 2},
+            "task_history": [{"task_id": "t1"}, {"task_id": "t2"}],
+        }
+        engine.write_document("agent_performance.json", document)
+        engine.write_document("quality_history.json", [{"task_id": "q1", "quality_score": 0.8}])
+
+        assert engine.read_document("agent_performance.json") == document
+        assert engine.read_document("quality_history.json") == [{"task_id": "q1", "quality_score": 0.8}]
+        assert engine.read_document("missing.json", default={}) == {}
+        assert engine.count_records(collection_name("agent_performance.json", "task_history")) == 2
+
+    @pytest.mark.unit
+    def test_write_document_only_touches_changed_rows(self, engine):
+        """Appending to a list field writes one row, not the whole list"""
+        document = {"feedback_exchanges": [{"feedback_id": f"f{i}"} for i in range(50)]}
+        assert engine.write_document("agent_feedback.json", document) == 50
+
+        document["feedback_exchanges"].append({"feedback_id": "f50"})
+        assert engine.write_document("agent_feedback.json", document) == 1
+
+        document["feedback_exchanges"][3]["read"] = True
+        assert engine.write_document("agent_feedback.json", document) == 1
+
+        document["feedback_exchanges"] = document["feedback_exchanges"][:10]
+        assert engine.write_document("agent_feedback.json", document) == 41
+        assert len(engine.read_document("agent_feedback.json")["feedback_exchanges"]) == 10
+
+    @pytest.mark.unit
+    def test_append_and_update_record(self, engine):
+        """Records can be appended and updated in place by key"""
+        engine.append_record(PATTERNS_COLLECTION, {"pattern_id": "p1", "usage_count": 0})
+        engine.append_record(PATTERNS_COLLECTION, {"pattern_id": "p2", "usage_count": 0})
+
+        assert engine.update_record(PATTERNS_COLLECTION, "p2", {"pattern_id": "p2", "usage_count": 1}) is True
+        assert engine.update_record(PATTERNS_COLLECTION, "missing", {}) is False
+        assert engine.get_record(PATTERNS_COLLECTION, "p2")["usage_count"] == 1
+        assert [r["pattern_id"] for r in engine.read_records(PATTERNS_COLLECTION)] == ["p1", "p2"]
+
+    @pytest.mark.unit
+    def test_query_records_uses_indexed_columns(self, engine):
+        """Range and tag filters select the expected records"""
+        collection = collection_name("assessments.json", "assessments")
+        engine.write_document(
+            "assessments.json",
+            {
+                "assessments": [
+                    {"assessment_id": "a1", "timestamp": "2025-01-01T00:00:00", "task_type": "testing",
+                     "agents_used": ["test-engineer"], "skills_used": ["testing-strategies"]},
+                    {"assessment_id": "a2", "timestamp": "2025-01-05T00:00:00", "task_type": "refactoring",
+                     "agents_used": ["code-analyzer"]},
+                    {"assessment_id": "a3", "timestamp": "2025-01-09T00:00:00", "task_type": "testing",
+                     "agents_used": ["code-analyzer"], "skills_used": ["testing-strategies"]},
+                ]
+            },
+        )
+
+        def ids(records):
+            return [r["assessment_id"] for r in records]
+
+        assert ids(engine.query_records(collection, since="2025-01-04")) == ["a2", "a3"]
+        assert ids(engine.query_records(collection, task_type="testing", newest_first=True)) == ["a3", "a1"]
+        assert ids(engine.query_records(collection, agent="code-analyzer", skill="testing-strategies")) == ["a3"]
+        assert ids(engine.query_records(collection, limit=1)) == ["a1"]
+
+    @pytest.mark.unit
+    def test_search_patterns(self, engine):
+        """Pattern search ranks full-text matches and applies filters"""
+        engine.append_record(PATTERNS_COLLECTION, {
+            "pattern_id": "p1", "task_type": "feature_implementation", "quality_score": 0.9,
+            "context": "User authentication with JWT tokens", "approach": "JWT implementation",
+        })
+        engine.append_record(PATTERNS_COLLECTION, {
+            "pattern_id": "p2", "task_type": "bug_fix", "quality_score": 0.95,
+            "context": "Database connection management", "approach": "Connection pooling",
+        })
+
+        assert [p["pattern_id"] for p in engine.search_patterns("jwt")] == ["p1"]
+        assert engine.search_patterns("connection", task_type="feature_implementation") == []
+        assert engine.search_patterns("connection", min_quality=0.99) == []
+
+        engine.update_record(PATTERNS_COLLECTION, "p1", {
+            "pattern_id": "p1", "quality_score": 0.9, "context": "Rewritten", "approach": "",
+        })
+        assert engine.search_patterns("jwt") == []
+
+    @pytest.mark.unit
+    def test_migrate_json_directory(self, temp_directory):
+        """The migrator imports existing JSON files once"""
+        patterns_dir = Path(temp_directory)
+        (patterns_dir / "patterns.json").write_text(
+            json.dumps({"version": "1.0", "patterns": [{"pattern_id": "p1", "context": "x"}]}), encoding="utf-8"
+        )
+        (patterns_dir / "quality_history.json").write_text(
+            json.dumps([{"task_id": "t1", "quality_score": 0.9}]), encoding="utf-8"
+        )
+
+        result = migrate_json_directory(temp_directory)
+        assert result["migrated"] == {"patterns.json": 1, "quality_history.json": 1}
+
+        again = migrate_json_directory(temp_directory)
+        assert sorted(again["skipped"]) == ["patterns.json", "quality_history.json"]
+
+    @pytest.mark.unit
+    def test_migrate_root_array_patterns(self, temp_directory):
+        """A root-array patterns.json lands in the patterns collection and stays a list"""
+        from sqlite_storage_engine import get_storage_engine
+
+        pattern = {
+            "pattern_id": "p1", "task_type": "bug_fix", "quality_score": 0.9,
+            "context": "Fix login redirect loop", "approach": "Clear stale session cookie",
+        }
+        (Path(temp_directory) / "patterns.json").write_text(json.dumps([pattern]), encoding="utf-8")
+        assert migrate_json_directory(temp_directory)["migrated"] == {"patterns.json": 1}
+
+        engine = get_storage_engine(temp_directory)
+        assert engine.read_records(PATTERNS_COLLECTION) == [pattern]
+        assert [p["pattern_id"] for p in engine.search_patterns("login")] == ["p1"]
+        assert engine.read_document("patterns.json") == [pattern]
+
+    @pytest.mark.unit
+    def test_rewrite_drops_old_root_rows(self, engine):
+        """Rewriting a document clears list collections the new version no longer has"""
+        engine.write_document("custom.json", [{"id": "a"}])
+        engine.write_document("custom.json", {"items": [{"id": "b"}]}, list_fields=["items"])
+        assert engine.read_records(collection_name("custom.json", "__root__")) == []
+        assert engine.read_document("custom.json") == {"items": [{"id": "b"}]}
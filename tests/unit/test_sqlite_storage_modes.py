@@ -0,0 +1,122 @@
+"""
+Unit tests for the sqlite storage mode of the pattern-file writers
+
+Constructs each writer with storage_mode="sqlite" and round-trips a record
+through the shared patterns.db:
+- PatternStorage, including a migrated root-array patterns.json
+- QualityTracker, AssessmentStorage, AgentPerformanceTracker, AgentFeedbackSystem
+"""
+
+import pytest
+import json
+import os
+from pathlib import Path
+import sys
+
+# Add lib directory to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
+
+from sqlite_storage_engine import DATABASE_NAME, get_storage_engine, migrate_json_directory
+from pattern_storage import PatternStorage
+from quality_tracker import QualityTracker
+from assessment_storage import AssessmentStorage
+from agent_performance_tracker import AgentPerformanceTracker
+from agent_feedback_system import AgentFeedbackSystem
+
+
+class TestSQLiteStorageModes:
+    """Round-trips through each writer's sqlite mode"""
+
+    @pytest.mark.unit
+    def test_pattern_storage(self, temp_directory):
+        """Stored patterns are retrievable and usage updates persist"""
+        storage = PatternStorage(temp_directory, storage_mode="sqlite")
+        pattern_id = storage.store_pattern(
+            {
+                "task_type": "refactoring",
+                "context": "split the sqlite engine module",
+                "skills_used": ["code-analysis"],
+                "approach": "extract helpers",
+                "quality_score": 0.9,
+            }
+        )
+
+        assert storage.update_usage(pattern_id, success=True)
+        patterns = PatternStorage(temp_directory, storage_mode="sqlite").get_patterns()
+        assert [p["pattern_id"] for p in patterns] == [pattern_id]
+        assert patterns[0]["usage_count"] == 1
+        assert (Path(temp_directory) / DATABASE_NAME).exists()
+        assert not (Path(temp_directory) / "patterns.json").exists()
+
+    @pytest.mark.unit
+    def test_pattern_storage_reads_migrated_root_array(self, temp_directory):
+        """A root-array patterns.json migrates into the collection PatternStorage reads"""
+        legacy = [
+            {"pattern_id": "p1", "task_type": "bugfix", "context": "fix the login form", "quality_score": 0.8},
+            {"pattern_id": "p2", "task_type": "feature", "context": "add dark mode", "quality_score": 0.9},
+        ]
+        with open(os.path.join(temp_directory, "patterns.json"), "w") as f:
+            json.dump(legacy, f)
+        migrate_json_directory(temp_directory)
+
+        storage = PatternStorage(temp_directory, storage_mode="sqlite")
+        assert [p["pattern_id"] for p in storage.get_patterns()] == ["p1", "p2"]
+        assert [p["pattern_id"] for p in storage.retrieve_patterns(context="login")] == ["p1"]
+
+    @pytest.mark.unit
+    def test_quality_tracker(self, temp_directory):
+        """Quality records read back from the engine"""
+        tracker = QualityTracker(temp_directory, storage_mode="sqlite")
+        assert tracker.record_quality("task-1", 0.85, {"code_quality": 0.9})
+
+        records = QualityTracker(temp_directory, storage_mode="sqlite").get_recent_records()
+        assert [r["task_id"] for r in records] == ["task-1"]
+        assert records[0]["metrics"] == {"code_quality": 0.9}
+        assert get_storage_engine(temp_directory).read_document("quality_history.json")[0]["task_id"] == "task-1"
+
+    @pytest.mark.unit
+    def test_assessment_storage(self, temp_directory):
+        """Assessments are stored as rows and counted in the command summary"""
+        storage = AssessmentStorage(temp_directory, storage_mode="sqlite")
+        assert storage.store_assessment(
+            {
+                "command_name": "quality-check",
+                "assessment_type": "quality-control",
+                "overall_score": 88,
+                "breakdown": {"tests": 30},
+                "details": {},
+                "issues_found": [],
+                "recommendations": [],
+            }
+        )
+
+        document = get_storage_engine(temp_directory).read_document("assessments.json")
+        assert [a["command_name"] for a in document["assessments"]] == ["quality-check"]
+        assert document["total_assessments"] == 1
+        assert not (Path(temp_directory) / "assessments.json").exists()
+
+    @pytest.mark.unit
+    def test_agent_performance_tracker(self, temp_directory):
+        """Task executions update the agent's persisted performance"""
+        tracker = AgentPerformanceTracker(temp_directory, storage_mode="sqlite")
+        tracker.record_task_execution("code-analyzer", "task-1", "analysis", True, 92.0, 12.5)
+
+        performance = AgentPerformanceTracker(temp_directory, storage_mode="sqlite").get_agent_performance(
+            "code-analyzer"
+        )
+        assert performance["total_tasks"] == 1
+        assert performance["successful_tasks"] == 1
+
+    @pytest.mark.unit
+    def test_agent_feedback_system(self, temp_directory):
+        """Feedback exchanges read back and keep their read flag"""
+        system = AgentFeedbackSystem(temp_directory, storage_mode="sqlite")
+        feedback_id = system.add_feedback("code-analyzer", "quality-controller", "task-1", "success", "looks good")
+        system.mark_feedback_read(feedback_id)
+
+        feedbacks = AgentFeedbackSystem(temp_directory, storage_mode="sqlite").get_feedback_for_agent(
+            "quality-controller"
+        )
+        assert [fb["feedback_id"] for fb in feedbacks] == [feedback_id]
+        assert feedbacks[0]["read"] is True
+        assert not (Path(temp_directory) / "agent_feedback.json").exists()
@@ -0,0 +1,146 @@
+"""
+Unit tests for the Tiered Cache
+
+Tests the shared two-tier cache behind SmartCache, SimpleSmartCache and TokenCache:
+- L1 hits, write-behind flushes and L2 promotion
+- Content-addressed L2 storage and its size cap
+- Namespaces, clearing and expiry
+- Statistics readable across processes
+"""
+
+import pytest
+import os
+import sys
+import time
+
+# Add lib directory to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
+
+import tiered_cache
+from tiered_cache import TieredCache, read_cache_stats
+
+
+class TestTieredCache:
+    """Test suite for TieredCache class"""
+
+    @pytest.fixture
+    def cache(self, temp_directory):
+        """Create a tiered cache without a background flusher"""
+        cache = TieredCache(temp_directory, l1_max_mb=0.01, l2_max_mb=1, background=False)
+        yield cache
+        cache.close()
+
+    @pytest.mark.unit
+    def test_write_behind_and_promotion(self, temp_directory, cache):
+        """Puts reach L2 only on flush; a fresh cache promotes L2 hits into L1"""
+        cache.put("analysis", "k", {"result": 1}, tokens=7)
+        assert cache.get_stats()["l2"]["entries"] == 0
+        assert cache.get("analysis", "k") == {"result": 1}
+
+        assert cache.flush() == 1
+        assert cache.get_stats()["l2"]["entries"] == 1
+
+        reopened = TieredCache(temp_directory, background=False)
+        try:
+            assert reopened.get("analysis", "k") == {"result": 1}
+            assert reopened.get("analysis", "k") == {"result": 1}
+            stats = reopened.get_stats()["namespaces"]["analysis"]
+            assert stats["l2_hits"] == 1
+            assert stats["l1_hits"] == 2
+            assert stats["tokens_saved"] == 21
+        finally:
+            reopened.close()
+
+    @pytest.mark.unit
+    def test_values_pickled_once(self, cache, monkeypatch):
+        """The bytes pickled for sizing in put() are the ones flushed to L2"""
+        calls = []
+        serialize = tiered_cache._serialize
+        monkeypatch.setattr(tiered_cache, "_serialize", lambda value: calls.append(value) or serialize(value))
+
+        cache.put("analysis", "k", {"result": 1})
+        assert cache.flush() == 1
+        assert len(calls) == 1
+        assert cache._l1[("analysis", "k")].data is None
+
+    @pytest.mark.unit
+    def test_l1_is_bounded_and_l2_serves_evicted_entries(self, cache):
+        """Entries evicted from L1 are still served from L2"""
+        for i in range(30):
+            cache.put("content", f"k{i}", "x" * 1000)
+        cache.flush()
+
+        stats = cache.get_stats()
+        assert stats["l1"]["bytes"] <= stats["l1"]["max_bytes"]
+        assert stats["total"]["l1_evictions"] > 0
+        assert cache.get("content", "k0") == "x" * 1000
+        assert cache.count("content") == 30
+
+    @pytest.mark.unit
+    def test_identical_content_is_stored_once(self, cache):
+        """Content addressing stores one object for identical values"""
+        cache.put("optimized", "a", "same payload")
+        cache.put("analysis", "b", "same payload")
+        cache.flush()
+
+        l2 = cache.get_stats()["l2"]
+        assert l2["entries"] == 2
+        assert l2["objects"] == 1
+
+        cache.delete("optimized", "a")
+        cache.flush()
+        assert cache.get("analysis", "b") == "same payload"
+        assert cache.get_stats()["l2"]["objects"] == 1
+
+    @pytest.mark.unit
+    def test_l2_size_cap(self, temp_directory):
+        """L2 evicts least recently accessed entries beyond its cap"""
+        cache = TieredCache(temp_directory, l1_max_mb=0.001, l2_max_mb=0.01, background=False)
+        try:
+            for i in range(20):
+                cache.put("content", f"k{i}", os.urandom(1000))
+            cache.flush()
+            l2 = cache.get_stats()["l2"]
+            assert l2["bytes"] <= l2["max_bytes"]
+            assert cache.get_stats()["total"]["l2_evictions"] > 0
+            assert "k19" in cache.namespace("content")
+        finally:
+            cache.close()
+
+    @pytest.mark.unit
+    def test_namespaces_clear_and_expiry(self, cache):
+        """Namespaces are isolated; clear and TTL remove entries from both tiers"""
+        content = cache.namespace("content")
+        analysis = cache.namespace("analysis")
+        content.put("user_1", "a")
+        content.put("user_2", "b")
+        analysis.put("user_1", "c")
+        content.put("short", "d", ttl=0.01)
+        cache.flush()
+
+        assert content.clear("user_") == 2
+        assert "user_1" not in content
+        assert analysis.get("user_1") == "c"
+
+        time.sleep(0.02)
+        assert content.get("short") is None
+        cache.flush()
+        assert len(content) == 0
+
+        with pytest.raises(ValueError):
+            cache.namespace("bad namespace")
+
+    @pytest.mark.unit
+    def test_read_cache_stats(self, temp_directory, cache):
+        """Flushed counters are readable without opening a cache"""
+        cache.put("predictions", "k", "v")
+        cache.get("predictions", "k")
+        cache.get("predictions", "missing")
+        cache.flush()
+
+        stats = read_cache_stats(temp_directory)
+        assert stats["namespaces"]["predictions"]["puts"] == 1
+        assert stats["total"]["hits"] == 1
+        assert stats["total"]["misses"] == 1
+        assert stats["total"]["hit_rate"] == 0.5
+        assert stats["l2"]["entries"] == 1
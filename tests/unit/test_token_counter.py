@@ -0,0 +1,229 @@
+"""
+Unit tests for the Token Counter
+
+Tests the shared token-counting service:
+- Character-class features and calibrated estimates
+- Content-hash memoization and batch counting
+- Structured content counted as JSON
+- The token optimization modules estimating through count_tokens
+"""
+
+import pytest
+import json
+import os
+import sys
+import threading
+
+# Add lib directory to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
+
+from token_counter import (
+    FEATURES,
+    MIN_CACHED_LENGTH,
+    TokenCounter,
+    count_tokens,
+    get_token_counter,
+    load_reference_corpus,
+    run_benchmark,
+    text_features,
+)
+
+PROSE = (
+    "The orchestrator delegates analysis to specialized agents, collects their "
+    "results and records the learned patterns for future tasks.\n"
+)
+
+
+@pytest.mark.unit
+class TestFeatures:
+    """Test character-class features"""
+
+    def test_word_classes(self):
+        """Letter runs are split by length; humps, digits and punctuation are counted"""
+        features = dict(zip(FEATURES, text_features("a tokenCounter with 42 items!")))
+        assert features["short_words"] == 1  # a
+        assert features["medium_words"] == 2  # with, items
+        assert features["long_words"] == 1  # tokenCounter
+        assert features["long_word_letters"] == 12
+        assert features["humps"] == 1
+        assert features["digits"] == 2
+        assert features["punctuation"] == 1
+
+    def test_escapes_and_non_ascii(self):
+        """JSON escapes are counted once and not as letters; non-ASCII counts its UTF-8 bytes"""
+        features = dict(zip(FEATURES, text_features('"line\\nnext \\u2014 café"')))
+        assert features["escapes"] == 1
+        assert features["unicode_escapes"] == 1
+        assert features["medium_words"] == 2  # line, next
+        assert features["non_ascii_bytes"] == 2
+
+
+@pytest.mark.unit
+class TestCounting:
+    """Test estimates"""
+
+    def test_empty_and_short(self):
+        """Empty text is zero tokens; any other text at least one"""
+        counter = TokenCounter()
+        assert counter.count("") == 0
+        assert counter.count(None) == 0
+        assert counter.count(".") == 1
+
+    def test_estimate_is_plausible(self):
+        """English prose lands at four to six characters per token (reference BPE: 22 tokens)"""
+        tokens = TokenCounter().count(PROSE)
+        assert len(PROSE) / 7 < tokens < len(PROSE) / 4
+
+    def test_more_text_more_tokens(self):
+        """Counts grow with the text"""
+        counter = TokenCounter()
+        assert counter.count(PROSE * 4) > counter.count(PROSE * 2) > counter.count(PROSE)
+
+    def test_structured_content_counted_as_json(self):
+        """Dicts and lists are counted as their JSON"""
+        counter = TokenCounter()
+        message = {"type": "analysis_result", "content": PROSE, "score": 87}
+        assert counter.count(message) == counter.count(json.dumps(message))
+
+    def test_coefficient_count_checked(self):
+        """Coefficients must match the features"""
+        with pytest.raises(ValueError):
+            TokenCounter(coefficients=(1.0, 2.0))
+
+
+@pytest.mark.unit
+class TestMemo:
+    """Test memoization and batch counting"""
+
+    def test_repeated_counts_hit_memo(self):
+        """A repeated text is looked up by hash"""
+        counter = TokenCounter()
+        first = counter.count(PROSE)
+        assert counter.count(PROSE) == first
+        assert counter.get_stats()["hits"] == 1
+        assert counter.get_stats()["misses"] == 1
+
+    def test_short_texts_not_memoized(self):
+        """Texts below MIN_CACHED_LENGTH are counted directly"""
+        counter = TokenCounter()
+        counter.count("x" * (MIN_CACHED_LENGTH - 1))
+        assert counter.get_stats()["cached_counts"] == 0
+
+    def test_lru_bound(self):
+        """The memo keeps at most cache_size counts"""
+        counter = TokenCounter(cache_size=3)
+        for n in range(10):
+            counter.count(PROSE + str(n))
+        assert counter.get_stats()["cached_counts"] == 3
+
+    def test_batch_matches_single(self):
+        """Batch counts equal single counts and count duplicates once"""
+        texts = [PROSE, PROSE * 2, "short", PROSE, {"content": PROSE}]
+        single = TokenCounter()
+        expected = [single.count(text) for text in texts]
+
+        batch = TokenCounter()
+        assert batch.count_batch(texts) == expected
+        stats = batch.get_stats()
+        assert stats["misses"] == 3
+        assert stats["hits"] == 1
+
+    def test_concurrent_counts(self):
+        """Threads sharing a counter get consistent results"""
+        counter = TokenCounter(cache_size=8)
+        texts = [PROSE * (n % 5 + 1) for n in range(50)]
+        expected = TokenCounter().count_batch(texts)
+        results = []
+
+        def work():
+            results.append([counter.count(text) for text in texts])
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert all(result == expected for result in results)
+
+    def test_shared_counter(self):
+        """count_tokens uses the process-wide counter"""
+        assert get_token_counter() is get_token_counter()
+        assert count_tokens(PROSE) == TokenCounter().count(PROSE)
+
+
+@pytest.mark.unit
+def test_benchmark_with_reference(temp_directory):
+    """The benchmark reports throughput and per-estimator error against a reference"""
+    agents = os.path.join(temp_directory, "agents")
+    os.makedirs(agents)
+    with open(os.path.join(agents, "agent.md"), "w", encoding="utf-8") as f:
+        f.write((PROSE + "\n") * 20)
+
+    assert load_reference_corpus(temp_directory)
+    results = run_benchmark(reference=lambda text: max(1, len(text) // 4), root=temp_directory, repeats=1)
+    assert results["chunks"] > 0
+    assert results["cold_mb_per_sec"] > 0
+    assert results["errors"]["len // 4"]["mean_abs_error"] == 0
+    assert "token_counter" in results["errors"]
+
+
+@pytest.mark.unit
+class TestModuleEstimators:
+    """The token optimization modules estimate through count_tokens"""
+
+    @pytest.fixture(autouse=True)
+    def isolated_cwd(self, temp_directory, monkeypatch):
+        """Module singletons write to .claude-patterns in the working directory"""
+        monkeypatch.chdir(temp_directory)
+
+    def test_smart_caching_system(self, temp_directory):
+        """SmartCache credits hits with the count_tokens estimate"""
+        from smart_caching_system import SmartCache
+
+        cache = SmartCache(os.path.join(temp_directory, "cache"), flush_interval=60)
+        try:
+            assert cache._estimate_tokens(PROSE) == count_tokens(PROSE)
+        finally:
+            cache.shutdown()
+
+    def test_token_optimization_engine(self, temp_directory):
+        """TokenOptimizer estimates registered content with count_tokens"""
+        from token_optimization_engine import TokenOptimizer
+
+        assert TokenOptimizer(temp_directory)._estimate_tokens(PROSE) == count_tokens(PROSE)
+
+    def test_progressive_content_loader(self, temp_directory):
+        """Parsed sections carry the count_tokens estimate of their content"""
+        from progressive_content_loader import ProgressiveContentLoader
+
+        loader = ProgressiveContentLoader(temp_directory)
+        sections = loader._parse_content_sections("# Intro\n" + PROSE + "\n## Usage\n" + PROSE * 2, "doc.md")
+        assert len(sections) == 2
+        assert [section.tokens for section in sections] == [count_tokens(section.content) for section in sections]
+
+    def test_enhanced_progressive_loader(self, temp_directory):
+        """EnhancedProgressiveLoader estimates with count_tokens"""
+        from enhanced_progressive_loader import EnhancedProgressiveLoader
+
+        assert EnhancedProgressiveLoader(temp_directory)._estimate_tokens(PROSE) == count_tokens(PROSE)
+
+    def test_autonomous_token_optimizer(self, temp_directory):
+        """Message estimates are count_tokens of the content plus the metadata"""
+        from autonomous_token_optimizer import AutonomousTokenOptimizer
+
+        message = {"content": PROSE, "metadata": {"sender": "code-analyzer"}}
+        expected = count_tokens(PROSE) + count_tokens({"sender": "code-analyzer"})
+        assert AutonomousTokenOptimizer(temp_directory)._estimate_message_tokens(message) == expected
+
+    def test_token_optimization_integration(self, temp_directory):
+        """Monitoring-only requests pass content through with its count_tokens estimate"""
+        from token_optimization_integration import (
+            IntegrationConfig,
+            IntegrationMode,
+            OptimizationLevel,
+            TokenOptimizationIntegration,
+        )
+
+        config = IntegrationConfig(IntegrationMode.MONITORING_ONLY, OptimizationLevel.MINIMAL, data_directory=temp_directory)
+        integration = TokenOptimizationIntegration(config)
+        assert integration.process_task_request("analysis", PROSE) == (PROSE, count_tokens(PROSE))
@@ -0,0 +1,91 @@
+"""
+Unit tests for the Word Map Rewriter
+
+Tests the compiled whole-word replacement used by the communication optimizers:
+- Output identical to sequential per-word re.sub
+- Mapping chains and case-insensitive matching
+- Dead multi-word keys and the sequential fallback
+"""
+
+import pytest
+import os
+import random
+import re
+import sys
+
+# Add lib directory to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
+
+from word_map_rewriter import WordMapRewriter, run_benchmark
+
+
+def legacy_rewrite(mappings, text):
+    """Reference implementation: one case-insensitive whole-word re.sub per entry."""
+    for full_word, abbreviation in mappings.items():
+        text = re.sub(r"\b" + re.escape(full_word) + r"\b", abbreviation, text, flags=re.IGNORECASE)
+    return text
+
+
+MAPPINGS = {
+    "information": "info",
+    "time": "tm",
+    "guide": "gd",
+    "guideline": "guide",
+    "info": "inf",
+    "security": "sec",
+    "match": "match",
+    "on-time": "ontime",
+    "kit": "kt",
+}
+
+
+class TestWordMapRewriter:
+    """Test suite for WordMapRewriter class"""
+
+    @pytest.mark.unit
+    def test_chains_follow_later_entries_only(self):
+        """information -> info -> inf, but guideline -> guide stops at the earlier entry"""
+        rewriter = WordMapRewriter(MAPPINGS)
+        assert rewriter.single_pass
+        text = "Information guideline guide INFO"
+        assert rewriter.rewrite(text) == legacy_rewrite(MAPPINGS, text) == "inf guide gd inf"
+
+    @pytest.mark.unit
+    def test_whole_words_and_case(self):
+        """Only whole \\w runs match, in any case, including IGNORECASE-equal non-ASCII letters"""
+        rewriter = WordMapRewriter(MAPPINGS)
+        for text in (
+            "security_analysis timely TIME Security.MATCH",
+            "on-time On-Time time-on",
+            "Kit İnformation ſecurity ınfo",
+            "",
+        ):
+            assert rewriter.rewrite(text) == legacy_rewrite(MAPPINGS, text)
+
+    @pytest.mark.unit
+    def test_random_texts_match_legacy(self):
+        """Randomized texts over keys, values and separators match the sequential loop"""
+        rewriter = WordMapRewriter(MAPPINGS)
+        vocabulary = list(MAPPINGS) + list(MAPPINGS.values()) + ["other", "on"]
+        rng = random.Random(7)
+        for _ in range(500):
+            words = [rng.choice(vocabulary) + rng.choice(["", " ", "-", "_", ". ", "\n"]) for _ in range(12)]
+            text = "".join(c.upper() if rng.random() < 0.2 else c for c in "".join(words))
+            assert rewriter.rewrite(text) == legacy_rewrite(MAPPINGS, text)
+
+    @pytest.mark.unit
+    def test_live_multi_word_key_falls_back(self):
+        """Maps the single pass cannot reproduce use the sequential loop"""
+        mappings = {"on-time": "ontime", "time": "tm"}
+        rewriter = WordMapRewriter(mappings)
+        assert not rewriter.single_pass
+        text = "on-time delivery, time"
+        assert rewriter.rewrite(text) == legacy_rewrite(mappings, text) == "ontime delivery, tm"
+
+    @pytest.mark.unit
+    def test_benchmark_on_optimizer_map(self):
+        """The benchmark loads the enhanced optimizer's map and checks both implementations agree on it"""
+        results = run_benchmark(duration=0.05)
+        assert results["map_entries"] > 500
+        assert results["single_pass"]
+        assert results["compiled_msgs_per_sec"] > results["legacy_msgs_per_sec"]